@@ -0,0 +1,315 @@
+"""
+Analítica columnar de reservas y pagos (NumPy).
+
+Mantiene un espejo de reservations/payments en arreglos NumPy, una columna por
+atributo, que los endpoints actualizan en cada alta, pago o cancelación (bajo
+STORE_LOCK, igual que las listas). Las filas no se borran: una reserva
+cancelada queda con estado CANCELADA y un pago eliminado queda inactivo, así
+la tasa de cancelación sale de las mismas columnas. Los textos de baja
+cardinalidad (moneda, método de pago) se guardan como códigos enteros.
+
+Las agregaciones (np.unique / np.bincount sobre claves combinadas) trabajan
+sobre copias de las columnas tomadas con el lock, así que millones de filas se
+agregan en milisegundos sin recorrer dicts en Python ni retener el lock.
+
+NumPy es opcional: sin él, AnaliticaReservas no registra nada y
+`habilitada` es False (el endpoint responde 503). Se importa recién con la
+primera fila o la primera consulta, no al importar el servicio.
+"""
+
+import importlib.util
+import time
+from datetime import datetime, timezone
+
+# El servicio funciona igual sin NumPy, solo sin analítica
+NUMPY_DISPONIBLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+RESERVADA, PAGADA, CANCELADA = 0, 1, 2
+ESTADOS_RESERVA = ("Reservado", "Pagado", "Cancelado")
+_CODIGO_ESTADO = {"Reservado": RESERVADA, "Pagado": PAGADA}
+
+_SEGUNDOS_DIA = 86400
+
+
+def dia_actual():
+    """Días desde 1970-01-01 (UTC)."""
+    return int(time.time() // _SEGUNDOS_DIA)
+
+
+def fecha_de_dia(dia):
+    return datetime.fromtimestamp(int(dia) * _SEGUNDOS_DIA, timezone.utc).strftime("%Y-%m-%d")
+
+
+def dia_de_fecha(texto):
+    """'2025-04-30' -> días desde epoch; ValueError si no es una fecha ISO."""
+    fecha = datetime.strptime(texto, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(fecha.timestamp() // _SEGUNDOS_DIA)
+
+
+def dia_de_reserva(reserva):
+    """Día de reservation_date ('2025-04-30 10:00:00'); hoy si falta o no se entiende."""
+    try:
+        return dia_de_fecha(str(reserva.get("reservation_date"))[:10])
+    except ValueError:
+        return dia_actual()
+
+
+class _Diccionario:
+    """Codifica textos de baja cardinalidad como enteros consecutivos."""
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def codigo(self, valor):
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+class _Columnas:
+    """Columnas NumPy de igual largo; la capacidad se duplica al llenarse (alta amortizada O(1))."""
+
+    def __init__(self, tipos, capacidad=1024):
+        self.n = 0
+        self._tipos = tipos
+        self._capacidad = capacidad
+        self._datos = None  # se crean con la primera fila
+
+    def _reservar(self, n):
+        if self._datos is None:
+            _numpy()
+            while self._capacidad < n:
+                self._capacidad *= 2
+            self._datos = {nombre: np.zeros(self._capacidad, dtype=tipo) for nombre, tipo in self._tipos.items()}
+            return
+        if n <= self._capacidad:
+            return
+        capacidad = self._capacidad
+        while capacidad < n:
+            capacidad *= 2
+        for nombre, arreglo in self._datos.items():
+            nuevo = np.zeros(capacidad, dtype=arreglo.dtype)
+            nuevo[:self.n] = arreglo[:self.n]
+            self._datos[nombre] = nuevo
+        self._capacidad = capacidad
+
+    def agregar(self, **valores):
+        self._reservar(self.n + 1)
+        i = self.n
+        for nombre, valor in valores.items():
+            self._datos[nombre][i] = valor
+        self.n += 1
+        return i
+
+    def extender(self, **columnas):
+        """Agrega muchas filas de una vez (secuencias o arreglos del mismo largo)."""
+        largo = len(next(iter(columnas.values())))
+        self._reservar(self.n + largo)
+        for nombre, valores in columnas.items():
+            self._datos[nombre][self.n:self.n + largo] = valores
+        self.n += largo
+
+    def asignar(self, i, nombre, valor):
+        self._datos[nombre][i] = valor
+
+    def copia(self):
+        self._reservar(self.n)
+        return {nombre: arreglo[:self.n].copy() for nombre, arreglo in self._datos.items()}
+
+    def vaciar(self):
+        self.n = 0
+
+
+class AnaliticaReservas:
+    """Espejo columnar de reservas y pagos con agregaciones vectorizadas."""
+
+    def __init__(self, capacidad=1024):
+        self.habilitada = NUMPY_DISPONIBLE
+        if not self.habilitada:
+            return
+        self._reservas = _Columnas({
+            "route_id": "int64", "dia": "int32", "estado": "int8", "precio": "float64",
+        }, capacidad)
+        self._pagos = _Columnas({
+            "route_id": "int64", "moneda": "int16", "metodo": "int16",
+            "centimos": "int64", "activo": "bool",
+        }, capacidad)
+        self._fila_reserva = {}   # reservation_id -> fila (solo reservas vigentes)
+        self._fila_pago = {}      # payment_id -> fila (solo pagos vigentes)
+        self.monedas = _Diccionario()
+        self.metodos = _Diccionario()
+
+    # --- Eventos (se llaman con STORE_LOCK tomado) ---
+    def reserva_creada(self, reserva, dia=None):
+        if not self.habilitada:
+            return
+        self._fila_reserva[reserva["reservation_id"]] = self._reservas.agregar(
+            route_id=reserva.get("airplane_route_id") or 0,
+            dia=dia_actual() if dia is None else dia,
+            estado=_CODIGO_ESTADO.get(reserva.get("status"), RESERVADA),
+            precio=float(reserva.get("price") or 0.0),
+        )
+
+    def reserva_pagada(self, reservation_id):
+        if self.habilitada and reservation_id in self._fila_reserva:
+            self._reservas.asignar(self._fila_reserva[reservation_id], "estado", PAGADA)
+
+    def reserva_cancelada(self, reservation_id):
+        # El ID puede reutilizarse después: la fila queda como historial
+        fila = self._fila_reserva.pop(reservation_id, None) if self.habilitada else None
+        if fila is not None:
+            self._reservas.asignar(fila, "estado", CANCELADA)
+
+    def pago_creado(self, pago):
+        if not self.habilitada:
+            return
+        self._fila_pago[pago["payment_id"]] = self._pagos.agregar(
+            route_id=pago.get("airplane_route_id") or 0,
+            moneda=self.monedas.codigo(pago.get("currency") or "USD"),
+            metodo=self.metodos.codigo(pago.get("payment_method") or ""),
+            centimos=round(float(pago.get("amount") or 0) * 100),
+            activo=True,
+        )
+
+    def pago_eliminado(self, payment_id):
+        fila = self._fila_pago.pop(payment_id, None) if self.habilitada else None
+        if fila is not None:
+            self._pagos.asignar(fila, "activo", False)
+
+    def pago_editado(self, pago):
+        fila = self._fila_pago.get(pago["payment_id"]) if self.habilitada else None
+        if fila is not None:
+            self._pagos.asignar(fila, "metodo", self.metodos.codigo(pago.get("payment_method") or ""))
+
+    def cargar(self, reservas, pagos):
+        """
+        Reconstruye el espejo desde las listas en memoria (arranque y seed):
+        una lista por columna y una sola copia a NumPy, no una fila a la vez.
+        """
+        if not self.habilitada:
+            return
+        self._reservas.vaciar()
+        self._pagos.vaciar()
+        self._fila_reserva.clear()
+        self._fila_pago.clear()
+        if reservas:
+            # Muchas reservas comparten fecha: cada fecha distinta se parsea una sola vez
+            dias = {}
+            for r in reservas:
+                fecha = str(r.get("reservation_date"))[:10]
+                if fecha not in dias:
+                    dias[fecha] = dia_de_reserva(r)
+            self._fila_reserva.update((r["reservation_id"], i) for i, r in enumerate(reservas))
+            self._reservas.extender(
+                route_id=[r.get("airplane_route_id") or 0 for r in reservas],
+                dia=[dias[str(r.get("reservation_date"))[:10]] for r in reservas],
+                estado=[_CODIGO_ESTADO.get(r.get("status"), RESERVADA) for r in reservas],
+                precio=[float(r.get("price") or 0.0) for r in reservas],
+            )
+        if pagos:
+            self._fila_pago.update((p["payment_id"], i) for i, p in enumerate(pagos))
+            self._pagos.extender(
+                route_id=[p.get("airplane_route_id") or 0 for p in pagos],
+                moneda=[self.monedas.codigo(p.get("currency") or "USD") for p in pagos],
+                metodo=[self.metodos.codigo(p.get("payment_method") or "") for p in pagos],
+                centimos=[round(float(p.get("amount") or 0) * 100) for p in pagos],
+                activo=[True] * len(pagos),
+            )
+
+    def instantanea(self):
+        """Copia de las columnas (memcpy) para agregar fuera del lock."""
+        return {
+            "reservas": self._reservas.copia(),
+            "pagos": self._pagos.copia(),
+            "monedas": list(self.monedas.valores),
+            "metodos": list(self.metodos.valores),
+        }
+
+
+# --- Agregaciones (funciones puras sobre una instantánea) ---
+# np.bincount agrupa en O(n + rango) con un arreglo denso de contadores; conviene
+# solo si el rango de claves es a lo sumo _FACTOR_DENSO veces la cantidad de filas
+# (o muy chico). Las claves (ruta, día) son dispersas: su rango puede ser miles de
+# veces las filas filtradas, y ahí np.unique (ordena, O(n log n)) no reserva nada
+# proporcional al rango.
+_FACTOR_DENSO = 4
+_MIN_CLAVES_DENSAS = 1 << 12
+
+
+def _agrupar(clave, *pesos):
+    """(claves presentes, conteo por clave, [suma de cada peso por clave])."""
+    minimo = int(clave.min())
+    rango = int(clave.max()) - minimo + 1
+    if rango <= max(_MIN_CLAVES_DENSAS, _FACTOR_DENSO * len(clave)):
+        indice = clave - minimo
+        conteo = np.bincount(indice, minlength=rango)
+        presentes = np.flatnonzero(conteo)
+        sumas = [np.bincount(indice, weights=p, minlength=rango)[presentes] for p in pesos]
+        return presentes + minimo, conteo[presentes], sumas
+    unicas, inversa, conteo = np.unique(clave, return_inverse=True, return_counts=True)
+    return unicas, conteo, [np.bincount(inversa, weights=p, minlength=len(unicas)) for p in pesos]
+
+
+def reservas_por_ruta_y_dia(reservas, desde=None, hasta=None, route_id=None):
+    """[(route_id, dia, reservas, canceladas)] ordenado por ruta y día."""
+    route, dia, estado = reservas["route_id"], reservas["dia"], reservas["estado"]
+    mascara = np.ones(len(route), dtype=bool)
+    if desde is not None:
+        mascara &= dia >= desde
+    if hasta is not None:
+        mascara &= dia <= hasta
+    if route_id is not None:
+        mascara &= route == route_id
+    route, dia, canceladas = route[mascara], dia[mascara], estado[mascara] == CANCELADA
+    if len(route) == 0:
+        return []
+    # Clave combinada (ruta, día) en un int64: una sola agrupación en lugar de un groupby
+    base = int(dia.min())
+    ancho = int(dia.max()) - base + 1
+    clave = route * ancho + (dia - base)
+    unicas, conteo, (canceladas_por_clave,) = _agrupar(clave, canceladas)
+    rutas, dias = np.divmod(unicas, ancho)
+    return list(zip(rutas.tolist(), (dias + base).tolist(), conteo.tolist(),
+                    canceladas_por_clave.astype(np.int64).tolist()))
+
+
+def ingresos_por_moneda_y_metodo(pagos, monedas, metodos):
+    """[(moneda, método, pagos, monto)] de los pagos vigentes."""
+    activo = pagos["activo"]
+    if not activo.any():
+        return []
+    ancho = max(len(metodos), 1)
+    clave = pagos["moneda"][activo].astype(np.int64) * ancho + pagos["metodo"][activo]
+    tamano = max(len(monedas), 1) * ancho
+    conteo = np.bincount(clave, minlength=tamano)
+    centimos = np.bincount(clave, weights=pagos["centimos"][activo], minlength=tamano)
+    return [
+        (monedas[c // ancho], metodos[c % ancho], int(conteo[c]), round(float(centimos[c]) / 100, 2))
+        for c in np.flatnonzero(conteo).tolist()
+    ]
+
+
+def tasa_cancelacion(reservas):
+    """(total, canceladas, tasa global, {route_id: tasa})."""
+    route, estado = reservas["route_id"], reservas["estado"]
+    total = len(route)
+    if total == 0:
+        return 0, 0, 0.0, {}
+    canceladas = estado == CANCELADA
+    rutas, conteo, (canceladas_por_ruta,) = _agrupar(route, canceladas)
+    por_ruta = canceladas_por_ruta / conteo
+    n_canceladas = int(canceladas.sum())
+    return total, n_canceladas, round(n_canceladas / total, 4), dict(zip(rutas.tolist(), np.round(por_ruta, 4).tolist()))
@@ -11,18 +11,30 @@ import random
 import string
 from werkzeug.exceptions import BadRequest
 import uuid
+import threading
+import time
+from collections import OrderedDict
 
 # Third-party Libraries
 import requests
 from dotenv import load_dotenv
-from faker import Faker
-from faker_airtravel import AirTravelProvider
-from flasgger import Swagger
 from marshmallow import Schema, fields, ValidationError, RAISE
 
 # Flask
 from flask import Flask, jsonify, request
 
+# Local
+import analytics
+from arranque import FakerPerezoso, SwaggerPerezoso
+from analytics import AnaliticaReservas
+from compresion import comprimir_solicitudes, registrar_compresion
+from metrics import LockInstrumentado, Metricas, SesionInstrumentada, instrumentar_flask
+from openapi_spec import EspecOpenAPI
+from salud import Dependencia, Dependencias, registrar_salud
+from semilla_reservas import generar as generar_semilla
+from tracing import LockTrazado, iniciar_tracing
+from transporte import registrar_transporte, usar_transporte_binario
+
 
 ## Cargar variables de entorno desde el archivo .env
 load_dotenv("config.env")
@@ -42,7 +54,32 @@ logging.basicConfig(
 ## Configuración de la aplicación Flask
 app = Flask(__name__)
 
+## Métricas (/metrics) y sesión HTTP instrumentada hacia GestiónVuelos
+METRICAS = Metricas()
+instrumentar_flask(app, METRICAS)
+HTTP = SesionInstrumentada(METRICAS)
+
+## Respuestas grandes con gzip/br según Accept-Encoding y cuerpos grandes hacia
+## GestiónVuelos con gzip (ver compresion.py)
+registrar_compresion(app, METRICAS)
+comprimir_solicitudes(HTTP)
+usar_transporte_binario(HTTP)
+iniciar_tracing(app, "GestionReservas", sesion=HTTP)
+
+## Rutas que consulta Usuario: también en MessagePack a quien lo pida por Accept
+## (ver transporte.py); las GET de HTTP hacia GestiónVuelos lo piden solas
+RUTAS_INTERNAS = (
+    '/get_fake_reservations',
+    '/get_reservation_by_code/<reservation_code>',
+    '/get_reservation_by_id/<reservation_id>',
+    '/get_all_fake_payments',
+    '/get_payment_by_id/<string:payment_id>',
+    '/payments/revenue_by_route',
+)
+registrar_transporte(app, RUTAS_INTERNAS)
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+OPENAPI_SPEC = EspecOpenAPI(os.path.join(BASE_DIR, "openapi.json"), app)
 
 
 # === Identificador de instancia (por proceso) ===
@@ -57,12 +94,310 @@ def root():
 
 @app.route('/health', methods=['GET'])
 def health():
-    payload = {"status": "ok", "service": "GestionReservas"}
+    payload = {"status": "ok", "service": "GestionReservas", "bootstrap": ARRANQUE.snapshot()}
     resp = jsonify(payload)
     resp.headers["X-Instance-Id"] = INSTANCE_ID
     return resp, 200
 
 
+####################################
+## Concurrencia y outbox de asientos
+####################################
+
+# Protege reservations/payments. El cambio de estado local y el encolado del
+# comando de asiento hacia GestiónVuelos ocurren en la misma sección crítica.
+STORE_LOCK = LockTrazado(LockInstrumentado(METRICAS, "store"))
+
+# Tiempo máximo que una solicitud espera la entrega de su comando antes de responder.
+OUTBOX_ESPERA_MAX_S = float(os.getenv("OUTBOX_ESPERA_MAX_S", "0.25"))
+# Al reservar un asiento se espera más: la reserva solo se confirma con el asiento marcado.
+OUTBOX_ESPERA_RESERVA_S = float(os.getenv("OUTBOX_ESPERA_RESERVA_S", "5"))
+
+
+class SeatOutbox:
+    """
+    Outbox de comandos de estado de asiento pendientes de entregar a GestiónVuelos.
+
+    - Deduplica por (airplane_id, seat_number): gana el último estado encolado.
+    - Un hilo en segundo plano entrega en lotes vía PUT /seats/status/batch, de a
+      un lote por vez: los comandos de un mismo asiento llegan en el orden en que
+      se encolaron y uno viejo que se reintenta nunca pisa a uno más nuevo. Por eso
+      todos los cambios de estado de asiento (reservar, pagar, liberar) pasan por acá.
+    - Errores de red y 5xx se reintentan con backoff exponencial (sin límite de intentos);
+      las respuestas 4xx se descartan a dead letters.
+    - Una reserva que no se confirmó a tiempo se retira (retirar): la solicitud responde
+      sin guardar nada y el asiento no queda tomado en GestiónVuelos sin reserva.
+    """
+
+    def __init__(self, lote_max=100, timeout=5, backoff_base=0.5, backoff_max=30.0, dead_letters_max=100):
+        self.lote_max = lote_max
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._cond = threading.Condition()
+        self._pendientes = OrderedDict()   # (airplane_id, seat_number) -> comando
+        self._en_vuelo = {}                # (airplane_id, seat_number) -> status del lote en curso
+        self._dead_letters = []
+        self._dead_letters_max = dead_letters_max
+        self._secuencia = 0
+        self._hilo = None
+        self.ultimo_error = None
+        self.stats = {
+            "encolados": 0,
+            "deduplicados": 0,
+            "entregados": 0,
+            "reintentos": 0,
+            "fallidos": 0,
+            "retirados": 0,
+            "lotes": 0,
+        }
+
+    def encolar(self, airplane_id, seat_number, status, solo_si_libre=False):
+        """
+        Registra el estado deseado del asiento y devuelve un ticket para esperar la entrega.
+
+        Con solo_si_libre=True (reservar) devuelve None si el último comando del asiento
+        que sigue pendiente o en curso no es "Libre": otra reserva o pago está en camino.
+        Un "Libre" pendiente, en cambio, queda reemplazado por el nuevo estado. Si no hay
+        nada pendiente ni en curso para el asiento, el comando lleva expected_status
+        "Libre" y GestiónVuelos lo rechaza con 409 si otro tomó el asiento mientras tanto
+        (con un "Libre" todavía sin entregar no se sabe qué estado tiene allá).
+        """
+        ticket = {"evento": threading.Event(), "estado": "pendiente", "codigo": None}
+        clave = ticket["clave"] = (airplane_id, str(seat_number).upper())
+        with self._cond:
+            esperado = None
+            if solo_si_libre:
+                pendiente = self._pendientes.get(clave)
+                ultimo = pendiente["status"] if pendiente is not None else self._en_vuelo.get(clave, "Libre")
+                if ultimo != "Libre":
+                    return None
+                if pendiente is None and clave not in self._en_vuelo:
+                    esperado = "Libre"
+            comando = self._comando(clave, status, esperado, [ticket])
+            anterior = self._pendientes.pop(clave, None)
+            if anterior is not None:
+                comando["tickets"] = anterior["tickets"] + comando["tickets"]
+                comando["encolado_en"] = anterior["encolado_en"]
+                self.stats["deduplicados"] += 1
+            self._pendientes[clave] = comando
+            self.stats["encolados"] += 1
+            self._asegurar_hilo()
+            self._cond.notify()
+        return ticket
+
+    def _comando(self, clave, status, esperado, tickets):
+        self._secuencia += 1
+        return {
+            "id": self._secuencia,
+            "airplane_id": clave[0],
+            "seat_number": clave[1],
+            "status": status,
+            "esperado": esperado,
+            "intentos": 0,
+            "proximo_intento": 0.0,
+            "encolado_en": time.monotonic(),
+            "tickets": tickets,
+        }
+
+    @staticmethod
+    def esperar(ticket, timeout):
+        """Espera como máximo `timeout` segundos; devuelve 'entregado', 'fallido' o 'pendiente'."""
+        if timeout > 0:
+            ticket["evento"].wait(timeout)
+        return ticket["estado"]
+
+    def retirar(self, ticket):
+        """
+        Retira el comando de un ticket que no se confirmó a tiempo (una reserva que se
+        responde sin guardar). Devuelve el estado final: 'entregado' o 'fallido' si se
+        resolvió mientras tanto, o 'retirado'. Un comando que nunca salió se descarta o,
+        si había reemplazado a un "Libre" pendiente, vuelve a ser ese "Libre". Si ya
+        salió, GestiónVuelos pudo haberlo aplicado: el ticket queda marcado y, cuando se
+        confirma la entrega, se encola un "Libre" para el asiento.
+        """
+        with self._cond:
+            if ticket["estado"] != "pendiente":
+                return ticket["estado"]
+            ticket["estado"] = "retirado"
+            self.stats["retirados"] += 1
+            clave = ticket["clave"]
+            comando = self._pendientes.get(clave)
+            if comando is not None and comando["intentos"] == 0 \
+                    and any(t is ticket for t in comando["tickets"]):
+                if comando["esperado"] == "Libre":
+                    # No reemplazó a nada: el asiento sigue como estaba
+                    del self._pendientes[clave]
+                else:
+                    comando["tickets"] = [t for t in comando["tickets"] if t is not ticket]
+                    comando["status"] = "Libre"
+            ticket["evento"].set()
+        return "retirado"
+
+    def snapshot(self):
+        with self._cond:
+            ahora = time.monotonic()
+            mas_antiguo = min((c["encolado_en"] for c in self._pendientes.values()), default=None)
+            return {
+                "pending": len(self._pendientes),
+                "in_flight": len(self._en_vuelo),
+                "oldest_pending_age_s": round(ahora - mas_antiguo, 3) if mas_antiguo is not None else None,
+                "stats": dict(self.stats),
+                "last_error": self.ultimo_error,
+                "dead_letters": list(self._dead_letters),
+            }
+
+    # --- Worker ---
+    def _asegurar_hilo(self):
+        # Se arranca de forma perezosa para que cada proceso (p. ej. worker de gunicorn) tenga el suyo
+        if self._hilo is None or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._bucle, name="seat-outbox", daemon=True)
+            self._hilo.start()
+
+    def _tomar_lote(self):
+        with self._cond:
+            while True:
+                ahora = time.monotonic()
+                listos = [c for c in self._pendientes.values() if c["proximo_intento"] <= ahora]
+                if listos:
+                    break
+                proximo = min((c["proximo_intento"] for c in self._pendientes.values()), default=None)
+                self._cond.wait(None if proximo is None else max(proximo - ahora, 0.01))
+            lote = listos[:self.lote_max]
+            for c in lote:
+                del self._pendientes[(c["airplane_id"], c["seat_number"])]
+            self._en_vuelo = {(c["airplane_id"], c["seat_number"]): c["status"] for c in lote}
+            return lote
+
+    def _bucle(self):
+        while True:
+            lote = self._tomar_lote()
+            try:
+                self._entregar(lote)
+            except Exception as e:
+                logging.exception("❌ Error inesperado en el outbox de asientos.")
+                self._reprogramar(lote, f"{type(e).__name__}: {e}")
+            finally:
+                with self._cond:
+                    self._en_vuelo = {}
+
+    def _entregar(self, lote):
+        gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
+        body = {"updates": [
+            {"airplane_id": c["airplane_id"], "seat_number": c["seat_number"], "status": c["status"],
+             **({"expected_status": c["esperado"]} if c.get("esperado") else {})}
+            for c in lote
+        ]}
+        with self._cond:
+            self.stats["lotes"] += 1
+        try:
+            resp = HTTP.put(f"{gestion_vuelos_url}/seats/status/batch", json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"⚠️ Outbox: GestiónVuelos no disponible ({type(e).__name__}); {len(lote)} comandos se reintentarán.")
+            self._reprogramar(lote, f"{type(e).__name__}: {e}")
+            return
+
+        if resp.status_code >= 500:
+            self._reprogramar(lote, f"HTTP {resp.status_code}")
+            return
+        if resp.status_code != 200:
+            for c in lote:
+                self._fallar(c, f"HTTP {resp.status_code}: {resp.text[:200]}", resp.status_code)
+            return
+
+        resultados = resp.json().get("results") or []
+        reintentar = []
+        for c, r in zip(lote, resultados):
+            codigo = r.get("status_code")
+            if codigo == 200:
+                self._completar(c, "entregado")
+            elif isinstance(codigo, int) and codigo >= 500:
+                reintentar.append(c)
+            else:
+                self._fallar(c, r.get("message") or f"HTTP {codigo}", codigo)
+        # Elementos sin resultado (respuesta truncada) se reintentan
+        reintentar.extend(lote[len(resultados):])
+        if reintentar:
+            self._reprogramar(reintentar, "Resultado incompleto del lote")
+        logging.info(f"📤 Outbox: lote de {len(lote)} comandos de asiento entregado a GestiónVuelos.")
+
+    def _completar(self, comando, estado, codigo=None):
+        with self._cond:
+            self.stats["entregados" if estado == "entregado" else "fallidos"] += 1
+            retirado = False
+            for t in comando["tickets"]:
+                if t["estado"] == "pendiente":
+                    t["estado"], t["codigo"] = estado, codigo
+                else:
+                    retirado = retirado or t["estado"] == "retirado"
+                t["evento"].set()
+            clave = (comando["airplane_id"], comando["seat_number"])
+            if retirado and estado == "entregado" and comando["status"] != "Libre" \
+                    and clave not in self._pendientes:
+                # La reserva se aplicó después de responder sin guardarla: se deshace
+                self._pendientes[clave] = self._comando(clave, "Libre", None, [])
+                self.stats["encolados"] += 1
+                self._cond.notify()
+
+    def _fallar(self, comando, error, codigo=None):
+        logging.error(f"❌ Outbox: comando descartado para asiento {comando['seat_number']} "
+                      f"del avión {comando['airplane_id']}: {error}")
+        with self._cond:
+            self.ultimo_error = error
+            self._dead_letters.append({
+                "airplane_id": comando["airplane_id"],
+                "seat_number": comando["seat_number"],
+                "status": comando["status"],
+                "error": error,
+            })
+            del self._dead_letters[:-self._dead_letters_max]
+        self._completar(comando, "fallido", codigo)
+
+    def _reprogramar(self, comandos, error):
+        with self._cond:
+            self.ultimo_error = error
+            ahora = time.monotonic()
+            for c in comandos:
+                self.stats["reintentos"] += 1
+                clave = (c["airplane_id"], c["seat_number"])
+                nuevo = self._pendientes.get(clave)
+                if nuevo is not None:
+                    # Ya hay un estado más reciente para el asiento: el viejo queda reemplazado
+                    nuevo["tickets"] = c["tickets"] + nuevo["tickets"]
+                    continue
+                c["intentos"] += 1
+                espera = min(self.backoff_base * (2 ** (c["intentos"] - 1)), self.backoff_max)
+                c["proximo_intento"] = ahora + espera * random.uniform(0.8, 1.2)
+                self._pendientes[clave] = c
+            self._cond.notify()
+
+
+SEAT_OUTBOX = SeatOutbox(
+    lote_max=int(os.getenv("OUTBOX_LOTE_MAX", "100")),
+    backoff_max=float(os.getenv("OUTBOX_BACKOFF_MAX_S", "30")),
+)
+
+
+@app.route('/outbox', methods=['GET'])
+def get_outbox():
+    """
+    Estado del outbox de notificaciones de asiento hacia GestiónVuelos
+    ---
+    tags:
+      - Diagnostics
+    responses:
+      200:
+        description: Pendientes, estadísticas de entrega y últimos comandos descartados
+    """
+    return jsonify(SEAT_OUTBOX.snapshot()), 200
+
+
+METRICAS.gauge("seat_outbox_pending", "Comandos de asiento pendientes en el outbox",
+               lambda: len(SEAT_OUTBOX._pendientes))
+METRICAS.gauge("seat_outbox_commands_total", "Comandos del outbox por resultado",
+               lambda: {(("result", k),): v for k, v in dict(SEAT_OUTBOX.stats).items()}, tipo="counter")
+
+
 ## Configuración de Swagger
 swagger_template = {
     "info": {
@@ -85,6 +420,18 @@ swagger_template = {
         {
             "name": "Payments",
             "description": "Operaciones relacionadas con pagos de reservas."
+        },
+        {
+            "name": "Analytics",
+            "description": "Agregados de reservas y pagos para planificación de capacidad."
+        },
+        {
+            "name": "Diagnostics",
+            "description": "Estado interno del servicio (outbox de asientos)."
+        },
+        {
+            "name": "Metrics",
+            "description": "Métricas del proceso en formato Prometheus."
         }
     ],
     "definitions": {
@@ -150,11 +497,11 @@ swagger_template = {
 }
 
 
-## Configuración de Swagger
-swagger = Swagger(app, template=swagger_template)
+## Configuración de Swagger (se construye en la primera visita a /apidocs/, ver arranque.py)
+swagger = SwaggerPerezoso(app, template=swagger_template)
 
 
-fake = Faker()
+fake = FakerPerezoso()
 payments = []
 
 
@@ -165,98 +512,97 @@ payments = []
 ####################################
 
 
-## Generar datos de aviones falsos
-fake_airplane = Faker()
-## Añadir el proveedor de AirTravel a Faker
-fake_airplane.add_provider(AirTravelProvider)
+## Generar datos de aviones falsos (Faker con el proveedor de AirTravel, creado en el primer uso)
+fake_airplane = FakerPerezoso("faker_airtravel.AirTravelProvider")
 
 
 ## Generar datos de reservaciones falsos
-def generate_fake_reservations(n=3):
-    generated = []
-    existing_ids = set()
+class GestionVuelosNoDisponible(Exception):
+    """GestiónVuelos no responde o responde 5xx (por ejemplo, todavía está arrancando)."""
 
-    gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
-    rutas_url = f"{gestion_vuelos_url}/get_all_airplanes_routes"
-
-    logging.info("🔄 Iniciando generación de reservas...")
 
+def _llamar_gestion_vuelos(metodo, ruta, **kwargs):
+    gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
     try:
-        response = requests.get(rutas_url)
-        if response.status_code != 200:
-            logging.error(f"❌ No se pudo obtener rutas desde GestiónVuelos. Código: {response.status_code}")
-            return generated
+        response = HTTP.request(metodo, f"{gestion_vuelos_url}{ruta}", timeout=5, **kwargs)
+    except requests.exceptions.RequestException as e:
+        raise GestionVuelosNoDisponible(f"{metodo} {ruta}: {type(e).__name__}") from e
+    if response.status_code >= 500:
+        raise GestionVuelosNoDisponible(f"{metodo} {ruta}: HTTP {response.status_code}")
+    return response
 
-        routes = response.json()
 
-        if not isinstance(routes, list):
-            logging.error("❌ Formato inválido: se esperaba una lista de rutas, pero se recibió otro tipo.")
-            return generated
-
-        logging.info(f"✅ Se recibieron {len(routes)} rutas desde GestiónVuelos.")
-    except Exception as e:
-        logging.exception("❌ Conexión con GestiónVuelos fallida al obtener rutas.")
-        return generated
+def generate_fake_reservations(n=3, pagadas=0):
+    """
+    Genera hasta `n` reservas falsas, cada una en una ruta distinta de GestiónVuelos;
+    las primeras `pagadas` salen con estado 'Pagado'. Los asientos se piden en
+    tandas a POST /seats/allocate (una solicitud por tanda en lugar de un GET y un
+    PUT por reserva): si en una tanda algún avión ya no tiene asientos libres, la
+    siguiente pide los que faltan en otras rutas, sin volver a ese avión, hasta
+    llegar a `n` o quedarse sin rutas. Las reservas salen sin reservation_id: lo
+    asigna quien las inserta.
+    Lanza GestionVuelosNoDisponible si GestiónVuelos no responde o responde 5xx.
+    """
+    logging.info("🔄 Iniciando generación de reservas...")
 
-    if not routes:
+    response = _llamar_gestion_vuelos("GET", "/get_all_airplanes_routes")
+    if response.status_code != 200:
+        logging.error(f"❌ No se pudo obtener rutas desde GestiónVuelos. Código: {response.status_code}")
+        return []
+    routes = response.json()
+    if not isinstance(routes, list) or not routes:
+        # GestiónVuelos responde {"message": ...} cuando no tiene rutas
         logging.warning("⚠️ No hay rutas disponibles para generar reservas.")
-        return generated
+        return []
+    logging.info(f"✅ Se recibieron {len(routes)} rutas desde GestiónVuelos.")
 
     random.shuffle(routes)
-
-    while len(generated) < n and routes:
-        route = routes.pop()
-        airplane_id = route['airplane_id']
-        flight_number = route['flight_number']
-        airplane_route_id = route['airplane_route_id']
-        route_id = route.get('route_id')  # ✅ Se toma el route_id si está presente
-        price = route.get('price', 0.0)  # ✅ Se toma el precio si viene, o 0.0 por defecto
-        logging.info(f"➡️ Procesando ruta para avión id {airplane_id} con código de vuelo {flight_number}")
-
-        seat_url = f"{gestion_vuelos_url}/get_random_free_seat/{airplane_id}"
-        try:
-            seat_response = requests.get(seat_url)
-            if seat_response.status_code != 200:
-                logging.warning(f"⚠️ No se encontró asiento libre para avión id {airplane_id}")
-                continue
-
-            seat = seat_response.json()
-            logging.info(f"🪑 Asiento libre encontrado: {seat['seat_number']} en avión id {airplane_id}")
-        except Exception as e:
-            logging.exception("❌ Error al obtener asiento libre desde GestiónVuelos.")
-            continue
-
-        update_seat_url = f"{gestion_vuelos_url}/update_seat_status/{airplane_id}/seats/{seat['seat_number']}"
-        try:
-            update_response = requests.put(update_seat_url, json={"status": "Reservado"})
-            if update_response.status_code != 200:
-                logging.warning(f"⚠️ No se pudo reservar el asiento {seat['seat_number']} en avión id {airplane_id}")
+    restantes = iter(routes)
+    sin_asientos = set()   # aviones que ya respondieron sin asiento libre
+    generated = []
+    pagadas_generadas = 0
+    while len(generated) < n:
+        elegidas = []
+        for route in restantes:
+            if route['airplane_id'] not in sin_asientos:
+                elegidas.append(route)
+                if len(elegidas) == n - len(generated):
+                    break
+        if not elegidas:
+            break
+        allocations = [
+            {"airplane_id": route['airplane_id'], "count": 1,
+             "status": "Pagado" if pagadas_generadas + i < pagadas else "Reservado"}
+            for i, route in enumerate(elegidas)
+        ]
+        response = _llamar_gestion_vuelos("POST", "/seats/allocate", json={"allocations": allocations})
+        if response.status_code != 200:
+            logging.error(f"❌ GestiónVuelos rechazó la asignación de asientos. Código: {response.status_code}")
+            break
+
+        for route, pedido, resultado in zip(elegidas, allocations, response.json().get("results", [])):
+            if resultado.get("status_code") != 200:
+                logging.warning(f"⚠️ No se encontró asiento libre para avión id {route['airplane_id']}: "
+                                f"{resultado.get('message')}")
+                sin_asientos.add(route['airplane_id'])
                 continue
-            logging.info(f"✅ Asiento {seat['seat_number']} marcado como 'Reservado'")
-        except Exception as e:
-            logging.exception("❌ Error al actualizar estado del asiento a 'Reservado'")
-            continue
-
-        reservation = {
-            'reservation_id': len(generated) + 1,
-            'reservation_code': generate_reservation_code(),
-            'passport_number': generate_passport_number(),
-            'full_name': fake.name(),
-            'email': fake.email(),
-            'phone_number': fake.phone_number(),
-            'emergency_contact_name': fake.name(),
-            'emergency_contact_phone': fake.phone_number(),
-            'airplane_id': airplane_id,
-            'flight_number': flight_number,
-            'airplane_route_id': airplane_route_id,
-            'seat_number': seat['seat_number'],
-            'reservation_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'status': "Reservado",
-            'price': price
-        }
-
-        generated.append(reservation)
-        logging.info(f"✅ Reserva generada: ID {reservation['reservation_id']} para asiento {reservation['seat_number']} reservación {reservation['reservation_code']}")
+            pagadas_generadas += pedido['status'] == "Pagado"
+            generated.append({
+                'reservation_code': generate_reservation_code(),
+                'passport_number': generate_passport_number(),
+                'full_name': fake.name(),
+                'email': fake.email(),
+                'phone_number': fake.phone_number(),
+                'emergency_contact_name': fake.name(),
+                'emergency_contact_phone': fake.phone_number(),
+                'airplane_id': route['airplane_id'],
+                'flight_number': route['flight_number'],
+                'airplane_route_id': route['airplane_route_id'],
+                'seat_number': resultado['seats'][0],
+                'reservation_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'status': pedido['status'],
+                'price': route.get('price', 0.0)
+            })
 
     logging.info(f"🎉 Finalizada generación de reservas. Total generadas: {len(generated)}")
     return generated
@@ -275,20 +621,16 @@ def openapi_json_reservas():
     """
     Devuelve el OpenAPI spec del repo para ser consumido como 'live spec'
     por pruebas de contrato en GestiónReservas.
+    Se sirve desde memoria con ETag (ver openapi_spec.py): solo los paths de
+    este servicio, o el spec completo con ?full=1.
     """
     try:
-        spec_path = os.path.join(BASE_DIR, "openapi.json")
-        if not os.path.exists(spec_path):
-            return jsonify({
-                "message": "Spec openapi.json no encontrado en la raíz del repo.",
-                "errors": {}
-            }), 500
-
-        with open(spec_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-        return jsonify(data), 200
-
+        return OPENAPI_SPEC.respuesta(request, completo=request.args.get("full") == "1")
+    except FileNotFoundError:
+        return jsonify({
+            "message": "Spec openapi.json no encontrado en la raíz del repo.",
+            "errors": {}
+        }), 500
     except Exception:
         logging.exception("❌ Error al servir /openapi.json en GestiónReservas")
         return jsonify({
@@ -383,6 +725,10 @@ reservation_schema = ReservationSchema()
 # Lista en memoria
 reservations = []
 
+METRICAS.gauge("store_items", "Elementos en memoria por colección",
+               lambda: {(("collection", "reservations"),): len(reservations),
+                        (("collection", "payments"),): len(payments)})
+
 
 def generate_reservation_code():
     """Genera un código de reserva estilo ABC123"""
@@ -612,8 +958,9 @@ def delete_reservation_by_id(reservation_id):
     """
     Summary: Elimina o cancela una reserva existente
     Description:
-      Elimina una reserva por su ID y libera automáticamente el asiento asociado llamando al microservicio GestiónVuelos.
-      Si el ID no existe, la estructura es inválida, o el asiento no se puede liberar, se devuelve el error correspondiente.
+      Elimina una reserva por su ID y encola la liberación del asiento en el outbox hacia GestiónVuelos.
+      La respuesta espera como máximo OUTBOX_ESPERA_MAX_S la entrega; `seat_sync` indica si el asiento
+      ya quedó liberado ('entregado') o si se reintentará en segundo plano ('pendiente').
     ---
     tags:
       - Reservations
@@ -631,11 +978,12 @@ def delete_reservation_by_id(reservation_id):
         example: 5
     responses:
       200:
-        description: Reserva eliminada con éxito y asiento liberado
+        description: Reserva eliminada con éxito y liberación de asiento encolada
         examples:
           application/json:
             {
               "message": "Reserva eliminada exitosamente",
+              "seat_sync": "entregado",
               "deleted_reservation": {
                 "reservation_id": 5,
                 "reservation_code": "DEF456",
@@ -665,20 +1013,6 @@ def delete_reservation_by_id(reservation_id):
             {
               "message": "Reserva no encontrada"
             }
-      503:
-        description: Servicio de GestiónVuelos no disponible
-        examples:
-          application/json:
-            {
-              "message": "No se pudo conectar con GestiónVuelos para liberar el asiento."
-            }
-      504:
-        description: Timeout al contactar GestiónVuelos
-        examples:
-          application/json:
-            {
-              "message": "Timeout al intentar liberar el asiento en GestiónVuelos."
-            }
       500:
         description: Error interno del servidor
         examples:
@@ -696,42 +1030,35 @@ def delete_reservation_by_id(reservation_id):
         if not isinstance(reservations, list):
             return jsonify({'message': 'Estructura de datos inválida para reservas.'}), 500
 
-        reservation = next((r for r in reservations if r['reservation_id'] == reservation_id), None)
-        if not reservation:
-            return jsonify({'message': 'Reserva no encontrada'}), 404
+        with STORE_LOCK:
+            reservation = next((r for r in reservations if r['reservation_id'] == reservation_id), None)
+            if not reservation:
+                return jsonify({'message': 'Reserva no encontrada'}), 404
 
-        # Validar la estructura básica con Marshmallow
-        try:
-            reservation_schema.load(reservation, partial=True)
-        except ValidationError as err:
-            return jsonify({'message': 'Error de validación', 'errors': err.messages}), 500
+            # Validar la estructura básica con Marshmallow
+            try:
+                reservation_schema.load(reservation, partial=True)
+            except ValidationError as err:
+                return jsonify({'message': 'Error de validación', 'errors': err.messages}), 500
 
-        airplane_id = reservation['airplane_id']
-        seat_number = reservation['seat_number']
+            airplane_id = reservation['airplane_id']
+            seat_number = reservation['seat_number']
 
-        # Eliminar la reserva de memoria
-        reservations.remove(reservation)
+            # Eliminar la reserva de memoria y encolar la liberación del asiento (misma sección crítica)
+            reservations.remove(reservation)
+            ANALITICA.reserva_cancelada(reservation_id)
+            ticket = SEAT_OUTBOX.encolar(airplane_id, seat_number, "Libre")
         logging.info(f"✅ Reserva con ID {reservation_id} eliminada correctamente.")
 
-        # Llamar al microservicio GestiónVuelos para liberar el asiento
-        gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
-        liberar_url = f"{gestion_vuelos_url}/free_seat/{airplane_id}/seats/{seat_number}"
-
-        try:
-            response = requests.put(liberar_url, timeout=20)
-            if response.status_code == 200:
-                logging.info(f"🪑 Asiento {seat_number} del avión {airplane_id} liberado exitosamente en GestiónVuelos.")
-            else:
-                logging.warning(f"⚠️ GestiónVuelos devolvió error al liberar asiento {seat_number}: {response.status_code} - {response.text}")
-        except requests.exceptions.ConnectionError:
-            logging.error("❌ No se pudo conectar con GestiónVuelos al liberar asiento.")
-            return jsonify({'message': 'No se pudo conectar con GestiónVuelos para liberar el asiento.'}), 503
-        except requests.exceptions.Timeout:
-            logging.error("⏰ Timeout al intentar liberar asiento en GestiónVuelos.")
-            return jsonify({'message': 'Timeout al intentar liberar el asiento en GestiónVuelos.'}), 504
+        seat_sync = SEAT_OUTBOX.esperar(ticket, OUTBOX_ESPERA_MAX_S)
+        if seat_sync == "entregado":
+            logging.info(f"🪑 Asiento {seat_number} del avión {airplane_id} liberado exitosamente en GestiónVuelos.")
+        else:
+            logging.warning(f"⚠️ Liberación del asiento {seat_number} del avión {airplane_id} en estado '{seat_sync}'.")
 
         return jsonify({
             'message': 'Reserva eliminada exitosamente',
+            'seat_sync': seat_sync,
             'deleted_reservation': reservation
         }), 200
 
@@ -743,6 +1070,27 @@ def delete_reservation_by_id(reservation_id):
 ################################################################################################################
 
 
+def _reservar_asiento(airplane_id, seat_number):
+    """
+    Marca el asiento como "Reservado" por el outbox y espera la confirmación de
+    GestiónVuelos. Devuelve 'entregado', 'ocupado' (otro lo tomó: hay otro comando
+    en camino o GestiónVuelos respondió 409), 'retirado' (no se confirmó en
+    OUTBOX_ESPERA_RESERVA_S y el comando se retiró) o 'fallido'. Salvo con
+    'entregado', la reserva no se guarda.
+    """
+    ticket = SEAT_OUTBOX.encolar(airplane_id, seat_number, "Reservado", solo_si_libre=True)
+    if ticket is None:
+        return "ocupado"
+    seat_sync = SEAT_OUTBOX.esperar(ticket, OUTBOX_ESPERA_RESERVA_S)
+    if seat_sync == "pendiente":
+        seat_sync = SEAT_OUTBOX.retirar(ticket)
+    if seat_sync == "fallido" and ticket["codigo"] == 409:
+        return "ocupado"
+    if seat_sync != "entregado":
+        logging.warning(f"⚠️ Asiento {seat_number} del avión {airplane_id} no reservado en GestiónVuelos ({seat_sync}).")
+    return seat_sync
+
+
 ## Crear una nueva reserva de vuelo
 @app.route('/add_reservation', methods=['POST'])
 def add_reservation():
@@ -753,7 +1101,9 @@ def add_reservation():
       Valida que la ruta (airplane_route_id) exista y esté asociada al airplane_id.
       El reservation_code, issued_at y reservation_id se generan automáticamente.
       Falla si la ruta no existe o no coincide con el avión, el asiento ya está
-      reservado o si hay problemas de conexión/timeout con GestiónVuelos.
+      reservado o si hay problemas de conexión/timeout con GestiónVuelos. Si
+      GestiónVuelos no confirma el asiento en OUTBOX_ESPERA_RESERVA_S, la reserva
+      no se guarda y responde 504.
     ---
     tags:
       - Reservations
@@ -774,11 +1124,11 @@ def add_reservation():
       400:
         description: Datos inválidos, ruta/avión no coinciden o asiento inexistente
       409:
-        description: Asiento ya reservado
+        description: Asiento ya reservado (también si otro lo tomó mientras se reservaba)
       503:
         description: Servicio de GestiónVuelos no disponible
       504:
-        description: Timeout al contactar GestiónVuelos
+        description: Timeout al contactar GestiónVuelos o al confirmar el asiento (no se guarda nada)
       500:
         description: Error interno del servidor
     """
@@ -798,7 +1148,7 @@ def add_reservation():
 
         # 2) Validar que la ruta exista y esté asociada al avión
         try:
-            routes_resp = requests.get(
+            routes_resp = HTTP.get(
                 f"{gestion_vuelos_url}/get_all_airplanes_routes",
                 timeout=20
             )
@@ -821,7 +1171,7 @@ def add_reservation():
 
         # 3) Comprobar que el asiento exista y esté libre
         try:
-            seats_resp = requests.get(
+            seats_resp = HTTP.get(
                 f"{gestion_vuelos_url}/get_airplane_seats/{airplane_id}/seats",
                 timeout=20
             )
@@ -840,28 +1190,27 @@ def add_reservation():
         if asiento['status'] != 'Libre':
             return jsonify({'message': f"El asiento {seat_number} no está disponible."}), 409
 
-        # 4) Generar reservation_code, issued_at, reservation_id
+        # 4) Generar reservation_code e issued_at (el reservation_id se asigna al guardar)
         validated['reservation_code'] = generar_codigo_reserva_unico()
         validated['issued_at']        = formatear_fecha_espanol(datetime.now())
-        validated['reservation_id']   = len(reservations) + 1
-
-        # 5) Marcar asiento como "Reservado"
-        try:
-            reserve_resp = requests.put(
-                f"{gestion_vuelos_url}/update_seat_status/{airplane_id}/seats/{seat_number}",
-                json={"status": "Reservado"},
-                timeout=20
-            )
-        except requests.exceptions.ConnectionError:
-            return jsonify({'message': 'No se pudo conectar con GestiónVuelos al reservar asiento.'}), 503
-        except requests.exceptions.Timeout:
-            return jsonify({'message': 'Timeout al reservar asiento en GestiónVuelos.'}), 504
 
-        if reserve_resp.status_code != 200:
+        # 5) Marcar asiento como "Reservado" por el outbox, el mismo camino que las
+        #    liberaciones: un "Libre" viejo que se reintenta tras un timeout no puede
+        #    llegar después y liberar el asiento recién reservado
+        seat_sync = _reservar_asiento(airplane_id, seat_number)
+        if seat_sync == "ocupado":
+            return jsonify({'message': f"El asiento {seat_number} no está disponible."}), 409
+        if seat_sync == "retirado":
+            return jsonify({'message': 'Timeout al reservar el asiento en GestiónVuelos.'}), 504
+        if seat_sync != "entregado":
             return jsonify({'message': f"No se pudo reservar el asiento {seat_number}."}), 500
 
-        # 6) Guardar la reserva en memoria
-        reservations.append(validated)
+        # 6) Guardar la reserva en memoria. El ID se calcula sobre el máximo actual
+        #    (no sobre len(): tras eliminar reservas se repetirían IDs)
+        with STORE_LOCK:
+            validated['reservation_id'] = max((r['reservation_id'] for r in reservations), default=0) + 1
+            reservations.append(validated)
+            ANALITICA.reserva_creada(validated)
         logging.info(f"✅ Reserva creada exitosamente: {validated}")
 
         return jsonify({
@@ -987,7 +1336,7 @@ def edit_reservation(reservation_code):
 
         # 6.a) Consultar disponibilidad del nuevo asiento
         try:
-            status_resp = requests.get(
+            status_resp = HTTP.get(
                 f"{gestion_vuelos_url}/get_airplane_seats/{airplane_id}/seats",
                 timeout=20
 
@@ -1007,33 +1356,20 @@ def edit_reservation(reservation_code):
         if seat_info['status'] != 'Libre':
             return jsonify({'message': f"El asiento {new_seat} no está libre."}), 409
 
-        # 6.b) Liberar asiento anterior
-        old_seat = reservation['seat_number']
-        try:
-            free_resp = requests.put(
-                f"{gestion_vuelos_url}/free_seat/{airplane_id}/seats/{old_seat}",
-                timeout=20
-            )
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            return jsonify({'message': 'Error liberando el asiento anterior en GestiónVuelos.'}), 503
-
-        if free_resp.status_code != 200:
-            return jsonify({'message': 'No se pudo liberar el asiento anterior.'}), 500
-
-        # 6.c) Reservar el nuevo asiento
-        try:
-            reserve_resp = requests.put(
-                f"{gestion_vuelos_url}/update_seat_status/{airplane_id}/seats/{new_seat}",
-                json={"status": "Reservado"},
-                timeout=20
-            )
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            return jsonify({'message': 'Error reservando el nuevo asiento en GestiónVuelos.'}), 503
-
-        if reserve_resp.status_code not in (200, 204):
+        # 6.b) Reservar el nuevo asiento y 6.c) liberar el anterior, ambos por el outbox
+        #      (ver add_reservation): primero el nuevo, así un fallo no deja al pasajero sin asiento
+        seat_sync = _reservar_asiento(airplane_id, new_seat)
+        if seat_sync == "ocupado":
+            return jsonify({'message': f"El asiento {new_seat} no está libre."}), 409
+        if seat_sync == "retirado":
+            return jsonify({'message': 'Timeout al reservar el nuevo asiento en GestiónVuelos.'}), 504
+        if seat_sync != "entregado":
             return jsonify({'message': f"No se pudo reservar el nuevo asiento {new_seat}."}), 500
 
-        reservation['seat_number'] = new_seat
+        old_seat = reservation['seat_number']
+        with STORE_LOCK:
+            reservation['seat_number'] = new_seat
+            SEAT_OUTBOX.encolar(airplane_id, old_seat, "Libre")
 
     # 7) Actualizar los demás campos de contacto
     for field in ['email', 'phone_number', 'emergency_contact_name', 'emergency_contact_phone']:
@@ -1070,30 +1406,85 @@ def edit_reservation(reservation_code):
 ############################################################################################################
 
 
-def generate_fake_payments(max_pagados=None):
+class IngresosPorRuta:
     """
-    Genera pagos falsos únicos para algunas o todas las reservas existentes,
-    actualiza el estado de la reserva a 'Pagado' y llama a GESTIONVUELOS
-    para cambiar el estado del asiento a 'Pagado'.
+    Ingresos y cantidad de pagos por ruta, actualizados al crear o cancelar un
+    pago (bajo STORE_LOCK) para que el resumen no recorra todos los pagos.
+    Los montos se acumulan en céntimos por moneda para no arrastrar error de float.
     """
-    if not isinstance(reservations, list) or not reservations:
-        logging.warning("⚠️ No hay reservas disponibles para generar pagos.")
-        return []
-
-    total_reservas = len(reservations)
-    cantidad = max_pagados if isinstance(max_pagados, int) and 0 < max_pagados <= total_reservas else total_reservas
 
-    reservas_seleccionadas = random.sample(reservations, cantidad)
+    def __init__(self):
+        self._rutas = {}   # airplane_route_id -> {flight_number, airplane_id, payments, monedas: {moneda: [pagos, céntimos]}}
+
+    def _aplicar(self, pago, signo):
+        route_id = pago.get("airplane_route_id")
+        if route_id is None:
+            return
+        fila = self._rutas.get(route_id)
+        if fila is None:
+            if signo < 0:
+                return
+            fila = self._rutas[route_id] = {
+                "flight_number": pago.get("flight_number"),
+                "airplane_id": pago.get("airplane_id"),
+                "payments": 0,
+                "monedas": {},
+            }
+        moneda = pago.get("currency") or "USD"
+        acumulado = fila["monedas"].setdefault(moneda, [0, 0])
+        acumulado[0] += signo
+        acumulado[1] += signo * round(float(pago.get("amount") or 0) * 100)
+        fila["payments"] += signo
+        if acumulado[0] <= 0:
+            del fila["monedas"][moneda]
+        if fila["payments"] <= 0:
+            del self._rutas[route_id]
+
+    def registrar(self, pago):
+        self._aplicar(pago, 1)
+
+    def anular(self, pago):
+        self._aplicar(pago, -1)
+
+    def reconstruir(self, pagos):
+        self._rutas.clear()
+        for pago in pagos:
+            self.registrar(pago)
+
+    def resumen(self):
+        """(rutas, totales por moneda); copia todo, se puede serializar fuera del lock."""
+        rutas, totales = [], {}
+        for route_id in sorted(self._rutas):
+            fila = self._rutas[route_id]
+            for moneda, (_, centimos) in fila["monedas"].items():
+                totales[moneda] = totales.get(moneda, 0) + centimos
+            rutas.append({
+                "airplane_route_id": route_id,
+                "flight_number": fila["flight_number"],
+                "airplane_id": fila["airplane_id"],
+                "payments": fila["payments"],
+                "revenue": {m: c / 100 for m, (_, c) in fila["monedas"].items()},
+            })
+        return rutas, {m: c / 100 for m, c in totales.items()}
+
+
+INGRESOS_POR_RUTA = IngresosPorRuta()
+
+# Espejo columnar (NumPy) de reservas y pagos para /analytics; se actualiza junto con las listas
+ANALITICA = AnaliticaReservas()
+
+
+def generate_fake_payments(reservas_pagadas):
+    """
+    Genera un pago falso por cada reserva de `reservas_pagadas` (ya en estado
+    'Pagado': el asiento quedó 'Pagado' en GESTIONVUELOS al asignarlo, ver
+    generate_fake_reservations). Se llama con STORE_LOCK tomado; los payment_id
+    no repiten los de `payments`.
+    """
     fake_payments = []
-    used_ids = set()
-    gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
-
-    for reserva in reservas_seleccionadas:
-        reservation_id = reserva.get("reservation_id")
-        price = reserva.get("price", 0.0)
-        airplane_id = reserva.get("airplane_id")
-        seat_number = reserva.get("seat_number")
+    used_ids = {p.get("payment_id") for p in payments}
 
+    for reserva in reservas_pagadas:
         # Generar ID único de pago
         while True:
             payment_id = f"PAY{random.randint(100000, 999999)}"
@@ -1101,24 +1492,10 @@ def generate_fake_payments(max_pagados=None):
                 used_ids.add(payment_id)
                 break
 
-        # ✅ Actualizar estado de la reserva
-        reserva["status"] = "Pagado"
-
-        # ✅ Llamar al microservicio para actualizar el estado del asiento
-        try:
-            update_url = f"{gestion_vuelos_url}/update_seat_status/{airplane_id}/seats/{seat_number}"
-            update_response = requests.put(update_url, json={"status": "Pagado"})
-            if update_response.status_code == 200:
-                logging.info(f"🛫 Asiento {seat_number} del avión {airplane_id} marcado como 'Pagado' en GESTIONVUELOS.")
-            else:
-                logging.warning(f"⚠️ No se pudo actualizar asiento {seat_number} en avión {airplane_id}: {update_response.status_code}")
-        except Exception as e:
-            logging.exception(f"❌ Error al llamar al microservicio GESTIONVUELOS para el asiento {seat_number}")
-
         payment_info = {
             "payment_id": payment_id,
-            "reservation_id": reservation_id,
-            "amount": price,
+            "reservation_id": reserva.get("reservation_id"),
+            "amount": reserva.get("price", 0.0),
             "currency": random.choice(["USD", "CRC"]),
             "payment_method": random.choice(["Tarjeta", "PayPal", "Transferencia"]),
             "status": "Pagado",
@@ -1129,13 +1506,25 @@ def generate_fake_payments(max_pagados=None):
         full_payment_record = {**payment_info, **reserva}
         fake_payments.append(full_payment_record)
 
-    logging.info(f"💳 Se generaron {len(fake_payments)} pagos con actualización remota de asiento.")
+    logging.info(f"💳 Se generaron {len(fake_payments)} pagos.")
     return fake_payments
 
 
 #####################################################################################################
 
 
+## Campos propios de un pago en la vista compacta: la reserva se referencia por
+## reservation_id / reservation_code en lugar de copiarse entera en cada pago
+CAMPOS_PAGO_COMPACTO = (
+    "payment_id", "reservation_id", "reservation_code", "amount", "currency",
+    "payment_method", "status", "payment_date", "transaction_reference",
+)
+
+
+def pago_compacto(pago):
+    return {campo: pago[campo] for campo in CAMPOS_PAGO_COMPACTO if campo in pago}
+
+
 ## Lista en memoria para pagos falsos
 @app.route('/get_all_fake_payments', methods=['GET'])
 def get_all_fake_payments():
@@ -1144,11 +1533,20 @@ def get_all_fake_payments():
     Description:
       Devuelve una lista de pagos simulados almacenados en memoria, útiles para pruebas o demostraciones.
       Si no hay pagos generados, se devuelve un mensaje indicando la ausencia de registros.
+      Con view=compact cada pago trae solo sus campos y referencia la reserva por
+      reservation_id y reservation_code en lugar de incluirla completa.
     ---
     tags:
       - Payments
     produces:
       - application/json
+    parameters:
+      - name: view
+        in: query
+        type: string
+        enum: [full, compact]
+        default: full
+        description: full incluye los datos de la reserva en cada pago; compact solo la referencia
     responses:
       200:
         description: Lista de pagos en memoria o mensaje de que no hay pagos
@@ -1170,9 +1568,21 @@ def get_all_fake_payments():
             {
               "message": "No hay pagos generados actualmente."
             }
+      400:
+        description: Valor de view inválido
+        examples:
+          application/json:
+            {
+              "message": "El parámetro view debe ser 'full' o 'compact'."
+            }
     """
+    vista = request.args.get('view', 'full')
+    if vista not in ('full', 'compact'):
+        return jsonify({'message': "El parámetro view debe ser 'full' o 'compact'."}), 400
     if not payments:
         return jsonify({'message': 'No hay pagos generados actualmente.'}), 200
+    if vista == 'compact':
+        return jsonify([pago_compacto(p) for p in payments]), 200
     return jsonify(payments), 200
 
 
@@ -1311,7 +1721,11 @@ def delete_payment_by_id(payment_id):
         return jsonify({'message': f'No se encontró ningún pago con ID: {payment_id}'}), 404
 
     # Eliminar
-    payments.remove(payment)
+    with STORE_LOCK:
+        if payment in payments:
+            payments.remove(payment)
+            INGRESOS_POR_RUTA.anular(payment)
+            ANALITICA.pago_eliminado(payment_id)
     logging.info(f"✅ Pago con ID {payment_id} eliminado correctamente.")
 
     return jsonify({'message': f'El pago con ID {payment_id} fue eliminado con éxito.'}), 200
@@ -1320,6 +1734,148 @@ def delete_payment_by_id(payment_id):
 #####################################################################################################
 
 
+## Ingresos por ruta a partir de los contadores incrementales (sin recorrer los pagos)
+@app.route('/payments/revenue_by_route', methods=['GET'])
+def revenue_by_route():
+    """
+    Summary: Ingresos y cantidad de pagos por ruta
+    Description:
+      Devuelve los ingresos por ruta y moneda. Los contadores se actualizan al crear,
+      eliminar o cancelar pagos, así que la respuesta es O(rutas) y no O(pagos).
+    ---
+    tags:
+      - Payments
+    produces:
+      - application/json
+    responses:
+      200:
+        description: Ingresos por ruta y totales por moneda
+        examples:
+          application/json:
+            {
+              "routes": [
+                {
+                  "airplane_route_id": 1,
+                  "flight_number": "CZ-3560",
+                  "airplane_id": 2,
+                  "payments": 2,
+                  "revenue": {"Dolares": 196000.0}
+                }
+              ],
+              "totals": {"routes": 1, "payments": 2, "revenue": {"Dolares": 196000.0}}
+            }
+    """
+    with STORE_LOCK:
+        rutas, ingresos = INGRESOS_POR_RUTA.resumen()
+    return jsonify({
+        "routes": rutas,
+        "totals": {
+            "routes": len(rutas),
+            "payments": sum(r["payments"] for r in rutas),
+            "revenue": ingresos,
+        }
+    }), 200
+
+
+############################################################################################################
+
+
+## Agregados para planificación de capacidad sobre el espejo columnar (NumPy) de reservas y pagos
+@app.route('/analytics', methods=['GET'])
+def get_analytics():
+    """
+    Summary: Agregados de reservas y pagos (reservas por ruta y día, ingresos, cancelaciones)
+    Description:
+      Calcula los agregados con NumPy sobre una copia de las columnas del espejo de reservas
+      y pagos, que se actualiza en cada alta, pago y cancelación. Las reservas canceladas se
+      conservan en el espejo para la tasa de cancelación. El día es el de registro (UTC).
+    ---
+    tags:
+      - Analytics
+    produces:
+      - application/json
+    parameters:
+      - name: date_from
+        in: query
+        type: string
+        description: Primer día (YYYY-MM-DD) para reservas por ruta y día
+      - name: date_to
+        in: query
+        type: string
+        description: Último día (YYYY-MM-DD), inclusivo
+      - name: route_id
+        in: query
+        type: integer
+        description: Solo esta ruta en reservas por ruta y día
+    responses:
+      200:
+        description: Agregados calculados
+        examples:
+          application/json:
+            {
+              "rows": {"reservations": 4, "payments": 2},
+              "bookings_by_route_day": [
+                {"airplane_route_id": 1, "date": "2025-04-30", "bookings": 3, "cancelled": 1}
+              ],
+              "revenue_by_currency_method": [
+                {"currency": "Dolares", "payment_method": "Tarjeta", "payments": 2, "amount": 196000.0}
+              ],
+              "cancellation": {"reservations": 4, "cancelled": 1, "rate": 0.25,
+                               "by_route": [{"airplane_route_id": 1, "rate": 0.3333}]},
+              "elapsed_ms": 0.41
+            }
+      400:
+        description: Parámetros inválidos
+      503:
+        description: NumPy no está instalado
+    """
+    if not ANALITICA.habilitada:
+        return jsonify({'message': 'La analítica requiere NumPy, que no está instalado.'}), 503
+
+    try:
+        desde = analytics.dia_de_fecha(request.args['date_from']) if 'date_from' in request.args else None
+        hasta = analytics.dia_de_fecha(request.args['date_to']) if 'date_to' in request.args else None
+    except ValueError:
+        return jsonify({'message': 'Las fechas deben tener el formato YYYY-MM-DD.'}), 400
+    route_id = request.args.get('route_id')
+    if route_id is not None:
+        if not route_id.isdigit() or int(route_id) <= 0:
+            return jsonify({'message': 'El route_id debe ser un número entero positivo.'}), 400
+        route_id = int(route_id)
+
+    with STORE_LOCK:
+        datos = ANALITICA.instantanea()
+
+    t0 = time.perf_counter()
+    reservas, pagos = datos["reservas"], datos["pagos"]
+    por_dia = analytics.reservas_por_ruta_y_dia(reservas, desde, hasta, route_id)
+    ingresos = analytics.ingresos_por_moneda_y_metodo(pagos, datos["monedas"], datos["metodos"])
+    total, canceladas, tasa, por_ruta = analytics.tasa_cancelacion(reservas)
+    transcurrido = (time.perf_counter() - t0) * 1000
+
+    return jsonify({
+        "rows": {"reservations": len(reservas["route_id"]), "payments": int(pagos["activo"].sum())},
+        "bookings_by_route_day": [
+            {"airplane_route_id": r, "date": analytics.fecha_de_dia(d), "bookings": n, "cancelled": c}
+            for r, d, n, c in por_dia
+        ],
+        "revenue_by_currency_method": [
+            {"currency": m, "payment_method": metodo, "payments": n, "amount": monto}
+            for m, metodo, n, monto in ingresos
+        ],
+        "cancellation": {
+            "reservations": total,
+            "cancelled": canceladas,
+            "rate": tasa,
+            "by_route": [{"airplane_route_id": r, "rate": t} for r, t in sorted(por_ruta.items())],
+        },
+        "elapsed_ms": round(transcurrido, 3),
+    }), 200
+
+
+############################################################################################################
+
+
 ## Crear un nuevo pago para una reserva existente y actualizar el estado de la reserva a 'Pagado'
 ## y notificar a GESTIONVUELOS para marcar el asiento como 'Pagado'
 @app.route('/create_payment', methods=['POST'])
@@ -1330,9 +1886,10 @@ def create_payment():
       Registra un pago asociado a una reserva existente en el sistema.
       Verifica que la reserva exista, que no tenga ya un pago registrado,
       y genera automáticamente un ID único de pago y la referencia de transacción.
-      Actualiza el estado de la reserva a 'Pagado' y notifica a GestiónVuelos
-      para que también marque el asiento como 'Pagado'.
-      El pago se almacena en memoria.
+      Actualiza el estado de la reserva a 'Pagado' y encola en el outbox la
+      notificación a GestiónVuelos para marcar el asiento como 'Pagado'.
+      El pago se almacena en memoria; `seat_sync` indica si la notificación ya
+      se entregó ('entregado') o queda pendiente de reintento ('pendiente').
     ---
     tags:
       - Payments
@@ -1375,10 +1932,6 @@ def create_payment():
         description: Reserva no encontrada
       409:
         description: Pago duplicado para la misma reserva
-      503:
-        description: Servicio de GestiónVuelos no disponible
-      504:
-        description: Timeout al contactar GestiónVuelos
       500:
         description: Error interno del servidor
     """
@@ -1398,57 +1951,52 @@ def create_payment():
         if currency not in ["Dolares", "Colones"]:
             return jsonify({'message': 'Moneda no soportada.'}), 400
 
-        # Validar existencia de reserva
-        reserva = next((r for r in reservations if r['reservation_id'] == reservation_id), None)
-        if not reserva:
-            return jsonify({'message': f'Reserva con ID {reservation_id} no encontrada.'}), 404
-
-        # Validar que no haya pago duplicado para esta reserva
-        if any(p.get("reservation_id") == reservation_id for p in payments):
-            return jsonify({'message': 'Esta reserva ya tiene un pago registrado.'}), 409
-
-        # Generar ID único de pago
-        while True:
-            payment_id = f"PAY{random.randint(100000, 999999)}"
-            if not any(p.get("payment_id") == payment_id for p in payments):
-                break
-
-        # 1) Actualizar estado de la reserva a 'Pagado'
-        reserva['status'] = "Pagado"
-
-        # 2) Notificar a GestiónVuelos para marcar el asiento como 'Pagado'
-        gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
-        airplane_id = reserva['airplane_id']
-        seat_number = reserva['seat_number']
-        try:
-            vuelo_resp = requests.put(
-                f"{gestion_vuelos_url}/update_seat_status/{airplane_id}/seats/{seat_number}",
-                json={"status": "Pagado"},
-                timeout=20
-            )
-            if vuelo_resp.status_code != 200:
-                logging.warning(f"⚠️ GestiónVuelos devolvió {vuelo_resp.status_code} al marcar asiento {seat_number} como Pagado.")
-        except requests.exceptions.ConnectionError:
-            return jsonify({'message': 'No se pudo conectar con GestiónVuelos para actualizar estado del asiento.'}), 503
-        except requests.exceptions.Timeout:
-            return jsonify({'message': 'Timeout al actualizar asiento en GestiónVuelos.'}), 504
+        with STORE_LOCK:
+            # Validar existencia de reserva
+            reserva = next((r for r in reservations if r['reservation_id'] == reservation_id), None)
+            if not reserva:
+                return jsonify({'message': f'Reserva con ID {reservation_id} no encontrada.'}), 404
+
+            # Validar que no haya pago duplicado para esta reserva
+            if any(p.get("reservation_id") == reservation_id for p in payments):
+                return jsonify({'message': 'Esta reserva ya tiene un pago registrado.'}), 409
+
+            # Generar ID único de pago
+            while True:
+                payment_id = f"PAY{random.randint(100000, 999999)}"
+                if not any(p.get("payment_id") == payment_id for p in payments):
+                    break
+
+            # 1) Actualizar estado de la reserva a 'Pagado'
+            reserva['status'] = "Pagado"
+
+            # 2) Encolar la notificación a GestiónVuelos para marcar el asiento como 'Pagado'
+            ticket = SEAT_OUTBOX.encolar(reserva['airplane_id'], reserva['seat_number'], "Pagado")
+
+            # 3) Crear el pago, incluyendo la reserva ya actualizada
+            payment = {
+                **reserva,
+                "payment_id": payment_id,
+                "reservation_id": reservation_id,
+                "amount": reserva.get("price", 0.0),
+                "currency": currency,
+                "payment_method": payment_method,
+                "status": "Pagado",
+                "payment_date": formatear_fecha_espanol(datetime.now()),
+                "transaction_reference": ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+            }
+            payments.append(payment)
+            INGRESOS_POR_RUTA.registrar(payment)
+            ANALITICA.reserva_pagada(reservation_id)
+            ANALITICA.pago_creado(payment)
 
-        # 3) Crear el pago, incluyendo la reserva ya actualizada
-        payment = {
-            **reserva,
-            "payment_id": payment_id,
-            "reservation_id": reservation_id,
-            "amount": reserva.get("price", 0.0),
-            "currency": currency,
-            "payment_method": payment_method,
-            "status": "Pagado",
-            "payment_date": formatear_fecha_espanol(datetime.now()),
-            "transaction_reference": ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
-        }
-        payments.append(payment)
+        seat_sync = SEAT_OUTBOX.esperar(ticket, OUTBOX_ESPERA_MAX_S)
+        if seat_sync != "entregado":
+            logging.warning(f"⚠️ Asiento {payment['seat_number']} aún no marcado como Pagado en GestiónVuelos ({seat_sync}).")
 
         return jsonify({
             "message": "✅ Pago registrado correctamente.",
+            "seat_sync": seat_sync,
             "payment": payment
         }), 201
 
@@ -1466,7 +2014,7 @@ def create_payment():
 def cancel_payment_and_reservation(payment_id):
     """
     Cancelación activa por parte del cliente: elimina el pago, la reserva asociada
-    y libera el asiento en el avión.
+    y encola en el outbox la liberación del asiento en el avión.
     ---
     tags:
       - Payments
@@ -1478,12 +2026,15 @@ def cancel_payment_and_reservation(payment_id):
         description: ID único del pago (formato PAY123456)
     responses:
       200:
-        description: "Cancelación exitosa. Se eliminó el pago y la reserva. El asiento fue liberado."
+        description: "Cancelación exitosa. Se eliminó el pago y la reserva. La liberación del asiento se entrega vía outbox."
         schema:
           type: object
           properties:
             message:
               type: string
+            seat_sync:
+              type: string
+              enum: [entregado, pendiente, fallido]
             deleted_payment:
               type: object
             deleted_reservation:
@@ -1493,7 +2044,7 @@ def cancel_payment_and_reservation(payment_id):
       404:
         description: "Pago no encontrado o datos incompletos"
       500:
-        description: "Error interno al liberar el asiento o procesar la cancelación"
+        description: "Error interno al procesar la cancelación"
     """
 
     logging.info(f"🚨 Solicitud de cancelación completa recibida para el pago: {payment_id}")
@@ -1502,48 +2053,46 @@ def cancel_payment_and_reservation(payment_id):
     if not re.match(r"^PAY\d{6}$", payment_id.strip().upper()):
         return jsonify({'message': 'El formato del payment_id es inválido. Debe ser como PAY123456'}), 400
 
-    # Buscar el pago
-    payment = next((p for p in payments if p['payment_id'] == payment_id), None)
-    if not payment:
-        return jsonify({'message': f'No se encontró el pago con ID: {payment_id}'}), 404
+    with STORE_LOCK:
+        # Buscar el pago
+        payment = next((p for p in payments if p['payment_id'] == payment_id), None)
+        if not payment:
+            return jsonify({'message': f'No se encontró el pago con ID: {payment_id}'}), 404
 
-    reservation_id = payment.get("reservation_id")
-    airplane_id = payment.get("airplane_id")
-    seat_number = payment.get("seat_number")
+        reservation_id = payment.get("reservation_id")
+        airplane_id = payment.get("airplane_id")
+        seat_number = payment.get("seat_number")
 
-    if not reservation_id or not airplane_id or not seat_number:
-        return jsonify({'message': 'El pago no tiene los datos completos para liberar la reserva'}), 404
+        if not reservation_id or not airplane_id or not seat_number:
+            return jsonify({'message': 'El pago no tiene los datos completos para liberar la reserva'}), 404
 
-    # 🔄 Primero liberar el asiento
-    try:
-        gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
-        liberar_url = f"{gestion_vuelos_url}/free_seat/{airplane_id}/seats/{seat_number}"
-        response = requests.put(liberar_url)
+        # ✅ Eliminar el pago
+        payments.remove(payment)
+        INGRESOS_POR_RUTA.anular(payment)
+        ANALITICA.pago_eliminado(payment_id)
 
-        if response.status_code != 200:
-            logging.warning(f"⚠️ No se pudo liberar el asiento {seat_number}. Código: {response.status_code}")
-            return jsonify({'message': 'No se pudo liberar el asiento en GestiónVuelos.'}), 500
+        # ✅ Eliminar la reserva asociada
+        reserva = next((r for r in reservations if r["reservation_id"] == reservation_id), None)
+        if reserva:
+            reservations.remove(reserva)
+            ANALITICA.reserva_cancelada(reservation_id)
+        else:
+            reserva = {}
 
-        logging.info(f"🪑 Asiento {seat_number} del avión {airplane_id} fue liberado exitosamente.")
+        # 🔄 Encolar la liberación del asiento en la misma sección crítica
+        ticket = SEAT_OUTBOX.encolar(airplane_id, seat_number, "Libre")
 
-    except Exception as e:
-        logging.exception("❌ Error al intentar liberar el asiento en GestiónVuelos.")
-        return jsonify({'message': 'Error interno al liberar el asiento'}), 500
-
-    # ✅ Luego eliminar el pago
-    payments.remove(payment)
-    logging.info(f"💸 Pago con ID {payment_id} eliminado correctamente.")
-
-    # ✅ Luego eliminar la reserva asociada
-    reserva = next((r for r in reservations if r["reservation_id"] == reservation_id), None)
-    if reserva:
-        reservations.remove(reserva)
-        logging.info(f"🗑️ Reserva con ID {reservation_id} eliminada correctamente.")
+    logging.info(f"💸 Pago con ID {payment_id} y reserva {reservation_id} eliminados correctamente.")
+
+    seat_sync = SEAT_OUTBOX.esperar(ticket, OUTBOX_ESPERA_MAX_S)
+    if seat_sync == "entregado":
+        logging.info(f"🪑 Asiento {seat_number} del avión {airplane_id} fue liberado exitosamente.")
     else:
-        reserva = {}
+        logging.warning(f"⚠️ Liberación del asiento {seat_number} del avión {airplane_id} en estado '{seat_sync}'.")
 
     return jsonify({
         'message': 'Cancelación exitosa: pago y reserva eliminados, asiento liberado.',
+        'seat_sync': seat_sync,
         'deleted_payment': payment,
         'deleted_reservation': reserva
     }), 200
@@ -1613,7 +2162,9 @@ def edit_payment(payment_id):
         if 'payment_method' in data:
             if data['payment_method'] not in ["Tarjeta", "PayPal", "Transferencia", "Efectivo", "SINPE"]:
                 return jsonify({'message': 'Método de pago inválido'}), 400
-            payment['payment_method'] = data['payment_method']
+            with STORE_LOCK:
+                payment['payment_method'] = data['payment_method']
+                ANALITICA.pago_editado(payment)
 
         # Editar payment_date
         if 'payment_date' in data:
@@ -1637,17 +2188,372 @@ def edit_payment(payment_id):
 ############################################################################################################
 
 
+## Reservas y pagos iniciales, generados en segundo plano al arrancar
+# SEED_DATA=0 arranca sin datos, igual que en GestiónVuelos.
+SEED_DATA = os.getenv("SEED_DATA", "1").strip().lower() not in ("0", "false", "no")
+ARRANQUE_RESERVAS = 3
+ARRANQUE_PAGOS = 1
+# Tiempo máximo esperando a que GestiónVuelos responda antes de dar el arranque por fallido
+ARRANQUE_ESPERA_MAX_S = float(os.getenv("ARRANQUE_ESPERA_MAX_S", "120"))
+
+
+class ArranqueReservas:
+    """
+    Genera las reservas y pagos iniciales en un hilo aparte, así el servicio
+    atiende solicitudes desde el primer momento. El progreso sale en /health.
+
+    - Si GestiónVuelos todavía no responde (o responde 5xx) reintenta con backoff
+      exponencial hasta `espera_max` segundos, en lugar de quedar con cero reservas.
+    - Las reservas se insertan en una sola sección crítica, con IDs a continuación
+      de los existentes y códigos que no se repiten.
+    - cancelar() descarta el resultado si todavía no se insertó (POST /admin/seed
+      reemplaza los datos) y devuelve los asientos ya tomados vía outbox.
+    """
+
+    def __init__(self, reservas, pagos, espera_max, backoff_base=0.5, backoff_max=10.0):
+        self.reservas = reservas
+        self.pagos = pagos
+        self.espera_max = espera_max
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._hilo = None
+        self._cancelado = False
+        self._inicio = None
+        self._fin = None
+        self.estado = "pendiente"
+        self.intentos = 0
+        self.ultimo_error = None
+        self.reservas_generadas = 0
+        self.pagos_generados = 0
+
+    def iniciar(self):
+        if self._hilo is not None:
+            return
+        with self._lock:
+            if self._hilo is None:
+                self._inicio = time.monotonic()
+                self._hilo = threading.Thread(target=self._correr, name="arranque-reservas", daemon=True)
+                self._hilo.start()
+
+    def cancelar(self):
+        with self._lock:
+            self._cancelado = True
+
+    def esperar(self, timeout=None):
+        """Espera a que termine el hilo; devuelve el estado final (o el actual si vence el timeout)."""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        return self.estado
+
+    def snapshot(self):
+        with self._lock:
+            fin = self._fin if self._fin is not None else time.monotonic()
+            return {
+                "state": self.estado,
+                "attempts": self.intentos,
+                "reservations": self.reservas_generadas,
+                "payments": self.pagos_generados,
+                "last_error": self.ultimo_error,
+                "elapsed_s": round(fin - self._inicio, 2) if self._inicio is not None else None,
+            }
+
+    def _terminar(self, estado):
+        # Se llama con self._lock tomado
+        self.estado = estado
+        self._fin = time.monotonic()
+
+    def _correr(self):
+        if not os.getenv("GESTIONVUELOS_SERVICE"):
+            with self._lock:
+                self.ultimo_error = "GESTIONVUELOS_SERVICE no está configurado."
+                self._terminar("fallido")
+            logging.error("❌ Arranque: GESTIONVUELOS_SERVICE no está configurado; no se generan reservas.")
+            return
+
+        espera = self.backoff_base
+        while True:
+            with self._lock:
+                if self._cancelado:
+                    self._terminar("cancelado")
+                    return
+                self.intentos += 1
+                self.estado = "generando"
+            try:
+                nuevas = generate_fake_reservations(self.reservas, self.pagos)
+                break
+            except GestionVuelosNoDisponible as e:
+                with self._lock:
+                    self.ultimo_error = str(e)
+                    if time.monotonic() - self._inicio + espera > self.espera_max:
+                        self._terminar("fallido")
+                        logging.error(f"❌ Arranque: GestiónVuelos no respondió en {self.espera_max:.0f} s ({e}).")
+                        return
+                    self.estado = "esperando_gestion_vuelos"
+                logging.warning(f"⏳ Arranque: GestiónVuelos no disponible ({e}); reintento en {espera:.1f} s.")
+                time.sleep(espera * random.uniform(0.8, 1.2))
+                espera = min(espera * 2, self.backoff_max)
+            except Exception as e:
+                logging.exception("❌ Arranque: error inesperado al generar las reservas iniciales.")
+                with self._lock:
+                    self.ultimo_error = f"{type(e).__name__}: {e}"
+                    self._terminar("fallido")
+                return
+
+        with STORE_LOCK:
+            with self._lock:
+                cancelado = self._cancelado
+            if cancelado:
+                # Los datos se reemplazaron mientras tanto: devolver los asientos tomados
+                for reserva in nuevas:
+                    SEAT_OUTBOX.encolar(reserva['airplane_id'], reserva['seat_number'], "Libre")
+                nuevos_pagos = []
+            else:
+                siguiente = max((r['reservation_id'] for r in reservations), default=0) + 1
+                codigos = {r['reservation_code'] for r in reservations}
+                for reserva in nuevas:
+                    while reserva['reservation_code'] in codigos:
+                        reserva['reservation_code'] = generate_reservation_code()
+                    codigos.add(reserva['reservation_code'])
+                    reserva['reservation_id'] = siguiente
+                    siguiente += 1
+                    reservations.append(reserva)
+                    ANALITICA.reserva_creada(reserva)
+                nuevos_pagos = generate_fake_payments([r for r in nuevas if r['status'] == "Pagado"])
+                for pago in nuevos_pagos:
+                    payments.append(pago)
+                    INGRESOS_POR_RUTA.registrar(pago)
+                    ANALITICA.pago_creado(pago)
+
+        with self._lock:
+            if cancelado:
+                self._terminar("cancelado")
+                return
+            self.reservas_generadas = len(nuevas)
+            self.pagos_generados = len(nuevos_pagos)
+            self._terminar("listo")
+        logging.info(f"🚀 Arranque listo: {len(nuevas)} reservas y {len(nuevos_pagos)} pagos "
+                     f"en {self.intentos} intento(s).")
+
+
+ARRANQUE = ArranqueReservas(ARRANQUE_RESERVAS, ARRANQUE_PAGOS, ARRANQUE_ESPERA_MAX_S)
+
+
+@app.before_request
+def _arranque_diferido():
+    # Con gunicorn no pasa por __main__: arranca con la primera solicitud de cada
+    # worker. El seed masivo reemplaza los datos, no hace falta generarlos antes.
+    if SEED_DATA and request.endpoint != "admin_seed":
+        ARRANQUE.iniciar()
+
+
+## Liveness y readiness (GET /livez y GET /readyz, ver salud.py)
+DEPENDENCIAS = Dependencias(Dependencia("gestion_vuelos", "GESTIONVUELOS_SERVICE"))
+
+
+def comprobar_listo():
+    with STORE_LOCK:
+        detalle = {"reservations": len(reservations), "payments": len(payments)}
+    detalle["bootstrap"] = ARRANQUE.snapshot()["state"] if SEED_DATA else "desactivado"
+    detalle["outbox_pending"] = SEAT_OUTBOX.snapshot()["pending"]
+    motivos = []
+    if detalle["bootstrap"] in ("pendiente", "generando", "esperando_gestion_vuelos"):
+        motivos.append("Reservas iniciales en generación.")
+    return motivos, detalle
+
+
+registrar_salud(app, "GestionReservas", comprobar_listo, DEPENDENCIAS)
+
+
+############################################################################################################
+
+
+## Seed masivo y determinista de reservas y pagos sobre la flota de GestiónVuelos
+# POST /admin/seed reemplaza reservas y pagos y no tiene autenticación: solo se
+# registra con ADMIN_SEED_ENABLED=1 (pruebas de capacidad, tools/seed.py).
+ADMIN_SEED_ENABLED = os.getenv("ADMIN_SEED_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+SEED_MAX_RESERVAS = 2000000
+SEED_LOTE_ASIENTOS = 500   # SEAT_BATCH_MAX de GestiónVuelos
+
+
+def _leer_flota_vuelos():
+    """
+    (rutas, {airplane_id: [(seat_number, status)]}) desde GestiónVuelos en dos
+    solicitudes. Lanza RuntimeError si GestiónVuelos no responde como se espera.
+    """
+    gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
+    try:
+        resp_rutas = HTTP.get(f"{gestion_vuelos_url}/get_all_airplanes_routes", timeout=60)
+        resp_asientos = HTTP.get(f"{gestion_vuelos_url}/seats/grouped-by-airplane", timeout=120)
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"GestiónVuelos no disponible ({type(e).__name__}).") from e
+    if resp_rutas.status_code != 200 or resp_asientos.status_code != 200:
+        raise RuntimeError(f"GestiónVuelos respondió {resp_rutas.status_code}/{resp_asientos.status_code}.")
+
+    rutas = resp_rutas.json()
+    agrupados = resp_asientos.json()
+    if not isinstance(rutas, list):
+        rutas = []   # {"message": ...} cuando no hay rutas
+    asientos = {}
+    for airplane_id, lista in agrupados.items():
+        if isinstance(lista, list):
+            asientos[int(airplane_id)] = [(a['seat_number'], a['status']) for a in lista]
+    return rutas, asientos
+
+
+def _sincronizar_asientos(nuevas, asientos):
+    """
+    Deja cada asiento de GestiónVuelos en el estado de su reserva nueva (el seed
+    da a lo sumo una por asiento de avión; sin reserva, Libre). Solo se envían
+    los que cambian, en lotes de PUT /seats/status/batch.
+    """
+    deseado = {(r['airplane_id'], r['seat_number']): r['status'] for r in nuevas}
+    cambios = [
+        {"airplane_id": airplane_id, "seat_number": numero, "status": deseado.get((airplane_id, numero), "Libre")}
+        for airplane_id, lista in asientos.items()
+        for numero, actual in lista
+        if deseado.get((airplane_id, numero), "Libre") != actual
+    ]
+
+    gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
+    resultado = {"updates": len(cambios), "applied": 0, "batches": 0}
+    for i in range(0, len(cambios), SEED_LOTE_ASIENTOS):
+        try:
+            resp = HTTP.put(f"{gestion_vuelos_url}/seats/status/batch",
+                            json={"updates": cambios[i:i + SEED_LOTE_ASIENTOS]}, timeout=60)
+        except requests.exceptions.RequestException as e:
+            resultado["error"] = f"GestiónVuelos no disponible ({type(e).__name__})."
+            break
+        if resp.status_code != 200:
+            resultado["error"] = f"HTTP {resp.status_code}: {resp.text[:200]}"
+            break
+        resultado["batches"] += 1
+        resultado["applied"] += resp.json().get("applied", 0)
+    return resultado
+
+
+def admin_seed():
+    """
+    Summary: Reemplaza reservas y pagos por datos generados desde una semilla
+    Description:
+      Genera en bloque `reservations` reservas sobre las rutas y asientos actuales de
+      GestiónVuelos (a lo sumo una por asiento de avión) y `payments` pagos para una parte
+      de ellas, y reemplaza las listas en memoria en una sola sección crítica. Es
+      determinista: la misma semilla con la misma flota produce los mismos datos.
+      Con `sync_seats` (por defecto) los asientos de GestiónVuelos quedan en el estado
+      de las reservas nuevas. Pensado para correr después de POST /admin/seed en
+      GestiónVuelos (ver tools/seed.py).
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            seed:
+              type: integer
+              example: 42
+            reservations:
+              type: integer
+              example: 1000000
+            payments:
+              type: integer
+              example: 300000
+            base_date:
+              type: string
+              example: "2025-06-01"
+            sync_seats:
+              type: boolean
+              example: true
+    responses:
+      201:
+        description: Reservas y pagos reemplazados; cantidades generadas y resultado de la sincronización
+      400:
+        description: Parámetros inválidos
+      409:
+        description: La flota de GestiónVuelos no alcanza para las reservas pedidas
+      503:
+        description: GestiónVuelos no disponible
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Se esperaba un objeto JSON.'}), 400
+
+    semilla = data.get("seed", 0)
+    cantidad = data.get("reservations", 3)
+    cantidad_pagos = data.get("payments", 0)
+    sincronizar = data.get("sync_seats", True)
+    for nombre, valor, maximo in (("seed", semilla, 2 ** 63 - 1), ("reservations", cantidad, SEED_MAX_RESERVAS),
+                                  ("payments", cantidad_pagos, SEED_MAX_RESERVAS)):
+        if not isinstance(valor, int) or isinstance(valor, bool) or not 0 <= valor <= maximo:
+            return jsonify({'message': f"El campo '{nombre}' debe ser un entero entre 0 y {maximo}."}), 400
+    if not isinstance(sincronizar, bool):
+        return jsonify({'message': "El campo 'sync_seats' debe ser booleano."}), 400
+    try:
+        fecha_base = datetime.strptime(data["base_date"], "%Y-%m-%d") if "base_date" in data \
+            else datetime.combine(datetime.now().date(), datetime.min.time())
+    except (TypeError, ValueError):
+        return jsonify({'message': "El campo 'base_date' debe tener el formato 'YYYY-MM-DD'."}), 400
+
+    inicio = time.perf_counter()
+    try:
+        rutas, asientos = _leer_flota_vuelos()
+    except RuntimeError as e:
+        logging.error(f"❌ Seed: no se pudo leer la flota de GestiónVuelos: {e}")
+        return jsonify({'message': str(e)}), 503
+
+    numeros = {airplane_id: [numero for numero, _ in lista] for airplane_id, lista in asientos.items()}
+    try:
+        nuevas, nuevos_pagos = generar_semilla(semilla, cantidad, cantidad_pagos, rutas, numeros,
+                                               fecha_base, formatear_fecha_espanol)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 409
+
+    ARRANQUE.cancelar()
+    with STORE_LOCK:
+        reservations[:] = nuevas
+        payments[:] = nuevos_pagos
+        INGRESOS_POR_RUTA.reconstruir(payments)
+        ANALITICA.cargar(reservations, payments)
+    generado_ms = round((time.perf_counter() - inicio) * 1000, 1)
+
+    seat_sync = _sincronizar_asientos(nuevas, asientos) if sincronizar else None
+    if seat_sync and "error" in seat_sync:
+        logging.warning(f"⚠️ Seed: sincronización de asientos incompleta: {seat_sync['error']}")
+
+    logging.info(f"🌱 Seed {semilla}: {len(nuevas)} reservas y {len(nuevos_pagos)} pagos en {generado_ms} ms.")
+    return jsonify({
+        'message': f"Datos generados con la semilla {semilla}.",
+        'seed': semilla,
+        'reservations': len(nuevas),
+        'payments': len(nuevos_pagos),
+        'elapsed_ms': generado_ms,
+        'seat_sync': seat_sync
+    }), 201
+
+
+if ADMIN_SEED_ENABLED:
+    app.add_url_rule('/admin/seed', view_func=admin_seed, methods=['POST'])
+
+
+############################################################################################################
+
+
 # Iniciar la aplicación
 if __name__ == '__main__':
 
   print("URL MAP GestionReservas:")
   print(app.url_map)
 
-  # Generar las reservas una sola vez al arrancar el servidor
-  reservations.extend(generate_fake_reservations(3))
-
-  ## Generar los pagos una sola vez al arrancar el servidor
-  payments = generate_fake_payments(1)
+  # Reservas y pagos iniciales en segundo plano: el servidor atiende desde ya
+  # y /health muestra el progreso
+  if SEED_DATA:
+      ARRANQUE.iniciar()
 
   # Ejecutar la app sin recargador para evitar duplicación
   app.run(debug=True, use_reloader=False, port=5002)
@@ -0,0 +1,147 @@
+"""
+Compresión negociada de respuestas y de cuerpos entre servicios.
+
+- registrar_compresion(app): comprime las respuestas JSON o de texto de al
+  menos COMPRESION_MIN_BYTES (1024) según el Accept-Encoding del cliente:
+  brotli si el paquete `brotli` está instalado y el cliente lo acepta, si no
+  gzip (nivel COMPRESION_NIVEL, 5). Agrega Vary: Accept-Encoding y vuelve
+  débil el ETag (cambia la representación, no el recurso), así If-None-Match
+  sigue dando 304. No toca respuestas en streaming (SSE), ya codificadas ni
+  sin cuerpo. También acepta solicitudes con Content-Encoding gzip o br.
+- comprimir_solicitudes(sesion): envuelve sesion.request para mandar con gzip
+  los cuerpos json= grandes. Las respuestas no necesitan nada: requests ya
+  anuncia gzip (y br con brotli instalado) y las descomprime solo.
+
+En /metrics: http_response_bytes_total{endpoint,encoding} (bytes de cuerpo
+enviados) y http_response_bytes_saved_total{endpoint,encoding} (lo que ahorró
+la compresión). COMPRESION=0 apaga la compresión de respuestas.
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import gzip
+import io
+import json
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # sin brotli se negocia solo gzip
+    brotli = None
+
+_COMPRIMIBLES = frozenset(("application/json", "application/msgpack", "application/javascript", "image/svg+xml"))
+
+# Tope del cuerpo descomprimido de una solicitud (protege de zip bombs)
+_MAX_DESCOMPRIMIDO = 64 * 1024 * 1024
+
+
+def _comprimible(mimetype):
+    return mimetype in _COMPRIMIBLES or (mimetype.startswith("text/") and mimetype != "text/event-stream")
+
+
+def _compresores(nivel):
+    compresores = {"gzip": lambda datos: gzip.compress(datos, compresslevel=nivel, mtime=0)}
+    if brotli is not None:
+        # Calidad 4: ~gzip -6 en tamaño y más rápido; las calidades altas son para estáticos
+        compresores = {"br": lambda datos: brotli.compress(datos, quality=4), **compresores}
+    return compresores
+
+
+def _descomprimir(codificacion, datos):
+    """Cuerpo descomprimido, o None si supera _MAX_DESCOMPRIMIDO."""
+    if codificacion == "br":
+        descompresor = brotli.Decompressor()
+        salida = descompresor.process(datos)
+        return salida if len(salida) <= _MAX_DESCOMPRIMIDO else None
+    descompresor = zlib.decompressobj(wbits=47)  # gzip o zlib, detectado por la cabecera
+    salida = descompresor.decompress(datos, _MAX_DESCOMPRIMIDO)
+    return None if descompresor.unconsumed_tail else salida
+
+
+def registrar_compresion(app, metricas=None):
+    """Registra la descompresión de solicitudes y la compresión negociada de respuestas."""
+    from flask import jsonify, request
+
+    minimo = int(os.getenv("COMPRESION_MIN_BYTES", "1024"))
+    compresores = _compresores(int(os.getenv("COMPRESION_NIVEL", "5")))
+    ofrecidas = list(compresores)
+    aceptadas = {"gzip", "x-gzip", "deflate"} | ({"br"} if brotli is not None else set())
+
+    if metricas is not None:
+        metricas.describir("http_response_bytes_total", "counter",
+                           "Bytes de cuerpo enviados por endpoint y codificación")
+        metricas.describir("http_response_bytes_saved_total", "counter",
+                           "Bytes que ahorró la compresión por endpoint y codificación")
+
+    @app.before_request
+    def _descomprimir_solicitud():
+        codificacion = request.headers.get("Content-Encoding", "").strip().lower()
+        if not codificacion or codificacion == "identity":
+            return None
+        if codificacion not in aceptadas:
+            return jsonify({"message": f"Content-Encoding no soportado: {codificacion}."}), 415
+        entrada = request.environ["wsgi.input"]
+        largo = request.content_length
+        try:
+            datos = _descomprimir(codificacion, entrada.read(largo) if largo is not None else entrada.read())
+        except (OSError, zlib.error, ValueError) + ((brotli.error,) if brotli is not None else ()):
+            return jsonify({"message": f"Cuerpo {codificacion} inválido."}), 400
+        if datos is None:
+            return jsonify({"message": "Cuerpo descomprimido demasiado grande."}), 413
+        # El resto de la app lee el cuerpo ya descomprimido como si hubiera llegado así
+        request.environ["wsgi.input"] = io.BytesIO(datos)
+        request.environ["CONTENT_LENGTH"] = str(len(datos))
+        request.environ.pop("HTTP_CONTENT_ENCODING", None)
+        request.__dict__.pop("content_length", None)  # cached_property de werkzeug
+        return None
+
+    if os.getenv("COMPRESION", "1") == "0":
+        return
+
+    @app.after_request
+    def _comprimir_respuesta(resp):
+        if (resp.is_streamed or resp.direct_passthrough or request.method == "HEAD"
+                or resp.status_code < 200 or resp.status_code in (204, 304)
+                or "Content-Encoding" in resp.headers or not _comprimible(resp.mimetype or "")):
+            return resp
+        cuerpo = resp.get_data()
+        codificacion, enviados = "identity", len(cuerpo)
+        if len(cuerpo) >= minimo:
+            resp.vary.add("Accept-Encoding")
+            elegida = request.accept_encodings.best_match(ofrecidas)
+            if elegida is not None:
+                comprimido = compresores[elegida](cuerpo)
+                if len(comprimido) < len(cuerpo):
+                    codificacion, enviados = elegida, len(comprimido)
+                    resp.set_data(comprimido)
+                    resp.headers["Content-Encoding"] = elegida
+                    etag, debil = resp.get_etag()
+                    if etag and not debil:
+                        resp.set_etag(etag, weak=True)
+        if metricas is not None:
+            endpoint = request.url_rule.rule if request.url_rule is not None else "sin_ruta"
+            labels = (("endpoint", endpoint), ("encoding", codificacion))
+            metricas.inc("http_response_bytes_total", labels, enviados)
+            if codificacion != "identity":
+                metricas.inc("http_response_bytes_saved_total", labels, len(cuerpo) - enviados)
+        return resp
+
+
+def comprimir_solicitudes(sesion, minimo=None, nivel=None):
+    """Envuelve sesion.request: los cuerpos json= de al menos `minimo` bytes salen con gzip."""
+    minimo = int(os.getenv("COMPRESION_MIN_BYTES", "1024")) if minimo is None else minimo
+    nivel = int(os.getenv("COMPRESION_NIVEL", "5")) if nivel is None else nivel
+    original = sesion.request
+
+    def request_comprimido(method, url, *args, **kwargs):
+        if kwargs.get("json") is not None and kwargs.get("data") is None and not args:
+            cuerpo = json.dumps(kwargs["json"], allow_nan=False).encode("utf-8")
+            if len(cuerpo) >= minimo:
+                del kwargs["json"]
+                kwargs["data"] = gzip.compress(cuerpo, compresslevel=nivel, mtime=0)
+                kwargs["headers"] = {**(kwargs.get("headers") or {}),
+                                     "Content-Type": "application/json", "Content-Encoding": "gzip"}
+        return original(method, url, *args, **kwargs)
+
+    sesion.request = request_comprimido
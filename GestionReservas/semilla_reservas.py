@@ -0,0 +1,189 @@
+"""
+Generación masiva y determinista de reservas y pagos (POST /admin/seed).
+
+Parte de la flota que ya tiene GestiónVuelos (rutas y asientos por avión). El
+estado de un asiento es del avión y no de la ruta (las rutas de un mismo avión
+comparten sus asientos), así que cada asiento de avión lleva como mucho una
+reserva activa, en una de las rutas de ese avión elegida al azar: un millón de
+reservas necesitan un millón de asientos en aviones con rutas.
+
+Con la misma semilla, la misma flota y los mismos parámetros sale exactamente
+lo mismo: el azar viene de un random.Random(semilla) propio y de un Faker con
+seed_instance(semilla). Faker (~100 µs por llamada) solo arma pools de nombres,
+correos y teléfonos. Los valores de las reservas se eligen de esos pools por
+columna con rng.choices (un millón de elecciones en ~0.15 s) y después se
+arman los dicts. Los códigos de reserva y las fechas se arman concatenando piezas
+precalculadas en lugar de formatear cada fila (strftime cuesta más que el
+resto del dict).
+"""
+
+import math
+import random
+from bisect import bisect_left
+from datetime import timedelta
+
+POOL_NOMBRES = 500
+POOL_CONTACTOS = 2000
+# Las reservas se reparten en los días anteriores a la fecha base
+DIAS_DE_RESERVAS = 90
+
+_LETRAS_CODIGO = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+_DIGITOS_CODIGO = "23456789"
+# Códigos distintos con el formato de generate_reservation_code (ABC123)
+MAX_CODIGOS = len(_LETRAS_CODIGO) ** 3 * len(_DIGITOS_CODIGO) ** 3
+# payment_id conserva el formato PAY###### (100000-999999)
+MAX_PAGOS = 900000
+
+MONEDAS = ("Dolares", "Colones")
+METODOS_PAGO = ("Tarjeta", "PayPal", "Transferencia")
+
+
+def faker_con_semilla(semilla):
+    from faker import Faker
+
+    faker = Faker()
+    faker.seed_instance(semilla)
+    return faker
+
+
+def pool(generar, tamano):
+    """Hasta `tamano` valores distintos de `generar()`, en el orden en que salen."""
+    return list(dict.fromkeys(generar() for _ in range(tamano)))
+
+
+_TRIOS_LETRAS = [a + b + c for a in _LETRAS_CODIGO for b in _LETRAS_CODIGO for c in _LETRAS_CODIGO]
+_TRIOS_DIGITOS = [a + b + c for a in _DIGITOS_CODIGO for b in _DIGITOS_CODIGO for c in _DIGITOS_CODIGO]
+
+
+def codigo_de_reserva(k):
+    """0 <= k < MAX_CODIGOS -> 'AAA222' ... 'ZZZ999' (biyectiva)."""
+    letras, digitos = divmod(k, len(_TRIOS_DIGITOS))
+    return _TRIOS_LETRAS[letras] + _TRIOS_DIGITOS[digitos]
+
+
+def permutacion_afin(rng, modulo):
+    """
+    i -> (a * i + b) % modulo con a coprimo con el módulo: una permutación de
+    range(modulo) que da valores distintos y desordenados sin muestrear ni
+    guardar un conjunto (rng.sample de 1M sobre 7M cuesta ~1 s).
+    """
+    while True:
+        a = rng.randrange(1, modulo)
+        if math.gcd(a, modulo) == 1:
+            break
+    b = rng.randrange(modulo)
+    return lambda i: (a * i + b) % modulo
+
+
+def plazas_elegidas(rng, total, cantidad):
+    """`cantidad` índices distintos de range(total), ordenados."""
+    if cantidad * 2 <= total:
+        return sorted(rng.sample(range(total), cantidad))
+    # Casi todas: es más barato sortear las que quedan afuera
+    afuera = set(rng.sample(range(total), total - cantidad))
+    return [i for i in range(total) if i not in afuera]
+
+
+def generar(semilla, cantidad, pagos, rutas, asientos, fecha_base, formatear_fecha):
+    """
+    (reservas, pagos) para la semilla dada. `rutas` son las de GestiónVuelos y
+    `asientos` es {airplane_id: [seat_number]}; cada asiento de avión recibe a lo
+    sumo una reserva. `formatear_fecha` da el formato de payment_date. ValueError
+    si la flota no tiene suficientes asientos en aviones con rutas, se piden más
+    pagos que reservas o se exceden los formatos de código.
+    """
+    por_avion = {}
+    for ruta in sorted(rutas, key=lambda r: r['airplane_route_id']):
+        if asientos.get(ruta['airplane_id']):
+            por_avion.setdefault(ruta['airplane_id'], []).append(ruta)
+    aviones = sorted(por_avion)
+    total = sum(len(asientos[a]) for a in aviones)
+    if cantidad > total:
+        raise ValueError(f"Se pidieron {cantidad} reservas y GestiónVuelos solo tiene {total} "
+                         f"asientos en aviones con rutas.")
+    if pagos > cantidad or pagos > MAX_PAGOS:
+        raise ValueError(f"Los pagos no pueden superar las reservas ni {MAX_PAGOS}.")
+    if cantidad > MAX_CODIGOS:
+        raise ValueError(f"No hay códigos de reserva distintos para {cantidad} reservas.")
+
+    rng = random.Random(semilla)
+    faker = faker_con_semilla(semilla)
+    nombres = pool(faker.first_name, POOL_NOMBRES)
+    apellidos = pool(faker.last_name, POOL_NOMBRES)
+    correos = pool(faker.email, POOL_CONTACTOS)
+    telefonos = pool(faker.phone_number, POOL_CONTACTOS)
+
+    # Asientos elegidos avión por avión; cada uno va a una de las rutas de su avión
+    elegidas = plazas_elegidas(rng, total, cantidad)
+    por_ruta = {}
+    inicio = 0
+    for airplane_id in aviones:
+        numeros, rutas_avion = asientos[airplane_id], por_avion[airplane_id]
+        desde, hasta = bisect_left(elegidas, inicio), bisect_left(elegidas, inicio + len(numeros))
+        destinos = rng.choices(rutas_avion, k=hasta - desde)
+        for i, ruta in zip(elegidas[desde:hasta], destinos):
+            por_ruta.setdefault(ruta['airplane_route_id'], (ruta, []))[1].append(numeros[i - inicio])
+        inicio += len(numeros)
+
+    # Columnas de ruta y asiento, ruta por ruta
+    col_ruta, col_asiento = [], []
+    for _, (ruta, numeros) in sorted(por_ruta.items()):
+        col_ruta.extend([ruta] * len(numeros))
+        col_asiento.extend(numeros)
+
+    # Una columna por campo con rng.choices (un bucle en C por columna, no por fila)
+    codigo = permutacion_afin(rng, MAX_CODIGOS)
+    col_codigo = [codigo_de_reserva(codigo(i)) for i in range(cantidad)]
+    col_pasaporte = list(map("{}{:08d}".format, rng.choices(_LETRAS_CODIGO, k=cantidad),
+                             rng.choices(range(100000000), k=cantidad)))
+    col_nombre = list(map("{} {}".format, rng.choices(nombres, k=cantidad), rng.choices(apellidos, k=cantidad)))
+    col_contacto = list(map("{} {}".format, rng.choices(nombres, k=cantidad), rng.choices(apellidos, k=cantidad)))
+    col_correo = rng.choices(correos, k=cantidad)
+    col_telefono = rng.choices(telefonos, k=cantidad)
+    col_telefono_contacto = rng.choices(telefonos, k=cantidad)
+    # reservation_date: uno de los DIAS_DE_RESERVAS anteriores a la fecha base + una hora del día
+    col_dia = rng.choices(range(DIAS_DE_RESERVAS), k=cantidad)
+    col_segundo = rng.choices(range(86400), k=cantidad)
+    dias = [(fecha_base - timedelta(days=d + 1)).strftime("%Y-%m-%d ") for d in range(DIAS_DE_RESERVAS)]
+    horas = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86400)]
+    pagadas = set(rng.sample(range(cantidad), pagos))
+
+    reservas = [
+        {
+            'reservation_id': i + 1,
+            'reservation_code': col_codigo[i],
+            'passport_number': col_pasaporte[i],
+            'full_name': col_nombre[i],
+            'email': col_correo[i],
+            'phone_number': col_telefono[i],
+            'emergency_contact_name': col_contacto[i],
+            'emergency_contact_phone': col_telefono_contacto[i],
+            'airplane_id': ruta['airplane_id'],
+            'flight_number': ruta['flight_number'],
+            'airplane_route_id': ruta['airplane_route_id'],
+            'seat_number': col_asiento[i],
+            'reservation_date': dias[col_dia[i]] + horas[col_segundo[i]],
+            'status': "Pagado" if i in pagadas else "Reservado",
+            'price': ruta.get('price', 0.0),
+        }
+        for i, ruta in enumerate(col_ruta)
+    ]
+
+    # Pagos: se pagan entre 0 y 2 horas después de reservar
+    id_pago = permutacion_afin(rng, MAX_PAGOS)
+    nuevos_pagos = []
+    for n, i in enumerate(sorted(pagadas)):
+        reserva = reservas[i]
+        pagado_en = fecha_base - timedelta(days=col_dia[i] + 1, seconds=-col_segundo[i] - rng.randrange(7200))
+        nuevos_pagos.append({
+            **reserva,
+            "payment_id": f"PAY{100000 + id_pago(n)}",
+            "reservation_id": reserva['reservation_id'],
+            "amount": reserva['price'],
+            "currency": MONEDAS[rng.randrange(len(MONEDAS))],
+            "payment_method": METODOS_PAGO[rng.randrange(len(METODOS_PAGO))],
+            "status": "Pagado",
+            "payment_date": formatear_fecha(pagado_en),
+            "transaction_reference": f"{rng.getrandbits(48):012X}",
+        })
+    return reservas, nuevos_pagos
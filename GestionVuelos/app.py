@@ -1,31 +1,125 @@
 # Standard Library
 import json
-import locale
 import logging
+import math
 import random
 import re
 import string
-from collections import Counter
+import time
+from collections import Counter, deque, namedtuple
 from datetime import datetime, timedelta
 import os
 import threading
 import uuid
 
 # Third-party Libraries
-from dateutil import parser  # pip install python-dateutil
 from dotenv import load_dotenv
-from faker import Faker
-from faker_airtravel import AirTravelProvider
-from flasgger import Swagger
 from marshmallow import Schema, fields, validates, ValidationError, RAISE
 
 # Flask
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+# Local
+from arranque import FakerPerezoso, SwaggerPerezoso
+from compresion import registrar_compresion
+from fechas import a_timestamp, formatear_fecha, iso_utc, parsear_fecha
+from metrics import LockInstrumentado, Metricas, instrumentar_flask
+from openapi_spec import EspecOpenAPI
+from route_index import IndiceRutas
+from salud import registrar_salud
+from seatmap import ESTADOS, LAYOUT_ESTANDAR, LAYOUTS, layout_para_modelo
+from semilla_vuelos import generar_flota
+from tracing import LockTrazado, iniciar_tracing
+from transporte import MSGPACK, desde_json, prefiere_msgpack, registrar_transporte, respuesta_json
 
 # -----------------------------
 # Concurrencia y estado global
 # -----------------------------
-STORE_LOCK = threading.RLock()
+class LockLectorEscritor:
+    """
+    Lock de lectores/escritor con preferencia de escritores.
+
+    - Escritura (`with STORE_LOCK:`): exclusiva y reentrante, como el RLock anterior.
+    - Lectura (`with STORE_LOCK.read():`): compartida y reentrante; también se permite
+      dentro de una escritura del mismo hilo. Un lector no puede promoverse a escritor.
+    Los lectores solo copian los datos bajo el lock; validan y serializan afuera.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor = None
+        self._profundidad = 0
+        self._escritores_esperando = 0
+        self._local = threading.local()
+        # Se incrementa al soltar cada escritura: versiona los snapshots de lectura
+        self.generacion = 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        yo = threading.get_ident()
+        with self._cond:
+            if self._escritor == yo:
+                self._profundidad += 1
+                return True
+            if getattr(self._local, "lecturas", 0):
+                raise RuntimeError("No se puede pasar de lectura a escritura en STORE_LOCK.")
+            libre = lambda: self._escritor is None and self._lectores == 0
+            if not blocking:
+                ok = libre()
+            else:
+                self._escritores_esperando += 1
+                try:
+                    ok = self._cond.wait_for(libre, None if timeout < 0 else timeout)
+                finally:
+                    self._escritores_esperando -= 1
+            if ok:
+                self._escritor = yo
+                self._profundidad = 1
+            return ok
+
+    def release(self):
+        with self._cond:
+            if self._escritor != threading.get_ident():
+                raise RuntimeError("STORE_LOCK liberado por un hilo que no es el escritor.")
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                self.generacion += 1
+                self._escritor = None
+                self._cond.notify_all()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def acquire_read(self):
+        local = self._local
+        lecturas = getattr(local, "lecturas", 0)
+        if lecturas:
+            local.lecturas = lecturas + 1
+            return True
+        if self._escritor == threading.get_ident():
+            # Lectura dentro de una escritura del mismo hilo: ya hay exclusión
+            local.lecturas, local.contado = 1, False
+            return True
+        with self._cond:
+            self._cond.wait_for(lambda: self._escritor is None and self._escritores_esperando == 0)
+            self._lectores += 1
+        local.lecturas, local.contado = 1, True
+        return True
+
+    def release_read(self):
+        local = self._local
+        local.lecturas -= 1
+        if local.lecturas == 0 and local.contado:
+            with self._cond:
+                self._lectores -= 1
+                if self._lectores == 0:
+                    self._cond.notify_all()
+
+
+METRICAS = Metricas()
+STORE_LOCK = LockTrazado(LockInstrumentado(METRICAS, "store", lock=LockLectorEscritor()))
 INITIALIZED = False
 MAX_TIMEOUT = 5
 
@@ -41,8 +135,25 @@ logging.basicConfig(
 )
 
 app = Flask(__name__)
+instrumentar_flask(app, METRICAS)
+registrar_compresion(app, METRICAS)
+iniciar_tracing(app, "GestionVuelos")
+
+## Rutas que consultan GestiónReservas y Usuario: las ofrecen también en MessagePack
+## a quien lo pida por Accept (ver transporte.py). Las de listas salen de SNAPSHOTS.
+RUTAS_INTERNAS = (
+    '/get_airplanes',
+    '/get_all_airplanes_routes',
+    '/seats/grouped-by-airplane',
+    '/get_airplane_seats/<int:airplane_id>/seats',
+    '/get_airplanes_route_by_id/<int:airplane_route_id>',
+    '/search_flights',
+    '/routes/load_summary',
+)
+registrar_transporte(app, RUTAS_INTERNAS)
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+OPENAPI_SPEC = EspecOpenAPI(os.path.join(BASE_DIR, "openapi.json"), app)
 
 
 
@@ -89,6 +200,9 @@ swagger_template = {
         {"name": "Airplanes", "description": "Operations related to airplane data"},
         {"name": "Airplanes Seats", "description": "Operations related to airplane seats data"},
         {"name": "Routes", "description": "Operations related to airplane routes"},
+        {"name": "Changes", "description": "Feed of seat, airplane and route changes"},
+        {"name": "Admin", "description": "Bulk data generation for capacity tests"},
+        {"name": "Metrics", "description": "Prometheus metrics of the process"},
     ],
     "definitions": {
         "AirplaneSchema": {
@@ -158,13 +272,13 @@ swagger_template = {
         }
     }
 }
-swagger = Swagger(app, template=swagger_template)
+# Swagger UI y /apispec_1.json se construyen en la primera visita (ver arranque.py)
+swagger = SwaggerPerezoso(app, template=swagger_template)
 
 # -----------------------------
 # Datos en memoria e índices
 # -----------------------------
-fake_airplane = Faker()
-fake_airplane.add_provider(AirTravelProvider)
+fake_airplane = FakerPerezoso("faker_airtravel.AirTravelProvider")
 
 airplane_models = [
     'Boeing 737', 'Boeing 777', 'Airbus A320', 'Airbus A380', 'Boeing 787',
@@ -180,49 +294,175 @@ def generate_flight_number():
 # Almacenes
 airplanes = []
 airplanes_by_id = {}
-seats = []
+seat_maps = {}   # airplane_id -> SeatMap (estado de cada asiento en un bytearray)
 airplanes_routes = []
 
+# -----------------------------
+# Feed de cambios (bus en memoria)
+# -----------------------------
+class ChangeFeed:
+    """
+    Bus en memoria de eventos de cambio (asientos, aviones y rutas).
+
+    Cada evento recibe una versión monotónica. Se conserva una ventana
+    acotada de eventos; un consumidor cuya versión quedó fuera de la
+    ventana recibe `reset` y debe recargar su caché completa.
+    """
+
+    def __init__(self, capacidad=1000):
+        self._cond = threading.Condition()
+        self._eventos = deque(maxlen=capacidad)
+        self.version = 0
+
+    def publicar(self, tipo, datos):
+        with self._cond:
+            self.version += 1
+            evento = {
+                'version': self.version,
+                'type': tipo,
+                'timestamp': time.time(),
+                'data': datos,
+            }
+            self._eventos.append(evento)
+            self._cond.notify_all()
+            return evento
+
+    def desde(self, since):
+        """Devuelve (eventos posteriores a `since`, reset)."""
+        with self._cond:
+            if since > self.version:
+                # Versión de otra instancia (reinicio): el cliente debe recargar
+                return [], True
+            if since == self.version:
+                return [], False
+            primera = self._eventos[0]['version'] if self._eventos else self.version + 1
+            if since < primera - 1:
+                return [], True
+            return [e for e in self._eventos if e['version'] > since], False
+
+    def reiniciar(self):
+        """Descarta la ventana de eventos (el store se reemplazó): todo consumidor recibe `reset`."""
+        with self._cond:
+            self._eventos.clear()
+            self.version += 1
+            self._cond.notify_all()
+
+    def esperar(self, since, timeout):
+        """Bloquea hasta que exista una versión posterior a `since` o venza el timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version != since, timeout=timeout)
+
+
+CHANGE_FEED = ChangeFeed(capacidad=int(os.getenv("CHANGE_FEED_CAPACITY", "1000")))
+CHANGES_MAX_WAIT = 30
+CHANGES_STREAM_MAX_SECONDS = 300
+# Cada long-poll o stream abierto ocupa un hilo del worker (gunicorn --threads 8):
+# a lo sumo CHANGES_WAITERS_MAX esperan a la vez y los demás hilos quedan para
+# el tráfico normal. El que no entra recibe 503 con Retry-After.
+CHANGES_WAITERS_MAX = int(os.getenv("CHANGES_WAITERS_MAX", "4"))
+ESPERAS_CAMBIOS = threading.BoundedSemaphore(CHANGES_WAITERS_MAX)
+CHANGES_RETRY_AFTER_S = 5
+
+# -----------------------------
+# Snapshots inmutables para lecturas de listas
+# -----------------------------
+Snapshot = namedtuple("Snapshot", ["generacion", "status", "cuerpo"])
+
+
+class SnapshotsLectura:
+    """
+    Respuestas ya serializadas de los endpoints de listas, versionadas con la
+    generación de STORE_LOCK (cada escritura la incrementa al soltar el lock).
+
+    Mientras no haya escrituras, un lector devuelve los bytes publicados sin
+    tomar el lock ni volver a validar/serializar. El primer lector tras un
+    cambio copia los datos bajo el lock de lectura, construye la respuesta
+    afuera y publica el snapshot nuevo con una sola asignación (atómica bajo el GIL).
+
+    La variante MessagePack (para quien la pide por Accept) se arma a partir
+    del JSON publicado la primera vez que se pide en cada generación.
+    """
+
+    def __init__(self, lock):
+        self._lock = lock
+        self._actuales = {}
+        self._binarios = {}
+
+    def respuesta(self, nombre, copiar, construir):
+        snap = self._actuales.get(nombre)
+        if snap is None or snap.generacion != self._lock.generacion:
+            with self._lock.read():
+                generacion = self._lock.generacion
+                datos = copiar()
+            status, cuerpo = construir(datos)
+            snap = Snapshot(generacion, status, respuesta_json(app, cuerpo).get_data())
+            actual = self._actuales.get(nombre)
+            if actual is None or actual.generacion <= generacion:
+                self._actuales[nombre] = snap
+        if prefiere_msgpack(request):
+            binario = self._binarios.get(nombre)
+            if binario is None or binario[0] != snap.generacion:
+                binario = self._binarios[nombre] = (snap.generacion, desde_json(snap.cuerpo))
+            resp = Response(binario[1], status=snap.status, mimetype=MSGPACK)
+        else:
+            resp = Response(snap.cuerpo, status=snap.status, mimetype="application/json")
+        resp.headers["X-Store-Generation"] = str(snap.generacion)
+        return resp
+
+    def generaciones(self):
+        return {nombre: snap.generacion for nombre, snap in list(self._actuales.items())}
+
+
+SNAPSHOTS = SnapshotsLectura(STORE_LOCK)
+
+# Tamaños del store (se calculan al hacer scrape de /metrics)
+METRICAS.gauge("store_items", "Elementos en memoria por colección",
+               lambda: {(("collection", "airplanes"),): len(airplanes),
+                        (("collection", "seats"),): sum(len(m) for m in list(seat_maps.values())),
+                        (("collection", "routes"),): len(airplanes_routes)})
+METRICAS.gauge("seats_by_status", "Asientos por estado",
+               lambda: {(("status", k),): v for k, v in
+                        sum((Counter(m.conteo()) for m in list(seat_maps.values())), Counter()).items()})
+METRICAS.gauge("change_feed_version", "Última versión publicada en el feed de cambios",
+               lambda: CHANGE_FEED.version)
+
 def reindex_airplanes():
     airplanes_by_id.clear()
     for a in airplanes:
         airplanes_by_id[a['airplane_id']] = a
 
-def generar_asientos_para_avion(airplane_id, capacidad=15):
-    columnas = ['A', 'B', 'C', 'D', 'E', 'F']
-    asientos = []
-    total_generados = 0
-    fila = 1
-    while total_generados < capacidad:
-        for letra in columnas:
-            if total_generados >= capacidad:
-                break
-            asientos.append({
-                'airplane_id': airplane_id,
-                'seat_number': f"{fila}{letra}",
-                'status': 'Libre'
-            })
-            total_generados += 1
-        fila += 1
-    return asientos
+def generar_asientos_para_avion(airplane_id, capacidad=15, modelo=None):
+    # Cuadrícula según la plantilla de cabina del modelo (A-F si no tiene), todo libre
+    return layout_para_modelo(modelo).generar(airplane_id, capacidad)
+
+
+# Capacidad de los aviones del seed: un entero o "layout" para usar la
+# capacidad típica del modelo (aviones realistas para pruebas de capacidad)
+SEED_AIRPLANE_CAPACITY = os.getenv("SEED_AIRPLANE_CAPACITY", "15").strip().lower()
 
-# Seed inicial
-with STORE_LOCK:
+
+def capacidad_seed(modelo):
+    if SEED_AIRPLANE_CAPACITY == "layout":
+        return layout_para_modelo(modelo).capacidad_tipica or 15
+    return int(SEED_AIRPLANE_CAPACITY)
+
+def sembrar_aviones():
     for i in range(1, 4):
         year_raw = fake_airplane.year()
         year = int(year_raw) if isinstance(year_raw, str) and year_raw.isdigit() else year_raw
+        modelo = random.choice(airplane_models)
         avion = {
             'airplane_id': i,
-            'model': random.choice(airplane_models),
+            'model': modelo,
             'manufacturer': fake_airplane.company(),
             'year': int(year),
-            'capacity': 15
+            'capacity': capacidad_seed(modelo)
         }
         airplanes.append(avion)
-        seats.extend(generar_asientos_para_avion(avion['airplane_id'], capacidad=avion['capacity']))
+        seat_maps[avion['airplane_id']] = generar_asientos_para_avion(
+            avion['airplane_id'], capacidad=avion['capacity'], modelo=modelo)
     reindex_airplanes()
-
-logging.info("✅ Aviones iniciales generados: %d", len(airplanes))
+    logging.info("✅ Aviones iniciales generados: %d", len(airplanes))
 
 # -----------------------------
 # Schemas
@@ -260,6 +500,11 @@ class AirplaneRouteSchema(Schema):
     arrival = fields.Str(required=True)
     arrival_time = fields.Str(required=True)
     flight_time = fields.Str(dump_only=True)
+    # Hora canónica (epoch UTC) guardada junto al texto; se usa para ordenar y buscar
+    departure_ts = fields.Int(dump_only=True)
+    arrival_ts = fields.Int(dump_only=True)
+    departure_utc = fields.Function(lambda r: iso_utc(r['departure_ts']), dump_only=True)
+    arrival_utc = fields.Function(lambda r: iso_utc(r['arrival_ts']), dump_only=True)
     price = fields.Int(required=True)
     Moneda = fields.Str(required=True)
 
@@ -291,10 +536,9 @@ class AirplaneRouteSchema(Schema):
     @validates("departure_time")
     @validates("arrival_time")
     def validar_fecha_formato_espanol(self, value):
-        traducido = traducir_mes_espanol_a_ingles(value)
         try:
-            parser.parse(traducido)
-        except Exception:
+            parsear_fecha(value)
+        except ValueError:
             raise ValidationError("Formato de fecha inválido. Usa: 'Marzo 30, 2025 - 16:46:19'")
 
 airplane_route_schema = AirplaneRouteSchema()
@@ -319,46 +563,28 @@ def detectar_claves_duplicadas(raw_data):
 # -----------------------------
 # Utilidades fechas
 # -----------------------------
-meses_es = {
-    1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril",
-    5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto",
-    9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
-}
-MESES_ES_A_EN = {
-    "enero": "january", "febrero": "february", "marzo": "march",
-    "abril": "april", "mayo": "may", "junio": "june",
-    "julio": "july", "agosto": "august", "septiembre": "september",
-    "octubre": "october", "noviembre": "november", "diciembre": "december"
-}
-try:
-    locale.setlocale(locale.LC_TIME, "es_ES.UTF-8")
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_TIME, "es_ES")
-    except locale.Error:
-        locale.setlocale(locale.LC_TIME, "")
-
-def traducir_mes_espanol_a_ingles(fecha_str: str) -> str:
-    for mes_es, mes_en in MESES_ES_A_EN.items():
-        if mes_es in fecha_str.lower():
-            return re.sub(mes_es, mes_en, fecha_str, flags=re.IGNORECASE)
-    return fecha_str
-
-def formatear_fecha(fecha: datetime) -> str:
-    return fecha.strftime("%B %d, %Y - %H:%M:%S").capitalize()
-
 def calcular_duracion(departure: datetime, arrival: datetime) -> str:
     duracion = arrival - departure
     horas, resto = divmod(duracion.total_seconds(), 3600)
     minutos = resto // 60
     return f"{int(horas)} horas {int(minutos)} minutos"
 
+
+def asignar_fechas(ruta, salida: datetime, llegada: datetime):
+    """Guarda en la ruta el texto para mostrar, la hora canónica (epoch UTC) y la duración."""
+    ruta['departure_time'] = formatear_fecha(salida)
+    ruta['arrival_time'] = formatear_fecha(llegada)
+    ruta['departure_ts'] = a_timestamp(salida)
+    ruta['arrival_ts'] = a_timestamp(llegada)
+    ruta['flight_time'] = calcular_duracion(salida, llegada)
+    return ruta
+
 VALID_MONEDAS = {'Dolares', 'Euros', 'Colones'}
 
-# -----------------------------
-# Seed de rutas iniciales
-# -----------------------------
-with STORE_LOCK:
+# Índices de búsqueda de vuelos (se mantienen junto con airplanes_routes, bajo STORE_LOCK)
+INDICE_RUTAS = IndiceRutas()
+
+def sembrar_rutas():
     available_airplanes = [a['airplane_id'] for a in airplanes]
     random.shuffle(available_airplanes)
     for i in range(1, 4):
@@ -367,27 +593,169 @@ with STORE_LOCK:
         airplane_id = available_airplanes.pop()
         departure_time = fake_airplane.date_time_this_year()
         arrival_time = departure_time + timedelta(hours=random.randint(1, 12), minutes=random.randint(0, 59))
-
-        def formatear_es(fecha):
-            mes = meses_es[fecha.month]
-            return f"{mes} {fecha.day}, {fecha.year} - {fecha.strftime('%H:%M:%S')}"
-
-        duracion = arrival_time - departure_time
-        horas, resto = divmod(duracion.total_seconds(), 3600)
-        minutos = resto // 60
-        flight_time = f"{int(horas)} horas {int(minutos)} minutos"
-        airplanes_routes.append({
+        airplanes_routes.append(asignar_fechas({
             'airplane_route_id': i,
             'airplane_id': airplane_id,
             'flight_number': generate_flight_number(),
             'departure': fake_airplane.airport_name(),
-            'departure_time': formatear_es(departure_time),
             'arrival': fake_airplane.airport_name(),
-            'arrival_time': formatear_es(arrival_time),
-            'flight_time': flight_time,
             'price': fake_airplane.random_int(min=60000, max=150000),
             'Moneda': 'Colones'
-        })
+        }, departure_time, arrival_time))
+    INDICE_RUTAS.reconstruir(airplanes_routes)
+
+# -----------------------------
+# Seed inicial (diferido)
+# -----------------------------
+# SEED_DATA=0 arranca sin datos. Con el seed activo se genera al arrancar con
+# `python app.py` o, con gunicorn, en la primera solicitud: importar el módulo
+# no paga Faker ni la generación de datos.
+SEED_DATA = os.getenv("SEED_DATA", "1").strip().lower() not in ("0", "false", "no")
+_seed_pendiente = SEED_DATA
+_seed_lock = threading.Lock()
+
+
+def asegurar_seed():
+    global _seed_pendiente
+    if not _seed_pendiente:
+        return
+    with _seed_lock:
+        if _seed_pendiente:
+            with STORE_LOCK:
+                sembrar_aviones()
+                sembrar_rutas()
+            _seed_pendiente = False
+
+
+@app.before_request
+def _seed_diferido():
+    asegurar_seed()
+
+# -----------------------------
+# Seed masivo (admin)
+# -----------------------------
+# POST /admin/seed reemplaza todo el store y no tiene autenticación: solo se
+# registra con ADMIN_SEED_ENABLED=1 (pruebas de capacidad, tools/seed.py).
+ADMIN_SEED_ENABLED = os.getenv("ADMIN_SEED_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+SEED_MAX_AVIONES = 20000
+SEED_MAX_RUTAS = 500000
+
+
+def _leer_entero_seed(data, nombre, defecto, minimo, maximo, errores):
+    valor = data.get(nombre, defecto)
+    if not isinstance(valor, int) or isinstance(valor, bool) or not minimo <= valor <= maximo:
+        errores[nombre] = [f"Debe ser un entero entre {minimo} y {maximo}."]
+        return None
+    return valor
+
+
+def admin_seed():
+    """
+    Reemplaza aviones, asientos y rutas por datos generados desde una semilla
+    ---
+    tags:
+      - Admin
+    description: >
+      Genera en bloque `airplanes` aviones (con todos sus asientos libres) y `routes`
+      rutas repartidas entre ellos, y reemplaza el store completo en una sola sección
+      crítica. Es determinista: la misma semilla con los mismos parámetros produce los
+      mismos datos. `capacity` es un entero o "layout" (capacidad típica del modelo).
+      Las salidas caen en los 180 días siguientes a `base_date` (hoy por defecto).
+      El feed de cambios se reinicia: sus consumidores reciben `reset`.
+    parameters:
+      - name: body
+        in: body
+        required: false
+        schema:
+          type: object
+          properties:
+            seed:
+              type: integer
+              example: 42
+            airplanes:
+              type: integer
+              example: 500
+            capacity:
+              example: 200
+            routes:
+              type: integer
+              example: 5000
+            base_date:
+              type: string
+              example: "2025-06-01"
+    responses:
+      201:
+        description: Store reemplazado; cantidades generadas
+      400:
+        description: Parámetros inválidos
+    """
+    global _seed_pendiente
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"message": "Se esperaba un objeto JSON.", "errors": {}}), 400
+
+    errores = {}
+    semilla = _leer_entero_seed(data, "seed", 0, 0, 2 ** 63 - 1, errores)
+    cantidad_aviones = _leer_entero_seed(data, "airplanes", 3, 1, SEED_MAX_AVIONES, errores)
+    cantidad_rutas = _leer_entero_seed(data, "routes", cantidad_aviones or 1, 0, SEED_MAX_RUTAS, errores)
+    capacidad = data.get("capacity", 15)
+    if capacidad != "layout" and (not isinstance(capacidad, int) or isinstance(capacidad, bool) or capacidad <= 0):
+        errores["capacity"] = ["Debe ser un entero positivo o 'layout'."]
+    try:
+        fecha_base = datetime.strptime(data["base_date"], "%Y-%m-%d") if "base_date" in data \
+            else datetime.combine(datetime.now().date(), datetime.min.time())
+    except (TypeError, ValueError):
+        errores["base_date"] = ["Formato esperado: 'YYYY-MM-DD'."]
+    if errores:
+        return jsonify({"message": "Parámetros de seed inválidos.", "errors": errores}), 400
+
+    def capacidad_para(modelo):
+        if capacidad == "layout":
+            return layout_para_modelo(modelo).capacidad_tipica or 15
+        return capacidad
+
+    inicio = time.perf_counter()
+    try:
+        # Todo se arma fuera del lock; adentro solo se reemplazan las colecciones
+        nuevos_aviones, rutas_con_fechas = generar_flota(
+            semilla, cantidad_aviones, cantidad_rutas, airplane_models, capacidad_para, fecha_base)
+        nuevos_mapas = {
+            a['airplane_id']: generar_asientos_para_avion(a['airplane_id'], a['capacity'], a['model'])
+            for a in nuevos_aviones
+        }
+    except ValueError as e:
+        return jsonify({"message": str(e), "errors": {"capacity": [str(e)]}}), 400
+    nuevas_rutas = [asignar_fechas(ruta, salida, llegada) for ruta, salida, llegada in rutas_con_fechas]
+
+    with STORE_LOCK:
+        airplanes[:] = nuevos_aviones
+        seat_maps.clear()
+        seat_maps.update(nuevos_mapas)
+        airplanes_routes[:] = nuevas_rutas
+        reindex_airplanes()
+        INDICE_RUTAS.reconstruir(airplanes_routes)
+        CHANGE_FEED.reiniciar()
+        # Un seed diferido pendiente ya no debe pisar estos datos
+        _seed_pendiente = False
+
+    asientos = sum(len(m) for m in nuevos_mapas.values())
+    ms = round((time.perf_counter() - inicio) * 1000, 1)
+    logging.info(f"🌱 Seed {semilla}: {len(nuevos_aviones)} aviones, {asientos} asientos, "
+                 f"{len(nuevas_rutas)} rutas en {ms} ms.")
+    return jsonify({
+        "message": f"Datos generados con la semilla {semilla}.",
+        "seed": semilla,
+        "airplanes": len(nuevos_aviones),
+        "seats": asientos,
+        "routes": len(nuevas_rutas),
+        "elapsed_ms": ms
+    }), 201
+
+
+if ADMIN_SEED_ENABLED:
+    app.add_url_rule('/admin/seed', view_func=admin_seed, methods=['POST'])
 
 # -----------------------------
 # Endpoints de diagnóstico
@@ -396,13 +764,40 @@ with STORE_LOCK:
 
 @app.route('/__state', methods=['GET'])
 def __state():
-    with STORE_LOCK:
-        return jsonify({
-            "instance_id": INSTANCE_ID,
-            "airplanes_count": len(airplanes),
-            "airplane_ids": sorted([a["airplane_id"] for a in airplanes]),
-            "routes_count": len(airplanes_routes)
-        }), 200
+    with STORE_LOCK.read():
+        airplane_ids = [a["airplane_id"] for a in airplanes]
+        routes_count = len(airplanes_routes)
+    return jsonify({
+        "instance_id": INSTANCE_ID,
+        "airplanes_count": len(airplane_ids),
+        "airplane_ids": sorted(airplane_ids),
+        "routes_count": routes_count
+    }), 200
+
+
+def comprobar_listo():
+    # Solo comparaciones O(1): /readyz se consulta seguido
+    with STORE_LOCK.read():
+        detalle = {
+            "seed": "desactivado" if not SEED_DATA else ("pendiente" if _seed_pendiente else "listo"),
+            "airplanes": len(airplanes),
+            "airplanes_indexed": len(airplanes_by_id),
+            "seat_maps": len(seat_maps),
+            "routes": len(airplanes_routes),
+            "routes_indexed": len(INDICE_RUTAS),
+        }
+    motivos = []
+    if detalle["seed"] == "pendiente":
+        motivos.append("Seed inicial pendiente.")
+    if not detalle["airplanes"] == detalle["airplanes_indexed"] == detalle["seat_maps"]:
+        motivos.append("Aviones, índice por ID y mapas de asientos no coinciden.")
+    if detalle["routes"] != detalle["routes_indexed"]:
+        motivos.append("Rutas e índice de rutas no coinciden.")
+    return motivos, detalle
+
+
+# GET /livez y GET /readyz (ver salud.py)
+registrar_salud(app, "vuelos", comprobar_listo)
 
 
 @app.route("/openapi.json", methods=["GET"])
@@ -410,20 +805,16 @@ def openapi_json():
     """
     Devuelve el OpenAPI spec del repo para ser consumido como 'live spec'
     por pruebas de contrato (por ejemplo test_ai_workflow.py).
+    Se sirve desde memoria con ETag (ver openapi_spec.py): solo los paths de
+    este servicio, o el spec completo con ?full=1.
     """
     try:
-        spec_path = os.path.join(BASE_DIR, "openapi.json")
-        if not os.path.exists(spec_path):
-            return jsonify({
-                "message": "Spec openapi.json no encontrado en la raíz del repo.",
-                "errors": {}
-            }), 500
-
-        with open(spec_path, encoding="utf-8") as f:
-            data = json.load(f)
-        # Content-Type application/json lo pone jsonify
-        return jsonify(data), 200
-
+        return OPENAPI_SPEC.respuesta(request, completo=request.args.get("full") == "1")
+    except FileNotFoundError:
+        return jsonify({
+            "message": "Spec openapi.json no encontrado en la raíz del repo.",
+            "errors": {}
+        }), 500
     except Exception:
         logging.exception("❌ Error al servir /openapi.json")
         return jsonify({
@@ -437,6 +828,33 @@ def openapi_json():
 # -----------------------------
 # Endpoints Airplanes
 # -----------------------------
+def _copiar_aviones():
+    # Bajo lectura solo se copia; validación y serialización van fuera del lock
+    if not isinstance(airplanes, list):
+        return None
+    return [dict(a) for a in airplanes]
+
+
+def _construir_aviones(copia):
+    if copia is None:
+        return 500, {'message': 'Estructura interna inválida.'}
+    if not copia:
+        return 200, {'message': 'No hay aviones registrados actualmente.'}
+    seen_ids = set()
+    for a in copia:
+        aid = a.get('airplane_id')
+        if aid in seen_ids:
+            return 500, {
+                'message': 'Error de datos: ID de avión duplicado.',
+                'errors': {'airplane_id': [f'Duplicado: {aid}']}
+            }
+        seen_ids.add(aid)
+    errors = airplane_list_schema.validate(copia)
+    if errors:
+        return 500, {'message': 'Errores de validación detectados', 'errors': errors}
+    return 200, airplane_list_schema.dump(copia)
+
+
 @app.route('/get_airplanes', methods=['GET'])
 def get_airplanes():
     """
@@ -450,24 +868,7 @@ def get_airplanes():
         description: Error interno
     """
     try:
-        with STORE_LOCK:
-            if not isinstance(airplanes, list):
-                return jsonify({'message': 'Estructura interna inválida.'}), 500
-            if not airplanes:
-                return jsonify({'message': 'No hay aviones registrados actualmente.'}), 200
-            seen_ids = set()
-            for a in airplanes:
-                aid = a.get('airplane_id')
-                if aid in seen_ids:
-                    return jsonify({
-                        'message': 'Error de datos: ID de avión duplicado.',
-                        'errors': {'airplane_id': [f'Duplicado: {aid}']}
-                    }), 500
-                seen_ids.add(aid)
-            errors = airplane_list_schema.validate(airplanes)
-            if errors:
-                return jsonify({'message': 'Errores de validación detectados', 'errors': errors}), 500
-            return jsonify(airplane_list_schema.dump(airplanes)), 200
+        return SNAPSHOTS.respuesta('airplanes', _copiar_aviones, _construir_aviones)
     except Exception:
         logging.exception("Error en get_airplanes")
         return jsonify({'message': 'Error interno del servidor.'}), 500
@@ -495,11 +896,12 @@ def get_airplane_by_id(airplane_id: int):
         return jsonify({"message": "El ID del avión debe ser un entero positivo.",
                         "errors": {"airplane_id": ["Debe ser mayor que cero."]}}), 400
     try:
-        with STORE_LOCK:
+        with STORE_LOCK.read():
             airplane = airplanes_by_id.get(airplane_id)
-            if not airplane:
-                return jsonify({"message": f"Avión {airplane_id} no encontrado.", "errors": {}}), 404
-            return jsonify(airplane_schema.dump(airplane)), 200
+            airplane = dict(airplane) if airplane else None
+        if not airplane:
+            return jsonify({"message": f"Avión {airplane_id} no encontrado.", "errors": {}}), 404
+        return jsonify(airplane_schema.dump(airplane)), 200
     except Exception:
         logging.exception("Error en get_airplane_by_id")
         return jsonify({"message": "Error interno del servidor."}), 500
@@ -556,6 +958,14 @@ def add_airplane():
         if errors:
             return jsonify({'message': 'Errores de validación.', 'errors': errors}), 400
 
+        # La plantilla de cabina del modelo acota la capacidad (filas x columnas)
+        layout = layout_para_modelo(data['model'])
+        if data['capacity'] > layout.capacidad_maxima:
+            return jsonify({
+                'message': f"La capacidad excede el máximo de la cabina {layout.nombre}.",
+                'errors': {'capacity': [f'Máximo {layout.capacidad_maxima}']}
+            }), 400
+
         with STORE_LOCK:
             if data['airplane_id'] in airplanes_by_id:
                 return jsonify({'message': 'Ya existe un avión con ese ID.',
@@ -580,9 +990,11 @@ def add_airplane():
 
             nuevos_asientos = generar_asientos_para_avion(
                 nuevo['airplane_id'],
-                capacidad=nuevo['capacity']
+                capacidad=nuevo['capacity'],
+                modelo=nuevo['model']
             )
-            seats.extend(nuevos_asientos)
+            seat_maps[nuevo['airplane_id']] = nuevos_asientos
+            CHANGE_FEED.publicar('airplane.created', {**nuevo, 'seats_count': len(nuevos_asientos)})
 
             logging.info(f"✈️ Avión agregado: {nuevo}")
             return jsonify({'message': 'Avión y asientos agregados con éxito', 'airplane': nuevo}), 201
@@ -592,6 +1004,40 @@ def add_airplane():
         return jsonify({'message': 'Error interno del servidor.'}), 500
 
 
+def _redimensionar_asientos(airplane, capacidad):
+    """
+    Calcula, sin aplicarlo, el mapa de asientos del avión para una nueva capacidad:
+    agrega asientos libres al final o recorta los últimos si están libres.
+    Se llama con STORE_LOCK tomado. Devuelve (mapa, None) o (None, (status, cuerpo)).
+    """
+    aid = airplane['airplane_id']
+    actual = seat_maps.get(aid)
+    # La cabina es la del mapa existente: cambiar el modelo no reconfigura la cabina
+    layout = actual.layout if actual is not None else layout_para_modelo(airplane.get('model'))
+    if capacidad > layout.capacidad_maxima:
+        return None, (400, {
+            'message': f"La capacidad excede el máximo de la cabina {layout.nombre}.",
+            'errors': {'capacity': [f'Máximo {layout.capacidad_maxima}']}
+        })
+    if actual is None:
+        return layout.generar(aid, capacidad), None
+    mapa, conflictos = actual.redimensionar(capacidad)
+    if conflictos:
+        return None, (409, {
+            'message': f'No se puede reducir la capacidad del avión {aid}: se eliminarían asientos no libres.',
+            'errors': {'seats': conflictos}
+        })
+    return mapa, None
+
+
+def _resumen_capacidad(anterior, nueva):
+    return {
+        'capacity': nueva,
+        'added': max(0, nueva - anterior),
+        'removed': max(0, anterior - nueva)
+    }
+
+
 ## Actualizar un avión existente por su ID
 @app.route('/update_airplane/<int:airplane_id>', methods=['PUT'])
 def update_airplane(airplane_id):
@@ -604,6 +1050,8 @@ def update_airplane(airplane_id):
       - Valida campos extra y faltantes.
       - Valida con Marshmallow.
       - Verifica que haya cambios reales antes de actualizar.
+      - Si cambia `capacity`, agrega asientos libres o recorta los últimos en la
+        misma transacción; si se eliminarían asientos no libres responde 409.
     ---
     tags:
       - Airplanes
@@ -660,6 +1108,10 @@ def update_airplane(airplane_id):
         description: Avión no encontrado
         schema:
           $ref: '#/definitions/ErrorSchema'
+      409:
+        description: Reducir la capacidad eliminaría asientos no libres
+        schema:
+          $ref: '#/definitions/ErrorSchema'
       500:
         description: Error interno del servidor
         schema:
@@ -729,16 +1181,30 @@ def update_airplane(airplane_id):
                     'message': 'No se realizaron cambios porque los datos son idénticos.'
                 }), 200
 
-            # 7) Actualizar
+            # 7) Resincronizar asientos si cambia la capacidad (misma sección crítica)
+            anterior = airplane.get('capacity')
+            nuevo_mapa = None
+            if data['capacity'] != anterior:
+                nuevo_mapa, error = _redimensionar_asientos(airplane, data['capacity'])
+                if error:
+                    return jsonify(error[1]), error[0]
+
+            # 8) Actualizar
             airplane.update({
                 'model': data['model'],
                 'manufacturer': data['manufacturer'],
                 'year': data['year'],
                 'capacity': data['capacity'],
             })
+            if nuevo_mapa is not None:
+                seat_maps[airplane_id] = nuevo_mapa
+            CHANGE_FEED.publicar('airplane.updated', dict(airplane))
 
         logging.info(f'✏️ Avión con ID={airplane_id} actualizado correctamente.')
-        return jsonify({'message': 'Avión actualizado con éxito'}), 200
+        return jsonify({
+            'message': 'Avión actualizado con éxito',
+            'seats': _resumen_capacidad(anterior, data['capacity'])
+        }), 200
 
     except Exception:
         logging.exception('❌ Error inesperado al actualizar el avión.')
@@ -748,6 +1214,135 @@ def update_airplane(airplane_id):
         }), 500
 
 
+FLEET_BATCH_MAX = 500
+
+## Reconfigurar la capacidad de varios aviones en una sola pasada
+@app.route('/airplanes/capacity/batch', methods=['PUT'])
+def update_fleet_capacity_batch():
+    """
+    Cambia la capacidad de varios aviones en una sola sección crítica
+    ---
+    tags:
+      - Airplanes
+    description: >
+      Cada cambio agrega asientos libres o recorta los últimos (solo si están libres),
+      igual que update_airplane. Con `atomic: true` se aplican todos o ninguno;
+      si no, cada elemento se resuelve por separado. El resultado individual viene en
+      `results[].status_code` (200 aplicado o sin cambios, 400 inválido, 404 avión
+      inexistente, 409 asientos no libres).
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required: [changes]
+          properties:
+            atomic:
+              type: boolean
+              default: false
+            changes:
+              type: array
+              maxItems: 500
+              items:
+                type: object
+                properties:
+                  airplane_id:
+                    type: integer
+                    example: 1
+                  capacity:
+                    type: integer
+                    example: 180
+    responses:
+      200:
+        description: Lote procesado (ver resultado por elemento)
+      400:
+        description: Cuerpo inválido
+      409:
+        description: Lote atómico rechazado (ningún cambio aplicado)
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get("changes"), list):
+            return jsonify({
+                "message": "Se esperaba un objeto JSON con la lista 'changes'.",
+                "errors": {"changes": ["Campo requerido de tipo lista."]}
+            }), 400
+
+        cambios = data["changes"]
+        atomico = data.get("atomic", False)
+        if not isinstance(atomico, bool):
+            return jsonify({"message": "'atomic' debe ser booleano.", "errors": {"atomic": ["Debe ser booleano."]}}), 400
+        if len(cambios) > FLEET_BATCH_MAX:
+            return jsonify({
+                "message": f"El lote excede el máximo de {FLEET_BATCH_MAX} elementos.",
+                "errors": {"changes": [f"Máximo {FLEET_BATCH_MAX} elementos."]}
+            }), 400
+
+        results = []
+        pendientes = []   # (airplane, capacidad, mapa nuevo)
+        with STORE_LOCK:
+            # 1) Calcular todos los mapas nuevos sin tocar el store
+            vistos = set()
+            for c in cambios:
+                if not isinstance(c, dict):
+                    results.append({"status_code": 400, "message": "Elemento inválido."})
+                    continue
+                airplane_id = c.get("airplane_id")
+                capacidad = c.get("capacity")
+                resultado = {"airplane_id": airplane_id, "capacity": capacidad}
+                if not isinstance(airplane_id, int) or isinstance(airplane_id, bool) or airplane_id <= 0:
+                    results.append({**resultado, "status_code": 400, "message": "airplane_id inválido."})
+                    continue
+                if not isinstance(capacidad, int) or isinstance(capacidad, bool) or capacidad <= 0:
+                    results.append({**resultado, "status_code": 400, "message": "capacity debe ser un entero positivo."})
+                    continue
+                if airplane_id in vistos:
+                    results.append({**resultado, "status_code": 400, "message": "Avión repetido en el lote."})
+                    continue
+                vistos.add(airplane_id)
+                airplane = airplanes_by_id.get(airplane_id)
+                if airplane is None:
+                    results.append({**resultado, "status_code": 404, "message": f"Avión con ID {airplane_id} no existe."})
+                    continue
+                anterior = airplane.get('capacity')
+                if capacidad == anterior:
+                    results.append({**resultado, "status_code": 200, "seats": _resumen_capacidad(anterior, capacidad)})
+                    continue
+                mapa, error = _redimensionar_asientos(airplane, capacidad)
+                if error:
+                    results.append({**resultado, "status_code": error[0], **error[1]})
+                    continue
+                results.append({**resultado, "status_code": 200, "seats": _resumen_capacidad(anterior, capacidad)})
+                pendientes.append((airplane, capacidad, mapa))
+
+            rechazado = atomico and any(r["status_code"] != 200 for r in results)
+            # 2) Aplicar (todos juntos, dentro del mismo lock)
+            if not rechazado:
+                for airplane, capacidad, mapa in pendientes:
+                    airplane['capacity'] = capacidad
+                    seat_maps[airplane['airplane_id']] = mapa
+                    CHANGE_FEED.publicar('airplane.updated', dict(airplane))
+
+        if rechazado:
+            return jsonify({
+                "message": "Lote atómico rechazado: ningún cambio aplicado.",
+                "applied": 0,
+                "results": results
+            }), 409
+
+        logging.info(f"Reconfiguración de flota: {len(cambios)} elementos, {len(pendientes)} aviones modificados.")
+        return jsonify({
+            "message": f"Lote procesado: {len(pendientes)} aviones modificados.",
+            "applied": len(pendientes),
+            "results": results
+        }), 200
+
+    except Exception:
+        logging.exception("Error al reconfigurar la capacidad de la flota.")
+        return jsonify({'message': 'Error interno del servidor'}), 500
+
+
 @app.route('/delete_airplane_by_id/<int:airplane_id>', methods=['DELETE'])
 def delete_airplane_by_id(airplane_id):
     """
@@ -804,7 +1399,7 @@ def delete_airplane_by_id(airplane_id):
             }), 400
 
         with STORE_LOCK:
-          if not isinstance(airplanes, list) or not isinstance(seats, list):
+          if not isinstance(airplanes, list) or not isinstance(seat_maps, dict):
               return jsonify({'message': 'Estructura interna inválida.', 'errors': {}}), 500
 
           if not airplanes:
@@ -816,14 +1411,15 @@ def delete_airplane_by_id(airplane_id):
               return jsonify({'message': f'Avión con ID {airplane_id} no encontrado.', 'errors': {}}), 404
 
           # Quita asientos asociados
-          count = sum(1 for s in seats if s.get('airplane_id') == airplane_id)
-          seats[:] = [s for s in seats if s.get('airplane_id') != airplane_id]
+          mapa = seat_maps.pop(airplane_id, None)
+          count = len(mapa) if mapa is not None else 0
 
           # Quita de la lista y del índice
           airplanes.remove(airplane)
           airplanes_by_id.pop(airplane_id, None)   # <- clave del fix
           # opcional: reindexar para consistencia total
           # reindex_airplanes()
+          CHANGE_FEED.publicar('airplane.deleted', {'airplane_id': airplane_id, 'seats_removed': count})
 
         logging.info(f"🗑️ Avión eliminado: ID={airplane_id}, Asientos eliminados={count}")
         return jsonify({
@@ -890,9 +1486,9 @@ def get_airplane_seats(airplane_id):
                 'errors': {'airplane_id': ['Debe ser mayor que cero.']}
             }), 400
 
-        with STORE_LOCK:
+        with STORE_LOCK.read():
           # Estructuras internas
-          if not isinstance(airplanes, list) or not isinstance(seats, list):
+          if not isinstance(airplanes, list) or not isinstance(seat_maps, dict):
               return jsonify({
                   'message': 'Estructura interna inválida.',
                   'errors': {}
@@ -905,21 +1501,25 @@ def get_airplane_seats(airplane_id):
                   'errors': {}
               }), 404
 
-          # Filtrar asientos
-          lista = [s for s in seats if s.get('airplane_id') == airplane_id]
-          if not lista:
-              return jsonify({
-                  'message': f'No hay asientos registrados para el avión {airplane_id}.',
-                  'errors': {}
-              }), 404
+          # Copia del mapa (memcpy): los dicts de la API se arman fuera del lock
+          mapa = seat_maps.get(airplane_id)
+          mapa = mapa.copia() if mapa is not None else None
 
-          # Validación con Marshmallow
-          errors = airplane_seats_schema.validate(lista)
-          if errors:
-              return jsonify({
-                  'message': 'Error en los datos de los asientos.',
-                  'errors': errors
-              }), 500
+        lista = mapa.asientos() if mapa is not None else []
+
+        if not lista:
+            return jsonify({
+                'message': f'No hay asientos registrados para el avión {airplane_id}.',
+                'errors': {}
+            }), 404
+
+        # Validación con Marshmallow fuera del lock
+        errors = airplane_seats_schema.validate(lista)
+        if errors:
+            return jsonify({
+                'message': 'Error en los datos de los asientos.',
+                'errors': errors
+            }), 500
 
         return jsonify(lista), 200
 
@@ -932,6 +1532,43 @@ def get_airplane_seats(airplane_id):
 
 
 ## Obtener todos los asientos agrupados por avión
+def _copiar_asientos_agrupados():
+    if not isinstance(seat_maps, dict):
+        return None
+    # Solo se copian los bytearrays; los dicts por asiento se arman fuera del lock
+    return [m.copia() for m in seat_maps.values()]
+
+
+def _construir_asientos_agrupados(copia):
+    # Validar lista de asientos
+    if copia is None:
+        return 500, {
+            'message': 'Estructura interna de asientos inválida.',
+            'errors': {}
+        }
+    # Agrupar por avión
+    grouped = {
+        m.airplane_id: m.asientos()
+        for m in copia
+        if isinstance(m.airplane_id, int) and m.airplane_id > 0 and len(m)
+    }
+    if not grouped:
+        return 200, {
+            'message': 'No hay asientos registrados en el sistema.',
+            'errors': {}
+        }
+
+    # Validar cada grupo fuera del lock
+    for aid, group in grouped.items():
+        errors = airplane_seats_schema.validate(group)
+        if errors:
+            return 500, {
+                'message': f'Error en los datos de los asientos del avión {aid}.',
+                'errors': errors
+            }
+    return 200, grouped
+
+
 @app.route('/seats/grouped-by-airplane', methods=['GET'])
 def get_seats_grouped_by_airplane():
     """
@@ -960,42 +1597,7 @@ def get_seats_grouped_by_airplane():
           $ref: '#/definitions/ErrorSchema'
     """
     try:
-        with STORE_LOCK:
-          # Validar lista de asientos
-          if not isinstance(seats, list):
-              return jsonify({
-                  'message': 'Estructura interna de asientos inválida.',
-                  'errors': {}
-              }), 500
-
-          if not seats:
-              return jsonify({
-                  'message': 'No hay asientos registrados en el sistema.',
-                  'errors': {}
-              }), 200
-
-          # Agrupar
-          grouped = {}
-          for s in seats:
-              aid = s.get('airplane_id')
-              if not isinstance(aid, int) or aid <= 0:
-                  continue
-              grouped.setdefault(aid, []).append({
-                  'airplane_id': aid,
-                  'seat_number': s.get('seat_number'),
-                  'status': s.get('status')
-              })
-
-          # Validar cada grupo
-          for aid, group in grouped.items():
-              errors = airplane_seats_schema.validate(group)
-              if errors:
-                  return jsonify({
-                      'message': f'Error en los datos de los asientos del avión {aid}.',
-                      'errors': errors
-                  }), 500
-
-        return jsonify(grouped), 200
+        return SNAPSHOTS.respuesta('seats_grouped', _copiar_asientos_agrupados, _construir_asientos_agrupados)
 
     except Exception:
         logging.exception("❌ Error inesperado al agrupar los asientos.")
@@ -1043,12 +1645,12 @@ def update_seat_status(airplane_id, seat_number):
         description: Asiento o avión no encontrado
     """
     try:
-        # Validar que la lista de asientos sea válida
-        if not isinstance(seats, list):
+        # Validar que el índice de mapas de asientos sea válido
+        if not isinstance(seat_maps, dict):
             return jsonify({"message": "Error interno: estructura de asientos inválida."}), 500
 
         # Validar que el avión exista
-        if not any(a['airplane_id'] == airplane_id for a in airplanes):
+        if airplane_id not in airplanes_by_id:
             return jsonify({"message": f"Avión con ID {airplane_id} no existe."}), 404
 
         # Validar longitud del número de asiento
@@ -1059,8 +1661,10 @@ def update_seat_status(airplane_id, seat_number):
         if seat_number.upper() in ["ALL", "*"]:
             return jsonify({"message": "No está permitido modificar todos los asientos en una sola solicitud."}), 400
 
-        # Validar formato del número de asiento
-        if not re.match(r"^\d+[A-F]$", seat_number.upper()):
+        # Validar formato según la cabina del avión (fila + letra de sus columnas), O(1)
+        mapa = seat_maps.get(airplane_id)
+        layout = mapa.layout if mapa is not None else LAYOUT_ESTANDAR
+        if layout.parsear(seat_number.upper()) is None:
             return jsonify({"message": "Formato de número de asiento inválido. Debe ser como '12A'."}), 400
 
         data = request.get_json()
@@ -1072,20 +1676,20 @@ def update_seat_status(airplane_id, seat_number):
             return jsonify({"message": "Estado inválido. Debe ser 'Libre', 'Reservado', 'Pagado'."}), 400
 
         with STORE_LOCK:
-          # Buscar el asiento específico
-          asiento = next(
-              (s for s in seats if s["airplane_id"] == airplane_id and s["seat_number"] == seat_number.upper()),
-              None
-          )
+          # Buscar el asiento específico (índice directo por fila y columna)
+          mapa = seat_maps.get(airplane_id)
+          i = mapa.indice(seat_number.upper()) if mapa is not None else None
 
-          if not asiento:
+          if i is None:
               return jsonify({"message": f"Asiento {seat_number} no encontrado en el avión {airplane_id}."}), 404
 
-          if asiento["status"] == nuevo_estado:
+          if mapa.estado(i) == nuevo_estado:
               return jsonify({"message": f"El asiento {seat_number} ya tenía el estado '{nuevo_estado}'."}), 200
 
           # Actualizar estado
-          asiento["status"] = nuevo_estado
+          anterior = mapa.cambiar(i, nuevo_estado)
+          asiento = mapa.asiento(i)
+          CHANGE_FEED.publicar('seat.updated', {**asiento, 'previous_status': anterior})
 
         # Log para auditoría
         logging.info(f"Estado del asiento {seat_number} en avión {airplane_id} actualizado a {nuevo_estado}")
@@ -1102,11 +1706,10 @@ def update_seat_status(airplane_id, seat_number):
 
 def get_random_free_seat(airplane_id):
     try:
-        with STORE_LOCK:
-            for seat in seats:
-                if seat["airplane_id"] == airplane_id and seat["status"] == "Libre":
-                    return seat
-            return None
+        with STORE_LOCK.read():
+            mapa = seat_maps.get(airplane_id)
+            i = mapa.primer_libre() if mapa is not None else None
+            return mapa.asiento(i) if i is not None else None
     except Exception:
         logging.exception("Error al buscar asiento libre.")
         return None
@@ -1118,22 +1721,81 @@ def get_random_free_seat_endpoint(airplane_id):
         return jsonify(seat), 200
     return jsonify({'message': 'No hay asientos libres'}), 404
 
+## Plantillas de cabina
+@app.route('/cabin_layouts', methods=['GET'])
+def get_cabin_layouts():
+    """
+    Lista las plantillas de cabina por modelo
+    ---
+    tags:
+      - Airplanes Seats
+    description: >
+      Columnas, clases por rango de filas, asientos bloqueados y capacidad típica
+      de cada modelo conocido. Los modelos sin plantilla usan la cabina "estandar" (A-F).
+    responses:
+      200:
+        description: Plantillas por modelo
+    """
+    return jsonify({
+        "default": LAYOUT_ESTANDAR.describir(),
+        "models": {modelo: layout.describir() for modelo, layout in LAYOUTS.items()}
+    }), 200
+
+
+@app.route('/get_airplane_layout/<int:airplane_id>', methods=['GET'])
+def get_airplane_layout(airplane_id):
+    """
+    Obtiene la cabina de un avión (plantilla, filas, capacidad y libres)
+    ---
+    tags:
+      - Airplanes Seats
+    parameters:
+      - name: airplane_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Cabina del avión
+      404:
+        description: Avión no encontrado
+    """
+    with STORE_LOCK.read():
+        airplane = airplanes_by_id.get(airplane_id)
+        mapa = seat_maps.get(airplane_id)
+        if airplane is None or mapa is None:
+            return jsonify({"message": f"Avión con ID {airplane_id} no encontrado.", "errors": {}}), 404
+        modelo, filas, capacidad, conteo = airplane.get('model'), mapa.filas(), len(mapa), mapa.conteo()
+        layout = mapa.layout
+    return jsonify({
+        "airplane_id": airplane_id,
+        "model": modelo,
+        **layout.describir(),
+        "rows": filas,
+        "capacity": capacidad,
+        "seats_by_status": conteo
+    }), 200
+
+
 @app.route('/free_seat/<int:airplane_id>/seats/<string:seat_number>', methods=['PUT'])
 def liberar_asiento(airplane_id, seat_number):
     try:
         with STORE_LOCK:
-            if not isinstance(seats, list) or not isinstance(airplanes, list):
+            if not isinstance(seat_maps, dict) or not isinstance(airplanes, list):
                 return jsonify({'message': 'Estructuras inválidas.'}), 500
             if airplane_id <= 0:
                 return jsonify({'message': 'El ID del avión debe ser positivo.'}), 400
             if not any(a['airplane_id'] == airplane_id for a in airplanes):
                 return jsonify({'message': f"Avión con ID {airplane_id} no encontrado."}), 404
-            asiento = next((s for s in seats if s['airplane_id'] == airplane_id and s['seat_number'] == seat_number.upper()), None)
-            if not asiento:
+            mapa = seat_maps.get(airplane_id)
+            i = mapa.indice(seat_number.upper()) if mapa is not None else None
+            if i is None:
                 return jsonify({'message': f"Asiento {seat_number} no encontrado en el avión {airplane_id}."}), 404
-            if asiento["status"] == "Libre":
+            if mapa.estado(i) == "Libre":
                 return jsonify({'message': f"El asiento {seat_number} ya estaba libre."}), 200
-            asiento["status"] = "Libre"
+            anterior = mapa.cambiar(i, "Libre")
+            asiento = mapa.asiento(i)
+            CHANGE_FEED.publicar('seat.updated', {**asiento, 'previous_status': anterior})
             logging.info(f"🟢 Asiento {seat_number} del avión {airplane_id} liberado exitosamente.")
             return jsonify({'message': f"Asiento {seat_number} en avión {airplane_id} fue liberado con éxito.",
                             'asiento': asiento}), 200
@@ -1141,6 +1803,244 @@ def liberar_asiento(airplane_id, seat_number):
         logging.exception("Error al liberar el asiento.")
         return jsonify({'message': 'Error interno del servidor'}), 500
 
+
+SEAT_BATCH_MAX = 500
+
+## Actualizar el estado de varios asientos en una sola solicitud
+@app.route('/seats/status/batch', methods=['PUT'])
+def update_seat_status_batch():
+    """
+    Actualiza el estado de varios asientos en una sola solicitud
+    ---
+    tags:
+      - Airplanes Seats
+    description: >
+      Aplica en una sola sección crítica una lista de cambios de estado de asiento.
+      Cada elemento se valida y se resuelve por separado: la respuesta siempre es 200
+      si el cuerpo es válido, y el resultado individual viene en `results[].status_code`
+      (200 aplicado o sin cambios, 400 inválido, 404 avión/asiento inexistente,
+      409 el asiento no tenía `expected_status`). Con `expected_status` el cambio
+      solo se aplica si el asiento está en ese estado: GestiónReservas lo usa al
+      reservar para no tomar un asiento que otro ocupó mientras tanto.
+      Lo usa el outbox de GestiónReservas para entregar notificaciones en lote.
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required: [updates]
+          properties:
+            updates:
+              type: array
+              maxItems: 500
+              items:
+                type: object
+                properties:
+                  airplane_id:
+                    type: integer
+                    example: 1
+                  seat_number:
+                    type: string
+                    example: 1A
+                  status:
+                    type: string
+                    enum: [Libre, Reservado, Pagado]
+                    example: Pagado
+                  expected_status:
+                    type: string
+                    enum: [Libre, Reservado, Pagado]
+                    example: Libre
+    responses:
+      200:
+        description: Lote procesado (ver resultado por elemento)
+      400:
+        description: Cuerpo inválido
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get("updates"), list):
+            return jsonify({
+                "message": "Se esperaba un objeto JSON con la lista 'updates'.",
+                "errors": {"updates": ["Campo requerido de tipo lista."]}
+            }), 400
+
+        updates = data["updates"]
+        if len(updates) > SEAT_BATCH_MAX:
+            return jsonify({
+                "message": f"El lote excede el máximo de {SEAT_BATCH_MAX} elementos.",
+                "errors": {"updates": [f"Máximo {SEAT_BATCH_MAX} elementos."]}
+            }), 400
+
+        results = []
+        aplicados = 0
+        with STORE_LOCK:
+            for u in updates:
+                if not isinstance(u, dict):
+                    results.append({"status_code": 400, "message": "Elemento inválido."})
+                    continue
+                airplane_id = u.get("airplane_id")
+                seat_number = str(u.get("seat_number") or "").upper()
+                nuevo_estado = u.get("status")
+                resultado = {"airplane_id": airplane_id, "seat_number": seat_number}
+
+                if not isinstance(airplane_id, int) or isinstance(airplane_id, bool) or airplane_id <= 0:
+                    results.append({**resultado, "status_code": 400, "message": "airplane_id inválido."})
+                    continue
+                mapa = seat_maps.get(airplane_id)
+                layout = mapa.layout if mapa is not None else LAYOUT_ESTANDAR
+                if len(seat_number) > 5 or layout.parsear(seat_number) is None:
+                    results.append({**resultado, "status_code": 400, "message": "Formato de número de asiento inválido."})
+                    continue
+                if nuevo_estado not in ESTADOS:
+                    results.append({**resultado, "status_code": 400, "message": "Estado inválido."})
+                    continue
+                esperado = u.get("expected_status")
+                if esperado is not None and esperado not in ESTADOS:
+                    results.append({**resultado, "status_code": 400, "message": "expected_status inválido."})
+                    continue
+                if airplane_id not in airplanes_by_id:
+                    results.append({**resultado, "status_code": 404, "message": f"Avión con ID {airplane_id} no existe."})
+                    continue
+                i = mapa.indice(seat_number) if mapa is not None else None
+                if i is None:
+                    results.append({**resultado, "status_code": 404, "message": f"Asiento {seat_number} no encontrado."})
+                    continue
+                if esperado is not None and mapa.estado(i) != esperado:
+                    results.append({**resultado, "status": mapa.estado(i), "status_code": 409,
+                                    "message": f"El asiento {seat_number} no está '{esperado}'."})
+                    continue
+
+                if mapa.estado(i) != nuevo_estado:
+                    anterior = mapa.cambiar(i, nuevo_estado)
+                    CHANGE_FEED.publicar('seat.updated', {**mapa.asiento(i), 'previous_status': anterior})
+                    aplicados += 1
+                results.append({**resultado, "status": nuevo_estado, "status_code": 200})
+
+        logging.info(f"Lote de asientos procesado: {len(updates)} elementos, {aplicados} cambios aplicados.")
+        return jsonify({
+            "message": f"Lote procesado: {aplicados} cambios aplicados.",
+            "applied": aplicados,
+            "results": results
+        }), 200
+
+    except Exception:
+        logging.exception("Error al procesar el lote de asientos.")
+        return jsonify({"message": "Error interno del servidor"}), 500
+
+
+## Asignar asientos libres de varios aviones en una sola solicitud
+@app.route('/seats/allocate', methods=['POST'])
+def allocate_seats():
+    """
+    Asigna asientos libres de varios aviones en una sola solicitud
+    ---
+    tags:
+      - Airplanes Seats
+    description: >
+      Toma, en una sola sección crítica, los primeros `count` asientos libres de cada
+      avión pedido y los deja en el estado indicado (Reservado por defecto). Reemplaza
+      el par GET /get_random_free_seat + PUT /update_seat_status por asiento: lo usa el
+      arranque de GestiónReservas para generar sus reservas iniciales. Cada elemento es
+      todo o nada: si el avión no tiene `count` asientos libres no se toma ninguno. La
+      respuesta siempre es 200 si el cuerpo es válido y el resultado individual viene en
+      `results[].status_code` (200 asignado, 400 inválido, 404 avión inexistente,
+      409 sin asientos libres suficientes).
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required: [allocations]
+          properties:
+            allocations:
+              type: array
+              items:
+                type: object
+                properties:
+                  airplane_id:
+                    type: integer
+                    example: 1
+                  count:
+                    type: integer
+                    example: 2
+                  status:
+                    type: string
+                    enum: [Reservado, Pagado]
+                    example: Reservado
+    responses:
+      200:
+        description: Asignación procesada (ver resultado por elemento)
+      400:
+        description: Cuerpo inválido o más de 500 asientos en total
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get("allocations"), list):
+            return jsonify({
+                "message": "Se esperaba un objeto JSON con la lista 'allocations'.",
+                "errors": {"allocations": ["Campo requerido de tipo lista."]}
+            }), 400
+
+        pedidos = data["allocations"]
+        total = sum(p["count"] for p in pedidos
+                    if isinstance(p, dict) and isinstance(p.get("count"), int) and p["count"] > 0)
+        if total > SEAT_BATCH_MAX:
+            return jsonify({
+                "message": f"La asignación excede el máximo de {SEAT_BATCH_MAX} asientos.",
+                "errors": {"allocations": [f"Máximo {SEAT_BATCH_MAX} asientos en total."]}
+            }), 400
+
+        results = []
+        asignados = 0
+        with STORE_LOCK:
+            for p in pedidos:
+                if not isinstance(p, dict):
+                    results.append({"status_code": 400, "message": "Elemento inválido."})
+                    continue
+                airplane_id = p.get("airplane_id")
+                cantidad = p.get("count", 1)
+                nuevo_estado = p.get("status", "Reservado")
+                resultado = {"airplane_id": airplane_id}
+
+                if not isinstance(airplane_id, int) or isinstance(airplane_id, bool) or airplane_id <= 0:
+                    results.append({**resultado, "status_code": 400, "message": "airplane_id inválido."})
+                    continue
+                if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+                    results.append({**resultado, "status_code": 400, "message": "count debe ser un entero positivo."})
+                    continue
+                if nuevo_estado not in ("Reservado", "Pagado"):
+                    results.append({**resultado, "status_code": 400, "message": "Estado inválido."})
+                    continue
+                mapa = seat_maps.get(airplane_id)
+                if airplane_id not in airplanes_by_id or mapa is None:
+                    results.append({**resultado, "status_code": 404, "message": f"Avión con ID {airplane_id} no existe."})
+                    continue
+                indices = mapa.primeros_libres(cantidad)
+                if len(indices) < cantidad:
+                    results.append({**resultado, "status_code": 409,
+                                    "message": f"El avión {airplane_id} solo tiene {len(indices)} asientos libres."})
+                    continue
+
+                for i in indices:
+                    anterior = mapa.cambiar(i, nuevo_estado)
+                    CHANGE_FEED.publicar('seat.updated', {**mapa.asiento(i), 'previous_status': anterior})
+                asignados += len(indices)
+                results.append({**resultado, "status": nuevo_estado, "status_code": 200,
+                                "seats": [mapa.numero(i) for i in indices]})
+
+        logging.info(f"Asignación de asientos procesada: {len(pedidos)} aviones, {asignados} asientos.")
+        return jsonify({
+            "message": f"Asignación procesada: {asignados} asientos.",
+            "allocated": asignados,
+            "results": results
+        }), 200
+
+    except Exception:
+        logging.exception("Error al asignar asientos.")
+        return jsonify({"message": "Error interno del servidor"}), 500
+
 # -----------------------------
 # Endpoints Routes
 # -----------------------------
@@ -1214,16 +2114,31 @@ def add_airplane_route():
         # 2) Deserializar y validar esquema
         route = airplane_route_schema.load(data)
 
+        # 3) Validar orden de fechas
+        # (el schema ya las parseó; parsear_fecha está cacheada)
+        dt_dep = parsear_fecha(route['departure_time'])
+        dt_arr = parsear_fecha(route['arrival_time'])
+        if dt_arr <= dt_dep:
+            return jsonify({
+                'message': 'La hora de llegada debe ser posterior a la de salida.',
+                'errors': {'arrival_time': ['<= departure_time']}
+            }), 400
+
+        # 4) Formatear fechas, hora canónica y duración
+        asignar_fechas(route, dt_dep, dt_arr)
+
+        # 5) Verificaciones y registro en la misma sección crítica: con verificaciones
+        #    y append separados, dos solicitudes concurrentes registraban el mismo ID
         with STORE_LOCK:
 
-          # 3) Verificar existencia de avión
+          # 5.a) Verificar existencia de avión
           if not any(a['airplane_id'] == route['airplane_id'] for a in airplanes):
               return jsonify({
                   'message': 'El avión especificado no existe.',
                   'errors': {'airplane_id': [f"No existe avión con ID {route['airplane_id']}"]}
               }), 400
 
-          # 4) Duplicados por ID o número de vuelo
+          # 5.b) Duplicados por ID o número de vuelo
           if any(r['airplane_route_id'] == route['airplane_route_id'] for r in airplanes_routes):
               return jsonify({
                   'message': f"Ya existe una ruta con ID {route['airplane_route_id']}.",
@@ -1242,24 +2157,12 @@ def add_airplane_route():
                   'errors': {'airplane_route_id': [f"Ya registrada con ID {existing['airplane_route_id']}"]}
               }), 400
 
-        # 5) Validar orden de fechas
-        dep_str = traducir_mes_espanol_a_ingles(route['departure_time'])
-        arr_str = traducir_mes_espanol_a_ingles(route['arrival_time'])
-        dt_dep = parser.parse(dep_str)
-        dt_arr = parser.parse(arr_str)
-        if dt_arr <= dt_dep:
-            return jsonify({
-                'message': 'La hora de llegada debe ser posterior a la de salida.',
-                'errors': {'arrival_time': ['<= departure_time']}
-            }), 400
+          # 6) Registrar
+          airplanes_routes.append(route)
+          INDICE_RUTAS.agregar(route)
+          CHANGE_FEED.publicar('route.created', dict(route))
 
-        # 6) Formatear fechas y duración
-        route['departure_time'] = formatear_fecha(dt_dep)
-        route['arrival_time'] = formatear_fecha(dt_arr)
-        route['flight_time'] = calcular_duracion(dt_dep, dt_arr)
-
-        # 7) Registrar y responder con mensaje de éxito
-        airplanes_routes.append(route)
+        # 7) Responder con mensaje de éxito
         logging.info(f"🛬 Ruta agregada: ID={route['airplane_route_id']}, Vuelo={route['flight_number']}, Avión={route['airplane_id']}")
         return jsonify({
             'message': 'Ruta agregada con éxito',
@@ -1281,6 +2184,33 @@ def add_airplane_route():
 
 
 ## Obtener todas las rutas de avión
+def _copiar_rutas():
+    if not isinstance(airplanes_routes, list):
+        return None
+    return [dict(r) for r in airplanes_routes]
+
+
+def _construir_rutas(copia):
+    # Verificar estructura de datos
+    if copia is None:
+        logging.error("❌ 'airplanes_routes' no es una lista.")
+        return 500, {
+            'message': 'Error interno: estructura de datos inválida.',
+            'errors': {'airplanes_routes': ['Debe ser una lista.']}
+        }
+
+    # Si no hay rutas registradas
+    if not copia:
+        logging.info("📭 No hay rutas registradas actualmente.")
+        return 200, {'message': 'No hay rutas registradas actualmente.'}
+
+    # Validar y serializar usando Marshmallow (fuera del lock); solo se
+    # ejecuta cuando cambió el store desde el último snapshot
+    serialized = AirplaneRouteSchema(many=True).dump(copia)
+    logging.info(f"📦 Snapshot de {len(serialized)} rutas de avión regenerado.")
+    return 200, serialized
+
+
 @app.route('/get_all_airplanes_routes', methods=['GET'])
 def get_airplanes_routes():
     """
@@ -1318,26 +2248,7 @@ def get_airplanes_routes():
               $ref: '#/definitions/ErrorSchema'
     """
     try:
-        with STORE_LOCK:
-          # Verificar estructura de datos
-          if not isinstance(airplanes_routes, list):
-              logging.error("❌ 'airplanes_routes' no es una lista.")
-              return jsonify({
-                  'message': 'Error interno: estructura de datos inválida.',
-                  'errors': {'airplanes_routes': ['Debe ser una lista.']}
-              }), 500
-
-          # Si no hay rutas registradas
-          if not airplanes_routes:
-              logging.info("📭 No hay rutas registradas actualmente.")
-              return jsonify({'message': 'No hay rutas registradas actualmente.'}), 200
-
-          # Validar y serializar usando Marshmallow
-          schema = AirplaneRouteSchema(many=True)
-          serialized = schema.dump(airplanes_routes)
-
-        logging.info(f"📦 Se retornaron {len(serialized)} rutas de avión.")
-        return jsonify(serialized), 200
+        return SNAPSHOTS.respuesta('routes', _copiar_rutas, _construir_rutas)
 
     except Exception:
         logging.exception("❌ Error inesperado al obtener las rutas de avión.")
@@ -1401,7 +2312,7 @@ def get_airplanes_route_by_id(airplane_route_id):
                 'errors': {'airplane_route_id': ['Debe ser mayor que cero.']}
             }), 400
 
-        with STORE_LOCK:
+        with STORE_LOCK.read():
 
           # 2) Verificar la estructura en memoria
           if not isinstance(airplanes_routes, list):
@@ -1413,14 +2324,16 @@ def get_airplanes_route_by_id(airplane_route_id):
 
           # 3) Búsqueda de la ruta
           route = next((r for r in airplanes_routes if r.get('airplane_route_id') == airplane_route_id), None)
-          if not route:
-              return jsonify({
-                  'message': f'Ruta con ID {airplane_route_id} no encontrada.',
-                  'errors': {}
-              }), 404
+          route = dict(route) if route else None
+
+        if not route:
+            return jsonify({
+                'message': f'Ruta con ID {airplane_route_id} no encontrada.',
+                'errors': {}
+            }), 404
 
-          # 4) Serializar con Marshmallow
-          serialized = AirplaneRouteSchema().dump(route)
+        # 4) Serializar con Marshmallow (fuera del lock)
+        serialized = AirplaneRouteSchema().dump(route)
 
         return jsonify(serialized), 200
 
@@ -1515,9 +2428,10 @@ def update_airplane_route_by_id(airplane_route_id):
                 'errors': {'airplanes_routes': ['Debe ser una lista.']}
             }), 500
 
-        # 3) Buscar la ruta a actualizar
-        route = next((r for r in airplanes_routes if r.get('airplane_route_id') == airplane_route_id), None)
-        if not route:
+        # 3) Comprobar que la ruta exista (se vuelve a buscar al aplicar el cambio)
+        with STORE_LOCK.read():
+            existe = any(r.get('airplane_route_id') == airplane_route_id for r in airplanes_routes)
+        if not existe:
             return jsonify({
                 'message': f'Ruta con ID {airplane_route_id} no encontrada.',
                 'errors': {}
@@ -1550,24 +2464,29 @@ def update_airplane_route_by_id(airplane_route_id):
         # 6) Validar y deserializar con Marshmallow
         updated = AirplaneRouteSchema().load(data)
 
+        # 7) Validar fecha y calcular duración
+        dt_dep = parsear_fecha(updated['departure_time'])
+        dt_arr = parsear_fecha(updated['arrival_time'])
+        if dt_arr <= dt_dep:
+            return jsonify({
+                'message': 'La hora de llegada debe ser posterior a la de salida.',
+                'errors': {'arrival_time': ['Debe ser posterior a departure_time.']}
+            }), 400
+
+        asignar_fechas(updated, dt_dep, dt_arr)
+
         with STORE_LOCK:
 
-          # 7) Validar fecha y calcular duración
-          dep_str = traducir_mes_espanol_a_ingles(updated['departure_time'])
-          arr_str = traducir_mes_espanol_a_ingles(updated['arrival_time'])
-          dt_dep = parser.parse(dep_str)
-          dt_arr = parser.parse(arr_str)
-          if dt_arr <= dt_dep:
+          # 8) Buscar la ruta en la misma sección crítica que el cambio: si otro hilo la
+          #    eliminó mientras tanto, actualizarla la volvería a poner en el índice
+          route = next((r for r in airplanes_routes if r.get('airplane_route_id') == airplane_route_id), None)
+          if route is None:
               return jsonify({
-                  'message': 'La hora de llegada debe ser posterior a la de salida.',
-                  'errors': {'arrival_time': ['Debe ser posterior a departure_time.']}
-              }), 400
-
-          updated['departure_time'] = formatear_fecha(dt_dep)
-          updated['arrival_time']   = formatear_fecha(dt_arr)
-          updated['flight_time']    = calcular_duracion(dt_dep, dt_arr)
+                  'message': f'Ruta con ID {airplane_route_id} no encontrada.',
+                  'errors': {}
+              }), 404
 
-          # 8) Comprobar si no hay cambios reales
+          # 8.b) Comprobar si no hay cambios reales
           keys_to_compare = [
               'airplane_id', 'flight_number', 'departure',
               'departure_time', 'arrival', 'arrival_time',
@@ -1581,6 +2500,8 @@ def update_airplane_route_by_id(airplane_route_id):
 
           # 9) Aplicar cambios en memoria
           route.update(updated)
+          INDICE_RUTAS.agregar(route)
+          CHANGE_FEED.publicar('route.updated', dict(route))
           logging.info(f"✏️ Ruta actualizada: ID={airplane_route_id}")
 
           # 10) Serializar para la respuesta
@@ -1684,6 +2605,8 @@ def delete_airplane_route_by_id(airplane_route_id):
 
           # 4) Eliminar
           airplanes_routes.remove(route)
+          INDICE_RUTAS.quitar(airplane_route_id)
+          CHANGE_FEED.publicar('route.deleted', {'airplane_route_id': airplane_route_id})
 
         logging.info(f"🗑️ Ruta eliminada: ID={airplane_route_id}")
 
@@ -1698,6 +2621,365 @@ def delete_airplane_route_by_id(airplane_route_id):
         }), 500
 
 
+# -----------------------------
+# Búsqueda de vuelos
+# -----------------------------
+SEARCH_LIMIT_DEFAULT = 50
+SEARCH_LIMIT_MAX = 500
+
+
+def _leer_fecha_busqueda(nombre, fin_de_dia=False):
+    """Fecha ISO ('2025-04-30' o '2025-04-30T08:00:00') -> timestamp UTC; un día completo si solo viene la fecha."""
+    valor = request.args.get(nombre)
+    if valor is None:
+        return None
+    fecha = datetime.fromisoformat(valor.strip())
+    if fin_de_dia and len(valor.strip()) == 10:
+        fecha = fecha + timedelta(days=1, seconds=-1)
+    return a_timestamp(fecha)
+
+
+def _leer_entero_busqueda(nombre, minimo, maximo=None):
+    valor = request.args.get(nombre)
+    if valor is None:
+        return None
+    numero = int(valor)
+    if numero < minimo or (maximo is not None and numero > maximo):
+        raise ValueError(valor)
+    return numero
+
+
+@app.route('/search_flights', methods=['GET'])
+def search_flights():
+    """
+    Busca vuelos por origen, destino, ventana de fechas, precio y moneda
+    ---
+    tags:
+      - Routes
+    description: >
+      Usa índices en memoria (ordenado por hora de salida en UTC y hash por aeropuerto),
+      así que no recorre ni parsea todo el catálogo. Cada resultado incluye la
+      disponibilidad de asientos del avión. Resultados ordenados por salida.
+    parameters:
+      - {name: origin, in: query, type: string, description: Aeropuerto de salida (sin distinguir mayúsculas)}
+      - {name: destination, in: query, type: string, description: Aeropuerto de llegada}
+      - {name: date_from, in: query, type: string, description: "Salida desde (ISO: 2025-04-30 o 2025-04-30T08:00:00, UTC)"}
+      - {name: date_to, in: query, type: string, description: Salida hasta (inclusive; una fecha sola cubre el día)}
+      - {name: max_price, in: query, type: integer}
+      - {name: currency, in: query, type: string, enum: [Dolares, Euros, Colones]}
+      - {name: min_seats, in: query, type: integer, description: Mínimo de asientos libres}
+      - {name: limit, in: query, type: integer, default: 50, maximum: 500}
+    responses:
+      200:
+        description: Vuelos encontrados (posiblemente ninguno)
+      400:
+        description: Parámetros inválidos
+    """
+    errors = {}
+    filtros = {}
+    for nombre, clave in (('origin', 'origen'), ('destination', 'destino')):
+        valor = request.args.get(nombre)
+        if valor is not None:
+            if not valor.strip():
+                errors[nombre] = ['No puede estar vacío.']
+            filtros[clave] = valor
+    for nombre, clave, fin in (('date_from', 'desde', False), ('date_to', 'hasta', True)):
+        try:
+            filtros[clave] = _leer_fecha_busqueda(nombre, fin_de_dia=fin)
+        except ValueError:
+            errors[nombre] = ['Fecha ISO inválida (ej. 2025-04-30 o 2025-04-30T08:00:00).']
+    for nombre, minimo, maximo in (('max_price', 1, None), ('min_seats', 1, None), ('limit', 1, SEARCH_LIMIT_MAX)):
+        try:
+            filtros[nombre] = _leer_entero_busqueda(nombre, minimo, maximo)
+        except ValueError:
+            rango = f'entre {minimo} y {maximo}' if maximo else f'>= {minimo}'
+            errors[nombre] = [f'Debe ser un entero {rango}.']
+    moneda = request.args.get('currency')
+    if moneda is not None and moneda not in VALID_MONEDAS:
+        errors['currency'] = [f"Moneda no válida. Use: {', '.join(sorted(VALID_MONEDAS))}"]
+    if not errors and filtros.get('desde') is not None and filtros.get('hasta') is not None \
+            and filtros['desde'] > filtros['hasta']:
+        errors['date_to'] = ['Debe ser posterior a date_from.']
+    if errors:
+        return jsonify({'message': 'Parámetros de búsqueda inválidos.', 'errors': errors}), 400
+
+    limite = filtros['limit'] or SEARCH_LIMIT_DEFAULT
+    min_asientos = filtros['min_seats']
+    resultados = []
+    with STORE_LOCK.read():
+        encontrados = INDICE_RUTAS.buscar(
+            origen=filtros.get('origen'), destino=filtros.get('destino'),
+            desde=filtros.get('desde'), hasta=filtros.get('hasta'),
+            precio_max=filtros['max_price'], moneda=moneda,
+        )
+        for _, ruta in encontrados:
+            mapa = seat_maps.get(ruta['airplane_id'])
+            libres = mapa.libres() if mapa is not None else 0
+            if min_asientos is not None and libres < min_asientos:
+                continue
+            resultados.append((dict(ruta), libres, len(mapa) if mapa is not None else 0))
+            if len(resultados) >= limite:
+                break
+
+    vuelos = AirplaneRouteSchema(many=True).dump([r for r, _, _ in resultados])
+    for vuelo, (_, libres, capacidad) in zip(vuelos, resultados):
+        vuelo['available_seats'] = libres
+        vuelo['capacity'] = capacidad
+    return jsonify({'count': len(vuelos), 'results': vuelos}), 200
+
+
+# -----------------------------
+# Ocupación por ruta
+# -----------------------------
+def _factor_ocupacion(conteo, capacidad):
+    return round((conteo['Reservado'] + conteo['Pagado']) / capacidad, 4) if capacidad else 0.0
+
+
+@app.route('/routes/load_summary', methods=['GET'])
+def routes_load_summary():
+    """
+    Ocupación de asientos por ruta (libres, reservados, pagados y factor de carga)
+    ---
+    tags:
+      - Routes
+    description: >
+      Usa los contadores por estado que cada avión mantiene en cada cambio de
+      asiento, así que responde en O(rutas) sin recorrer los asientos.
+      load_factor = (Reservado + Pagado) / capacity. Varias rutas pueden compartir
+      avión: los totales cuentan cada avión una sola vez.
+    responses:
+      200:
+        description: Resumen por ruta y totales
+        examples:
+          application/json:
+            {
+              "routes": [
+                {
+                  "airplane_route_id": 1,
+                  "flight_number": "CZ-3560",
+                  "airplane_id": 2,
+                  "departure": "SJO",
+                  "arrival": "PTY",
+                  "departure_ts": 1770606597,
+                  "capacity": 15,
+                  "seats": {"Libre": 12, "Reservado": 2, "Pagado": 1},
+                  "load_factor": 0.2
+                }
+              ],
+              "totals": {"routes": 1, "airplanes": 1, "capacity": 15, "seats": {"Libre": 12, "Reservado": 2, "Pagado": 1}, "load_factor": 0.2}
+            }
+    """
+    filas = []
+    with STORE_LOCK.read():
+        for ruta in airplanes_routes:
+            mapa = seat_maps.get(ruta['airplane_id'])
+            filas.append((ruta, len(mapa) if mapa is not None else 0,
+                          mapa.conteo() if mapa is not None else dict.fromkeys(ESTADOS, 0)))
+
+    rutas = []
+    totales = dict.fromkeys(ESTADOS, 0)
+    capacidad_total = 0
+    aviones_contados = set()
+    for ruta, capacidad, conteo in filas:
+        rutas.append({
+            'airplane_route_id': ruta['airplane_route_id'],
+            'flight_number': ruta['flight_number'],
+            'airplane_id': ruta['airplane_id'],
+            'departure': ruta['departure'],
+            'arrival': ruta['arrival'],
+            'departure_ts': ruta['departure_ts'],
+            'capacity': capacidad,
+            'seats': conteo,
+            'load_factor': _factor_ocupacion(conteo, capacidad),
+        })
+        # Los asientos son del avión: si varias rutas lo comparten, se suma una sola vez
+        if ruta['airplane_id'] in aviones_contados:
+            continue
+        aviones_contados.add(ruta['airplane_id'])
+        capacidad_total += capacidad
+        for estado, n in conteo.items():
+            totales[estado] += n
+    return jsonify({
+        'routes': rutas,
+        'totals': {
+            'routes': len(rutas),
+            'airplanes': len(aviones_contados),
+            'capacity': capacidad_total,
+            'seats': totales,
+            'load_factor': _factor_ocupacion(totales, capacidad_total),
+        }
+    }), 200
+
+
+# -----------------------------
+# Endpoints Feed de cambios
+# -----------------------------
+def _leer_since():
+    """Lee `since` del query string o del header Last-Event-ID (SSE)."""
+    raw = request.args.get('since', request.headers.get('Last-Event-ID', '0'))
+    try:
+        since = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return since if since >= 0 else None
+
+
+def _leer_segundos(nombre, defecto):
+    """Lee un número finito del query string; None si no lo es (nan e inf incluidos)."""
+    try:
+        valor = float(request.args.get(nombre, defecto))
+    except ValueError:
+        return None
+    return valor if math.isfinite(valor) else None
+
+
+def _sin_lugar_para_esperar():
+    resp = jsonify({
+        'message': 'Demasiadas esperas de cambios abiertas; reintente más tarde.',
+        'errors': {}
+    })
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(CHANGES_RETRY_AFTER_S)
+    return resp
+
+
+@app.route('/changes', methods=['GET'])
+def get_changes():
+    """
+    Summary: Long-poll de cambios de asientos, aviones y rutas
+    Description:
+      Devuelve los eventos posteriores a `since`. Si no hay eventos nuevos,
+      espera hasta `timeout` segundos (máximo 30) antes de responder vacío.
+      Si `since` quedó fuera de la ventana retenida (o pertenece a otra
+      instancia), responde `reset: true` y el cliente debe recargar su caché.
+      Si ya hay CHANGES_WAITERS_MAX esperas abiertas (long-polls y streams),
+      responde 503 con Retry-After en lugar de esperar.
+    ---
+    tags:
+      - Changes
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        required: false
+        description: Última versión conocida por el cliente (0 por defecto)
+      - name: timeout
+        in: query
+        type: number
+        required: false
+        description: Segundos máximos de espera si no hay cambios (0 = sin espera)
+    responses:
+      200:
+        description: Eventos posteriores a `since`
+      400:
+        description: Parámetros inválidos
+      503:
+        description: Demasiadas esperas abiertas (ver Retry-After)
+    """
+    since = _leer_since()
+    if since is None:
+        return jsonify({
+            'message': "El parámetro 'since' debe ser un entero no negativo.",
+            'errors': {'since': ['Debe ser entero >= 0.']}
+        }), 400
+    timeout = _leer_segundos('timeout', 0)
+    if timeout is None:
+        return jsonify({
+            'message': "El parámetro 'timeout' debe ser numérico.",
+            'errors': {'timeout': ['Debe ser un número.']}
+        }), 400
+    timeout = min(max(timeout, 0.0), CHANGES_MAX_WAIT)
+
+    eventos, reset = CHANGE_FEED.desde(since)
+    if not eventos and not reset and timeout > 0:
+        if not ESPERAS_CAMBIOS.acquire(blocking=False):
+            return _sin_lugar_para_esperar()
+        try:
+            CHANGE_FEED.esperar(since, timeout)
+        finally:
+            ESPERAS_CAMBIOS.release()
+        eventos, reset = CHANGE_FEED.desde(since)
+
+    return jsonify({
+        'instance_id': INSTANCE_ID,
+        'version': CHANGE_FEED.version,
+        'reset': reset,
+        'events': eventos
+    }), 200
+
+
+@app.route('/changes/stream', methods=['GET'])
+def stream_changes():
+    """
+    Summary: Stream Server-Sent Events de cambios
+    Description:
+      Emite cada evento como `id: <version>`, `event: <type>`, `data: <json>`.
+      Acepta `since` o el header `Last-Event-ID` para reanudar. La conexión se
+      cierra tras `max_seconds` (por defecto y máximo 300) y el cliente reconecta.
+      Cada stream ocupa una de las CHANGES_WAITERS_MAX esperas; sin lugar
+      responde 503 con Retry-After.
+    ---
+    tags:
+      - Changes
+    produces:
+      - text/event-stream
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        required: false
+      - name: max_seconds
+        in: query
+        type: number
+        required: false
+    responses:
+      200:
+        description: Stream de eventos
+      400:
+        description: Parámetros inválidos
+      503:
+        description: Demasiadas esperas abiertas (ver Retry-After)
+    """
+    since = _leer_since()
+    if since is None:
+        return jsonify({
+            'message': "El parámetro 'since' debe ser un entero no negativo.",
+            'errors': {'since': ['Debe ser entero >= 0.']}
+        }), 400
+    max_seconds = _leer_segundos('max_seconds', CHANGES_STREAM_MAX_SECONDS)
+    if max_seconds is None:
+        return jsonify({
+            'message': "El parámetro 'max_seconds' debe ser numérico.",
+            'errors': {'max_seconds': ['Debe ser un número.']}
+        }), 400
+    max_seconds = min(max(max_seconds, 0.0), CHANGES_STREAM_MAX_SECONDS)
+
+    def generar(ultima):
+        limite = time.monotonic() + max_seconds
+        yield f"retry: 3000\n: instance {INSTANCE_ID}\n\n"
+        while True:
+            eventos, reset = CHANGE_FEED.desde(ultima)
+            if reset:
+                ultima = CHANGE_FEED.version
+                yield f"id: {ultima}\nevent: reset\ndata: {json.dumps({'version': ultima})}\n\n"
+            for evento in eventos:
+                ultima = evento['version']
+                yield f"id: {ultima}\nevent: {evento['type']}\ndata: {json.dumps(evento)}\n\n"
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return
+            if not CHANGE_FEED.esperar(ultima, min(restante, 15)):
+                yield ": keep-alive\n\n"
+
+    if not ESPERAS_CAMBIOS.acquire(blocking=False):
+        return _sin_lugar_para_esperar()
+    resp = Response(stream_with_context(generar(since)), mimetype='text/event-stream')
+    resp.headers['X-Accel-Buffering'] = 'no'
+    # El lugar se libera cuando el servidor cierra la respuesta (fin del stream o cliente desconectado)
+    resp.call_on_close(ESPERAS_CAMBIOS.release)
+    return resp
+
+
 # -----------------------------
 # Handlers globales
 # -----------------------------
@@ -1718,12 +3000,14 @@ if __name__ == '__main__':
 
     print("URL MAP GestionVuelos:")
     print(app.url_map)
+    asegurar_seed()
 
-    # Ejecuta con un solo proceso/hilo.
+    # Un solo proceso; multihilo para que /changes y /changes/stream
+    # no bloqueen al resto de endpoints (el estado se protege con STORE_LOCK).
     app.run(
         host="0.0.0.0",
         port=5001,
         debug=False,
         use_reloader=False,
-        threaded=False
+        threaded=True
     )
@@ -0,0 +1,80 @@
+"""
+Fechas de las rutas sin depender del locale del proceso.
+
+Las rutas se muestran como 'Marzo 30, 2025 - 16:46:19'. Antes se formateaban con
+strftime('%B') tras locale.setlocale(LC_TIME, 'es_ES'), que es global al proceso,
+no es thread-safe y cambia según la imagen (sin el locale instalado los meses
+salían en inglés). Aquí los nombres de mes salen de una tabla fija y el parseo
+usa una expresión regular para el formato de la API; solo los formatos
+distintos pasan por dateutil. El parseo se cachea porque la misma cadena se
+valida en el schema y luego se vuelve a leer en el endpoint.
+
+Las rutas guardan además la hora en epoch (segundos UTC; las fechas sin zona se
+interpretan como UTC), que es lo que se usa para ordenar, comparar y buscar.
+"""
+
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from dateutil import parser  # pip install python-dateutil
+
+MESES = (
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre",
+)
+_MES_A_NUMERO = {mes.lower(): i for i, mes in enumerate(MESES, start=1)}
+_MES_A_NUMERO["setiembre"] = 9   # variante usada en Costa Rica
+_MESES_EN = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+# Se siguen aceptando los meses en inglés (sin el locale español instalado, las
+# rutas se mostraban así)
+_MES_A_NUMERO.update({mes: i for i, mes in enumerate(_MESES_EN, start=1)})
+
+# 'Marzo 30, 2025 - 16:46:19' (segundos opcionales)
+_FORMATO_API = re.compile(
+    r"\s*([^\W\d_]+)\s+(\d{1,2}),\s*(\d{4})\s*-\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*"
+)
+_NOMBRE_MES = re.compile(r"\b(?:" + "|".join(sorted(_MES_A_NUMERO, key=len, reverse=True)) + r")\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def parsear_fecha(texto):
+    """
+    'Marzo 30, 2025 - 16:46:19' -> datetime sin zona. Lanza ValueError si no es
+    una fecha válida. Otros formatos se delegan a dateutil tras traducir el mes.
+    """
+    if not isinstance(texto, str):
+        raise ValueError("La fecha debe ser texto.")
+    m = _FORMATO_API.fullmatch(texto)
+    if m is not None:
+        mes = _MES_A_NUMERO.get(m.group(1).lower())
+        if mes is not None:
+            return datetime(
+                int(m.group(3)), mes, int(m.group(2)),
+                int(m.group(4)), int(m.group(5)), int(m.group(6) or 0),
+            )
+    traducido = _NOMBRE_MES.sub(lambda x: _MESES_EN[_MES_A_NUMERO[x.group(0).lower()] - 1], texto)
+    try:
+        return parser.parse(traducido)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(str(e)) from None
+
+
+def formatear_fecha(fecha):
+    """datetime -> 'Marzo 30, 2025 - 16:46:19' (mismo resultado en cualquier proceso o hilo)."""
+    return f"{MESES[fecha.month - 1]} {fecha.day:02d}, {fecha.year} - {fecha:%H:%M:%S}"
+
+
+def a_timestamp(fecha):
+    """datetime sin zona (las rutas se guardan en UTC) -> segundos epoch."""
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return int(fecha.timestamp())
+
+
+def iso_utc(ts):
+    """Segundos epoch -> '2025-03-30T16:46:19Z'."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -0,0 +1,318 @@
+"""
+Métricas en memoria con exposición en formato de texto de Prometheus.
+
+Los contadores e histogramas se escriben en un "shard" por hilo (threading.local):
+cada hilo solo modifica su propio dict, así que registrar una observación no toma
+ningún lock (cuesta un par de microsegundos). Los shards se suman al hacer scrape.
+
+Este archivo se copia tal cual en cada microservicio (cada uno es su propio
+contexto de build en Docker).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+import requests
+from flask import has_request_context, request
+
+
+# Buckets de latencia en segundos (similares a los de prometheus_client)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Cada cuántos shards nuevos se pliegan los de hilos ya terminados
+# (el servidor de desarrollo de Flask crea un hilo por solicitud)
+_COMPACTAR_CADA = 256
+
+
+def _nuevo_shard():
+    return {"c": {}, "h": {}}
+
+
+class Metricas:
+    """Registro de contadores, histogramas y gauges calculados al hacer scrape."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._registro_lock = threading.Lock()
+        self._shards = []             # [(hilo, shard)]
+        self._retirado = _nuevo_shard()
+        self._nuevos = 0
+        self._descripciones = {}      # nombre -> (tipo, ayuda)
+        self._gauges = []             # [(nombre, fn)]
+
+    # --- Registro ---
+    def describir(self, nombre, tipo, ayuda):
+        self._descripciones[nombre] = (tipo, ayuda)
+
+    def gauge(self, nombre, ayuda, fn, tipo="gauge"):
+        """
+        Registra un valor calculado al hacer scrape. `fn` devuelve un número
+        o un dict {tupla_de_labels: valor}. `tipo` permite exponer como "counter"
+        contadores que ya lleva otro componente (p. ej. el outbox).
+        """
+        self.describir(nombre, tipo, ayuda)
+        self._gauges.append((nombre, fn))
+
+    # --- Camino caliente (sin locks) ---
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _nuevo_shard()
+            with self._registro_lock:
+                self._shards.append((threading.current_thread(), shard))
+                self._nuevos += 1
+                if self._nuevos >= _COMPACTAR_CADA:
+                    self._compactar()
+        return shard
+
+    def inc(self, nombre, labels=(), valor=1):
+        c = self._shard()["c"]
+        clave = (nombre, labels)
+        c[clave] = c.get(clave, 0) + valor
+
+    def observe(self, nombre, labels, valor):
+        h = self._shard()["h"]
+        clave = (nombre, labels)
+        fila = h.get(clave)
+        if fila is None:
+            # [conteo por bucket..., +Inf, suma]
+            fila = h[clave] = [0] * (len(self.buckets) + 1) + [0.0]
+        fila[bisect_left(self.buckets, valor)] += 1
+        fila[-1] += valor
+
+    # --- Agregación ---
+    @staticmethod
+    def _sumar(destino, origen):
+        for clave, v in origen["c"].items():
+            destino["c"][clave] = destino["c"].get(clave, 0) + v
+        for clave, fila in origen["h"].items():
+            actual = destino["h"].get(clave)
+            if actual is None:
+                destino["h"][clave] = list(fila)
+            else:
+                for i, v in enumerate(fila):
+                    actual[i] += v
+
+    def _compactar(self):
+        # Se llama con _registro_lock tomado: pliega los shards de hilos terminados
+        vivos = []
+        for hilo, shard in self._shards:
+            if hilo.is_alive():
+                vivos.append((hilo, shard))
+            else:
+                self._sumar(self._retirado, shard)
+        self._shards = vivos
+        self._nuevos = 0
+
+    def snapshot(self):
+        """Suma todos los shards. dict.copy() es atómico bajo el GIL."""
+        with self._registro_lock:
+            self._compactar()
+            total = _nuevo_shard()
+            self._sumar(total, self._retirado)
+            for _, shard in self._shards:
+                self._sumar(total, {"c": shard["c"].copy(), "h": {k: list(v) for k, v in shard["h"].copy().items()}})
+        return total
+
+    # --- Exposición ---
+    @staticmethod
+    def _labels(labels, extra=()):
+        pares = tuple(labels) + tuple(extra)
+        if not pares:
+            return ""
+        cuerpo = ",".join(
+            '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for k, v in pares
+        )
+        return "{" + cuerpo + "}"
+
+    def render(self):
+        total = self.snapshot()
+        por_nombre = {}
+        for (nombre, labels), v in total["c"].items():
+            por_nombre.setdefault(nombre, []).append(("c", labels, v))
+        for (nombre, labels), fila in total["h"].items():
+            por_nombre.setdefault(nombre, []).append(("h", labels, fila))
+        for nombre, fn in self._gauges:
+            try:
+                valor = fn()
+            except Exception:
+                continue
+            if isinstance(valor, dict):
+                por_nombre.setdefault(nombre, []).extend(("g", labels, v) for labels, v in valor.items())
+            else:
+                por_nombre.setdefault(nombre, []).append(("g", (), valor))
+
+        lineas = []
+        for nombre in sorted(por_nombre):
+            tipo, ayuda = self._descripciones.get(nombre, ("untyped", nombre))
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for clase, labels, v in sorted(por_nombre[nombre], key=lambda x: x[1]):
+                if clase != "h":
+                    lineas.append(f"{nombre}{self._labels(labels)} {v}")
+                    continue
+                acumulado = 0
+                for le, n in zip(self.buckets, v):
+                    acumulado += n
+                    lineas.append(f"{nombre}_bucket{self._labels(labels, (('le', repr(le)),))} {acumulado}")
+                acumulado += v[len(self.buckets)]
+                lineas.append(f"{nombre}_bucket{self._labels(labels, (('le', '+Inf'),))} {acumulado}")
+                lineas.append(f"{nombre}_sum{self._labels(labels)} {v[-1]}")
+                lineas.append(f"{nombre}_count{self._labels(labels)} {acumulado}")
+        return "\n".join(lineas) + "\n"
+
+
+class LockInstrumentado:
+    """
+    Envoltorio de un lock que mide tiempo de espera y de retención por endpoint
+    (solo en la adquisición más externa, para no contar dos veces las reentradas).
+
+    `with lock:` es el modo escritura. Si el lock envuelto es de lectores/escritor
+    (tiene acquire_read/release_read), `with lock.read():` mide el modo lectura.
+    """
+
+    def __init__(self, metricas, nombre="store", lock=None):
+        self._lock = lock if lock is not None else threading.RLock()
+        self._metricas = metricas
+        self._nombre = nombre
+        self._local = threading.local()
+        metricas.describir("store_lock_wait_seconds", "histogram", "Tiempo esperando para adquirir el lock del store")
+        metricas.describir("store_lock_hold_seconds", "histogram", "Tiempo que se retuvo el lock del store")
+
+    def __getattr__(self, atributo):
+        # Atributos propios del lock envuelto (p. ej. la generación del lock RW)
+        return getattr(self._lock, atributo)
+
+    def _labels(self, modo):
+        return (("lock", self._nombre), ("mode", modo), ("endpoint", _endpoint_actual()))
+
+    def _medir(self, modo, adquirir, *args):
+        t0 = time.perf_counter()
+        ok = adquirir(*args)
+        if ok:
+            clave = "profundidad_" + modo
+            profundidad = getattr(self._local, clave, 0)
+            if profundidad == 0:
+                t1 = time.perf_counter()
+                labels = self._labels(modo)
+                self._metricas.observe("store_lock_wait_seconds", labels, t1 - t0)
+                setattr(self._local, "inicio_" + modo, (t1, labels))
+            setattr(self._local, clave, profundidad + 1)
+        return ok
+
+    def _soltar(self, modo, liberar):
+        clave = "profundidad_" + modo
+        profundidad = getattr(self._local, clave) - 1
+        setattr(self._local, clave, profundidad)
+        if profundidad == 0:
+            desde, labels = getattr(self._local, "inicio_" + modo)
+            self._metricas.observe("store_lock_hold_seconds", labels, time.perf_counter() - desde)
+        liberar()
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._medir("write", self._lock.acquire, blocking, timeout)
+
+    def release(self):
+        self._soltar("write", self._lock.release)
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def acquire_read(self):
+        return self._medir("read", self._lock.acquire_read)
+
+    def release_read(self):
+        self._soltar("read", self._lock.release_read)
+
+    def read(self):
+        return _ContextoLectura(self)
+
+
+class _ContextoLectura:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_read()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release_read()
+
+
+def _endpoint_actual():
+    # Regla de Flask de la solicitud en curso; "background" fuera de una solicitud (hilos, seed)
+    if has_request_context() and request.url_rule is not None:
+        return request.url_rule.rule
+    return "background"
+
+
+class SesionInstrumentada(requests.Session):
+    """requests.Session que registra latencia y resultado de cada llamada por destino (host:puerto)."""
+
+    def __init__(self, metricas):
+        super().__init__()
+        self._metricas = metricas
+        metricas.describir("upstream_request_duration_seconds", "histogram", "Latencia de llamadas a otros servicios")
+        metricas.describir("upstream_requests_total", "counter", "Llamadas a otros servicios por resultado")
+
+    def request(self, method, url, *args, **kwargs):
+        labels = (("target", urlsplit(str(url)).netloc or "desconocido"), ("method", str(method).upper()))
+        t0 = time.perf_counter()
+        resultado = "error"
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+            resultado = str(resp.status_code)
+            return resp
+        except requests.exceptions.RequestException as e:
+            resultado = type(e).__name__
+            raise
+        finally:
+            self._metricas.observe("upstream_request_duration_seconds", labels, time.perf_counter() - t0)
+            self._metricas.inc("upstream_requests_total", labels + (("outcome", resultado),))
+
+
+def instrumentar_flask(app, metricas):
+    """Registra hooks before/after_request con contador y latencia por endpoint, y GET /metrics."""
+    from flask import Response, g
+
+    metricas.describir("http_requests_total", "counter", "Solicitudes HTTP atendidas por endpoint y código")
+    metricas.describir("http_request_duration_seconds", "histogram", "Latencia de solicitudes HTTP por endpoint")
+
+    @app.before_request
+    def _metricas_inicio():
+        g._metricas_t0 = time.perf_counter()
+
+    @app.after_request
+    def _metricas_fin(resp):
+        t0 = g.pop("_metricas_t0", None)
+        if t0 is not None:
+            # La regla (p. ej. /get_airplane_by_id/<int:airplane_id>) acota la cardinalidad
+            endpoint = request.url_rule.rule if request.url_rule is not None else "sin_ruta"
+            labels = (("method", request.method), ("endpoint", endpoint))
+            metricas.observe("http_request_duration_seconds", labels, time.perf_counter() - t0)
+            metricas.inc("http_requests_total", labels + (("status", str(resp.status_code)),))
+        return resp
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        """
+        Métricas del proceso en formato de texto de Prometheus
+        ---
+        tags:
+          - Metrics
+        produces:
+          - text/plain
+        responses:
+          200:
+            description: Contadores, histogramas de latencia y gauges del proceso
+        """
+        return Response(metricas.render(), mimetype="text/plain; version=0.0.4")
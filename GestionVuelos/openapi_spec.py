@@ -0,0 +1,70 @@
+"""
+openapi.json del repo servido desde memoria.
+
+El archivo se lee y se codifica una sola vez; cada solicitud solo hace un
+os.stat() y se vuelve a cargar cuando cambia el mtime (o el tamaño). La
+respuesta sale como bytes ya codificados con un ETag, así que un cliente que
+manda If-None-Match recibe 304 sin cuerpo.
+
+Por defecto cada servicio devuelve solo los paths que él mismo expone (según
+su url_map); con ?full=1 se devuelve el spec completo.
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from flask import Response
+
+_PARAMETRO = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>")
+
+
+def path_openapi(regla):
+    """'/get_airplane_by_id/<int:airplane_id>' -> '/get_airplane_by_id/{airplane_id}'."""
+    return _PARAMETRO.sub(r"{\1}", regla)
+
+
+class EspecOpenAPI:
+    def __init__(self, ruta, app):
+        self.ruta = ruta
+        self.app = app
+        self._lock = threading.Lock()
+        self._firma = None
+        self._variantes = {}   # completo (bool) -> (bytes, etag)
+
+    def _firma_actual(self):
+        st = os.stat(self.ruta)  # FileNotFoundError si no existe
+        return st.st_mtime_ns, st.st_size
+
+    def _cargar(self, firma):
+        with open(self.ruta, encoding="utf-8") as f:
+            spec = json.load(f)
+        propios = {path_openapi(r.rule) for r in self.app.url_map.iter_rules()}
+        recorte = dict(spec, paths={p: v for p, v in spec.get("paths", {}).items() if p in propios})
+        self._variantes = {True: self._codificar(spec), False: self._codificar(recorte)}
+        self._firma = firma
+
+    @staticmethod
+    def _codificar(spec):
+        cuerpo = json.dumps(spec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cuerpo, hashlib.sha256(cuerpo).hexdigest()[:32]
+
+    def respuesta(self, request, completo=False):
+        """
+        Response con el spec (o 304 si el ETag coincide). Lanza FileNotFoundError
+        si el archivo no existe y ValueError si no es JSON válido.
+        """
+        firma = self._firma_actual()
+        if firma != self._firma:
+            with self._lock:
+                if firma != self._firma:
+                    self._cargar(firma)
+        cuerpo, etag = self._variantes[bool(completo)]
+        resp = Response(cuerpo, mimetype="application/json")
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp.make_conditional(request)
@@ -0,0 +1,111 @@
+"""
+Índices en memoria para la búsqueda de vuelos.
+
+- Índice ordenado por hora de salida (departure_ts, epoch UTC guardado en la
+  ruta): lista de (ts, route_id) que se recorre con bisect para ventanas de
+  fecha, sin parsear fechas por fila.
+- Índices hash por aeropuerto de origen y de destino (nombre normalizado)
+  -> conjunto de route_id.
+
+Se mantiene de forma incremental desde los endpoints que crean, actualizan o
+eliminan rutas. Como el resto del store, no toma locks: se usa con STORE_LOCK.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+def normalizar_aeropuerto(nombre):
+    return " ".join(str(nombre).split()).casefold()
+
+
+class IndiceRutas:
+    """Índices de rutas por hora de salida y por aeropuerto."""
+
+    def __init__(self):
+        self._por_salida = []   # [(ts, route_id)] ordenada
+        self._claves = {}       # route_id -> (ts, origen, destino) con que se indexó
+        self._origen = {}       # aeropuerto -> {route_id}
+        self._destino = {}
+        self._rutas = {}        # route_id -> ruta (el dict del store)
+
+    def __len__(self):
+        return len(self._rutas)
+
+    def agregar(self, ruta):
+        rid = ruta['airplane_route_id']
+        if rid in self._rutas:
+            self.quitar(rid)
+        insort(self._por_salida, self._indexar(ruta))
+
+    def _indexar(self, ruta):
+        """Índices hash de la ruta; devuelve la clave (ts, route_id) para _por_salida."""
+        rid = ruta['airplane_route_id']
+        ts = ruta['departure_ts']
+        origen, destino = normalizar_aeropuerto(ruta['departure']), normalizar_aeropuerto(ruta['arrival'])
+        self._rutas[rid] = ruta
+        self._claves[rid] = (ts, origen, destino)
+        self._origen.setdefault(origen, set()).add(rid)
+        self._destino.setdefault(destino, set()).add(rid)
+        return ts, rid
+
+    def quitar(self, route_id):
+        # Se usan las claves guardadas: el dict de la ruta puede haberse modificado ya
+        if self._rutas.pop(route_id, None) is None:
+            return
+        ts, origen, destino = self._claves.pop(route_id)
+        i = bisect_left(self._por_salida, (ts, route_id))
+        del self._por_salida[i]
+        for indice, clave in ((self._origen, origen), (self._destino, destino)):
+            ids = indice.get(clave)
+            if ids is not None:
+                ids.discard(route_id)
+                if not ids:
+                    del indice[clave]
+
+    def reconstruir(self, rutas):
+        for indice in (self._por_salida, self._claves, self._origen, self._destino, self._rutas):
+            indice.clear()
+        # Un solo sort al final: insort por ruta es O(n²) con cientos de miles de rutas
+        for ruta in {r['airplane_route_id']: r for r in rutas}.values():
+            self._por_salida.append(self._indexar(ruta))
+        self._por_salida.sort()
+
+    def salida(self, route_id):
+        claves = self._claves.get(route_id)
+        return claves[0] if claves else None
+
+    def buscar(self, origen=None, destino=None, desde=None, hasta=None, precio_max=None, moneda=None):
+        """
+        Rutas que cumplen todos los filtros, ordenadas por salida: [(ts, ruta)].
+        `desde`/`hasta` son timestamps inclusivos.
+        """
+        candidatos = None
+        for indice, valor in ((self._origen, origen), (self._destino, destino)):
+            if valor is not None:
+                ids = indice.get(normalizar_aeropuerto(valor), set())
+                candidatos = ids if candidatos is None else candidatos & ids
+
+        lo = bisect_left(self._por_salida, (desde,)) if desde is not None else 0
+        hi = bisect_right(self._por_salida, (hasta, float('inf'))) if hasta is not None else len(self._por_salida)
+
+        if candidatos is not None and len(candidatos) < hi - lo:
+            # Pocas rutas por aeropuerto: se filtran por hora en lugar de recorrer la ventana
+            en_ventana = [
+                (ts, rid) for ts, rid in ((self._claves[rid][0], rid) for rid in candidatos)
+                if (desde is None or ts >= desde) and (hasta is None or ts <= hasta)
+            ]
+            en_ventana.sort()
+        else:
+            en_ventana = self._por_salida[lo:hi]
+            if candidatos is not None:
+                en_ventana = [x for x in en_ventana if x[1] in candidatos]
+
+        resultado = []
+        for ts, rid in en_ventana:
+            ruta = self._rutas[rid]
+            if precio_max is not None and ruta['price'] > precio_max:
+                continue
+            if moneda is not None and ruta['Moneda'] != moneda:
+                continue
+            resultado.append((ts, ruta))
+        return resultado
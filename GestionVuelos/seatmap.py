@@ -0,0 +1,261 @@
+"""
+Mapa compacto de asientos por avión y plantillas de cabina.
+
+En lugar de un dict por asiento ({'airplane_id', 'seat_number', 'status'}:
+unos 250 bytes por asiento entre el dict y la cadena del número), cada avión
+guarda el estado de sus asientos en un bytearray, un byte por asiento,
+indexado por fila y columna (fila-mayor). Las columnas, las clases y los
+asientos bloqueados vienen de la plantilla de cabina (CabinLayout) del modelo.
+El número de asiento ("12A") se deriva del índice cuando hace falta y los dicts
+con la forma de la API solo se construyen en el borde, al serializar respuestas.
+
+Cada mapa lleva además un contador por estado que se actualiza en cada
+transición (cambiar), así que los libres/reservados/pagados de un avión se
+leen en O(1); bytearray.count (recorrido en C) solo se usa al crear o
+redimensionar el mapa.
+
+La clase no toma locks: quien la usa la protege con STORE_LOCK.
+"""
+
+ESTADOS = ("Libre", "Reservado", "Pagado")
+CODIGO_ESTADO = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+LIBRE = CODIGO_ESTADO["Libre"]
+# Posición de la cuadrícula que no es un asiento (bloqueado por la plantilla o
+# sobrante de la última fila); no se expone en la API
+BLOQUEADO = 0xFF
+_SOBRANTE = bytes([BLOQUEADO])
+
+MAX_FILAS = 999
+
+
+class CabinLayout:
+    """
+    Plantilla de cabina: letras de columna (de izquierda a derecha), clases por
+    rango de filas y asientos bloqueados (puertas, galleys, salidas).
+    """
+
+    __slots__ = ("nombre", "columnas", "clases", "bloqueados", "capacidad_tipica", "_columna")
+
+    def __init__(self, nombre, columnas, clases=(("Economica", None),), bloqueados=(), capacidad_tipica=None):
+        self.nombre = nombre
+        self.columnas = columnas
+        self.clases = tuple(clases)   # ((clase, última fila o None), ...)
+        self.bloqueados = frozenset(bloqueados)
+        self.capacidad_tipica = capacidad_tipica
+        self._columna = {letra: i for i, letra in enumerate(columnas)}
+
+    def parsear(self, seat_number):
+        """
+        '12A' -> (fila, columna) en O(1), o None si no tiene el formato de esta
+        cabina (fila sin ceros a la izquierda + una letra de sus columnas).
+        """
+        if not isinstance(seat_number, str) or not 2 <= len(seat_number) <= 4:
+            return None
+        fila, columna = seat_number[:-1], self._columna.get(seat_number[-1])
+        if columna is None or not (fila.isascii() and fila.isdigit()) or fila[0] == "0":
+            return None
+        return int(fila), columna
+
+    def clase(self, fila):
+        for nombre, hasta in self.clases:
+            if hasta is None or fila <= hasta:
+                return nombre
+        return self.clases[-1][0]
+
+    @property
+    def capacidad_maxima(self):
+        return MAX_FILAS * len(self.columnas) - len(self.bloqueados)
+
+    def generar(self, airplane_id, capacidad):
+        """SeatMap con `capacidad` asientos libres siguiendo esta plantilla."""
+        if capacidad > self.capacidad_maxima:
+            raise ValueError(f"La capacidad {capacidad} excede las {MAX_FILAS} filas de la cabina {self.nombre}.")
+        ancho = len(self.columnas)
+        filas = -(-(capacidad + len(self.bloqueados)) // ancho)
+        estados = bytearray(filas * ancho)
+        for asiento in self.bloqueados:
+            fila, columna = self.parsear(asiento)
+            if fila <= filas:
+                estados[(fila - 1) * ancho + columna] = BLOQUEADO
+        # Lo que sobra de la última fila (o de las últimas) queda fuera de la cabina
+        sobrantes = len(estados) - estados.count(BLOQUEADO) - capacidad
+        i = len(estados)
+        while sobrantes > 0:
+            i -= 1
+            if estados[i] != BLOQUEADO:
+                estados[i] = BLOQUEADO
+                sobrantes -= 1
+        return SeatMap(airplane_id, capacidad, self, estados)
+
+    def describir(self):
+        return {
+            "layout": self.nombre,
+            "columns": list(self.columnas),
+            "classes": [{"class": nombre, "last_row": hasta} for nombre, hasta in self.clases],
+            "blocked": sorted(self.bloqueados, key=lambda a: self.parsear(a)),
+            "typical_capacity": self.capacidad_tipica,
+        }
+
+
+LAYOUT_ESTANDAR = CabinLayout("estandar", "ABCDEF")
+
+# Plantillas por modelo (fuselaje ancho sin la letra I, como en la industria).
+# Los bloqueados están en filas altas para no alterar los aviones pequeños del seed.
+LAYOUTS = {
+    "Airbus A380": CabinLayout(
+        "A380", "ABCDEFGHJK",
+        clases=(("Primera", 2), ("Ejecutiva", 9), ("Economica", None)),
+        bloqueados=("12A", "12K", "30A", "30K"), capacidad_tipica=525),
+    "Boeing 777": CabinLayout(
+        "B777", "ABCDEFGHJK",
+        clases=(("Ejecutiva", 6), ("Economica", None)),
+        bloqueados=("28A", "28K"), capacidad_tipica=396),
+    "Airbus A350": CabinLayout(
+        "A350", "ABCDEFGHJ",
+        clases=(("Ejecutiva", 6), ("Economica", None)),
+        bloqueados=("20A", "20J"), capacidad_tipica=325),
+    "Boeing 787": CabinLayout(
+        "B787", "ABCDEFGHJ",
+        clases=(("Ejecutiva", 5), ("Economica", None)),
+        bloqueados=("18A", "18J"), capacidad_tipica=296),
+    "Airbus A330": CabinLayout(
+        "A330", "ABCDEFGH",
+        clases=(("Ejecutiva", 5), ("Economica", None)), capacidad_tipica=277),
+    "Boeing 767": CabinLayout(
+        "B767", "ABCDEFG",
+        clases=(("Ejecutiva", 4), ("Economica", None)), capacidad_tipica=218),
+    "Boeing 737": CabinLayout(
+        "B737", "ABCDEF",
+        clases=(("Ejecutiva", 3), ("Economica", None)), capacidad_tipica=189),
+    "Airbus A320": CabinLayout(
+        "A320", "ABCDEF",
+        clases=(("Ejecutiva", 3), ("Economica", None)), capacidad_tipica=180),
+    "McDonnell Douglas MD-80": CabinLayout("MD80", "ABCDE", capacidad_tipica=155),
+    "Embraer E190": CabinLayout("E190", "ABCD", capacidad_tipica=100),
+}
+
+
+def layout_para_modelo(modelo):
+    return LAYOUTS.get(modelo, LAYOUT_ESTANDAR)
+
+
+class SeatMap:
+    """Estados de los asientos de un avión (un byte por posición de la cuadrícula)."""
+
+    __slots__ = ("airplane_id", "layout", "_capacidad", "_estados", "_conteo")
+
+    def __init__(self, airplane_id, capacidad, layout=LAYOUT_ESTANDAR, estados=None, conteo=None):
+        self.airplane_id = airplane_id
+        self.layout = layout
+        self._capacidad = capacidad
+        if estados is None:
+            # Sin plantilla explícita: cuadrícula exacta, todo en 0 = Libre
+            estados = bytearray(capacidad)
+        self._estados = estados
+        # Asientos por código de estado, mantenido en cambiar()
+        self._conteo = conteo if conteo is not None else [estados.count(c) for c in range(len(ESTADOS))]
+
+    def __len__(self):
+        return self._capacidad
+
+    @property
+    def capacidad(self):
+        return self._capacidad
+
+    # --- Índice <-> número de asiento ---
+    def indice(self, seat_number):
+        """'12A' -> índice en el bytearray, o None si el asiento no existe en este avión."""
+        posicion = self.layout.parsear(seat_number)
+        if posicion is None:
+            return None
+        i = (posicion[0] - 1) * len(self.layout.columnas) + posicion[1]
+        if i >= len(self._estados) or self._estados[i] == BLOQUEADO:
+            return None
+        return i
+
+    def numero(self, i):
+        fila, columna = divmod(i, len(self.layout.columnas))
+        return f"{fila + 1}{self.layout.columnas[columna]}"
+
+    def filas(self):
+        return -(-len(self._estados) // len(self.layout.columnas))
+
+    # --- Estado ---
+    def estado(self, i):
+        return ESTADOS[self._estados[i]]
+
+    def cambiar(self, i, estado):
+        """Asigna `estado` al asiento `i` y devuelve el estado anterior."""
+        codigo_anterior, codigo = self._estados[i], CODIGO_ESTADO[estado]
+        self._estados[i] = codigo
+        self._conteo[codigo_anterior] -= 1
+        self._conteo[codigo] += 1
+        return ESTADOS[codigo_anterior]
+
+    def libres(self):
+        return self._conteo[LIBRE]
+
+    def conteo(self):
+        """{estado: cantidad} de este avión (O(1), sin recorrer los asientos)."""
+        return dict(zip(ESTADOS, self._conteo))
+
+    def primer_libre(self):
+        i = self._estados.find(LIBRE)
+        return None if i < 0 else i
+
+    def primeros_libres(self, cantidad):
+        """Índices de hasta `cantidad` asientos libres, en orden de fila y columna."""
+        indices = []
+        i = self._estados.find(LIBRE)
+        while i >= 0 and len(indices) < cantidad:
+            indices.append(i)
+            i = self._estados.find(LIBRE, i + 1)
+        return indices
+
+    # --- Borde de la API ---
+    def asiento(self, i):
+        return {
+            "airplane_id": self.airplane_id,
+            "seat_number": self.numero(i),
+            "status": ESTADOS[self._estados[i]],
+        }
+
+    def asientos(self):
+        """Lista de dicts con la forma de la API, en orden de fila y columna."""
+        aid, columnas, ancho = self.airplane_id, self.layout.columnas, len(self.layout.columnas)
+        return [
+            {
+                "airplane_id": aid,
+                "seat_number": f"{i // ancho + 1}{columnas[i % ancho]}",
+                "status": ESTADOS[codigo],
+            }
+            for i, codigo in enumerate(self._estados)
+            if codigo != BLOQUEADO
+        ]
+
+    def redimensionar(self, capacidad):
+        """
+        Mapa nuevo con `capacidad` asientos que conserva el estado de los que
+        permanecen; los asientos agregados quedan libres. Devuelve (mapa, conflictos):
+        si reducir eliminaría asientos que no están libres, mapa es None y
+        conflictos lista esos números de asiento.
+        """
+        nuevo = self.layout.generar(self.airplane_id, capacidad)
+        # Los asientos útiles ocupan un prefijo de la cuadrícula (orden fila-columna)
+        # con los mismos bloqueados, así que basta copiar el prefijo común
+        comun = min(len(self._estados.rstrip(_SOBRANTE)), len(nuevo._estados.rstrip(_SOBRANTE)))
+        eliminados = self._estados[comun:]
+        if eliminados.count(LIBRE) + eliminados.count(BLOQUEADO) != len(eliminados):
+            conflictos = [
+                self.numero(comun + i)
+                for i, codigo in enumerate(eliminados)
+                if codigo not in (LIBRE, BLOQUEADO)
+            ]
+            return None, conflictos
+        nuevo._estados[:comun] = self._estados[:comun]
+        nuevo._conteo = [nuevo._estados.count(c) for c in range(len(ESTADOS))]
+        return nuevo, []
+
+    def copia(self):
+        """Copia independiente (memcpy del bytearray) para leer fuera del lock."""
+        return SeatMap(self.airplane_id, self._capacidad, self.layout, bytearray(self._estados), list(self._conteo))
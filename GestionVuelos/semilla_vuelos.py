@@ -0,0 +1,106 @@
+"""
+Generación masiva y determinista de aviones y rutas (POST /admin/seed).
+
+Con la misma semilla y los mismos parámetros sale exactamente la misma flota:
+todo el azar viene de un random.Random(semilla) propio y de un Faker con
+seed_instance(semilla), sin tocar el random global ni el Faker del servicio.
+
+Cada llamada a Faker cuesta ~100 µs, así que Faker solo arma un pool chico de
+fabricantes y cada avión o ruta toma sus valores de los pools con el Random.
+Los aeropuertos salen de la lista de faker_airtravel, cuyo provider usa el
+random global (seed_instance no lo afecta). Los SeatMap, las fechas de las
+rutas y la carga en el store los hace app.py.
+"""
+
+import random
+import string
+from datetime import timedelta
+
+POOL_FABRICANTES = 100
+# Ventana de salidas de las rutas a partir de la fecha base
+DIAS_DE_SALIDAS = 180
+
+_LETRAS_VUELO = string.ascii_uppercase
+_NUMEROS_VUELO = 9000   # 1000-9999
+MAX_NUMEROS_VUELO = len(_LETRAS_VUELO) ** 2 * _NUMEROS_VUELO
+
+
+def faker_con_semilla(semilla):
+    from faker import Faker
+
+    faker = Faker()
+    faker.seed_instance(semilla)
+    return faker
+
+
+def aeropuertos():
+    from faker_airtravel.airports import airport_list
+
+    return sorted({a['airport'] for a in airport_list if a.get('airport')})
+
+
+def pool(generar, tamano):
+    """Hasta `tamano` valores distintos de `generar()`, en el orden en que salen."""
+    return list(dict.fromkeys(generar() for _ in range(tamano)))
+
+
+def numero_de_vuelo(k):
+    """0 <= k < MAX_NUMEROS_VUELO -> 'AA-1000' ... 'ZZ-9999' (biyectiva)."""
+    letras, numero = divmod(k, _NUMEROS_VUELO)
+    primera, segunda = divmod(letras, len(_LETRAS_VUELO))
+    return f"{_LETRAS_VUELO[primera]}{_LETRAS_VUELO[segunda]}-{1000 + numero}"
+
+
+def generar_aviones(rng, faker, cantidad, modelos, capacidad_para):
+    """Aviones con IDs 1..cantidad; `capacidad_para(modelo)` fija la capacidad de cada uno."""
+    fabricantes = pool(faker.company, POOL_FABRICANTES)
+    aviones = []
+    for airplane_id in range(1, cantidad + 1):
+        modelo = rng.choice(modelos)
+        aviones.append({
+            'airplane_id': airplane_id,
+            'model': modelo,
+            'manufacturer': rng.choice(fabricantes),
+            'year': rng.randint(1985, 2024),
+            'capacity': capacidad_para(modelo),
+        })
+    return aviones
+
+
+def generar_rutas(rng, cantidad, aviones, fecha_base):
+    """
+    Rutas con IDs 1..cantidad repartidas en ronda entre los aviones (todas las
+    de un avión comparten sus asientos). Devuelve [(ruta, salida, llegada)]:
+    las fechas se asignan con asignar_fechas() del servicio.
+    """
+    if cantidad > MAX_NUMEROS_VUELO:
+        raise ValueError(f"No hay números de vuelo distintos para {cantidad} rutas.")
+    nombres = aeropuertos()
+    numeros = rng.sample(range(MAX_NUMEROS_VUELO), cantidad)
+    minutos_ventana = DIAS_DE_SALIDAS * 24 * 60
+    azar = rng.random   # int(azar() * k) es varias veces más barato que randrange
+    rutas = []
+    for i in range(cantidad):
+        origen = int(azar() * len(nombres))
+        # Destino distinto del origen
+        destino = (origen + 1 + int(azar() * (len(nombres) - 1))) % len(nombres)
+        salida = fecha_base + timedelta(minutes=int(azar() * minutos_ventana))
+        llegada = salida + timedelta(minutes=60 + int(azar() * 720))
+        rutas.append(({
+            'airplane_route_id': i + 1,
+            'airplane_id': aviones[i % len(aviones)]['airplane_id'],
+            'flight_number': numero_de_vuelo(numeros[i]),
+            'departure': nombres[origen],
+            'arrival': nombres[destino],
+            'price': 60000 + int(azar() * 90001),
+            'Moneda': 'Colones',
+        }, salida, llegada))
+    return rutas
+
+
+def generar_flota(semilla, aviones, rutas, modelos, capacidad_para, fecha_base):
+    """(aviones, [(ruta, salida, llegada)]) para la semilla dada."""
+    rng = random.Random(semilla)
+    faker = faker_con_semilla(semilla)
+    nuevos = generar_aviones(rng, faker, aviones, modelos, capacidad_para)
+    return nuevos, generar_rutas(rng, rutas, nuevos, fecha_base)
@@ -0,0 +1,294 @@
+"""
+Trazas distribuidas con OpenTelemetry (opcionales).
+
+Se activan con OTEL_TRACES_EXPORTER=console|file (por defecto "none": no se
+instala ningún hook y LockTrazado solo delega). Una solicitud no muestreada no
+crea spans: solo se reenvía la decisión (flags 00) en el traceparent saliente.
+Configuración por entorno:
+
+- OTEL_TRACES_EXPORTER      none | console | file
+- OTEL_TRACES_SAMPLER_ARG   fracción de trazas raíz muestreadas (default 0.01);
+                            las solicitudes con traceparent respetan la decisión del padre
+- OTEL_EXPORTER_FILE_PATH   archivo JSONL para el exporter "file"
+                            (default traces-<servicio>.jsonl)
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+_TRACER = None
+_RATIO = 0.0
+
+
+def _cargar_otel():
+    """
+    Importa OpenTelemetry recién al activar el tracing: con el exporter en
+    "none" (el caso por defecto) el servicio no paga ese import al arrancar.
+    Devuelve False si no está instalado.
+    """
+    global otel_context, trace, extract, inject, Resource, TracerProvider
+    global BatchSpanProcessor, ConsoleSpanExporter, ParentBased, ALWAYS_ON, ExportadorArchivo
+    try:
+        from opentelemetry import context as otel_context
+        from opentelemetry import trace
+        from opentelemetry.propagate import extract, inject
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SpanExporter,
+            SpanExportResult,
+        )
+        from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased
+    except ImportError:  # el servicio funciona igual sin OpenTelemetry instalado
+        return False
+
+    class ExportadorArchivo(SpanExporter):
+        """Escribe un span por línea (JSON) para análisis offline."""
+
+        def __init__(self, ruta):
+            self._ruta = ruta
+            self._lock = threading.Lock()
+
+        def export(self, spans):
+            lineas = [s.to_json(indent=None) for s in spans]
+            with self._lock, open(self._ruta, "a", encoding="utf-8") as f:
+                f.write("\n".join(lineas) + "\n")
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+    return True
+
+
+def habilitado():
+    return _TRACER is not None
+
+
+def traza(nombre, **atributos):
+    """Context manager de un span hijo del actual; no hace nada si el tracing está apagado."""
+    if _TRACER is None or not trace.get_current_span().is_recording():
+        return nullcontext()
+    return _TRACER.start_as_current_span(nombre, attributes=atributos)
+
+
+def iniciar_tracing(app, servicio, sesion=None):
+    """Configura el proveedor, los hooks de Flask, la sesión HTTP saliente y Marshmallow/JSON."""
+    global _TRACER, _RATIO
+    exportador = os.getenv("OTEL_TRACES_EXPORTER", "none").strip().lower()
+    if exportador in ("", "none"):
+        return False
+    if not _cargar_otel():
+        logging.warning("⚠️ OTEL_TRACES_EXPORTER=%s pero OpenTelemetry no está instalado; tracing desactivado.", exportador)
+        return False
+
+    ratio = _RATIO = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "0.01"))
+    # La fracción de trazas raíz se decide una sola vez, en el before_request de
+    # _instrumentar_flask (sin tocar el SDK); lo que llega al sampler ya está
+    # muestreado, o trae un padre cuya decisión se respeta.
+    proveedor = TracerProvider(
+        resource=Resource.create({"service.name": servicio}),
+        sampler=ParentBased(ALWAYS_ON),
+    )
+    if exportador == "file":
+        ruta = os.getenv("OTEL_EXPORTER_FILE_PATH", f"traces-{servicio}.jsonl")
+        proveedor.add_span_processor(BatchSpanProcessor(ExportadorArchivo(ruta)))
+    else:
+        proveedor.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    trace.set_tracer_provider(proveedor)
+    _TRACER = trace.get_tracer(servicio)
+
+    _instrumentar_flask(app)
+    if sesion is not None:
+        _instrumentar_sesion(sesion)
+    _instrumentar_marshmallow()
+    logging.info("🔭 Tracing OpenTelemetry activo (exporter=%s, ratio=%s).", exportador, ratio)
+    return True
+
+
+class LockTrazado:
+    """
+    Envuelve el lock del store para registrar un span 'store_lock' (espera + retención)
+    en la adquisición más externa, solo si la solicitud actual está muestreada.
+    Soporta el modo lectura (`with lock.read():`) si el lock envuelto lo tiene.
+    Puede crearse antes de iniciar_tracing(): con el tracing apagado solo delega.
+    """
+
+    def __init__(self, lock, nombre="store"):
+        self._lock = lock
+        self._nombre = nombre
+        self._local = threading.local()
+
+    def __getattr__(self, atributo):
+        return getattr(self._lock, atributo)
+
+    def _adquirir(self, modo, adquirir, *args):
+        if _TRACER is None:
+            return adquirir(*args)
+        clave = "profundidad_" + modo
+        profundidad = getattr(self._local, clave, 0)
+        if profundidad or not trace.get_current_span().is_recording():
+            ok = adquirir(*args)
+            if ok:
+                setattr(self._local, clave, profundidad + 1)
+            return ok
+        t0 = time.time_ns()
+        ok = adquirir(*args)
+        if ok:
+            t1 = time.time_ns()
+            setattr(self._local, "span_" + modo, _TRACER.start_span(
+                "store_lock", start_time=t0,
+                attributes={"lock.name": self._nombre, "lock.mode": modo, "lock.wait_ms": (t1 - t0) / 1e6},
+            ))
+            setattr(self._local, clave, 1)
+        return ok
+
+    def _soltar(self, modo, liberar):
+        if _TRACER is None:
+            return liberar()
+        clave = "profundidad_" + modo
+        profundidad = getattr(self._local, clave) - 1
+        setattr(self._local, clave, profundidad)
+        liberar()
+        if profundidad == 0:
+            span = getattr(self._local, "span_" + modo, None)
+            if span is not None:
+                setattr(self._local, "span_" + modo, None)
+                span.end()
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._adquirir("write", self._lock.acquire, blocking, timeout)
+
+    def release(self):
+        self._soltar("write", self._lock.release)
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def acquire_read(self):
+        return self._adquirir("read", self._lock.acquire_read)
+
+    def release_read(self):
+        self._soltar("read", self._lock.release_read)
+
+    def read(self):
+        return _ContextoLectura(self)
+
+
+class _ContextoLectura:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_read()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release_read()
+
+
+def _instrumentar_flask(app):
+    from flask import g, request
+    from flask.json.provider import DefaultJSONProvider
+
+    @app.before_request
+    def _traza_inicio():
+        # Única decisión de muestreo de las trazas raíz, antes de tocar el SDK
+        entrante = request.headers.get("traceparent")
+        if entrante is None:
+            if random.random() >= _RATIO:
+                g._traceparent_no_muestreado = f"00-{random.getrandbits(128):032x}-{random.getrandbits(64):016x}-00"
+                return
+        elif entrante.endswith("-00"):
+            g._traceparent_no_muestreado = entrante
+            return
+        regla = request.url_rule.rule if request.url_rule is not None else request.path
+        span = _TRACER.start_span(
+            f"{request.method} {regla}",
+            context=extract(request.headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": request.method, "http.route": regla},
+        )
+        g._traza = (span, otel_context.attach(trace.set_span_in_context(span)))
+
+    @app.after_request
+    def _traza_respuesta(resp):
+        actual = g.get("_traza")
+        if actual is not None:
+            actual[0].set_attribute("http.response.status_code", resp.status_code)
+        return resp
+
+    @app.teardown_request
+    def _traza_fin(exc):
+        actual = g.pop("_traza", None)
+        if actual is None:
+            return
+        span, token = actual
+        if exc is not None:
+            span.record_exception(exc)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end()
+        otel_context.detach(token)
+
+    class ProveedorJSONTrazado(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            with traza("json.serialize"):
+                return super().dumps(obj, **kwargs)
+
+    app.json = ProveedorJSONTrazado(app)
+
+
+def _instrumentar_sesion(sesion):
+    original = sesion.request
+
+    from flask import g, has_request_context
+
+    def request_trazado(method, url, *args, **kwargs):
+        if not trace.get_current_span().is_recording():
+            # Sin muestreo se reenvía la decisión para que el servicio destino tampoco muestree
+            no_muestreado = g.get("_traceparent_no_muestreado") if has_request_context() else None
+            if no_muestreado:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "traceparent": no_muestreado}
+            return original(method, url, *args, **kwargs)
+        with _TRACER.start_as_current_span(
+            f"HTTP {str(method).upper()}", kind=trace.SpanKind.CLIENT,
+            attributes={"http.request.method": str(method).upper(), "url.full": str(url)},
+        ) as span:
+            headers = dict(kwargs.get("headers") or {})
+            inject(headers)
+            kwargs["headers"] = headers
+            resp = original(method, url, *args, **kwargs)
+            span.set_attribute("http.response.status_code", resp.status_code)
+            return resp
+
+    sesion.request = request_trazado
+
+
+def _instrumentar_marshmallow():
+    # Se envuelven los métodos públicos de la clase base una sola vez (todas las
+    # schemas del servicio heredan de marshmallow.Schema sin sobrescribirlos).
+    from marshmallow import Schema
+
+    if getattr(Schema, "_trazado", False):
+        return
+    for metodo in ("load", "validate", "dump"):
+        original = getattr(Schema, metodo)
+
+        def envoltura(self, *args, _original=original, _metodo=metodo, **kwargs):
+            with traza(f"marshmallow.{_metodo}", schema=type(self).__name__):
+                return _original(self, *args, **kwargs)
+
+        setattr(Schema, metodo, envoltura)
+    Schema._trazado = True
@@ -0,0 +1,124 @@
+"""
+Transporte binario entre servicios: application/msgpack negociado por Accept.
+
+- registrar_transporte(app, rutas): en las rutas internas (las que consultan
+  los otros servicios) un cliente que prefiere application/msgpack sobre
+  application/json recibe el mismo contenido en MessagePack. jsonify sigue
+  igual: se envuelve app.json.response. Las respuestas de error (>= 300)
+  siempre salen en JSON, así los mensajes se pueden reenviar como texto.
+- usar_transporte_binario(sesion): la sesión HTTP compartida pide msgpack en
+  sus GET (Accept: application/msgpack, application/json;q=0.9) y la
+  respuesta se usa igual: resp.json() decodifica MessagePack si llegó así.
+  Para validar el tipo de contenido, es_json(resp) en lugar de buscar
+  application/json en Content-Type.
+
+Navegadores, Swagger y tests mandan Accept */* o application/json y siguen
+recibiendo JSON. Solo MessagePack con claves str (el modelo de datos de JSON):
+si una ruta devuelve dicts con claves int, su variante binaria tiene que salir
+de un JSON ya serializado (ver desde_json), como los snapshots de GestionVuelos.
+
+msgpack es opcional: sin el paquete, o con TRANSPORTE_BINARIO=0, todo sigue en JSON.
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import json
+import os
+
+import requests
+
+try:
+    import msgpack
+except ImportError:  # sin msgpack todo viaja en JSON
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+ACCEPT_INTERNO = f"{MSGPACK}, application/json;q=0.9"
+
+
+def disponible():
+    return msgpack is not None and os.getenv("TRANSPORTE_BINARIO", "1") != "0"
+
+
+def empaquetar(obj, default=None):
+    return msgpack.packb(obj, default=default)
+
+
+def desempaquetar(datos):
+    return msgpack.unpackb(datos)
+
+
+def desde_json(cuerpo):
+    """MessagePack equivalente a un cuerpo JSON ya serializado (claves int -> str, como en JSON)."""
+    return empaquetar(json.loads(cuerpo))
+
+
+def respuesta_json(app, *args, **kwargs):
+    """Como jsonify pero siempre en JSON, aunque la solicitud en curso haya pedido msgpack."""
+    return app.extensions.get("transporte_json", app.json.response)(*args, **kwargs)
+
+
+def prefiere_msgpack(request):
+    # Con */* o sin Accept gana application/json (empata y va primero)
+    return disponible() and request.accept_mimetypes.best_match(("application/json", MSGPACK)) == MSGPACK
+
+
+def registrar_transporte(app, rutas):
+    """Ofrece application/msgpack en las `rutas` (reglas de Flask) a quien lo pida por Accept."""
+    if not disponible():
+        return
+    from flask import has_request_context, request
+
+    rutas = frozenset(rutas)
+    proveedor = app.json
+    response_json = app.extensions["transporte_json"] = proveedor.response
+
+    def response(*args, **kwargs):
+        if not (has_request_context() and request.url_rule is not None
+                and request.url_rule.rule in rutas and prefiere_msgpack(request)):
+            return response_json(*args, **kwargs)
+        obj = args[0] if len(args) == 1 else (args or kwargs)
+        return app.response_class(empaquetar(obj, default=proveedor.default), mimetype=MSGPACK)
+
+    proveedor.response = response
+
+    @app.after_request
+    def _negociar(resp):
+        if request.url_rule is None or request.url_rule.rule not in rutas:
+            return resp
+        resp.vary.add("Accept")
+        if resp.mimetype == MSGPACK and resp.status_code >= 300 and not resp.is_streamed:
+            resp.set_data(proveedor.dumps(desempaquetar(resp.get_data())))
+            resp.mimetype = "application/json"
+        return resp
+
+
+def es_json(resp):
+    """True si el cuerpo de `resp` se puede leer con resp.json(): JSON, o MessagePack ya negociado."""
+    tipo = resp.headers.get("Content-Type", "")
+    return "application/json" in tipo or tipo.startswith(MSGPACK)
+
+
+class RespuestaMsgpack(requests.Response):
+    """Response cuyo cuerpo llegó en MessagePack: json() lo decodifica igual que a un JSON."""
+
+    def json(self, **kwargs):
+        return desempaquetar(self.content)
+
+
+def usar_transporte_binario(sesion):
+    """Envuelve sesion.request: las GET piden msgpack y la respuesta se lee con resp.json() como siempre."""
+    if not disponible():
+        return
+    original = sesion.request
+
+    def request_binario(method, url, *args, **kwargs):
+        cabeceras = kwargs.get("headers") or {}
+        if str(method).upper() == "GET" and not any(k.lower() == "accept" for k in cabeceras):
+            kwargs["headers"] = {**cabeceras, "Accept": ACCEPT_INTERNO}
+        resp = original(method, url, *args, **kwargs)
+        if resp.headers.get("Content-Type", "").startswith(MSGPACK):
+            resp.__class__ = RespuestaMsgpack
+        return resp
+
+    sesion.request = request_binario
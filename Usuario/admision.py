@@ -0,0 +1,203 @@
+"""
+Control de admisión de Usuario, la fachada pública: límites por cliente y por
+endpoint y tope de concurrencia en los endpoints que orquestan varias llamadas.
+Una solicitud que no entra se rechaza al instante, antes de tocar GestiónVuelos
+o GestiónReservas, en lugar de esperar en la cola del servidor.
+
+- Cubo de tokens por (cliente, regla): se recarga a `tasa` tokens por segundo
+  hasta `rafaga`. La recarga es perezosa (se calcula al consultar el cubo, sin
+  hilos ni timers), así cada chequeo es O(1). Sin token -> 429 con Retry-After.
+- La regla "*" vale para todas las rutas; las reglas por endpoint (la regla de
+  Flask, p. ej. /get_all_airplanes_with_seats) se suman: la solicitud necesita
+  token en las dos y solo se descuenta si hay en ambas.
+- Concurrencia: como mucho N solicitudes a la vez por endpoint caro y
+  `en_curso_max` en total en el proceso. La que no entra -> 503 con Retry-After.
+- Los cubos viven en un OrderedDict acotado a `max_clientes` (LRU): se descarta
+  primero el menos usado. Un cubo descartado vuelve lleno, igual que si el
+  cliente hubiera estado quieto.
+
+El cliente es request.remote_addr o, detrás de un proxy, el primer valor de la
+cabecera `header_cliente` (p. ej. X-Forwarded-For).
+
+Todo el estado (cubos y contadores de concurrencia) es del proceso. Con
+gunicorn `-w N --threads T` cada worker tiene el suyo:
+- Los topes de concurrencia actúan entre los T hilos de cada worker. Con
+  workers síncronos (sin --threads) un worker atiende una solicitud a la vez y
+  un tope >= 1 nunca se alcanza.
+- Los límites efectivos del servicio son N veces los configurados: las
+  solicitudes de un cliente se reparten entre los workers y cada uno le da su
+  propio cubo. Para un límite L en todo el servicio, configurar L/N.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+Limite = namedtuple("Limite", "tasa rafaga")
+
+TODAS = "*"
+
+
+def parsear_limite(texto):
+    """'tasa:rafaga' o 'tasa' (ráfaga = tasa) -> Limite; vacío o '0' -> None (sin límite)."""
+    texto = (texto or "").strip()
+    if not texto or texto == "0":
+        return None
+    tasa, _, rafaga = texto.partition(":")
+    tasa = float(tasa)
+    rafaga = float(rafaga) if rafaga else max(tasa, 1.0)
+    if tasa <= 0 or rafaga < 1:
+        raise ValueError(f"Límite inválido: {texto!r} (tasa > 0 y ráfaga >= 1).")
+    return Limite(tasa, rafaga)
+
+
+def parsear_reglas(texto, valor=parsear_limite):
+    """'/ruta=valor,/otra=valor' -> {ruta: valor(valor)}; las reglas sin valor se ignoran."""
+    reglas = {}
+    for parte in (texto or "").split(","):
+        ruta, igual, crudo = parte.strip().partition("=")
+        if not igual:
+            continue
+        regla = valor(crudo)
+        if regla:
+            reglas[ruta.strip()] = regla
+    return reglas
+
+
+class CuboDeTokens:
+    __slots__ = ("tasa", "rafaga", "tokens", "actualizado")
+
+    def __init__(self, limite, ahora):
+        self.tasa, self.rafaga = limite
+        self.tokens = self.rafaga
+        self.actualizado = ahora
+
+    def recargar(self, ahora):
+        self.tokens = min(self.rafaga, self.tokens + (ahora - self.actualizado) * self.tasa)
+        self.actualizado = ahora
+
+    def espera(self):
+        """Segundos hasta el próximo token (0 si hay uno disponible)."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.tasa
+
+
+class ControlDeAdmision:
+    def __init__(self, por_cliente=None, por_endpoint=None, concurrencia=None, en_curso_max=0,
+                 max_clientes=100_000, header_cliente=None, exentos=(), metricas=None,
+                 reloj=time.monotonic):
+        self.limites = dict(por_endpoint or {})
+        if por_cliente:
+            self.limites[TODAS] = por_cliente
+        self.concurrencia = dict(concurrencia or {})
+        self.en_curso_max = en_curso_max
+        self.max_clientes = max_clientes
+        self.header_cliente = header_cliente
+        self.exentos = frozenset(exentos)
+        self.metricas = metricas
+        self.reloj = reloj
+        self._lock = threading.Lock()
+        self._cubos = OrderedDict()        # (cliente, regla) -> CuboDeTokens
+        self._en_curso = {}                # endpoint -> solicitudes en curso
+        self._en_curso_total = 0
+        self.rechazos = {"rate_limit": 0, "concurrencia": 0, "sobrecarga": 0}
+
+    # --- Decisión (O(1), con el lock tomado solo lo justo) ---
+    def _cubo(self, cliente, regla, ahora):
+        # Se llama con self._lock tomado
+        clave = (cliente, regla)
+        cubo = self._cubos.get(clave)
+        if cubo is None:
+            cubo = self._cubos[clave] = CuboDeTokens(self.limites[regla], ahora)
+            if len(self._cubos) > self.max_clientes:
+                self._cubos.popitem(last=False)
+        else:
+            self._cubos.move_to_end(clave)
+            cubo.recargar(ahora)
+        return cubo
+
+    def admitir(self, cliente, endpoint):
+        """
+        None si la solicitud entra (y ocupa un lugar que se devuelve con
+        liberar(endpoint)); si no, (codigo, retry_after_s, mensaje, motivo).
+        """
+        ahora = self.reloj()
+        tope = self.concurrencia.get(endpoint)
+        with self._lock:
+            if self.en_curso_max and self._en_curso_total >= self.en_curso_max:
+                return self._rechazo("sobrecarga", 503, 1, "Servicio saturado; reintenta en un momento.")
+            if tope and self._en_curso.get(endpoint, 0) >= tope:
+                return self._rechazo("concurrencia", 503, 1,
+                                     f"Demasiadas solicitudes simultáneas a {endpoint}; reintenta en un momento.")
+            cubos = [self._cubo(cliente, regla, ahora) for regla in (TODAS, endpoint) if regla in self.limites]
+            espera = max((cubo.espera() for cubo in cubos), default=0.0)
+            if espera > 0:
+                return self._rechazo("rate_limit", 429, math.ceil(espera),
+                                     "Demasiadas solicitudes; respeta Retry-After antes de reintentar.")
+            for cubo in cubos:
+                cubo.tokens -= 1
+            self._en_curso_total += 1
+            if tope:
+                self._en_curso[endpoint] = self._en_curso.get(endpoint, 0) + 1
+        return None
+
+    def _rechazo(self, motivo, codigo, retry_after, mensaje):
+        # Se llama con self._lock tomado
+        self.rechazos[motivo] += 1
+        return codigo, max(1, retry_after), mensaje, motivo
+
+    def liberar(self, endpoint):
+        with self._lock:
+            self._en_curso_total -= 1
+            if endpoint in self.concurrencia:
+                self._en_curso[endpoint] -= 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "clients_tracked": len(self._cubos),
+                "in_flight": self._en_curso_total,
+                "in_flight_by_endpoint": dict(self._en_curso),
+                "rejected": dict(self.rechazos),
+            }
+
+    # --- Integración con Flask ---
+    def cliente(self, request):
+        if self.header_cliente:
+            valor = request.headers.get(self.header_cliente)
+            if valor:
+                return valor.split(",", 1)[0].strip()
+        return request.remote_addr or "desconocido"
+
+    def registrar(self, app):
+        """Engancha el control en before_request / teardown_request de la app."""
+        from flask import g, jsonify, request
+
+        if self.metricas is not None:
+            self.metricas.describir("admision_rechazos_total", "counter",
+                                    "Solicitudes rechazadas por el control de admisión")
+            self.metricas.gauge("admision_en_curso", "Solicitudes admitidas en curso",
+                                lambda: self._en_curso_total)
+
+        @app.before_request
+        def _admitir():
+            endpoint = request.url_rule.rule if request.url_rule is not None else None
+            if endpoint in self.exentos:
+                return None
+            rechazo = self.admitir(self.cliente(request), endpoint)
+            if rechazo is None:
+                g.admision_endpoint = endpoint
+                return None
+            codigo, retry_after, mensaje, motivo = rechazo
+            if self.metricas is not None:
+                self.metricas.inc("admision_rechazos_total",
+                                  (("endpoint", endpoint or "sin_ruta"), ("motivo", motivo)))
+            resp = jsonify({"message": mensaje, "retry_after_s": retry_after})
+            resp.status_code = codigo
+            resp.headers["Retry-After"] = str(retry_after)
+            return resp
+
+        @app.teardown_request
+        def _liberar(_exc):
+            if "admision_endpoint" in g:
+                self.liberar(g.pop("admision_endpoint"))
@@ -0,0 +1,174 @@
+"""
+Lecturas compartidas (single-flight) hacia GestiónVuelos / GestiónReservas.
+
+Cuando muchos usuarios abren a la vez el mapa de asientos del mismo avión,
+Usuario mandaría la misma GET /get_airplane_seats/{id}/seats una vez por
+cliente. Con AgrupadorDeLecturas.instalar(sesion), una GET idéntica (mismo
+método, URL, parámetros y cabeceras) a otra que ya está en curso no sale a la
+red: espera a la primera (la "líder") y recibe su misma respuesta (una copia
+superficial del Response, con el cuerpo ya leído) o su misma excepción.
+
+Las seguidoras esperan a la líder como mucho su propio `timeout=` (la suma de
+connect y read si es una tupla); si se cumple antes de que llegue la respuesta,
+la seguidora sale con ReadTimeout y la líder sigue su curso.
+
+El agrupador es por proceso: solo se juntan lecturas de hilos del mismo
+proceso. Con workers síncronos de gunicorn (un hilo por worker) nunca hay dos
+GET a la vez en el mismo proceso y no se agrupa nada; por eso el Dockerfile de
+Usuario usa `--threads` (worker gthread).
+
+Solo se agrupan lecturas que empezaron después de la última escritura del
+mismo hilo (= de la misma solicitud de Flask): una GET que sigue a un PUT
+propio nunca recibe una respuesta pedida antes de ese PUT.
+
+Por clave se cuentan líderes y seguidoras: en /metrics agrupadas por ruta
+(upstream_coalesced_requests_total, con los segmentos que llevan dígitos como
+{id} para acotar la cardinalidad) y en snapshot() por URL exacta, con las
+`max_claves` más recientes.
+"""
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+from requests.exceptions import ReadTimeout
+
+_SEGMENTO_CON_ID = re.compile(r"/[^/]*\d[^/]*")
+
+# Argumentos con los que la solicitud deja de ser una lectura simple
+_NO_AGRUPABLES = ("data", "json", "files", "stream", "auth", "cookies")
+
+
+class _EnCurso:
+    __slots__ = ("listo", "inicio", "resp", "error")
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.inicio = time.monotonic()
+        self.resp = None
+        self.error = None
+
+
+def _espera_max(timeout):
+    """Segundos que una seguidora puede esperar a la líder según el timeout= de requests (None: sin tope)."""
+    if isinstance(timeout, tuple):
+        if any(t is None for t in timeout):
+            return None
+        return sum(timeout)
+    return timeout
+
+
+def ruta_normalizada(url):
+    return _SEGMENTO_CON_ID.sub("/{id}", urlsplit(url).path) or "/"
+
+
+class AgrupadorDeLecturas:
+    def __init__(self, metricas=None, metodos=("GET",), max_claves=1000):
+        self.metricas = metricas
+        self.metodos = frozenset(metodos)
+        self.max_claves = max_claves
+        self._lock = threading.Lock()
+        self._en_curso = {}               # clave -> _EnCurso
+        self._por_clave = OrderedDict()   # url exacta -> [líderes, seguidoras]
+        self._local = threading.local()
+        self.lideres = 0
+        self.seguidoras = 0
+        if metricas is not None:
+            metricas.describir("upstream_coalesced_requests_total", "counter",
+                               "GET a otros servicios por rol: leader salió a la red, follower reusó la respuesta")
+            metricas.gauge("upstream_coalesced_in_flight", "Lecturas líderes en curso",
+                           lambda: len(self._en_curso))
+
+    @staticmethod
+    def _clave(metodo, url, kwargs):
+        """(metodo, url completa, cabeceras) o None si la solicitud no es una lectura agrupable."""
+        if any(kwargs.get(nombre) for nombre in _NO_AGRUPABLES):
+            return None
+        url = str(url)
+        params = kwargs.get("params")
+        if params:
+            items = params.items(multi=True) if hasattr(params, "getlist") else params.items()
+            url += ("&" if "?" in url else "?") + urlencode(sorted(items), doseq=True)
+        cabeceras = kwargs.get("headers")
+        return metodo, url, tuple(sorted(cabeceras.items())) if cabeceras else ()
+
+    def instalar(self, sesion):
+        """Envuelve sesion.request: las GET idénticas y simultáneas comparten una sola llamada."""
+        original = sesion.request
+
+        def request_agrupado(method, url, *args, **kwargs):
+            metodo = str(method).upper()
+            clave = self._clave(metodo, url, kwargs) if metodo in self.metodos and not args else None
+            if clave is None:
+                try:
+                    return original(method, url, *args, **kwargs)
+                finally:
+                    if metodo not in self.metodos:
+                        self._local.ultima_escritura = time.monotonic()
+
+            ultima_escritura = getattr(self._local, "ultima_escritura", 0.0)
+            with self._lock:
+                vuelo = self._en_curso.get(clave)
+                lider = vuelo is None or vuelo.inicio < ultima_escritura
+                if lider:
+                    vuelo = self._en_curso[clave] = _EnCurso()
+
+            if not lider:
+                if not vuelo.listo.wait(_espera_max(kwargs.get("timeout"))):
+                    raise ReadTimeout(f"La lectura compartida de {clave[1]} no respondió dentro del timeout")
+                self._contar(clave, "follower")
+                if vuelo.error is not None:
+                    raise vuelo.error
+                return copy.copy(vuelo.resp)
+
+            try:
+                vuelo.resp = original(method, url, *args, **kwargs)
+                return vuelo.resp
+            except BaseException as e:
+                vuelo.error = e
+                raise
+            finally:
+                with self._lock:
+                    if self._en_curso.get(clave) is vuelo:
+                        del self._en_curso[clave]
+                vuelo.listo.set()
+                self._contar(clave, "leader")
+
+        sesion.request = request_agrupado
+
+    def _contar(self, clave, rol):
+        url = clave[1]
+        with self._lock:
+            fila = self._por_clave.get(url)
+            if fila is None:
+                fila = self._por_clave[url] = [0, 0]
+                if len(self._por_clave) > self.max_claves:
+                    self._por_clave.popitem(last=False)
+            else:
+                self._por_clave.move_to_end(url)
+            if rol == "leader":
+                fila[0] += 1
+                self.lideres += 1
+            else:
+                fila[1] += 1
+                self.seguidoras += 1
+        if self.metricas is not None:
+            self.metricas.inc("upstream_coalesced_requests_total", (
+                ("target", urlsplit(url).netloc or "desconocido"),
+                ("key", f"{clave[0]} {ruta_normalizada(url)}"),
+                ("role", rol),
+            ))
+
+    def snapshot(self, top=10):
+        """Totales y las `top` URLs con más lecturas reusadas."""
+        with self._lock:
+            filas = sorted(self._por_clave.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+            return {
+                "leaders": self.lideres,
+                "followers": self.seguidoras,
+                "in_flight": len(self._en_curso),
+                "top_keys": [{"url": url, "leaders": l, "followers": s} for url, (l, s) in filas],
+            }
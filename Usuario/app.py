@@ -13,15 +13,23 @@ import json
 # Third-party Libraries
 import requests
 from dotenv import load_dotenv
-from faker import Faker
-from faker_airtravel import AirTravelProvider
-from flasgger import Swagger
 from marshmallow import Schema, fields, ValidationError, validates, RAISE, INCLUDE
 
 
 # Flask
 from flask import Flask, jsonify, request
 
+# Local
+from admision import ControlDeAdmision, parsear_limite, parsear_reglas
+from agrupador import AgrupadorDeLecturas
+from arranque import SwaggerPerezoso
+from compresion import comprimir_solicitudes, registrar_compresion
+from metrics import Metricas, SesionInstrumentada, instrumentar_flask
+from openapi_spec import EspecOpenAPI
+from salud import Dependencia, Dependencias, registrar_salud
+from tracing import iniciar_tracing
+from transporte import es_json, usar_transporte_binario
+
 
 ## Cargar variables de entorno desde el archivo .env
 load_dotenv("config.env")
@@ -38,10 +46,55 @@ logging.basicConfig(
 )
 
 
-## Configuración de Faker
 app = Flask(__name__)
 
+## Métricas (/metrics) y sesión HTTP instrumentada hacia GestiónVuelos / GestiónReservas
+METRICAS = Metricas()
+instrumentar_flask(app, METRICAS)
+HTTP = SesionInstrumentada(METRICAS)
+
+## Respuestas grandes con gzip/br según Accept-Encoding y cuerpos grandes hacia los
+## upstreams con gzip (ver compresion.py)
+registrar_compresion(app, METRICAS)
+comprimir_solicitudes(HTTP)
+## Las GET a los upstreams piden MessagePack; resp.json() lo decodifica (ver transporte.py)
+usar_transporte_binario(HTTP)
+iniciar_tracing(app, "Usuario", sesion=HTTP)
+
+## Disyuntor por upstream: con GestiónVuelos o GestiónReservas caídos o no listos las
+## llamadas fallan al instante en lugar de esperar el timeout de 20 s (ver salud.py)
+DEPENDENCIAS = Dependencias(
+    Dependencia("gestion_vuelos", "GESTIONVUELOS_SERVICE"),
+    Dependencia("gestion_reservas", "GESTIONRESERVAS_SERVICE"),
+)
+DEPENDENCIAS.proteger(HTTP, connect_timeout=float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_S", "2")))
+
+## GET idénticas y simultáneas a los upstreams comparten una sola llamada (ver agrupador.py).
+## Va por fuera del disyuntor y de las trazas: las que reusan la respuesta no salen a la red.
+LECTURAS = AgrupadorDeLecturas(METRICAS)
+if os.getenv("AGRUPAR_LECTURAS", "1") != "0":
+    LECTURAS.instalar(HTTP)
+
+## Control de admisión (ver admision.py): cubo de tokens por cliente y por endpoint y
+## tope de solicitudes simultáneas en los endpoints que piden catálogos completos a
+## GestiónVuelos. Lo que no entra recibe 429/503 con Retry-After. ADMISION=0 lo apaga.
+## Los límites son por worker de gunicorn: en todo el servicio valen N veces (-w N).
+ADMISION = ControlDeAdmision(
+    por_cliente=parsear_limite(os.getenv("RATE_LIMIT_CLIENTE", "50:100")),
+    por_endpoint=parsear_reglas(os.getenv(
+        "RATE_LIMIT_ENDPOINTS", "/get_all_airplanes_with_seats=2:10,/routes/summary=2:10")),
+    concurrencia=parsear_reglas(os.getenv(
+        "CONCURRENCIA_ENDPOINTS", "/get_all_airplanes_with_seats=4,/routes/summary=4"), valor=int),
+    en_curso_max=int(os.getenv("ADMISION_EN_CURSO_MAX", "64")),
+    header_cliente=os.getenv("ADMISION_HEADER_CLIENTE") or None,
+    exentos=("/health", "/livez", "/readyz", "/metrics"),
+    metricas=METRICAS,
+)
+if os.getenv("ADMISION", "1") != "0":
+    ADMISION.registrar(app)
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+OPENAPI_SPEC = EspecOpenAPI(os.path.join(BASE_DIR, "openapi.json"), app)
 
 # === Identificador de instancia (por proceso) ===
 INSTANCE_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
@@ -55,7 +108,12 @@ def root():
 @app.route('/health', methods=['GET'])
 def health():
     app.logger.info(">>> /health de Usuario llamado")
-    return jsonify({"status": "ok", "service": "usuario", "instance_id": INSTANCE_ID}), 200
+    return jsonify({"status": "ok", "service": "usuario", "instance_id": INSTANCE_ID,
+                    "admission": ADMISION.snapshot(), "coalescing": LECTURAS.snapshot()}), 200
+
+
+## GET /livez y GET /readyz: Usuario no guarda datos, está listo si sus dos upstreams lo están
+registrar_salud(app, "usuario", lambda: ([], {}), DEPENDENCIAS)
 
 
 ## Configuración de Swagger
@@ -76,6 +134,10 @@ swagger_template = {
         {
             "name": "Flights routes and seats",
             "description": "Operations related to airplane routes and flights seats data"
+        },
+        {
+            "name": "Metrics",
+            "description": "Prometheus metrics of the process"
         }
     ],
     "definitions": {
@@ -314,8 +376,8 @@ class PaymentCreationSchema(Schema):
 ################################################################################################
 
 
-## Configuración de Swagger
-swagger = Swagger(app, template=swagger_template)
+## Configuración de Swagger (se construye en la primera visita a /apidocs/, ver arranque.py)
+swagger = SwaggerPerezoso(app, template=swagger_template)
 
 
 @app.route("/openapi.json", methods=["GET"])
@@ -323,20 +385,16 @@ def openapi_json():
     """
     Devuelve el OpenAPI spec del repo para ser consumido como 'live spec'
     por pruebas de contrato en el microservicio Usuario.
+    Se sirve desde memoria con ETag (ver openapi_spec.py): solo los paths de
+    este servicio, o el spec completo con ?full=1.
     """
     try:
-        spec_path = os.path.join(BASE_DIR, "openapi.json")
-        if not os.path.exists(spec_path):
-            return jsonify({
-                "message": "Spec openapi.json no encontrado en la raíz del repo.",
-                "errors": {}
-            }), 500
-
-        with open(spec_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-        return jsonify(data), 200
-
+        return OPENAPI_SPEC.respuesta(request, completo=request.args.get("full") == "1")
+    except FileNotFoundError:
+        return jsonify({
+            "message": "Spec openapi.json no encontrado en la raíz del repo.",
+            "errors": {}
+        }), 500
     except Exception:
         logging.exception("❌ Error al servir /openapi.json en Usuario")
         return jsonify({
@@ -464,7 +522,7 @@ def get_all_airplanes_with_seats():
         gestionvuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
 
         # 1) Obtener todos los aviones
-        resp_planes = requests.get(f"{gestionvuelos_url}/get_airplanes", timeout=20)
+        resp_planes = HTTP.get(f"{gestionvuelos_url}/get_airplanes", timeout=20)
         if resp_planes.status_code != 200:
             return jsonify({"error": "No se pudieron obtener los aviones."}), 500
 
@@ -474,7 +532,7 @@ def get_all_airplanes_with_seats():
             return jsonify({"message": "No hay aviones registrados actualmente."}), 404
 
         # 2) Obtener todos los asientos agrupados por avión
-        resp_seats = requests.get(f"{gestionvuelos_url}/seats/grouped-by-airplane", timeout=20)
+        resp_seats = HTTP.get(f"{gestionvuelos_url}/seats/grouped-by-airplane", timeout=20)
         if resp_seats.status_code != 200:
             return jsonify({"error": "No se pudieron obtener los asientos."}), 500
 
@@ -546,11 +604,11 @@ def get_seats_by_airplane_id(airplane_id):
     app.logger.info(f"🔍 Consultando asientos del avión ID {airplane_id} en: {url}")
 
     try:
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
         app.logger.info("📥 HTTP %d recibido", response.status_code)
 
         # 🧾 Validación de respuesta JSON esperada
-        if response.status_code == 200 and 'application/json' in response.headers.get('Content-Type', ''):
+        if response.status_code == 200 and es_json(response):
             data = response.json()
             if isinstance(data, list):
                 app.logger.info(f"✅ Se recibieron {len(data)} asientos.")
@@ -674,7 +732,7 @@ def get_all_flights():
     app.logger.info("🌐 Consultando rutas de vuelo al microservicio: %s", url)
 
     try:
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
         status = response.status_code
         content_type = response.headers.get("Content-Type", "")
 
@@ -685,7 +743,7 @@ def get_all_flights():
             app.logger.warning("⚠️ Respuesta no exitosa del microservicio: %d", status)
             return None
 
-        if 'application/json' not in content_type:
+        if not es_json(response):
             app.logger.warning("⚠️ Se esperaba JSON, pero se recibió: %s", content_type)
             return None
 
@@ -712,6 +770,18 @@ def get_all_flights():
 ################################################################################################
 
 
+## Formato de número de asiento: fila (1-999, sin ceros a la izquierda) + letra de columna.
+## Se valida en O(1) sin regex; GestiónVuelos comprueba luego la letra contra la cabina del avión
+## (las de fuselaje ancho llegan hasta la K y las filas pasan de 99).
+def formato_asiento_valido(seat_number):
+    fila, letra = seat_number[:-1], seat_number[-1:]
+    return (
+        1 <= len(fila) <= 3
+        and fila.isascii() and fila.isdigit() and fila[0] != "0"
+        and "A" <= letra <= "Z"
+    )
+
+
 ## Función para notificar el estado de un asiento en un vuelo al microservicio de gestión de vuelos
 ## y devolver la respuesta al cliente
 def notificar_estado_asiento_en_vuelos(airplane_id, seat_number, status):
@@ -737,19 +807,18 @@ def notificar_estado_asiento_en_vuelos(airplane_id, seat_number, status):
         return {"ok": False, "error": "ID del avión inválido."}
 
     # Validación 2: seat_number no vacío y con formato tipo '12A'
-    import re
     if not isinstance(seat_number, str) or not seat_number.strip():
         msg = "El número de asiento ('seat_number') debe ser un texto no vacío."
         app.logger.warning(f"⚠️ {msg}")
         return {"ok": False, "error": msg}
-    if not re.match(r'^\d{1,2}[A-Z]$', seat_number.strip().upper()):
+    if not formato_asiento_valido(seat_number.strip().upper()):
         msg = f"El número de asiento '{seat_number}' no tiene un formato válido. Se espera algo como '1A'."
         app.logger.warning(f"⚠️ {msg}")
         return {"ok": False, "error": msg}
 
     url = f"{vuelos_service}/airplanes/{airplane_id}/seats/{seat_number}"
     try:
-        response = requests.put(url, json={"status": status}, timeout=20)
+        response = HTTP.put(url, json={"status": status}, timeout=20)
         app.logger.info("🪑 Estado del asiento actualizado: %s [%d]", url, response.status_code)
         return {"ok": response.status_code == 200}
     except requests.RequestException as e:
@@ -827,7 +896,7 @@ def get_airplane_route_by_id(airplane_route_id):
         gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
         url = f"{gestion_vuelos_url}/get_airplanes_route_by_id/{airplane_route_id}"
 
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
         status = response.status_code
 
         if status == 404:
@@ -836,8 +905,7 @@ def get_airplane_route_by_id(airplane_route_id):
             logging.warning(f"⚠️ Código inesperado del microservicio: {status}")
             return jsonify({"message": "Error al consultar el microservicio GestiónVuelos"}), 500
 
-        content_type = response.headers.get('Content-Type', '')
-        if 'application/json' not in content_type:
+        if not es_json(response):
             logging.error("❌ La respuesta no es JSON")
             return jsonify({"message": "El microservicio no respondió con JSON válido"}), 500
 
@@ -858,6 +926,152 @@ def get_airplane_route_by_id(airplane_route_id):
         return jsonify({"message": "Error interno del servidor"}), 500
 
 
+## Buscar vuelos por origen, destino y fechas en el microservicio de gestión de vuelos
+## (los filtros se reenvían tal cual; GestiónVuelos los valida y usa sus índices)
+@app.route('/search_flights', methods=['GET'])
+def search_flights():
+    """
+    Summary: Busca vuelos disponibles
+    Description:
+      Reenvía la búsqueda al microservicio GestiónVuelos, que filtra por origen, destino,
+      ventana de fechas de salida, precio y moneda usando índices en memoria. Cada resultado
+      incluye los asientos libres del avión. Los errores de validación se devuelven con el
+      mismo código (400) que da el microservicio.
+    ---
+    tags:
+      - Flights routes and seats
+    produces:
+      - application/json
+    parameters:
+      - {name: origin, in: query, type: string}
+      - {name: destination, in: query, type: string}
+      - {name: date_from, in: query, type: string, description: "ISO, p. ej. 2025-04-30"}
+      - {name: date_to, in: query, type: string}
+      - {name: max_price, in: query, type: integer}
+      - {name: currency, in: query, type: string}
+      - {name: min_seats, in: query, type: integer}
+      - {name: limit, in: query, type: integer}
+    responses:
+      200:
+        description: Vuelos encontrados
+        examples:
+          application/json:
+            {
+              "count": 1,
+              "results": [
+                {
+                  "airplane_route_id": 12,
+                  "flight_number": "LAV102",
+                  "departure": "SJO",
+                  "arrival": "PTY",
+                  "departure_time": "Abril 30, 2025 - 08:00:00",
+                  "departure_ts": 1746000000,
+                  "available_seats": 120,
+                  "capacity": 180
+                }
+              ]
+            }
+      400:
+        description: Parámetros de búsqueda inválidos
+      500:
+        description: Error de conexión o respuesta inválida del microservicio
+    """
+    try:
+        gestion_vuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
+        response = HTTP.get(f"{gestion_vuelos_url}/search_flights", params=request.args, timeout=20)
+        status = response.status_code
+
+        if not es_json(response):
+            logging.error("❌ La respuesta de búsqueda no es JSON")
+            return jsonify({"message": "El microservicio no respondió con JSON válido"}), 500
+        if status in (200, 400):
+            return jsonify(response.json()), status
+
+        logging.warning(f"⚠️ Código inesperado del microservicio: {status}")
+        return jsonify({"message": "Error al consultar el microservicio GestiónVuelos"}), 500
+
+    except requests.RequestException as e:
+        logging.error(f"❌ Error de red al buscar vuelos: {e}")
+        return jsonify({"message": "Error de conexión con el microservicio"}), 500
+    except Exception:
+        logging.exception("❌ Error inesperado al buscar vuelos.")
+        return jsonify({"message": "Error interno del servidor"}), 500
+
+
+## Resumen por ruta para dashboards: ocupación (GestiónVuelos) + ingresos (GestiónReservas)
+## Ambos servicios responden desde contadores incrementales; aquí solo se unen por airplane_route_id
+@app.route('/routes/summary', methods=['GET'])
+def routes_summary():
+    """
+    Summary: Ocupación e ingresos por ruta
+    Description:
+      Une el resumen de ocupación de GestiónVuelos (/routes/load_summary) con los
+      ingresos por ruta de GestiónReservas (/payments/revenue_by_route). Ambos se
+      calculan con contadores que se actualizan en cada cambio, así que el costo es
+      O(rutas) y no depende de la cantidad de asientos o pagos.
+    ---
+    tags:
+      - Flights routes and seats
+    produces:
+      - application/json
+    responses:
+      200:
+        description: Ocupación e ingresos por ruta
+        examples:
+          application/json:
+            {
+              "routes": [
+                {
+                  "airplane_route_id": 1,
+                  "flight_number": "CZ-3560",
+                  "airplane_id": 2,
+                  "capacity": 15,
+                  "seats": {"Libre": 12, "Reservado": 2, "Pagado": 1},
+                  "load_factor": 0.2,
+                  "payments": 1,
+                  "revenue": {"Dolares": 98000.0}
+                }
+              ],
+              "totals": {"routes": 1, "load_factor": 0.2, "payments": 1, "revenue": {"Dolares": 98000.0}}
+            }
+      500:
+        description: Error de conexión o respuesta inválida de algún microservicio
+    """
+    try:
+        gestion_vuelos = os.getenv("GESTIONVUELOS_SERVICE")
+        gestion_reservas = os.getenv("GESTIONRESERVAS_SERVICE")
+        ocupacion_resp = HTTP.get(f"{gestion_vuelos}/routes/load_summary", timeout=20)
+        ingresos_resp = HTTP.get(f"{gestion_reservas}/payments/revenue_by_route", timeout=20)
+        if ocupacion_resp.status_code != 200 or ingresos_resp.status_code != 200:
+            logging.warning(f"⚠️ Códigos inesperados: vuelos={ocupacion_resp.status_code}, reservas={ingresos_resp.status_code}")
+            return jsonify({"message": "Error al consultar los microservicios para el resumen de rutas"}), 500
+
+        ocupacion = ocupacion_resp.json()
+        ingresos = ingresos_resp.json()
+        por_ruta = {r["airplane_route_id"]: r for r in ingresos.get("routes", [])}
+
+        rutas = []
+        for ruta in ocupacion.get("routes", []):
+            pagos = por_ruta.get(ruta["airplane_route_id"], {})
+            rutas.append({**ruta, "payments": pagos.get("payments", 0), "revenue": pagos.get("revenue", {})})
+
+        return jsonify({
+            "routes": rutas,
+            "totals": {
+                **ocupacion.get("totals", {}),
+                "payments": ingresos.get("totals", {}).get("payments", 0),
+                "revenue": ingresos.get("totals", {}).get("revenue", {}),
+            }
+        }), 200
+
+    except requests.RequestException as e:
+        logging.error(f"❌ Error de red al armar el resumen de rutas: {e}")
+        return jsonify({"message": "Error de conexión con los microservicios"}), 500
+    except Exception:
+        logging.exception("❌ Error inesperado al armar el resumen de rutas.")
+        return jsonify({"message": "Error interno del servidor"}), 500
+
+
 ################################################################################################
 ################################################################################################
 ## Fin de la sección de rutas de vuelo
@@ -946,7 +1160,7 @@ def get_reservation_by_code(reservation_code):
         gestion_reservas_url = os.getenv("GESTIONRESERVAS_SERVICE")
         url = f"{gestion_reservas_url}/get_reservation_by_code/{reservation_code}"
 
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
 
         if response.status_code == 404:
             return jsonify({'message': 'Reserva no encontrada en GestiónReservas'}), 404
@@ -1045,7 +1259,7 @@ def consultar_reserva_por_id_usuario(reservation_id):
         gestion_reservas_url = os.getenv("GESTIONRESERVAS_SERVICE")
         url = f"{gestion_reservas_url}/get_reservation_by_id/{reservation_id}"
 
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
 
         if response.status_code == 404:
             return jsonify({'message': 'Reserva no encontrada en GestiónReservas'}), 404
@@ -1161,7 +1375,7 @@ def usuario_modify_reservation(reservation_code):
 
     # 3) Obtener la reserva actual de GestiónReservas
     try:
-        get_resp = requests.get(f"{gestion_reservas}/get_reservation_by_code/{code}", timeout=20)
+        get_resp = HTTP.get(f"{gestion_reservas}/get_reservation_by_code/{code}", timeout=20)
     except requests.exceptions.ConnectionError:
         return jsonify({'message': 'No se pudo conectar con GestiónReservas.'}), 503
     except requests.exceptions.Timeout:
@@ -1183,7 +1397,7 @@ def usuario_modify_reservation(reservation_code):
     if new_seat != reserva_actual['seat_number']:
         airplane_id = reserva_actual['airplane_id']
         try:
-            seats_resp = requests.get(f"{gestion_vuelos}/get_airplane_seats/{airplane_id}/seats", timeout=20)
+            seats_resp = HTTP.get(f"{gestion_vuelos}/get_airplane_seats/{airplane_id}/seats", timeout=20)
         except requests.exceptions.ConnectionError:
             return jsonify({'message': 'No se pudo conectar con GestiónVuelos para verificar asiento.'}), 503
         except requests.exceptions.Timeout:
@@ -1200,7 +1414,7 @@ def usuario_modify_reservation(reservation_code):
 
     # 6) Enviar cambios a GestiónReservas
     try:
-        put_resp = requests.put(
+        put_resp = HTTP.put(
             f"{gestion_reservas}/reservations/{code}",
             json=data,
             timeout=20
@@ -1223,7 +1437,7 @@ def usuario_modify_reservation(reservation_code):
 
         # Liberar
         try:
-            free_resp = requests.put(
+            free_resp = HTTP.put(
                 f"{gestion_vuelos}/free_seat/{airplane_id}/seats/{old_seat}",
                 timeout=20
             )
@@ -1234,7 +1448,7 @@ def usuario_modify_reservation(reservation_code):
 
         # Reservar
         try:
-            reserve_resp = requests.put(
+            reserve_resp = HTTP.put(
                 f"{gestion_vuelos}/update_seat_status/{airplane_id}/seats/{new_seat}",
                 json={"status": "Reservado"},
                 timeout=20
@@ -1261,7 +1475,7 @@ def put_reserva_en_microservicio(codigo, reserva_data):
     app.logger.info("📝 Enviando PUT al microservicio de reservas: %s", url)
 
     try:
-        response = requests.put(url, json=reserva_data)
+        response = HTTP.put(url, json=reserva_data)
         app.logger.info("📥 Código de respuesta: %d", response.status_code)
         if response.status_code == 200:
             return {"ok": True, "data": response.json()}
@@ -1310,7 +1524,7 @@ def eliminar_reserva_usuario_por_id(reservation_id):
         # Consultar y eliminar reserva en GestiónReservas
         gestionreservas_url = os.getenv("GESTIONRESERVAS_SERVICE")
         url_delete = f"{gestionreservas_url}/delete_reservation_by_id/{reservation_id}"
-        response = requests.delete(url_delete, timeout=20)
+        response = HTTP.delete(url_delete, timeout=20)
 
         if response.status_code == 404:
             return jsonify({"message": "Reserva no encontrada"}), 404
@@ -1336,7 +1550,7 @@ def eliminar_reserva_usuario_por_id(reservation_id):
         gestionvuelos_url = os.getenv("GESTIONVUELOS_SERVICE")
         liberar_url = f"{gestionvuelos_url}/free_seat/{airplane_id}/seats/{seat_number}"
         try:
-            response_vuelos = requests.put(liberar_url, timeout=20)
+            response_vuelos = HTTP.put(liberar_url, timeout=20)
             if response_vuelos.status_code != 200:
                 return jsonify({
                     "message": "Reserva eliminada, pero no se pudo liberar el asiento",
@@ -1379,7 +1593,7 @@ def listar_reservas():
     """
     try:
         gestion_reservas_url = os.getenv("GESTIONRESERVAS_SERVICE", "http://GestionReservas:5000")
-        resp = requests.get(f"{gestion_reservas_url}/get_fake_reservations", timeout=20)
+        resp = HTTP.get(f"{gestion_reservas_url}/get_fake_reservations", timeout=20)
 
         # Si GestiónReservas devuelve 204, lo convertimos en 200 con mensaje
         if resp.status_code == 204:
@@ -1475,7 +1689,7 @@ def usuario_add_reservation():
 
         # 3) Validar ruta ↔ avión en GestiónVuelos
         try:
-            routes_resp = requests.get(f"{gestion_vuelos}/get_all_airplanes_routes", timeout=20)
+            routes_resp = HTTP.get(f"{gestion_vuelos}/get_all_airplanes_routes", timeout=20)
         except requests.exceptions.ConnectionError:
             return jsonify({'message': 'No se pudo conectar con GestiónVuelos al obtener rutas.'}), 503
         except requests.exceptions.Timeout:
@@ -1496,7 +1710,7 @@ def usuario_add_reservation():
 
         # 4) Validar que el asiento esté Libre
         try:
-            seats_resp = requests.get(
+            seats_resp = HTTP.get(
                 f"{gestion_vuelos}/get_airplane_seats/{airplane_id}/seats",
                 timeout=20
             )
@@ -1516,7 +1730,7 @@ def usuario_add_reservation():
 
         # 5) Llamar primero a GestiónReservas para crear la reserva
         try:
-            resp = requests.post(
+            resp = HTTP.post(
                 f"{gestion_reservas}/add_reservation",
                 json=validated,
                 timeout=20
@@ -1536,7 +1750,7 @@ def usuario_add_reservation():
 
         # 6) Solo ahora marcamos el asiento como Reservado en GestiónVuelos
         try:
-            book_resp = requests.put(
+            book_resp = HTTP.put(
                 f"{gestion_vuelos}/update_seat_status/{airplane_id}/seats/{seat_number}",
                 json={'status': 'Reservado'},
                 timeout=20
@@ -1613,7 +1827,7 @@ def cancel_payment_and_reservation(payment_id):
 
     # 2) Llamar a GestiónReservas
     try:
-        resp = requests.delete(
+        resp = HTTP.delete(
             f"{gestion_reservas_url}/cancel_payment_and_reservation/{pid}",
             timeout=20
         )
@@ -1643,9 +1857,18 @@ def get_all_payments():
     Description:
       Consulta al microservicio de GestiónReservas para recuperar todos los pagos generados en memoria.
       Valida que la respuesta sea una lista válida. Si no hay pagos, devuelve un mensaje informativo.
+      Con view=compact cada pago referencia su reserva (reservation_id, reservation_code)
+      en lugar de incluirla completa.
     ---
     tags:
       - Payments
+    parameters:
+      - name: view
+        in: query
+        type: string
+        enum: [full, compact]
+        default: full
+        description: full incluye los datos de la reserva en cada pago; compact solo la referencia
     responses:
       200:
         description: Lista de pagos o mensaje indicando que no hay pagos
@@ -1677,12 +1900,23 @@ def get_all_payments():
                 "_schema": ["Invalid input type."]
               }
             }
+      400:
+        description: Valor de view inválido
+        examples:
+          application/json:
+            {
+              "message": "El parámetro view debe ser 'full' o 'compact'."
+            }
     """
+    vista = request.args.get('view', 'full')
+    if vista not in ('full', 'compact'):
+        return jsonify({'message': "El parámetro view debe ser 'full' o 'compact'."}), 400
+
     try:
         gestion_reservas_url = os.getenv("GESTIONRESERVAS_SERVICE")
         url = f"{gestion_reservas_url}/get_all_fake_payments"
 
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, params={'view': vista} if vista == 'compact' else None, timeout=20)
 
         if response.status_code != 200:
             return jsonify({'message': f'Error al consultar pagos. Código: {response.status_code}'}), response.status_code
@@ -1793,7 +2027,7 @@ def get_payment_by_id(payment_id):
         gestion_reservas_url = os.getenv("GESTIONRESERVAS_SERVICE")
         url = f"{gestion_reservas_url}/get_payment_by_id/{payment_id}"
 
-        response = requests.get(url, timeout=20)
+        response = HTTP.get(url, timeout=20)
 
         if response.status_code == 404:
             return jsonify({'message': f'No se encontró ningún pago con ID: {payment_id}'}), 404
@@ -1907,7 +2141,7 @@ def usuario_create_payment():
 
         # 2) Verificar existencia de la reserva
         try:
-            chk = requests.get(
+            chk = HTTP.get(
                 f"{gestion_reservas}/get_reservation_by_id/{reservation_id}",
                 timeout=timeout
             )
@@ -1927,7 +2161,7 @@ def usuario_create_payment():
 
         # 3) Delegar la creación del pago a GestiónReservas
         try:
-            resp = requests.post(
+            resp = HTTP.post(
                 f"{gestion_reservas}/create_payment",
                 json={
                     'reservation_id': reservation_id,
@@ -1950,7 +2184,7 @@ def usuario_create_payment():
 
         # 4) Notificar a GestiónVuelos para marcar el asiento como 'Pagado'
         try:
-            vuelo_resp = requests.put(
+            vuelo_resp = HTTP.put(
                 f"{gestion_vuelos}/update_seat_status/{airplane_id}/seats/{seat_number}",
                 json={"status": "Pagado"},
                 timeout=20
@@ -2047,7 +2281,7 @@ def usuario_edit_payment(payment_id):
     timeout = 20
 
     try:
-        resp = requests.put(
+        resp = HTTP.put(
             f"{gestion_reservas}/edit_payment/{pid}",
             json=data,
             timeout=timeout
@@ -0,0 +1,96 @@
+"""
+Arranque en frío rápido: Faker y Swagger se construyen en el primer uso.
+
+Importar faker (con sus providers) y flasgger se lleva la mayor parte del
+tiempo de import de cada servicio, y ninguno de los dos hace falta para
+atender el tráfico normal:
+
+- FakerPerezoso crea el Faker en el primer atributo que se le pide (seed).
+- SwaggerPerezoso deja /apidocs/ y /apispec_1.json detrás de un middleware
+  WSGI que importa flasgger y arma la documentación en la primera visita.
+
+El perfil de import se ve con `python -X importtime -c "import app"` o con
+tests/perf/test_startup_import.py.
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import importlib
+import threading
+
+from flask import Flask
+
+
+class FakerPerezoso:
+    """
+    Proxy de Faker: el primer atributo pedido importa faker, crea la instancia
+    y registra los providers ('modulo.Clase').
+    """
+
+    def __init__(self, *providers):
+        self._providers = providers
+        self._faker = None
+        self._lock = threading.Lock()
+
+    def _instancia(self):
+        if self._faker is None:
+            with self._lock:
+                if self._faker is None:
+                    from faker import Faker
+                    faker = Faker()
+                    for ruta in self._providers:
+                        modulo, _, clase = ruta.rpartition(".")
+                        faker.add_provider(getattr(importlib.import_module(modulo), clase))
+                    self._faker = faker
+        return self._faker
+
+    def __getattr__(self, nombre):
+        return getattr(self._instancia(), nombre)
+
+
+class SwaggerPerezoso:
+    """
+    Middleware WSGI para las rutas de flasgger. La primera solicitud a
+    /apidocs/, /apispec_1.json o sus estáticos construye una app Flask aparte
+    con Swagger; el spec se sigue generando desde las rutas (y docstrings) de
+    la app del servicio.
+    """
+
+    RUTAS = ("/apidocs", "/apispec_1.json", "/flasgger_static/", "/oauth2-redirect.html")
+
+    def __init__(self, app, template):
+        self.app = app
+        self.template = template
+        self.swagger = None
+        self._docs = None
+        self._lock = threading.Lock()
+        self._siguiente = app.wsgi_app
+        app.wsgi_app = self
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "").startswith(self.RUTAS):
+            return self.docs().wsgi_app(environ, start_response)
+        return self._siguiente(environ, start_response)
+
+    def docs(self):
+        if self._docs is None:
+            with self._lock:
+                if self._docs is None:
+                    self._docs = self._construir()
+        return self._docs
+
+    def _construir(self):
+        from flasgger import Swagger
+
+        principal = self.app
+
+        class _Swagger(Swagger):
+            def get_apispecs(self, endpoint="apispec_1"):
+                # flasgger recorre current_app.url_map: el de la app del servicio
+                with principal.app_context():
+                    return super().get_apispecs(endpoint)
+
+        docs = Flask(__name__)
+        docs.config["SWAGGER"] = principal.config.get("SWAGGER", {})
+        self.swagger = _Swagger(docs, template=self.template)
+        return docs
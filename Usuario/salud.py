@@ -0,0 +1,282 @@
+"""
+Liveness y readiness: GET /livez y GET /readyz.
+
+- /livez solo dice que el proceso atiende solicitudes (200 siempre): es lo que
+  debe mirar quien reinicia el contenedor. No consulta dependencias.
+- /readyz dice si el servicio puede atender tráfico real: seed o arranque
+  terminado, store consistente y dependencias listas. 503 si falta algo, con
+  los motivos, los tamaños del store y el estado de cada dependencia.
+
+Cada dependencia (Dependencia) sondea el /readyz del upstream con un timeout
+corto y guarda el resultado `ttl` segundos; mientras una solicitud sondea, las
+demás reciben el último resultado. Así un balanceador que pregunta seguido no
+multiplica la carga hacia arriba.
+
+Cada dependencia tiene además un disyuntor (circuit breaker). Con
+Dependencias.proteger(sesion), una llamada a un upstream con el disyuntor
+abierto falla al instante con CircuitoAbierto (un requests.ConnectionError,
+así los manejadores que ya existen la tratan como una caída de red) en lugar
+de esperar el timeout de 20 s. El disyuntor se abre con `umbral` fallos
+seguidos (error de red, timeout, 502/503/504) o cuando la sonda no llega al
+upstream; tras `enfriamiento` segundos deja pasar una llamada de prueba. Que el
+upstream responda /readyz con 503 (no listo, p. ej. porque su propia
+dependencia está caída) solo se informa: sus demás endpoints pueden seguir
+atendiendo y el disyuntor no se abre por eso.
+
+Este archivo se copia tal cual en cada microservicio, igual que metrics.py.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# Respuestas del upstream que cuentan como fallo para el disyuntor (500 suele
+# ser un error de la solicitud, no una caída del servicio)
+_CODIGOS_DE_FALLO = frozenset((502, 503, 504))
+
+
+class CircuitoAbierto(requests.exceptions.ConnectionError):
+    """Llamada rechazada sin tocar la red: el disyuntor del upstream está abierto."""
+
+
+class Disyuntor:
+    """Circuit breaker: cerrado -> abierto (rechaza) -> semiabierto (una prueba) -> cerrado."""
+
+    def __init__(self, umbral=3, enfriamiento=5.0):
+        self.umbral = umbral
+        self.enfriamiento = enfriamiento
+        self._lock = threading.Lock()
+        self.estado = "cerrado"
+        self.fallos_seguidos = 0
+        self.aperturas = 0
+        self.rechazadas = 0
+        self.ultimo_error = None
+        self._abierto_hasta = 0.0
+        self._prueba_en_curso = False
+
+    def permitir(self):
+        with self._lock:
+            if self.estado == "abierto" and time.monotonic() >= self._abierto_hasta:
+                self.estado = "semiabierto"
+                self._prueba_en_curso = False
+            if self.estado == "cerrado":
+                return True
+            if self.estado == "semiabierto" and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            self.rechazadas += 1
+            return False
+
+    def exito(self):
+        with self._lock:
+            self.estado = "cerrado"
+            self.fallos_seguidos = 0
+            self._prueba_en_curso = False
+
+    def fallo(self, motivo):
+        with self._lock:
+            self.fallos_seguidos += 1
+            self.ultimo_error = motivo
+            if self.estado == "semiabierto" or self.fallos_seguidos >= self.umbral:
+                self._abrir()
+
+    def abrir(self, motivo):
+        with self._lock:
+            self.ultimo_error = motivo
+            if self.estado != "abierto":
+                self._abrir()
+
+    def _abrir(self):
+        # Se llama con self._lock tomado
+        self.estado = "abierto"
+        self.aperturas += 1
+        self._abierto_hasta = time.monotonic() + self.enfriamiento
+        self._prueba_en_curso = False
+
+    def snapshot(self):
+        with self._lock:
+            restante = self._abierto_hasta - time.monotonic() if self.estado == "abierto" else 0.0
+            return {
+                "state": self.estado,
+                "consecutive_failures": self.fallos_seguidos,
+                "opens": self.aperturas,
+                "rejected": self.rechazadas,
+                "retry_in_s": round(max(restante, 0.0), 2),
+                "last_error": self.ultimo_error,
+            }
+
+
+class Dependencia:
+    """Un upstream: su URL base (variable de entorno), la sonda cacheada de /readyz y su disyuntor."""
+
+    def __init__(self, nombre, variable, ttl=2.0, timeout=1.0, umbral=3, enfriamiento=5.0):
+        self.nombre = nombre
+        self.variable = variable
+        self.ttl = ttl
+        self.timeout = timeout
+        self.disyuntor = Disyuntor(umbral, enfriamiento)
+        # Las sondas van por una sesión propia: ni cuentan como tráfico ni pasan por el disyuntor
+        self._sesion = requests.Session()
+        self._lock = threading.Lock()
+        self._sondeo = threading.Lock()
+        self._resultado = None
+        self._medido_en = 0.0
+
+    def url(self):
+        return (os.getenv(self.variable) or "").rstrip("/")
+
+    def sondear(self, forzar=False):
+        """Último resultado de GET <upstream>/readyz; se renueva si tiene más de `ttl` segundos."""
+        with self._lock:
+            vigente = self._resultado is not None and time.monotonic() - self._medido_en < self.ttl
+            if vigente and not forzar:
+                return self._con_edad()
+        # Una sola sonda a la vez; si ya hay otra en curso se devuelve el resultado anterior
+        medido_antes = self._medido_en
+        if not self._sondeo.acquire(blocking=self._resultado is None):
+            with self._lock:
+                return self._con_edad()
+        try:
+            with self._lock:
+                if self._medido_en != medido_antes:
+                    # Otra solicitud sondeó mientras se esperaba
+                    return self._con_edad()
+            resultado = self._medir()
+            with self._lock:
+                self._resultado = resultado
+                self._medido_en = time.monotonic()
+                return self._con_edad()
+        finally:
+            self._sondeo.release()
+
+    def _con_edad(self):
+        # Se llama con self._lock tomado
+        return {**self._resultado, "age_s": round(time.monotonic() - self._medido_en, 2)}
+
+    def _medir(self):
+        url = self.url()
+        if not url:
+            resultado = {"ready": False, "status_code": None, "latency_ms": None,
+                         "error": f"{self.variable} no está configurado."}
+            self.disyuntor.abrir(resultado["error"])
+            return resultado
+        t0 = time.perf_counter()
+        try:
+            resp = self._sesion.get(f"{url}/readyz", timeout=self.timeout)
+            resultado = {"ready": resp.status_code == 200, "status_code": resp.status_code, "error": None}
+        except requests.exceptions.RequestException as e:
+            resultado = {"ready": False, "status_code": None, "error": type(e).__name__}
+        resultado["latency_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        if resultado["ready"]:
+            self.disyuntor.exito()
+        elif resultado["status_code"] is None:
+            # Sin respuesta: el upstream está caído, no solo sin terminar de arrancar
+            self.disyuntor.abrir(f"readyz: {resultado['error']}")
+        return resultado
+
+    def estado(self):
+        return {**self.sondear(), "breaker": self.disyuntor.snapshot()}
+
+
+class Dependencias:
+    """Las dependencias de un servicio, buscables por la URL de una llamada saliente."""
+
+    def __init__(self, *dependencias):
+        self.todas = dependencias
+
+    def para(self, url):
+        destino = urlsplit(str(url)).netloc
+        for dependencia in self.todas:
+            if destino and urlsplit(dependencia.url()).netloc == destino:
+                return dependencia
+        return None
+
+    def estado(self):
+        """(todas listas, {nombre: estado}) con las sondas cacheadas."""
+        detalle = {d.nombre: d.estado() for d in self.todas}
+        return all(e["ready"] for e in detalle.values()), detalle
+
+    def proteger(self, sesion, connect_timeout=None):
+        """
+        Envuelve sesion.request con el disyuntor de la dependencia de destino.
+        Con `connect_timeout`, un timeout escalar t pasa a (min(connect_timeout, t), t):
+        un upstream que no acepta conexiones se detecta en segundos, no en t.
+        Tras un fallo se vuelve a sondear el upstream (la sonda abre el disyuntor
+        si no responde), así no hacen falta `umbral` timeouts para dejar de llamarlo.
+        """
+        original = sesion.request
+
+        def request_protegido(method, url, *args, **kwargs):
+            dependencia = self.para(url)
+            if dependencia is None:
+                return original(method, url, *args, **kwargs)
+            timeout = kwargs.get("timeout")
+            if connect_timeout is not None and isinstance(timeout, (int, float)):
+                kwargs["timeout"] = (min(connect_timeout, timeout), timeout)
+            disyuntor = dependencia.disyuntor
+            if not disyuntor.permitir():
+                raise CircuitoAbierto(f"Circuito abierto hacia {dependencia.nombre}; "
+                                      f"último error: {disyuntor.ultimo_error}")
+            try:
+                resp = original(method, url, *args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                disyuntor.fallo(type(e).__name__)
+                dependencia.sondear(forzar=True)
+                raise
+            if resp.status_code in _CODIGOS_DE_FALLO:
+                disyuntor.fallo(f"HTTP {resp.status_code}")
+                dependencia.sondear(forzar=True)
+            else:
+                disyuntor.exito()
+            return resp
+
+        sesion.request = request_protegido
+
+
+def registrar_salud(app, servicio, comprobar, dependencias=None):
+    """
+    Registra GET /livez y GET /readyz. `comprobar()` devuelve (motivos, detalle):
+    la lista de motivos por los que el servicio no está listo (vacía si lo está)
+    y un dict con los tamaños del store, el seed, etc.
+    """
+    from flask import jsonify
+
+    @app.route("/livez", methods=["GET"])
+    def livez():
+        """
+        Liveness: el proceso atiende solicitudes
+        ---
+        tags:
+          - Health
+        responses:
+          200:
+            description: Proceso vivo (no consulta dependencias)
+        """
+        return jsonify({"status": "alive", "service": servicio}), 200
+
+    @app.route("/readyz", methods=["GET"])
+    def readyz():
+        """
+        Readiness: seed terminado, store consistente y dependencias listas
+        ---
+        tags:
+          - Health
+        responses:
+          200:
+            description: Listo para recibir tráfico
+          503:
+            description: No listo; `reasons` explica por qué
+        """
+        motivos, detalle = comprobar()
+        motivos = list(motivos)
+        payload = {"service": servicio, "checks": detalle}
+        if dependencias is not None:
+            _, payload["dependencies"] = dependencias.estado()
+            motivos += [f"{nombre} no está listo." for nombre, estado in payload["dependencies"].items()
+                        if not estado["ready"]]
+        payload["status"] = "not_ready" if motivos else "ready"
+        payload["reasons"] = motivos
+        return jsonify(payload), 503 if motivos else 200
@@ -11,11 +11,12 @@ Estas herramientas se usarán desde ChatGPT/QA-Copilot como apoyo
 para diseñar y ejecutar pruebas sobre los endpoints.
 """
 
-from typing import Any, Literal
-import subprocess
+from typing import Any, Awaitable, Literal
+import asyncio
+import os
 from pathlib import Path
 
-import requests
+import httpx
 from fastmcp import FastMCP
 import logging
 
@@ -37,12 +38,38 @@ REPO_ROOT = SERVER_DIR.parent  # carpeta raíz del repo (LABORATORIO)
 DOCS_DIR = REPO_ROOT / "docs"
 TESTS_API_DIR = REPO_ROOT / "tests" / "api"
 
+# Pool de conexiones compartido por todas las tools: las llamadas de varios
+# agentes a la vez reutilizan conexiones en lugar de abrir una por llamada.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("MCP_HTTP_MAX_KEEPALIVE", "10")),
+)
+
 
 # ---------------------------------------------------------------------------
 # HELPER HTTP
 # ---------------------------------------------------------------------------
 
-def _call_service(
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http_client() -> httpx.AsyncClient:
+    """
+    Cliente httpx asíncrono compartido (keep-alive, pool acotado por HTTP_LIMITS).
+
+    Un AsyncClient queda atado al event loop donde se usó por primera vez, así
+    que se crea uno nuevo si las tools corren en otro loop (p. ej. en tests).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(limits=HTTP_LIMITS, follow_redirects=True)  # como requests
+        _client_loop = loop
+    return _client
+
+
+async def _call_service(
     service: Literal["vuelos", "reservas", "usuario"],
     method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"],
     path: str,
@@ -62,8 +89,8 @@ def _call_service(
 
     url = f"{base_url}{path}"
     try:
-        resp = requests.request(method=method, url=url, json=json_body, timeout=timeout)
-    except requests.RequestException as e:
+        resp = await _http_client().request(method, url, json=json_body, timeout=timeout)
+    except httpx.HTTPError as e:
         logger.error("Error de red llamando %s%s: %s", base_url, path, e)
         return {
             "status": 0,
@@ -79,33 +106,50 @@ def _call_service(
 
     return {
         "status": resp.status_code,
-        "ok": resp.ok,
+        "ok": resp.status_code < 400,
         "url": url,
         "body": body,
     }
 
 
+async def _fan_out(calls: dict[str, Awaitable[dict[str, Any]]]) -> dict[str, dict[str, Any]]:
+    """Ejecuta las llamadas en paralelo y devuelve sus resultados con las mismas claves."""
+    results = await asyncio.gather(*calls.values())
+    return dict(zip(calls, results))
+
+
 # ---------------------------------------------------------------------------
 # TOOLS GENÉRICOS (POR SERVICIO)
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def get_health(
+async def get_health(
     service: Literal["vuelos", "reservas", "usuario"],
 ) -> dict[str, Any]:
     """Obtiene el estado de salud (/health) del microservicio especificado."""
-    return _call_service(service, "GET", "/health")
+    return await _call_service(service, "GET", "/health")
+
+
+@mcp.tool()
+async def get_health_all() -> dict[str, Any]:
+    """
+    Obtiene /health de los tres microservicios en paralelo.
+
+    ok es True solo si todos respondieron con éxito.
+    """
+    results = await _fan_out({service: _call_service(service, "GET", "/health") for service in BASE_URLS})
+    return {"ok": all(r["ok"] for r in results.values()), "services": results}
 
 
 @mcp.tool()
-def call_endpoint(
+async def call_endpoint(
     service: Literal["vuelos", "reservas", "usuario"],
     method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"],
     path: str,
     payload: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """Herramienta genérica para probar cualquier endpoint de los microservicios."""
-    return _call_service(service, method, path, json_body=payload)
+    return await _call_service(service, method, path, json_body=payload)
 
 
 # ---------------------------------------------------------------------------
@@ -113,7 +157,7 @@ def call_endpoint(
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def add_airplane(
+async def add_airplane(
     airplane_id: int,
     model: str,
     manufacturer: str,
@@ -128,24 +172,24 @@ def add_airplane(
         "year": year,
         "capacity": capacity,
     }
-    return _call_service("vuelos", "POST", "/add_airplane", json_body=body)
+    return await _call_service("vuelos", "POST", "/add_airplane", json_body=body)
 
 
 @mcp.tool()
-def get_airplanes_vuelos() -> dict[str, Any]:
+async def get_airplanes_vuelos() -> dict[str, Any]:
     """GET /get_airplanes en GestiónVuelos."""
-    return _call_service("vuelos", "GET", "/get_airplanes")
+    return await _call_service("vuelos", "GET", "/get_airplanes")
 
 
 @mcp.tool()
-def get_airplane_by_id_vuelos(airplane_id: int) -> dict[str, Any]:
+async def get_airplane_by_id_vuelos(airplane_id: int) -> dict[str, Any]:
     """GET /get_airplane_by_id/<airplane_id> en GestiónVuelos."""
     path = f"/get_airplane_by_id/{airplane_id}"
-    return _call_service("vuelos", "GET", path)
+    return await _call_service("vuelos", "GET", path)
 
 
 @mcp.tool()
-def update_airplane_vuelos(
+async def update_airplane_vuelos(
     airplane_id: int,
     model: str,
     manufacturer: str,
@@ -160,31 +204,31 @@ def update_airplane_vuelos(
         "year": year,
         "capacity": capacity,
     }
-    return _call_service("vuelos", "PUT", path, json_body=body)
+    return await _call_service("vuelos", "PUT", path, json_body=body)
 
 
 @mcp.tool()
-def delete_airplane_by_id_vuelos(airplane_id: int) -> dict[str, Any]:
+async def delete_airplane_by_id_vuelos(airplane_id: int) -> dict[str, Any]:
     """DELETE /delete_airplane_by_id/<airplane_id> en GestiónVuelos."""
     path = f"/delete_airplane_by_id/{airplane_id}"
-    return _call_service("vuelos", "DELETE", path)
+    return await _call_service("vuelos", "DELETE", path)
 
 
 @mcp.tool()
-def get_airplane_seats_vuelos(airplane_id: int) -> dict[str, Any]:
+async def get_airplane_seats_vuelos(airplane_id: int) -> dict[str, Any]:
     """GET /get_airplane_seats/<airplane_id>/seats en GestiónVuelos."""
     path = f"/get_airplane_seats/{airplane_id}/seats"
-    return _call_service("vuelos", "GET", path)
+    return await _call_service("vuelos", "GET", path)
 
 
 @mcp.tool()
-def get_seats_grouped_by_airplane_vuelos() -> dict[str, Any]:
+async def get_seats_grouped_by_airplane_vuelos() -> dict[str, Any]:
     """GET /seats/grouped-by-airplane en GestiónVuelos."""
-    return _call_service("vuelos", "GET", "/seats/grouped-by-airplane")
+    return await _call_service("vuelos", "GET", "/seats/grouped-by-airplane")
 
 
 @mcp.tool()
-def update_seat_status_vuelos(
+async def update_seat_status_vuelos(
     airplane_id: int,
     seat_number: str,
     status: Literal["Libre", "Reservado", "Pagado"],
@@ -192,25 +236,25 @@ def update_seat_status_vuelos(
     """PUT /update_seat_status/<airplane_id>/seats/<seat_number> en GestiónVuelos."""
     path = f"/update_seat_status/{airplane_id}/seats/{seat_number}"
     body = {"status": status}
-    return _call_service("vuelos", "PUT", path, json_body=body)
+    return await _call_service("vuelos", "PUT", path, json_body=body)
 
 
 @mcp.tool()
-def get_random_free_seat_vuelos(airplane_id: int) -> dict[str, Any]:
+async def get_random_free_seat_vuelos(airplane_id: int) -> dict[str, Any]:
     """GET /get_random_free_seat/<airplane_id> en GestiónVuelos."""
     path = f"/get_random_free_seat/{airplane_id}"
-    return _call_service("vuelos", "GET", path)
+    return await _call_service("vuelos", "GET", path)
 
 
 @mcp.tool()
-def free_seat_vuelos(airplane_id: int, seat_number: str) -> dict[str, Any]:
+async def free_seat_vuelos(airplane_id: int, seat_number: str) -> dict[str, Any]:
     """PUT /free_seat/<airplane_id>/seats/<seat_number> en GestiónVuelos."""
     path = f"/free_seat/{airplane_id}/seats/{seat_number}"
-    return _call_service("vuelos", "PUT", path)
+    return await _call_service("vuelos", "PUT", path)
 
 
 @mcp.tool()
-def add_airplane_route_vuelos(
+async def add_airplane_route_vuelos(
     airplane_route_id: int,
     airplane_id: int,
     flight_number: str,
@@ -233,18 +277,18 @@ def add_airplane_route_vuelos(
         "price": price,
         "Moneda": Moneda,
     }
-    return _call_service("vuelos", "POST", "/add_airplane_route", json_body=body)
+    return await _call_service("vuelos", "POST", "/add_airplane_route", json_body=body)
 
 
 @mcp.tool()
-def get_airplane_route_by_id_vuelos(airplane_route_id: int) -> dict[str, Any]:
+async def get_airplane_route_by_id_vuelos(airplane_route_id: int) -> dict[str, Any]:
     """GET /get_airplanes_route_by_id/<airplane_route_id> en GestiónVuelos."""
     path = f"/get_airplanes_route_by_id/{airplane_route_id}"
-    return _call_service("vuelos", "GET", path)
+    return await _call_service("vuelos", "GET", path)
 
 
 @mcp.tool()
-def update_airplane_route_by_id_vuelos(
+async def update_airplane_route_by_id_vuelos(
     airplane_route_id: int,
     airplane_id: int,
     flight_number: str,
@@ -268,22 +312,22 @@ def update_airplane_route_by_id_vuelos(
         "price": price,
         "Moneda": Moneda,
     }
-    return _call_service("vuelos", "PUT", path, json_body=body)
+    return await _call_service("vuelos", "PUT", path, json_body=body)
 
 
 @mcp.tool()
-def delete_airplane_route_by_id_vuelos(airplane_route_id: int) -> dict[str, Any]:
+async def delete_airplane_route_by_id_vuelos(airplane_route_id: int) -> dict[str, Any]:
     """DELETE /delete_airplane_route_by_id/<airplane_route_id> en GestiónVuelos."""
     path = f"/delete_airplane_route_by_id/{airplane_route_id}"
-    return _call_service("vuelos", "DELETE", path)
+    return await _call_service("vuelos", "DELETE", path)
 
 
 @mcp.tool()
-def get_all_airplanes_routes_from_vuelos() -> dict[str, Any]:
+async def get_all_airplanes_routes_from_vuelos() -> dict[str, Any]:
     """
     Envuelve GET /get_all_airplanes_routes en GestiónVuelos.
     """
-    return _call_service("vuelos", "GET", "/get_all_airplanes_routes")
+    return await _call_service("vuelos", "GET", "/get_all_airplanes_routes")
 
 
 # ---------------------------------------------------------------------------
@@ -291,7 +335,7 @@ def get_all_airplanes_routes_from_vuelos() -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def add_reservation_gestionreservas(
+async def add_reservation_gestionreservas(
     airplane_id: int,
     airplane_route_id: int,
     passport_number: str,
@@ -318,47 +362,47 @@ def add_reservation_gestionreservas(
         "seat_number": seat_number,
         "status": status,
     }
-    return _call_service("reservas", "POST", "/add_reservation", json_body=body)
+    return await _call_service("reservas", "POST", "/add_reservation", json_body=body)
 
 
 @mcp.tool()
-def get_reservation_by_code_reservas(reservation_code: str) -> dict[str, Any]:
+async def get_reservation_by_code_reservas(reservation_code: str) -> dict[str, Any]:
     """GET /get_reservation_by_code/<reservation_code> en GestiónReservas."""
     path = f"/get_reservation_by_code/{reservation_code}"
-    return _call_service("reservas", "GET", path)
+    return await _call_service("reservas", "GET", path)
 
 
 @mcp.tool()
-def get_reservation_by_id_reservas(reservation_id: int) -> dict[str, Any]:
+async def get_reservation_by_id_reservas(reservation_id: int) -> dict[str, Any]:
     """GET /get_reservation_by_id/<reservation_id> en GestiónReservas."""
     path = f"/get_reservation_by_id/{reservation_id}"
-    return _call_service("reservas", "GET", path)
+    return await _call_service("reservas", "GET", path)
 
 
 @mcp.tool()
-def delete_reservation_by_id_reservas(reservation_id: int) -> dict[str, Any]:
+async def delete_reservation_by_id_reservas(reservation_id: int) -> dict[str, Any]:
     """DELETE /delete_reservation_by_id/<reservation_id> en GestiónReservas."""
     path = f"/delete_reservation_by_id/{reservation_id}"
-    return _call_service("reservas", "DELETE", path)
+    return await _call_service("reservas", "DELETE", path)
 
 
 @mcp.tool()
-def get_fake_reservations_reservas() -> dict[str, Any]:
+async def get_fake_reservations_reservas() -> dict[str, Any]:
     """GET /get_fake_reservations en GestiónReservas."""
-    return _call_service("reservas", "GET", "/get_fake_reservations")
+    return await _call_service("reservas", "GET", "/get_fake_reservations")
 
 
 @mcp.tool()
-def get_all_reservations_from_reservas() -> dict[str, Any]:
+async def get_all_reservations_from_reservas() -> dict[str, Any]:
     """
     Envuelve GET /get_fake_reservations en GestiónReservas.
     Útil para inspeccionar las reservas de prueba generadas al arrancar.
     """
-    return _call_service("reservas", "GET", "/get_fake_reservations")
+    return await _call_service("reservas", "GET", "/get_fake_reservations")
 
 
 @mcp.tool()
-def create_payment_reservas(
+async def create_payment_reservas(
     reservation_id: int,
     payment_method: str,
     currency: str = "Dolares",
@@ -369,39 +413,39 @@ def create_payment_reservas(
         "payment_method": payment_method,
         "currency": currency,
     }
-    return _call_service("reservas", "POST", "/create_payment", json_body=body)
+    return await _call_service("reservas", "POST", "/create_payment", json_body=body)
 
 
 @mcp.tool()
-def get_payment_by_id_reservas(payment_id: str) -> dict[str, Any]:
+async def get_payment_by_id_reservas(payment_id: str) -> dict[str, Any]:
     """GET /get_payment_by_id/<payment_id> en GestiónReservas."""
     path = f"/get_payment_by_id/{payment_id}"
-    return _call_service("reservas", "GET", path)
+    return await _call_service("reservas", "GET", path)
 
 
 @mcp.tool()
-def cancel_payment_and_reservation_reservas(payment_id: str) -> dict[str, Any]:
+async def cancel_payment_and_reservation_reservas(payment_id: str) -> dict[str, Any]:
     """DELETE /cancel_payment_and_reservation/<payment_id> en GestiónReservas."""
     path = f"/cancel_payment_and_reservation/{payment_id}"
-    return _call_service("reservas", "DELETE", path)
+    return await _call_service("reservas", "DELETE", path)
 
 
 @mcp.tool()
-def edit_payment_reservas(
+async def edit_payment_reservas(
     payment_id: str,
     body: dict[str, Any],
 ) -> dict[str, Any]:
     """PUT /edit_payment/<payment_id> en GestiónReservas."""
     path = f"/edit_payment/{payment_id}"
-    return _call_service("reservas", "PUT", path, json_body=body)
+    return await _call_service("reservas", "PUT", path, json_body=body)
 
 
 @mcp.tool()
-def get_all_fake_payments_from_reservas() -> dict[str, Any]:
+async def get_all_fake_payments_from_reservas() -> dict[str, Any]:
     """
     Envuelve GET /get_all_fake_payments en GestiónReservas.
     """
-    return _call_service("reservas", "GET", "/get_all_fake_payments")
+    return await _call_service("reservas", "GET", "/get_all_fake_payments")
 
 
 # ---------------------------------------------------------------------------
@@ -409,47 +453,47 @@ def get_all_fake_payments_from_reservas() -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def get_seats_by_airplane_id_usuario(airplane_id: int) -> dict[str, Any]:
+async def get_seats_by_airplane_id_usuario(airplane_id: int) -> dict[str, Any]:
     """GET /get_seats_by_airplane_id/<airplane_id>/seats en Usuario."""
     path = f"/get_seats_by_airplane_id/{airplane_id}/seats"
-    return _call_service("usuario", "GET", path)
+    return await _call_service("usuario", "GET", path)
 
 
 @mcp.tool()
-def get_all_airplanes_with_seats_usuario() -> dict[str, Any]:
+async def get_all_airplanes_with_seats_usuario() -> dict[str, Any]:
     """GET /get_all_airplanes_with_seats en Usuario."""
-    return _call_service("usuario", "GET", "/get_all_airplanes_with_seats")
+    return await _call_service("usuario", "GET", "/get_all_airplanes_with_seats")
 
 
 @mcp.tool()
-def get_all_airplanes_routes_usuario() -> dict[str, Any]:
+async def get_all_airplanes_routes_usuario() -> dict[str, Any]:
     """GET /get_all_airplanes_routes en Usuario."""
-    return _call_service("usuario", "GET", "/get_all_airplanes_routes")
+    return await _call_service("usuario", "GET", "/get_all_airplanes_routes")
 
 
 @mcp.tool()
-def get_airplane_route_by_id_usuario(airplane_route_id: int) -> dict[str, Any]:
+async def get_airplane_route_by_id_usuario(airplane_route_id: int) -> dict[str, Any]:
     """GET /get_airplane_route_by_id/<airplane_route_id> en Usuario."""
     path = f"/get_airplane_route_by_id/{airplane_route_id}"
-    return _call_service("usuario", "GET", path)
+    return await _call_service("usuario", "GET", path)
 
 
 @mcp.tool()
-def usuario_get_reservation_by_code(reservation_code: str) -> dict[str, Any]:
+async def usuario_get_reservation_by_code(reservation_code: str) -> dict[str, Any]:
     """GET /get_reservation_by_code/<reservation_code> en Usuario."""
     path = f"/get_reservation_by_code/{reservation_code}"
-    return _call_service("usuario", "GET", path)
+    return await _call_service("usuario", "GET", path)
 
 
 @mcp.tool()
-def usuario_get_reservation_by_id(reservation_id: int) -> dict[str, Any]:
+async def usuario_get_reservation_by_id(reservation_id: int) -> dict[str, Any]:
     """GET /get_reservation_by_id/<reservation_id> en Usuario."""
     path = f"/get_reservation_by_id/{reservation_id}"
-    return _call_service("usuario", "GET", path)
+    return await _call_service("usuario", "GET", path)
 
 
 @mcp.tool()
-def usuario_update_reservation(
+async def usuario_update_reservation(
     reservation_code: str,
     seat_number: str,
     email: str,
@@ -470,24 +514,24 @@ def usuario_update_reservation(
         "emergency_contact_name": emergency_contact_name,
         "emergency_contact_phone": emergency_contact_phone,
     }
-    return _call_service("usuario", "PUT", path, json_body=body)
+    return await _call_service("usuario", "PUT", path, json_body=body)
 
 
 @mcp.tool()
-def usuario_delete_reservation_by_id(reservation_id: int) -> dict[str, Any]:
+async def usuario_delete_reservation_by_id(reservation_id: int) -> dict[str, Any]:
     """DELETE /usuario/delete_reservation_by_id/<reservation_id> en Usuario."""
     path = f"/usuario/delete_reservation_by_id/{reservation_id}"
-    return _call_service("usuario", "DELETE", path)
+    return await _call_service("usuario", "DELETE", path)
 
 
 @mcp.tool()
-def usuario_get_all_reservations() -> dict[str, Any]:
+async def usuario_get_all_reservations() -> dict[str, Any]:
     """GET /get_all_reservations en Usuario."""
-    return _call_service("usuario", "GET", "/get_all_reservations")
+    return await _call_service("usuario", "GET", "/get_all_reservations")
 
 
 @mcp.tool()
-def usuario_add_reservation(
+async def usuario_add_reservation(
     airplane_id: int,
     airplane_route_id: int,
     passport_number: str,
@@ -512,31 +556,31 @@ def usuario_add_reservation(
         "seat_number": seat_number,
         "status": status,
     }
-    return _call_service("usuario", "POST", "/usuario/add_reservation", json_body=body)
+    return await _call_service("usuario", "POST", "/usuario/add_reservation", json_body=body)
 
 
 @mcp.tool()
-def usuario_cancel_payment_and_reservation(payment_id: str) -> dict[str, Any]:
+async def usuario_cancel_payment_and_reservation(payment_id: str) -> dict[str, Any]:
     """DELETE /cancel_payment_and_reservation/<payment_id> en Usuario."""
     path = f"/cancel_payment_and_reservation/{payment_id}"
-    return _call_service("usuario", "DELETE", path)
+    return await _call_service("usuario", "DELETE", path)
 
 
 @mcp.tool()
-def usuario_get_all_payments() -> dict[str, Any]:
+async def usuario_get_all_payments() -> dict[str, Any]:
     """GET /get_all_payments en Usuario."""
-    return _call_service("usuario", "GET", "/get_all_payments")
+    return await _call_service("usuario", "GET", "/get_all_payments")
 
 
 @mcp.tool()
-def usuario_get_payment_by_id(payment_id: str) -> dict[str, Any]:
+async def usuario_get_payment_by_id(payment_id: str) -> dict[str, Any]:
     """GET /get_payment_by_id/<payment_id> en Usuario."""
     path = f"/get_payment_by_id/{payment_id}"
-    return _call_service("usuario", "GET", path)
+    return await _call_service("usuario", "GET", path)
 
 
 @mcp.tool()
-def usuario_create_payment(
+async def usuario_create_payment(
     reservation_id: int,
     payment_method: str,
     currency: str = "Dolares",
@@ -547,11 +591,11 @@ def usuario_create_payment(
         "payment_method": payment_method,
         "currency": currency,
     }
-    return _call_service("usuario", "POST", "/usuario/create_payment", json_body=body)
+    return await _call_service("usuario", "POST", "/usuario/create_payment", json_body=body)
 
 
 @mcp.tool()
-def edit_payment(
+async def edit_payment(
     payment_id: str,
     body: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
@@ -560,7 +604,7 @@ def edit_payment(
     /usuario/edit_payment/<payment_id>.
     """
     path = f"/usuario/edit_payment/{payment_id}"
-    return _call_service(
+    return await _call_service(
         service="usuario",
         method="PUT",
         path=path,
@@ -569,10 +613,10 @@ def edit_payment(
 
 
 @mcp.tool()
-def edit_payment_sin_body(payment_id: str) -> dict[str, Any]:
+async def edit_payment_sin_body(payment_id: str) -> dict[str, Any]:
     """Escenario de prueba: editar un pago SIN cuerpo JSON en Usuario."""
     path = f"/usuario/edit_payment/{payment_id}"
-    return _call_service(
+    return await _call_service(
         service="usuario",
         method="PUT",
         path=path,
@@ -581,53 +625,62 @@ def edit_payment_sin_body(payment_id: str) -> dict[str, Any]:
 
 
 @mcp.tool()
-def smoke_test_usuario() -> dict[str, Any]:
+async def smoke_test_usuario() -> dict[str, Any]:
     """
-    Ejecuta un pequeño smoke test sobre el microservicio Usuario:
+    Ejecuta un pequeño smoke test sobre el microservicio Usuario
+    (las tres llamadas van en paralelo):
     - GET /get_all_airplanes_routes
     - GET /get_all_reservations
     - GET /get_all_payments
     """
-    results = {}
-    results["routes"] = _call_service("usuario", "GET", "/get_all_airplanes_routes")
-    results["reservations"] = _call_service("usuario", "GET", "/get_all_reservations")
-    results["payments"] = _call_service("usuario", "GET", "/get_all_payments")
-    return results
+    return await _fan_out({
+        "routes": _call_service("usuario", "GET", "/get_all_airplanes_routes"),
+        "reservations": _call_service("usuario", "GET", "/get_all_reservations"),
+        "payments": _call_service("usuario", "GET", "/get_all_payments"),
+    })
 
 
 # ---------------------------------------------------------------------------
 # HELPER: EJECUTAR PYTEST
 # ---------------------------------------------------------------------------
 
-def _run_pytest(pytest_args: list[str]) -> dict[str, Any]:
+async def _run_pytest(pytest_args: list[str], timeout: float = 300) -> dict[str, Any]:
     """
     Ejecuta pytest con los argumentos dados y devuelve un resumen estructurado.
 
     - pytest_args: lista de argumentos, por ejemplo:
       ["tests/api"] o ["tests/api/test_usuario_add_reservation_rag.py"].
+
+    Corre como subproceso asíncrono: mientras pytest trabaja, el servidor MCP
+    sigue atendiendo otras tools.
     """
     cmd = ["pytest", "-vv", "-s"] + pytest_args  # -vv para detalle, -s para mostrar prints
+    proc = None
     try:
-        result = subprocess.run(
-            cmd,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
             cwd=REPO_ROOT,
-            capture_output=True,  # seguimos capturando para devolverlo por MCP
-            text=True,
-            timeout=300,
+            stdout=asyncio.subprocess.PIPE,  # seguimos capturando para devolverlo por MCP
+            stderr=asyncio.subprocess.PIPE,
         )
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
     except Exception as e:
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        detalle = f"timeout de {timeout:g} s" if isinstance(e, asyncio.TimeoutError) else e
         return {
             "ok": False,
             "command": " ".join(cmd),
-            "error": f"Error al ejecutar pytest: {e}",
+            "error": f"Error al ejecutar pytest: {detalle}",
         }
 
     return {
-        "ok": result.returncode == 0,
-        "exit_code": result.returncode,
+        "ok": proc.returncode == 0,
+        "exit_code": proc.returncode,
         "command": " ".join(cmd),
-        "stdout": result.stdout,
-        "stderr": result.stderr,
+        "stdout": stdout.decode("utf-8", errors="replace"),
+        "stderr": stderr.decode("utf-8", errors="replace"),
     }
 
 
@@ -636,17 +689,17 @@ def _run_pytest(pytest_args: list[str]) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def run_all_api_tests() -> dict[str, Any]:
+async def run_all_api_tests() -> dict[str, Any]:
     """
     Ejecuta todos los tests de la carpeta tests/api con pytest.
 
     Útil para lanzar la batería completa de pruebas de API.
     """
-    return _run_pytest(["tests/api"])
+    return await _run_pytest(["tests/api"])
 
 
 @mcp.tool()
-def run_api_test_file(test_file: str) -> dict[str, Any]:
+async def run_api_test_file(test_file: str) -> dict[str, Any]:
     """
     Ejecuta un archivo de tests específico dentro de tests/api.
     """
@@ -657,11 +710,11 @@ def run_api_test_file(test_file: str) -> dict[str, Any]:
         }
 
     path = f"tests/api/{test_file}"
-    return _run_pytest([path])
+    return await _run_pytest([path])
 
 
 @mcp.tool()
-def run_api_tests_by_keyword(keyword: str) -> dict[str, Any]:
+async def run_api_tests_by_keyword(keyword: str) -> dict[str, Any]:
     """
     Ejecuta tests de tests/api filtrados con pytest -k <keyword>.
 
@@ -669,11 +722,11 @@ def run_api_tests_by_keyword(keyword: str) -> dict[str, Any]:
     - keyword='edit_payment'
     - keyword='rag'
     """
-    return _run_pytest(["tests/api", "-k", keyword])
+    return await _run_pytest(["tests/api", "-k", keyword])
 
 
 @mcp.tool()
-def run_single_api_test(test_file: str, test_name: str) -> dict[str, Any]:
+async def run_single_api_test(test_file: str, test_name: str) -> dict[str, Any]:
     """
     Ejecuta una sola prueba dentro de tests/api usando su nombre de función.
 
@@ -690,32 +743,32 @@ def run_single_api_test(test_file: str, test_name: str) -> dict[str, Any]:
 
     # Node id de pytest: tests/api/archivo.py::nombre_de_test
     node_id = f"tests/api/{test_file}::{test_name}"
-    return _run_pytest([node_id])
+    return await _run_pytest([node_id])
 
 
 @mcp.tool()
-def run_usuario_rag_tests() -> dict[str, Any]:
+async def run_usuario_rag_tests() -> dict[str, Any]:
     """
     Ejecuta solo los tests RAG del microservicio Usuario
     (asumiendo que sus nombres contienen 'usuario' y '_rag').
     """
-    return _run_pytest(["tests/api", "-k", "usuario and rag"])
+    return await _run_pytest(["tests/api", "-k", "usuario and rag"])
 
 
 @mcp.tool()
-def run_gestionreservas_rag_tests() -> dict[str, Any]:
+async def run_gestionreservas_rag_tests() -> dict[str, Any]:
     """
     Ejecuta solo los tests RAG del microservicio GestiónReservas.
     """
-    return _run_pytest(["tests/api", "-k", "gestionreservas and rag"])
+    return await _run_pytest(["tests/api", "-k", "gestionreservas and rag"])
 
 
 @mcp.tool()
-def run_gestionvuelos_rag_tests() -> dict[str, Any]:
+async def run_gestionvuelos_rag_tests() -> dict[str, Any]:
     """
     Ejecuta solo los tests RAG del microservicio GestiónVuelos.
     """
-    return _run_pytest(["tests/api", "-k", "vuelos and rag"])
+    return await _run_pytest(["tests/api", "-k", "vuelos and rag"])
 
 
 # ---------------------------------------------------------------------------
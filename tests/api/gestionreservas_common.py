@@ -119,6 +119,13 @@ def get_all_routes_from_vuelos() -> list | None:
     return data
 
 
+def get_seat_status_from_vuelos(airplane_id: int, seat_number: str) -> str:
+    """Estado actual de un asiento en GestiónVuelos (GET /get_airplane_seats/{id}/seats)."""
+    r = get_vuelos(f"/get_airplane_seats/{airplane_id}/seats")
+    assert r.status_code == 200
+    return next(s["status"] for s in r.json() if s["seat_number"] == seat_number)
+
+
 def find_route_and_free_seat() -> tuple[dict, dict] | None:
     """
     Replica la lógica de _find_route_and_free_seat de
@@ -68,6 +68,26 @@ def _build_valid_route_payload(airplane_id, route_id=None):
     }
 
 
+# -------------------------------------------------------------------
+# Helpers de asientos
+# -------------------------------------------------------------------
+def _asiento_libre():
+    """(airplane_id, seat_number) del primer asiento Libre, o (None, None) si no hay."""
+    r = _get("/seats/grouped-by-airplane")
+    assert r.status_code == 200, r.text
+    for aid, lista in r.json().items():
+        libre = next((s for s in lista if s.get("status") == "Libre"), None)
+        if libre:
+            return int(aid), libre["seat_number"]
+    return None, None
+
+
+def _estado_asiento(aid, seat):
+    r = _get(f"/get_airplane_seats/{aid}/seats")
+    assert r.status_code == 200
+    return next(s["status"] for s in r.json() if s["seat_number"] == seat)
+
+
 # ---------------------------------------------------------------------------
 # Fixture: servicio arriba
 # ---------------------------------------------------------------------------
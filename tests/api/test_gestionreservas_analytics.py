@@ -0,0 +1,76 @@
+"""
+Analítica columnar de GestiónReservas:
+    GET /analytics
+"""
+
+import pytest
+
+from gestionreservas_common import (
+    delete_reservas,
+    find_route_and_free_seat,
+    get_reservas,
+    make_add_reservation_body,
+    post_reservas,
+)
+
+
+def _analytics(**params):
+    r = get_reservas("/analytics", params=params)
+    if r.status_code == 503:
+        pytest.skip("[GR_ANALYTICS] NumPy no está instalado en GestiónReservas.")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _reservas_de_ruta(data, route_id):
+    return sum(f["bookings"] for f in data["bookings_by_route_day"] if f["airplane_route_id"] == route_id)
+
+
+def _pagos_tarjeta_dolares(data):
+    return next((f["payments"] for f in data["revenue_by_currency_method"]
+                 if f["currency"] == "Dolares" and f["payment_method"] == "Tarjeta"), 0)
+
+
+def test_analytics_estructura():
+    data = _analytics()
+    for campo in ("rows", "bookings_by_route_day", "revenue_by_currency_method", "cancellation", "elapsed_ms"):
+        assert campo in data, data
+    assert data["cancellation"]["reservations"] == sum(f["bookings"] for f in data["bookings_by_route_day"])
+
+
+def test_analytics_sigue_reserva_pago_y_cancelacion():
+    found = find_route_and_free_seat()
+    if not found:
+        pytest.skip("[GR_ANALYTICS] No hay ruta con asiento libre.")
+    ruta, seat = found
+    route_id = ruta["airplane_route_id"]
+    antes = _analytics()
+
+    r_res = post_reservas("/add_reservation", json=make_add_reservation_body(
+        airplane_id=ruta["airplane_id"], airplane_route_id=route_id, seat_number=seat["seat_number"],
+    ))
+    assert r_res.status_code == 201, r_res.text
+    r_pay = post_reservas("/create_payment", json={
+        "reservation_id": r_res.json()["reservation"]["reservation_id"],
+        "payment_method": "Tarjeta",
+        "currency": "Dolares",
+    })
+    assert r_pay.status_code == 201, r_pay.text
+
+    pagado = _analytics(route_id=route_id)
+    assert _reservas_de_ruta(pagado, route_id) == _reservas_de_ruta(antes, route_id) + 1
+    assert _pagos_tarjeta_dolares(pagado) == _pagos_tarjeta_dolares(antes) + 1
+
+    r_cancel = delete_reservas(f"/cancel_payment_and_reservation/{r_pay.json()['payment']['payment_id']}")
+    assert r_cancel.status_code == 200, r_cancel.text
+
+    cancelado = _analytics()
+    assert cancelado["cancellation"]["cancelled"] == antes["cancellation"]["cancelled"] + 1
+    assert cancelado["cancellation"]["reservations"] == antes["cancellation"]["reservations"] + 1
+    assert _pagos_tarjeta_dolares(cancelado) == _pagos_tarjeta_dolares(antes)
+
+
+@pytest.mark.parametrize("params", [{"date_from": "30/04/2025"}, {"date_to": "2025-02-30"}, {"route_id": "0"}])
+def test_analytics_parametros_invalidos(params):
+    r = get_reservas("/analytics", params=params)
+    assert r.status_code in (400, 503), r.text
@@ -0,0 +1,28 @@
+"""
+Arranque en segundo plano de GestiónReservas: las reservas y pagos iniciales
+se generan en un hilo aparte y el progreso se publica en GET /health.
+"""
+
+import time
+
+from gestionreservas_common import get_reservas
+
+EN_CURSO = ("pendiente", "generando", "esperando_gestion_vuelos")
+
+
+def test_gestionreservas_health_muestra_el_arranque():
+    limite = time.monotonic() + 30
+    while True:
+        r = get_reservas("/health")
+        assert r.status_code == 200, r.text
+        assert r.json()["status"] == "ok"
+        arranque = r.json()["bootstrap"]
+        if arranque["state"] not in EN_CURSO or time.monotonic() > limite:
+            break
+        time.sleep(0.5)
+
+    for campo in ("state", "attempts", "reservations", "payments", "last_error", "elapsed_s"):
+        assert campo in arranque, f"[GR_BOOTSTRAP] Falta '{campo}' en {arranque}"
+    assert arranque["state"] == "listo", arranque
+    assert arranque["attempts"] >= 1
+    assert 0 < arranque["reservations"] <= 3 and arranque["payments"] <= arranque["reservations"]
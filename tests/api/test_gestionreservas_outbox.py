@@ -0,0 +1,58 @@
+"""
+Pruebas del outbox de asientos de GestiónReservas:
+    GET /outbox
+y de la entrega a GestiónVuelos desde create_payment / cancel_payment_and_reservation.
+"""
+
+import pytest
+
+from gestionreservas_common import (
+    delete_reservas,
+    get_reservas,
+    post_reservas,
+    find_route_and_free_seat,
+    get_seat_status_from_vuelos,
+    make_add_reservation_body,
+)
+
+
+def test_gestionreservas_outbox_estado():
+    r = get_reservas("/outbox")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    for campo in ("pending", "in_flight", "stats", "dead_letters"):
+        assert campo in data, f"[GR_OUTBOX] Falta '{campo}' en {data}"
+    assert isinstance(data["dead_letters"], list)
+    assert data["stats"]["encolados"] >= data["stats"]["entregados"]
+
+
+def test_gestionreservas_outbox_pago_y_cancelacion_sincronizan_asiento():
+    found = find_route_and_free_seat()
+    if not found:
+        pytest.skip("[GR_OUTBOX_FLOW] No hay ruta con asiento libre.")
+    ruta, seat = found
+    airplane_id = ruta["airplane_id"]
+    seat_number = seat["seat_number"]
+
+    r_res = post_reservas("/add_reservation", json=make_add_reservation_body(
+        airplane_id=airplane_id,
+        airplane_route_id=ruta["airplane_route_id"],
+        seat_number=seat_number,
+    ))
+    assert r_res.status_code == 201, r_res.text
+    reservation_id = r_res.json()["reservation"]["reservation_id"]
+
+    r_pay = post_reservas("/create_payment", json={
+        "reservation_id": reservation_id,
+        "payment_method": "Tarjeta",
+        "currency": "Dolares",
+    })
+    assert r_pay.status_code == 201, r_pay.text
+    assert r_pay.json()["seat_sync"] == "entregado", r_pay.text
+    assert get_seat_status_from_vuelos(airplane_id, seat_number) == "Pagado"
+
+    payment_id = r_pay.json()["payment"]["payment_id"]
+    r_cancel = delete_reservas(f"/cancel_payment_and_reservation/{payment_id}")
+    assert r_cancel.status_code == 200, r_cancel.text
+    assert r_cancel.json()["seat_sync"] == "entregado", r_cancel.text
+    assert get_seat_status_from_vuelos(airplane_id, seat_number) == "Libre"
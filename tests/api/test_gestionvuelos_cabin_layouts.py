@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from gestionvuelos_common import _delete, _get, _post, _put, service_up
+
+
+@pytest.fixture
+def a380(service_up):
+    """Crea un Airbus A380 de capacidad realista (10 columnas, asientos bloqueados)."""
+    for _ in range(5):
+        aid = random.randint(950, 999)
+        r = _post("/add_airplane", json={
+            "airplane_id": aid,
+            "model": "Airbus A380",
+            "manufacturer": f"Airbus-{random.randint(1000, 9999)}",
+            "year": 2015,
+            "capacity": 525,
+        })
+        if r.status_code == 201:
+            break
+    else:
+        pytest.skip("[LAYOUT] No se pudo crear el avión de prueba.")
+    yield aid
+    _delete(f"/delete_airplane_by_id/{aid}")
+
+
+def test_cabin_layouts_lista_plantillas(service_up):
+    r = _get("/cabin_layouts")
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["default"]["columns"] == list("ABCDEF")
+    a380 = body["models"]["Airbus A380"]
+    assert len(a380["columns"]) == 10 and "I" not in a380["columns"]
+    assert a380["typical_capacity"] == 525
+
+
+def test_a380_genera_cabina_de_diez_columnas(a380):
+    r = _get(f"/get_airplane_layout/{a380}")
+    assert r.status_code == 200, r.text
+    layout = r.json()
+    assert layout["layout"] == "A380"
+    assert layout["capacity"] == 525
+    assert layout["seats_by_status"]["Libre"] == 525
+
+    r_seats = _get(f"/get_airplane_seats/{a380}/seats")
+    assert r_seats.status_code == 200
+    numeros = [s["seat_number"] for s in r_seats.json()]
+    assert len(numeros) == 525
+    assert "1K" in numeros and "53A" in numeros
+    # Los asientos bloqueados por la plantilla no existen en la API
+    assert "12A" not in numeros and "30K" not in numeros
+
+
+@pytest.mark.parametrize(
+    "case_id, seat_number, esperado",
+    [
+        ("LAYOUT_COLUMNA_K", "1K", 200),
+        ("LAYOUT_ULTIMA_FILA", "53A", 200),
+        ("LAYOUT_BLOQUEADO", "12A", 404),
+        ("LAYOUT_FUERA_DE_CABINA", "99A", 404),
+        ("LAYOUT_LETRA_I", "1I", 400),
+        ("LAYOUT_CERO_IZQUIERDA", "01A", 400),
+    ],
+)
+def test_a380_validacion_de_asiento_segun_cabina(a380, case_id, seat_number, esperado):
+    r = _put(f"/update_seat_status/{a380}/seats/{seat_number}", json={"status": "Reservado"})
+    assert r.status_code == esperado, f"[{case_id}] {r.status_code} {r.text}"
+
+
+def test_capacidad_mayor_que_la_cabina_es_400(service_up):
+    r = _post("/add_airplane", json={
+        "airplane_id": random.randint(950, 999),
+        "model": "Embraer E190",
+        "manufacturer": "Embraer",
+        "year": 2015,
+        "capacity": 10_000,
+    })
+    assert r.status_code == 400, r.text
+    assert "capacity" in r.json().get("errors", {})
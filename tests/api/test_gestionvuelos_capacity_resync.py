@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from gestionvuelos_common import _delete, _get, _post, _put, service_up
+
+
+def _crear_avion(capacity):
+    for _ in range(5):
+        aid = random.randint(900, 949)
+        body = {
+            "airplane_id": aid,
+            "model": "Boeing 737",
+            "manufacturer": f"Boeing-{random.randint(1000, 9999)}",
+            "year": 2018,
+            "capacity": capacity,
+        }
+        r = _post("/add_airplane", json=body)
+        if r.status_code == 201:
+            return aid, body
+    pytest.skip("[RESYNC] No se pudo crear el avión de prueba.")
+
+
+@pytest.fixture
+def avion(service_up):
+    creados = []
+
+    def _factory(capacity=12):
+        aid, body = _crear_avion(capacity)
+        creados.append(aid)
+        return aid, body
+
+    yield _factory
+    for aid in creados:
+        _delete(f"/delete_airplane_by_id/{aid}")
+
+
+def _numeros(aid):
+    r = _get(f"/get_airplane_seats/{aid}/seats")
+    assert r.status_code == 200, r.text
+    return {s["seat_number"]: s["status"] for s in r.json()}
+
+
+def _actualizar(aid, body, capacity):
+    return _put(f"/update_airplane/{aid}", json={
+        "model": body["model"], "manufacturer": body["manufacturer"],
+        "year": body["year"], "capacity": capacity,
+    })
+
+
+def test_aumentar_capacidad_agrega_asientos_conservando_estados(avion):
+    aid, body = avion(12)
+    assert _put(f"/update_seat_status/{aid}/seats/2F", json={"status": "Pagado"}).status_code == 200
+
+    r = _actualizar(aid, body, 20)
+    assert r.status_code == 200, r.text
+    assert r.json()["seats"] == {"capacity": 20, "added": 8, "removed": 0}
+
+    asientos = _numeros(aid)
+    assert len(asientos) == 20
+    assert asientos["2F"] == "Pagado"
+    assert asientos["4B"] == "Libre"
+
+
+def test_reducir_capacidad_recorta_solo_asientos_libres(avion):
+    aid, body = avion(12)
+    r = _actualizar(aid, body, 7)
+    assert r.status_code == 200, r.text
+    assert r.json()["seats"]["removed"] == 5
+    assert sorted(_numeros(aid)) == ["1A", "1B", "1C", "1D", "1E", "1F", "2A"]
+
+
+def test_reducir_capacidad_con_asientos_ocupados_es_409(avion):
+    aid, body = avion(12)
+    assert _put(f"/update_seat_status/{aid}/seats/2E", json={"status": "Reservado"}).status_code == 200
+
+    r = _actualizar(aid, body, 6)
+    assert r.status_code == 409, r.text
+    assert r.json()["errors"]["seats"] == ["2E"]
+    # Nada cambió: ni la capacidad ni los asientos
+    assert _get(f"/get_airplane_by_id/{aid}").json()["capacity"] == 12
+    assert len(_numeros(aid)) == 12
+
+
+def test_reconfiguracion_de_flota_en_lote(avion):
+    aid1, _ = avion(6)
+    aid2, _ = avion(12)
+    assert _put(f"/update_seat_status/{aid2}/seats/2A", json={"status": "Pagado"}).status_code == 200
+
+    r = _put("/airplanes/capacity/batch", json={"changes": [
+        {"airplane_id": aid1, "capacity": 18},
+        {"airplane_id": aid2, "capacity": 3},
+        {"airplane_id": 999999, "capacity": 10},
+        {"airplane_id": aid1, "capacity": 0},
+    ]})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["applied"] == 1
+    assert [x["status_code"] for x in body["results"]] == [200, 409, 404, 400]
+    assert len(_numeros(aid1)) == 18
+    assert len(_numeros(aid2)) == 12
+
+
+def test_reconfiguracion_atomica_no_aplica_nada_si_un_cambio_falla(avion):
+    aid1, _ = avion(6)
+    aid2, _ = avion(12)
+    assert _put(f"/update_seat_status/{aid2}/seats/2A", json={"status": "Pagado"}).status_code == 200
+
+    r = _put("/airplanes/capacity/batch", json={"atomic": True, "changes": [
+        {"airplane_id": aid1, "capacity": 18},
+        {"airplane_id": aid2, "capacity": 3},
+    ]})
+    assert r.status_code == 409, r.text
+    assert r.json()["applied"] == 0
+    assert len(_numeros(aid1)) == 6
+
+
+def test_reconfiguracion_lote_invalido(service_up):
+    r = _put("/airplanes/capacity/batch", json={"changes": "todo"})
+    assert r.status_code == 400
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+import requests
+
+from gestionvuelos_common import BASE_URL, _asiento_libre, _get, _put, service_up
+
+
+def test_changes_version_inicial(service_up):
+    r = _get("/changes")
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert isinstance(body.get("version"), int)
+    assert body.get("reset") is False
+    assert isinstance(body.get("events"), list)
+    assert body.get("instance_id")
+
+
+@pytest.mark.parametrize(
+    "case_id, query",
+    [
+        ("CHANGES_SINCE_NEGATIVO", "since=-1"),
+        ("CHANGES_SINCE_TEXTO", "since=abc"),
+        ("CHANGES_TIMEOUT_TEXTO", "since=0&timeout=abc"),
+    ],
+)
+def test_changes_parametros_invalidos(service_up, case_id, query):
+    r = _get(f"/changes?{query}")
+    assert r.status_code == 400, f"[{case_id}] {r.status_code} {r.text}"
+
+
+def test_changes_publica_cambio_de_asiento(service_up):
+    aid, seat = _asiento_libre()
+    if aid is None:
+        pytest.skip("[CHANGES_SEAT] No hay asientos libres para el test.")
+
+    version = _get("/changes").json()["version"]
+    r_put = _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Reservado"})
+    assert r_put.status_code == 200, r_put.text
+    try:
+        r = _get(f"/changes?since={version}")
+        body = r.json()
+        assert body["version"] > version
+        eventos = [
+            e for e in body["events"]
+            if e["type"] == "seat.updated"
+            and e["data"]["airplane_id"] == aid
+            and e["data"]["seat_number"] == seat
+        ]
+        assert eventos, f"[CHANGES_SEAT] No se publicó el evento: {body}"
+        assert eventos[-1]["data"]["status"] == "Reservado"
+        assert eventos[-1]["data"]["previous_status"] == "Libre"
+    finally:
+        _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Libre"})
+
+
+def test_changes_long_poll_espera_y_responde_vacio(service_up):
+    version = _get("/changes").json()["version"]
+    inicio = time.monotonic()
+    r = _get(f"/changes?since={version}&timeout=1")
+    transcurrido = time.monotonic() - inicio
+    assert r.status_code == 200
+    body = r.json()
+    if body["version"] == version:
+        assert body["events"] == []
+        assert transcurrido >= 0.9
+
+
+def test_changes_since_futuro_pide_reset(service_up):
+    r = _get("/changes?since=999999999")
+    assert r.status_code == 200
+    assert r.json()["reset"] is True
+
+
+def test_changes_stream_sse(service_up):
+    aid, seat = _asiento_libre()
+    if aid is None:
+        pytest.skip("[CHANGES_SSE] No hay asientos libres para el test.")
+
+    version = _get("/changes").json()["version"]
+    _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Reservado"})
+    try:
+        r = requests.get(
+            f"{BASE_URL}/changes/stream?since={version}&max_seconds=0.5",
+            timeout=10,
+        )
+        assert r.status_code == 200
+        assert r.headers.get("Content-Type", "").startswith("text/event-stream")
+        assert "event: seat.updated" in r.text
+        assert f"id: {version + 1}" in r.text
+    finally:
+        _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Libre"})
@@ -0,0 +1,56 @@
+import pytest
+
+from gestionvuelos_common import _build_valid_route_payload, _delete, _get, _post, _put, service_up
+
+
+@pytest.fixture
+def ruta(service_up):
+    airplane_id = _get("/__state").json()["airplane_ids"][0]
+    creadas = []
+    for _ in range(5):
+        payload = _build_valid_route_payload(airplane_id)
+        payload["departure_time"] = "Setiembre 5, 2030 - 08:15:00"
+        payload["arrival_time"] = "september 5, 2030 - 10:45:30"
+        r = _post("/add_airplane_route", json=payload)
+        if r.status_code == 201:
+            creadas.append(payload["airplane_route_id"])
+            break
+    else:
+        pytest.skip("[TS] No se pudo crear la ruta de prueba.")
+    yield payload, r.json()["route"]
+    for rid in creadas:
+        _delete(f"/delete_airplane_route_by_id/{rid}")
+
+
+def test_ruta_guarda_hora_canonica_y_texto_en_espanol(ruta):
+    payload, creada = ruta
+    assert creada["departure_time"] == "Septiembre 05, 2030 - 08:15:00"
+    assert creada["arrival_time"] == "Septiembre 05, 2030 - 10:45:30"
+    assert creada["departure_ts"] == 1914826500
+    assert creada["arrival_ts"] - creada["departure_ts"] == 2 * 3600 + 30 * 60 + 30
+    assert creada["flight_time"] == "2 horas 30 minutos"
+
+    r = _get(f"/get_airplanes_route_by_id/{payload['airplane_route_id']}")
+    assert r.status_code == 200, r.text
+    ruta_api = r.json()
+    assert ruta_api["departure_utc"] == "2030-09-05T08:15:00Z"
+    assert ruta_api["arrival_utc"] == "2030-09-05T10:45:30Z"
+
+
+def test_actualizar_recalcula_hora_canonica(ruta):
+    payload, creada = ruta
+    cambios = dict(payload, departure_time="Octubre 1, 2030 - 06:00:00", arrival_time="Octubre 1, 2030 - 07:00:00")
+    r = _put(f"/update_airplane_route_by_id/{payload['airplane_route_id']}", json=cambios)
+    assert r.status_code == 200, r.text
+    actualizada = r.json()["route"]
+    assert actualizada["departure_time"] == "Octubre 01, 2030 - 06:00:00"
+    assert actualizada["departure_utc"] == "2030-10-01T06:00:00Z"
+    assert actualizada["arrival_ts"] - actualizada["departure_ts"] == 3600
+
+
+def test_hora_canonica_es_solo_lectura(ruta):
+    payload, creada = ruta
+    cambios = dict(payload, departure_ts=0)
+    r = _put(f"/update_airplane_route_by_id/{payload['airplane_route_id']}", json=cambios)
+    assert r.status_code == 400
+    assert "departure_ts" in r.json()["errors"]
@@ -0,0 +1,119 @@
+import random
+from urllib.parse import urlencode
+
+import pytest
+
+from gestionvuelos_common import (
+    _build_valid_route_payload,
+    _delete,
+    _get,
+    _post,
+    _put,
+    service_up,
+)
+
+
+@pytest.fixture
+def ruta(service_up):
+    """Crea rutas con aeropuertos únicos para que la búsqueda no choque con el seed."""
+    creadas = []
+    sufijo = random.randint(100_000, 999_999)
+    airplane_id = _get("/__state").json()["airplane_ids"][0]
+
+    def _factory(departure_time, arrival_time, price=98000, moneda="Colones", origen="SRCH-A", destino="SRCH-B"):
+        for _ in range(5):
+            payload = _build_valid_route_payload(airplane_id)
+            payload.update({
+                "departure": f"{origen} {sufijo}",
+                "arrival": f"{destino} {sufijo}",
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "price": price,
+                "Moneda": moneda,
+            })
+            r = _post("/add_airplane_route", json=payload)
+            if r.status_code == 201:
+                creadas.append(payload["airplane_route_id"])
+                return payload
+        pytest.skip("[SEARCH] No se pudo crear la ruta de prueba.")
+
+    _factory.sufijo = sufijo
+    _factory.airplane_id = airplane_id
+    yield _factory
+    for rid in creadas:
+        _delete(f"/delete_airplane_route_by_id/{rid}")
+
+
+def _buscar(**params):
+    r = _get(f"/search_flights?{urlencode(params)}")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_busqueda_por_origen_destino_y_ventana(ruta):
+    temprano = ruta("Mayo 10, 2031 - 08:00:00", "Mayo 10, 2031 - 10:00:00")
+    tarde = ruta("Mayo 10, 2031 - 21:00:00", "Mayo 10, 2031 - 23:00:00")
+    otro_dia = ruta("Mayo 12, 2031 - 08:00:00", "Mayo 12, 2031 - 10:00:00")
+    s = ruta.sufijo
+
+    data = _buscar(origin=f"srch-a {s}", destination=f"SRCH-B {s}")
+    ids = [v["airplane_route_id"] for v in data["results"]]
+    assert ids == [temprano["airplane_route_id"], tarde["airplane_route_id"], otro_dia["airplane_route_id"]]
+    assert data["count"] == 3
+
+    # date_to solo con fecha incluye todo el día
+    data = _buscar(origin=f"SRCH-A {s}", date_from="2031-05-10", date_to="2031-05-10")
+    assert [v["airplane_route_id"] for v in data["results"]] == [temprano["airplane_route_id"], tarde["airplane_route_id"]]
+
+    data = _buscar(destination=f"SRCH-B {s}", date_from="2031-05-10T12:00:00")
+    assert [v["airplane_route_id"] for v in data["results"]] == [tarde["airplane_route_id"], otro_dia["airplane_route_id"]]
+
+    data = _buscar(origin=f"SRCH-A {s}", limit=1)
+    assert data["count"] == 1
+
+
+def test_busqueda_filtra_precio_moneda_e_incluye_disponibilidad(ruta):
+    barata = ruta("Junio 1, 2031 - 08:00:00", "Junio 1, 2031 - 10:00:00", price=100, moneda="Dolares")
+    ruta("Junio 1, 2031 - 09:00:00", "Junio 1, 2031 - 11:00:00", price=500, moneda="Dolares")
+    ruta("Junio 1, 2031 - 10:00:00", "Junio 1, 2031 - 12:00:00", price=100, moneda="Euros")
+
+    data = _buscar(origin=f"SRCH-A {ruta.sufijo}", max_price=200, currency="Dolares")
+    assert [v["airplane_route_id"] for v in data["results"]] == [barata["airplane_route_id"]]
+
+    vuelo = data["results"][0]
+    layout = _get(f"/get_airplane_layout/{ruta.airplane_id}").json()
+    assert vuelo["capacity"] == layout["capacity"]
+    assert vuelo["available_seats"] == layout["seats_by_status"]["Libre"]
+    assert isinstance(vuelo["departure_ts"], int)
+
+    data = _buscar(origin=f"SRCH-A {ruta.sufijo}", min_seats=vuelo["capacity"] + 1)
+    assert data["count"] == 0
+
+
+def test_busqueda_refleja_actualizacion_y_eliminacion(ruta):
+    creada = ruta("Julio 3, 2031 - 08:00:00", "Julio 3, 2031 - 10:00:00")
+    rid, s = creada["airplane_route_id"], ruta.sufijo
+
+    cambios = dict(creada)
+    cambios["departure"] = f"SRCH-C {s}"
+    r = _put(f"/update_airplane_route_by_id/{rid}", json=cambios)
+    assert r.status_code == 200, r.text
+
+    assert _buscar(origin=f"SRCH-A {s}")["count"] == 0
+    assert [v["airplane_route_id"] for v in _buscar(origin=f"SRCH-C {s}")["results"]] == [rid]
+
+    assert _delete(f"/delete_airplane_route_by_id/{rid}").status_code == 200
+    assert _buscar(origin=f"SRCH-C {s}")["count"] == 0
+
+
+@pytest.mark.parametrize("params, campo", [
+    ({"date_from": "30/05/2031"}, "date_from"),
+    ({"max_price": "0"}, "max_price"),
+    ({"currency": "Yenes"}, "currency"),
+    ({"limit": "501"}, "limit"),
+    ({"date_from": "2031-05-11", "date_to": "2031-05-10"}, "date_to"),
+])
+def test_busqueda_parametros_invalidos(service_up, params, campo):
+    r = _get(f"/search_flights?{urlencode(params)}")
+    assert r.status_code == 400, r.text
+    assert campo in r.json()["errors"]
@@ -0,0 +1,59 @@
+import pytest
+
+from gestionvuelos_common import _get, _post, _put, service_up
+
+
+def _avion_con_libres(minimo):
+    r_state = _get("/__state")
+    assert r_state.status_code == 200
+    for aid in r_state.json().get("airplane_ids") or []:
+        r = _get(f"/get_airplane_seats/{aid}/seats")
+        if r.status_code == 200 and sum(s.get("status") == "Libre" for s in r.json()) >= minimo:
+            return aid, r.json()
+    return None, None
+
+
+@pytest.mark.parametrize(
+    "case_id, body",
+    [
+        ("ALLOC_SIN_ALLOCATIONS", {}),
+        ("ALLOC_NO_LISTA", {"allocations": {"airplane_id": 1}}),
+        ("ALLOC_DEMASIADO_GRANDE", {"allocations": [{"airplane_id": 1, "count": 501}]}),
+    ],
+)
+def test_seat_allocate_cuerpo_invalido(service_up, case_id, body):
+    r = _post("/seats/allocate", json=body)
+    assert r.status_code == 400, f"[{case_id}] {r.status_code} {r.text}"
+    assert "message" in r.json()
+
+
+def test_seat_allocate_resultados_por_elemento(service_up):
+    aid, asientos = _avion_con_libres(2)
+    if aid is None:
+        pytest.skip("[ALLOC_OK] No hay avión con dos asientos libres para el test.")
+    libres = sum(s["status"] == "Libre" for s in asientos)
+
+    r = _post("/seats/allocate", json={"allocations": [
+        {"airplane_id": aid, "count": 2},
+        {"airplane_id": aid, "count": 1, "status": "Libre"},
+        {"airplane_id": 999999, "count": 1},
+        {"airplane_id": aid, "count": libres},
+    ]})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    tomados = data["results"][0].get("seats") or []
+    try:
+        assert [x["status_code"] for x in data["results"]] == [200, 400, 404, 409], data
+        assert data["allocated"] == 2
+        # Los primeros libres en orden de fila y columna
+        primeros = [s["seat_number"] for s in asientos if s["status"] == "Libre"][:2]
+        assert tomados == primeros
+
+        estados = {s["seat_number"]: s["status"] for s in _get(f"/get_airplane_seats/{aid}/seats").json()}
+        assert [estados[n] for n in tomados] == ["Reservado", "Reservado"]
+        # Todo o nada: el pedido rechazado por falta de libres no tomó ninguno
+        assert sum(e == "Libre" for e in estados.values()) == libres - 2
+    finally:
+        _put("/seats/status/batch", json={"updates": [
+            {"airplane_id": aid, "seat_number": n, "status": "Libre"} for n in tomados
+        ]})
@@ -0,0 +1,71 @@
+import pytest
+
+from gestionvuelos_common import _asiento_libre, _estado_asiento, _get, _put, service_up
+
+
+@pytest.mark.parametrize(
+    "case_id, body",
+    [
+        ("BATCH_SIN_UPDATES", {}),
+        ("BATCH_UPDATES_NO_LISTA", {"updates": "1A"}),
+        ("BATCH_DEMASIADO_GRANDE", {"updates": [{"airplane_id": 1, "seat_number": "1A", "status": "Libre"}] * 501}),
+    ],
+)
+def test_seat_status_batch_cuerpo_invalido(service_up, case_id, body):
+    r = _put("/seats/status/batch", json=body)
+    assert r.status_code == 400, f"[{case_id}] {r.status_code} {r.text}"
+    assert "message" in r.json()
+
+
+def test_seat_status_batch_resultados_por_elemento(service_up):
+    aid, seat = _asiento_libre()
+    if aid is None:
+        pytest.skip("[BATCH_OK] No hay asientos libres para el test.")
+
+    body = {"updates": [
+        {"airplane_id": aid, "seat_number": seat.lower(), "status": "Pagado"},
+        {"airplane_id": aid, "seat_number": "999Z", "status": "Pagado"},
+        {"airplane_id": aid, "seat_number": "99A", "status": "Pagado"},
+        {"airplane_id": 999999, "seat_number": "1A", "status": "Pagado"},
+        {"airplane_id": aid, "seat_number": seat, "status": "Vendido"},
+    ]}
+    r = _put("/seats/status/batch", json=body)
+    try:
+        assert r.status_code == 200, r.text
+        data = r.json()
+        codigos = [x["status_code"] for x in data["results"]]
+        assert codigos == [200, 400, 404, 404, 400], data
+        assert data["applied"] == 1
+        assert _estado_asiento(aid, seat) == "Pagado"
+
+        # Reenviar el mismo estado es idempotente
+        r2 = _put("/seats/status/batch", json={"updates": body["updates"][:1]})
+        assert r2.json()["applied"] == 0
+        assert r2.json()["results"][0]["status_code"] == 200
+    finally:
+        _put("/seats/status/batch", json={"updates": [
+            {"airplane_id": aid, "seat_number": seat, "status": "Libre"}
+        ]})
+    assert _estado_asiento(aid, seat) == "Libre"
+
+
+def test_seat_status_batch_expected_status(service_up):
+    aid, seat = _asiento_libre()
+    if aid is None:
+        pytest.skip("[BATCH_EXPECTED] No hay asientos libres para el test.")
+
+    reservar = {"airplane_id": aid, "seat_number": seat, "status": "Reservado", "expected_status": "Libre"}
+    try:
+        r = _put("/seats/status/batch", json={"updates": [reservar]})
+        assert r.json()["results"][0]["status_code"] == 200, r.text
+
+        # Ya no está Libre: el mismo pedido se rechaza y devuelve el estado actual
+        r2 = _put("/seats/status/batch", json={"updates": [reservar, {**reservar, "expected_status": "Vendido"}]})
+        resultados = r2.json()["results"]
+        assert [x["status_code"] for x in resultados] == [409, 400], r2.text
+        assert resultados[0]["status"] == "Reservado"
+        assert r2.json()["applied"] == 0
+    finally:
+        _put("/seats/status/batch", json={"updates": [
+            {"airplane_id": aid, "seat_number": seat, "status": "Libre"}
+        ]})
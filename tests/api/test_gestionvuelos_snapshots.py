@@ -0,0 +1,36 @@
+import pytest
+
+from gestionvuelos_common import _asiento_libre, _get, _put, service_up
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/get_airplanes", "/get_all_airplanes_routes", "/seats/grouped-by-airplane"],
+)
+def test_snapshot_se_reutiliza_sin_escrituras(service_up, path):
+    r1 = _get(path)
+    r2 = _get(path)
+    assert r1.status_code == r2.status_code == 200
+    assert r1.headers.get("Content-Type", "").startswith("application/json")
+    g1, g2 = r1.headers.get("X-Store-Generation"), r2.headers.get("X-Store-Generation")
+    assert g1 is not None and g1.isdigit()
+    # Si no hubo escrituras entre ambas lecturas, el cuerpo es el mismo blob
+    if g1 == g2:
+        assert r1.content == r2.content
+
+
+def test_snapshot_se_invalida_tras_escritura(service_up):
+    aid, seat = _asiento_libre()
+    if aid is None:
+        pytest.skip("[SNAPSHOT] No hay asientos libres para el test.")
+
+    antes = _get("/seats/grouped-by-airplane")
+    r_put = _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Reservado"})
+    assert r_put.status_code == 200, r_put.text
+    try:
+        despues = _get("/seats/grouped-by-airplane")
+        assert int(despues.headers["X-Store-Generation"]) > int(antes.headers["X-Store-Generation"])
+        asiento = next(s for s in despues.json()[str(aid)] if s["seat_number"] == seat)
+        assert asiento["status"] == "Reservado"
+    finally:
+        _put(f"/update_seat_status/{aid}/seats/{seat}", json={"status": "Libre"})
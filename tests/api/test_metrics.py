@@ -0,0 +1,85 @@
+"""
+Pruebas del endpoint GET /metrics (formato de texto de Prometheus) en los tres servicios.
+"""
+
+import re
+
+import pytest
+import requests
+
+from gestionreservas_common import BASE_URL_RESERVAS, BASE_URL_USUARIO, BASE_URL_VUELOS
+
+
+def _metrics(base_url):
+    try:
+        r = requests.get(f"{base_url}/metrics", timeout=10)
+    except requests.exceptions.ConnectionError:
+        pytest.skip(f"[METRICS] Servicio no disponible en {base_url}")
+    assert r.status_code == 200, r.text
+    assert r.headers.get("Content-Type", "").startswith("text/plain")
+    return r.text
+
+
+def _valor(texto, patron):
+    m = re.search(rf"^{patron} ([0-9.e+-]+)$", texto, re.MULTILINE)
+    return float(m.group(1)) if m else None
+
+
+@pytest.mark.parametrize("base_url", [BASE_URL_VUELOS, BASE_URL_RESERVAS, BASE_URL_USUARIO])
+def test_metrics_cuenta_solicitudes_por_endpoint(base_url):
+    patron = r'http_requests_total\{method="GET",endpoint="/health",status="200"\}'
+    antes = _valor(_metrics(base_url), patron) or 0
+    for _ in range(3):
+        requests.get(f"{base_url}/health", timeout=10)
+    texto = _metrics(base_url)
+    assert "# TYPE http_request_duration_seconds histogram" in texto
+    # Usuario corre con varios workers en gunicorn; en local es un solo proceso
+    assert _valor(texto, patron) >= antes + 3
+    assert re.search(r'^http_request_duration_seconds_bucket\{method="GET",endpoint="/health",le="\+Inf"\} \d+$',
+                     texto, re.MULTILINE)
+
+
+def test_metrics_gestionvuelos_store_y_lock():
+    requests.get(f"{BASE_URL_VUELOS}/get_airplanes", timeout=10)
+    texto = _metrics(BASE_URL_VUELOS)
+    assert _valor(texto, r'store_items\{collection="seats"\}') > 0
+    # Las lecturas toman el lock en modo compartido y se etiquetan por endpoint
+    lectura = r'lock="store",mode="read",endpoint="/get_airplanes"'
+    assert _valor(texto, r'store_lock_wait_seconds_count\{' + lectura + r'\}') > 0
+    assert _valor(texto, r'store_lock_hold_seconds_count\{' + lectura + r'\}') > 0
+    # Rutas con parámetros se agrupan por la plantilla de la regla
+    requests.get(f"{BASE_URL_VUELOS}/get_airplane_by_id/1", timeout=10)
+    assert 'endpoint="/get_airplane_by_id/<int:airplane_id>"' in _metrics(BASE_URL_VUELOS)
+
+
+def test_metrics_gestionvuelos_lock_escritura_por_endpoint():
+    r_state = requests.get(f"{BASE_URL_VUELOS}/__state", timeout=10)
+    ids = r_state.json().get("airplane_ids") or []
+    if not ids:
+        pytest.skip("[METRICS] No hay aviones para probar una escritura.")
+    r = requests.get(f"{BASE_URL_VUELOS}/get_airplane_seats/{ids[0]}/seats", timeout=10)
+    asiento = next((s for s in r.json() if s.get("status") == "Libre"), None) if r.status_code == 200 else None
+    if asiento is None:
+        pytest.skip("[METRICS] No hay asientos libres para probar una escritura.")
+    ruta = f"{BASE_URL_VUELOS}/update_seat_status/{ids[0]}/seats/{asiento['seat_number']}"
+    requests.put(ruta, json={"status": "Reservado"}, timeout=10)
+    requests.put(ruta, json={"status": "Libre"}, timeout=10)
+    texto = _metrics(BASE_URL_VUELOS)
+    etiqueta = 'lock="store",mode="write",endpoint="/update_seat_status/<int:airplane_id>/seats/<string:seat_number>"'
+    assert "store_lock_hold_seconds_count{" + etiqueta + "}" in texto
+
+
+def test_metrics_gestionreservas_store_y_outbox():
+    texto = _metrics(BASE_URL_RESERVAS)
+    assert _valor(texto, r'store_items\{collection="reservations"\}') is not None
+    assert _valor(texto, r'store_items\{collection="payments"\}') is not None
+    assert _valor(texto, "seat_outbox_pending") is not None
+
+
+def test_metrics_usuario_latencia_upstream():
+    r = requests.get(f"{BASE_URL_USUARIO}/get_all_airplanes_routes", timeout=20)
+    assert r.status_code in (200, 404, 503), r.text
+    texto = _metrics(BASE_URL_USUARIO)
+    assert "# TYPE upstream_request_duration_seconds histogram" in texto
+    assert re.search(r'^upstream_requests_total\{target="[^"]+",method="GET",outcome="\w+"\} \d+$',
+                     texto, re.MULTILINE)
@@ -0,0 +1,69 @@
+"""
+GET /openapi.json en los tres servicios: servido desde memoria con ETag,
+recortado a los paths de cada servicio (?full=1 devuelve todo) y recargado
+cuando cambia el archivo del repo.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from gestionreservas_common import get_reservas, get_usuario, get_vuelos
+
+SPEC_PATH = Path(__file__).resolve().parents[2] / "openapi.json"
+
+SERVICIOS = [
+    (get_vuelos, "/add_airplane"),
+    (get_reservas, "/add_reservation"),
+    (get_usuario, "/usuario/add_reservation"),
+]
+
+
+@pytest.mark.parametrize("get, propio", SERVICIOS)
+def test_spec_recortado_por_servicio(get, propio):
+    r = get("/openapi.json")
+    assert r.status_code == 200, r.text
+    assert r.headers["Content-Type"].startswith("application/json")
+    assert list(r.json()["paths"]) == [propio]
+
+    completo = get("/openapi.json", params={"full": "1"}).json()
+    assert completo == json.loads(SPEC_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("get, propio", SERVICIOS)
+def test_etag_y_304(get, propio):
+    r = get("/openapi.json")
+    etag = r.headers.get("ETag")
+    assert etag
+
+    r2 = get("/openapi.json", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+    # El recorte y el spec completo son representaciones distintas
+    assert get("/openapi.json", params={"full": "1"}).headers["ETag"] != etag
+
+
+def test_recarga_al_cambiar_el_archivo():
+    original = SPEC_PATH.read_bytes()
+    st = os.stat(SPEC_PATH)
+    antes = get_vuelos("/openapi.json")
+    try:
+        spec = json.loads(original)
+        spec["info"]["version"] = "9.9.9-test"
+        SPEC_PATH.write_text(json.dumps(spec, ensure_ascii=False, indent=2), encoding="utf-8")
+        # mtime distinto aunque el sistema de archivos tenga resolución gruesa
+        os.utime(SPEC_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+        despues = get_vuelos("/openapi.json", headers={"If-None-Match": antes.headers["ETag"]})
+        assert despues.status_code == 200
+        assert despues.json()["info"]["version"] == "9.9.9-test"
+        assert despues.headers["ETag"] != antes.headers["ETag"]
+    finally:
+        SPEC_PATH.write_bytes(original)
+        os.utime(SPEC_PATH, ns=(st.st_atime_ns, time.time_ns()))
+
+    assert get_vuelos("/openapi.json").headers["ETag"] == antes.headers["ETag"]
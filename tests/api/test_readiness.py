@@ -0,0 +1,49 @@
+"""
+GET /livez y GET /readyz en los tres servicios (ver salud.py): liveness sin
+dependencias, readiness con los tamaños del store, el seed y el estado de cada
+upstream con su disyuntor.
+"""
+
+import pytest
+
+from gestionreservas_common import get_reservas, get_usuario, get_vuelos
+
+SERVICIOS = [
+    (get_vuelos, []),
+    (get_reservas, ["gestion_vuelos"]),
+    (get_usuario, ["gestion_reservas", "gestion_vuelos"]),
+]
+
+
+@pytest.mark.parametrize("get, dependencias", SERVICIOS)
+def test_livez(get, dependencias):
+    r = get("/livez")
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "alive"
+
+
+@pytest.mark.parametrize("get, dependencias", SERVICIOS)
+def test_readyz_listo_con_dependencias(get, dependencias):
+    r = get("/readyz")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["status"] == "ready" and data["reasons"] == []
+    assert isinstance(data["checks"], dict)
+    assert sorted(data.get("dependencies", {})) == dependencias
+    for estado in data.get("dependencies", {}).values():
+        assert estado["ready"] is True and estado["status_code"] == 200
+        assert estado["breaker"]["state"] == "cerrado"
+
+
+def test_readyz_vuelos_reporta_store_y_seed():
+    checks = get_vuelos("/readyz").json()["checks"]
+    assert checks["seed"] == "listo"
+    assert checks["airplanes"] == checks["airplanes_indexed"] == checks["seat_maps"]
+    assert checks["routes"] == checks["routes_indexed"]
+
+
+def test_readyz_reservas_reporta_store_y_arranque():
+    checks = get_reservas("/readyz").json()["checks"]
+    assert checks["bootstrap"] == "listo"
+    assert checks["reservations"] >= 0 and checks["payments"] >= 0
+
@@ -0,0 +1,48 @@
+"""
+Compresión negociada (compresion.py) en los tres servicios y vista compacta de
+pagos: requests anuncia gzip y descomprime solo, así que basta mirar las
+cabeceras para saber qué viajó comprimido.
+"""
+
+import pytest
+
+from gestionreservas_common import get_reservas, get_usuario, get_vuelos
+
+
+@pytest.mark.parametrize("get, ruta", [
+    (get_vuelos, "/seats/grouped-by-airplane"),
+    (get_vuelos, "/get_all_airplanes_routes"),
+    (get_reservas, "/openapi.json"),
+    (get_usuario, "/openapi.json"),
+])
+def test_respuestas_grandes_viajan_con_gzip(get, ruta):
+    r = get(ruta)
+    assert r.status_code == 200, r.text
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert int(r.headers["Content-Length"]) < len(r.content)
+
+    plano = get(ruta, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plano.headers
+    assert plano.content == r.content
+
+
+def test_respuestas_chicas_sin_comprimir():
+    r = get_vuelos("/livez")
+    assert r.status_code == 200 and "Content-Encoding" not in r.headers
+
+
+@pytest.mark.parametrize("get, ruta", [
+    (get_reservas, "/get_all_fake_payments"),
+    (get_usuario, "/get_all_payments"),
+])
+def test_pagos_vista_compacta(get, ruta):
+    completos = get(ruta).json()
+    compactos = get(ruta, params={"view": "compact"}).json()
+    if isinstance(completos, dict):
+        pytest.skip("No hay pagos generados.")
+    assert [p["payment_id"] for p in compactos] == [p["payment_id"] for p in completos]
+    for pago in compactos:
+        assert {"payment_id", "reservation_id", "amount", "status"} <= set(pago)
+        assert "passport_number" not in pago and "full_name" not in pago
+    assert get(ruta, params={"view": "otra"}).status_code == 400
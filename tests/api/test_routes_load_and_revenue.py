@@ -0,0 +1,100 @@
+"""
+Resumen por ruta para dashboards:
+    GET /routes/load_summary         (GestiónVuelos, contadores por estado de asiento)
+    GET /payments/revenue_by_route   (GestiónReservas, contadores de ingresos)
+    GET /routes/summary              (Usuario, une ambos)
+"""
+
+import pytest
+
+from gestionreservas_common import (
+    delete_reservas,
+    find_route_and_free_seat,
+    get_reservas,
+    get_usuario,
+    get_vuelos,
+    make_add_reservation_body,
+    post_reservas,
+)
+
+
+def _ocupacion(route_id):
+    r = get_vuelos("/routes/load_summary")
+    assert r.status_code == 200, r.text
+    return next(x for x in r.json()["routes"] if x["airplane_route_id"] == route_id)
+
+
+def _ingresos(route_id):
+    r = get_reservas("/payments/revenue_by_route")
+    assert r.status_code == 200, r.text
+    fila = next((x for x in r.json()["routes"] if x["airplane_route_id"] == route_id), None)
+    return fila or {"payments": 0, "revenue": {}}
+
+
+def test_load_summary_coincide_con_los_asientos():
+    r = get_vuelos("/routes/load_summary")
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["totals"]["routes"] == len(data["routes"])
+    ruta = data["routes"][0]
+
+    asientos = get_vuelos(f"/get_airplane_seats/{ruta['airplane_id']}/seats").json()
+    conteo = {estado: sum(1 for s in asientos if s["status"] == estado) for estado in ("Libre", "Reservado", "Pagado")}
+    assert ruta["seats"] == conteo
+    assert ruta["capacity"] == len(asientos)
+    assert ruta["load_factor"] == round((conteo["Reservado"] + conteo["Pagado"]) / len(asientos), 4)
+
+
+def test_load_summary_totales_cuentan_cada_avion_una_vez():
+    data = get_vuelos("/routes/load_summary").json()
+    aviones = {ruta["airplane_id"] for ruta in data["routes"]}
+    agrupados = get_vuelos("/seats/grouped-by-airplane").json()
+    asientos = [s for aid, lista in agrupados.items() if int(aid) in aviones for s in lista]
+
+    totales = data["totals"]
+    assert totales["airplanes"] == len(aviones)
+    assert totales["capacity"] == len(asientos)
+    assert totales["seats"] == {estado: sum(1 for s in asientos if s["status"] == estado)
+                                for estado in ("Libre", "Reservado", "Pagado")}
+
+
+def test_pago_y_cancelacion_actualizan_ocupacion_e_ingresos():
+    found = find_route_and_free_seat()
+    if not found:
+        pytest.skip("[ROUTE_SUMMARY] No hay ruta con asiento libre.")
+    ruta, seat = found
+    route_id = ruta["airplane_route_id"]
+    antes_ocupacion, antes_ingresos = _ocupacion(route_id), _ingresos(route_id)
+
+    r_res = post_reservas("/add_reservation", json=make_add_reservation_body(
+        airplane_id=ruta["airplane_id"], airplane_route_id=route_id, seat_number=seat["seat_number"],
+    ))
+    assert r_res.status_code == 201, r_res.text
+    reserva = r_res.json()["reservation"]
+
+    r_pay = post_reservas("/create_payment", json={
+        "reservation_id": reserva["reservation_id"], "payment_method": "Tarjeta", "currency": "Dolares",
+    })
+    assert r_pay.status_code == 201, r_pay.text
+    assert r_pay.json()["seat_sync"] == "entregado", r_pay.text
+    pago = r_pay.json()["payment"]
+
+    despues = _ocupacion(route_id)
+    assert despues["seats"]["Libre"] == antes_ocupacion["seats"]["Libre"] - 1
+    assert despues["seats"]["Pagado"] == antes_ocupacion["seats"]["Pagado"] + 1
+
+    ingresos = _ingresos(route_id)
+    assert ingresos["payments"] == antes_ingresos["payments"] + 1
+    assert ingresos["revenue"]["Dolares"] == pytest.approx(
+        antes_ingresos["revenue"].get("Dolares", 0) + pago["amount"])
+
+    r = get_usuario("/routes/summary")
+    assert r.status_code == 200, r.text
+    combinada = next(x for x in r.json()["routes"] if x["airplane_route_id"] == route_id)
+    assert combinada["payments"] == ingresos["payments"]
+    assert combinada["seats"] == despues["seats"]
+
+    r_cancel = delete_reservas(f"/cancel_payment_and_reservation/{pago['payment_id']}")
+    assert r_cancel.status_code == 200, r_cancel.text
+    assert _ingresos(route_id) == antes_ingresos
+    assert _ocupacion(route_id)["seats"] == antes_ocupacion["seats"]
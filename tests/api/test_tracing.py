@@ -0,0 +1,64 @@
+"""
+Propagación de contexto de trazas (W3C traceparent) Usuario → GestiónVuelos.
+
+Solo aplica cuando los servicios corren con OTEL_TRACES_EXPORTER=file y el mismo
+OTEL_EXPORTER_FILE_PATH que ve este proceso; si no, se omite.
+"""
+
+import json
+import os
+import secrets
+import time
+
+import pytest
+import requests
+
+from gestionreservas_common import BASE_URL_USUARIO, BASE_URL_VUELOS
+
+TRACE_FILE = os.getenv("OTEL_EXPORTER_FILE_PATH")
+
+pytestmark = pytest.mark.skipif(
+    not TRACE_FILE or os.getenv("OTEL_TRACES_EXPORTER") != "file",
+    reason="[TRACING] Servicios sin exporter de archivo configurado.",
+)
+
+
+def _spans_de(trace_id, esperar_servicios, timeout=15):
+    # El BatchSpanProcessor exporta cada ~5 s
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        spans = []
+        if os.path.exists(TRACE_FILE):
+            with open(TRACE_FILE, encoding="utf-8") as f:
+                for linea in f:
+                    s = json.loads(linea)
+                    if s["context"]["trace_id"] == f"0x{trace_id}":
+                        spans.append(s)
+        servicios = {s["resource"]["attributes"]["service.name"] for s in spans}
+        if esperar_servicios <= servicios:
+            return spans
+        time.sleep(0.5)
+    return spans
+
+
+def test_tracing_propaga_traceparent_entre_servicios():
+    trace_id = secrets.token_hex(16)
+    traceparent = f"00-{trace_id}-{secrets.token_hex(8)}-01"
+    r = requests.get(f"{BASE_URL_USUARIO}/get_all_airplanes_routes",
+                     headers={"traceparent": traceparent}, timeout=20)
+    assert r.status_code == 200, r.text
+
+    spans = _spans_de(trace_id, {"Usuario", "GestionVuelos"})
+    nombres = {(s["resource"]["attributes"]["service.name"], s["name"]) for s in spans}
+    assert ("Usuario", "GET /get_all_airplanes_routes") in nombres, nombres
+    assert ("Usuario", "HTTP GET") in nombres, nombres
+    assert ("GestionVuelos", "GET /get_all_airplanes_routes") in nombres, nombres
+    assert ("GestionVuelos", "store_lock") in nombres, nombres
+
+
+def test_tracing_respeta_decision_de_no_muestrear():
+    trace_id = secrets.token_hex(16)
+    r = requests.get(f"{BASE_URL_VUELOS}/get_airplanes",
+                     headers={"traceparent": f"00-{trace_id}-{secrets.token_hex(8)}-00"}, timeout=20)
+    assert r.status_code == 200
+    assert _spans_de(trace_id, {"GestionVuelos"}, timeout=6) == []
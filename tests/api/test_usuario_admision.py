@@ -0,0 +1,34 @@
+"""
+Control de admisión de Usuario (ver Usuario/admision.py): un cliente que
+repite GET /routes/summary agota su cubo y recibe 429 con Retry-After; tras
+esperar ese tiempo vuelve a entrar. Las sondas de salud no se limitan.
+"""
+
+import time
+
+import pytest
+
+from gestionreservas_common import get_usuario
+
+
+def test_usuario_rate_limit_con_retry_after():
+    for _ in range(60):
+        r = get_usuario("/routes/summary")
+        if r.status_code == 429:
+            break
+        assert r.status_code == 200, r.text
+    else:
+        pytest.skip("Control de admisión desactivado en Usuario (ADMISION=0)")
+
+    retry_after = int(r.headers["Retry-After"])
+    assert retry_after >= 1
+    assert r.json()["retry_after_s"] == retry_after and r.json()["message"]
+
+    # Las sondas siguen respondiendo aunque el cliente esté limitado
+    assert get_usuario("/readyz").status_code == 200
+
+    time.sleep(retry_after)
+    assert get_usuario("/routes/summary").status_code == 200
+    admision = get_usuario("/health").json()["admission"]
+    assert admision["rejected"]["rate_limit"] >= 1
+    assert admision["in_flight_by_endpoint"]["/routes/summary"] == 0
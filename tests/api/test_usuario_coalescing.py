@@ -0,0 +1,31 @@
+"""
+Lecturas compartidas en Usuario (ver Usuario/agrupador.py) contra los servicios
+levantados: muchas consultas simultáneas al mapa de asientos del mismo avión
+responden todas lo mismo, y /health y /metrics exponen los contadores de
+líderes y seguidoras.
+
+Que las consultas se superpongan (y por lo tanto que haya seguidoras) depende
+de la latencia de GestiónVuelos y, con gunicorn -w 4, cada worker cuenta las
+suyas; acá no se afirma nada sobre cuántas se agruparon. Eso lo prueba
+tests/unit/test_agrupador.py con un upstream lento en proceso.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gestionreservas_common import get_usuario, get_vuelos
+
+
+def test_usuario_mapa_de_asientos_concurrente():
+    airplane_id = get_vuelos("/get_airplanes").json()[0]["airplane_id"]
+    ruta = f"/get_seats_by_airplane_id/{airplane_id}/seats"
+
+    with ThreadPoolExecutor(20) as pool:
+        respuestas = list(pool.map(lambda _: get_usuario(ruta), range(20)))
+
+    assert all(r.status_code == 200 for r in respuestas), [r.text for r in respuestas if r.status_code != 200]
+    assert all(r.json() == respuestas[0].json() for r in respuestas)
+
+    estado = get_usuario("/health").json()["coalescing"]
+    assert {"leaders", "followers", "in_flight", "top_keys"} <= set(estado)
+    metricas = get_usuario("/metrics").text
+    assert 'key="GET /get_airplane_seats/{id}/seats",role="leader"' in metricas
@@ -1,6 +1,10 @@
 import pytest, os, random
 random.seed(42)
 
+# POST /admin/seed solo se registra con esta variable; los tests de tests/unit y
+# tests/perf cargan las apps en proceso y siembran por el test client
+os.environ.setdefault("ADMIN_SEED_ENABLED", "1")
+
 def pytest_addoption(parser):
     parser.addoption("--retries", action="store", default="1")
 
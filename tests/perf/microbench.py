@@ -0,0 +1,76 @@
+"""
+Utilidades de los micro-benchmarks (tests/perf/test_microbench_*.py).
+
+`medir` es un timeit mínimo: corre la función varias veces y se queda con el
+mínimo (el ruido del sistema solo suma) y la mediana. Con PERF_HISTORY=1 cada
+medición se agrega a metrics/microbench.csv junto con el commit, para comparar
+antes y después de una optimización:
+
+    PERF_HISTORY=1 python -m pytest tests/perf -q -s
+"""
+
+import csv
+import datetime
+import os
+import statistics
+import subprocess
+import time
+
+from tests.utils.modulos import ROOT, cargar_app  # noqa: F401 (re-exportados para los benchmarks)
+
+CSV_PATH = ROOT / "metrics" / "microbench.csv"
+
+GUARDAR_HISTORIAL = os.getenv("PERF_HISTORY") == "1"
+# Con PERF_FULL=1 los tamaños de N pasan de "rápido para la suite" a "carga real"
+ESCALA = 10 if os.getenv("PERF_FULL") == "1" else 1
+
+_COMMIT = None
+
+
+def _commit():
+    global _COMMIT
+    if _COMMIT is None:
+        try:
+            salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                    capture_output=True, text=True, timeout=10)
+            _COMMIT = salida.stdout.strip() or "desconocido"
+        except (OSError, subprocess.SubprocessError):
+            _COMMIT = "desconocido"
+    return _COMMIT
+
+
+def medir(nombre, funcion, n, repeticiones=3, preparar=None):
+    """
+    Corre `funcion()` `repeticiones` veces (con `preparar()` antes de cada una,
+    fuera del tiempo) y devuelve el resultado de la última corrida. `n` es la
+    cantidad de elementos que procesa cada corrida, para el costo por elemento.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    minimo, mediana = min(tiempos), statistics.median(tiempos)
+    print(f"\n[BENCH] {nombre}: n={n} min={minimo * 1000:.2f} ms "
+          f"mediana={mediana * 1000:.2f} ms ({minimo / n * 1e6:.3f} µs/elem)")
+    if GUARDAR_HISTORIAL:
+        registrar(nombre, n, repeticiones, minimo, mediana)
+    return resultado
+
+
+def registrar(nombre, n, repeticiones, minimo, mediana):
+    CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not CSV_PATH.exists()
+    with CSV_PATH.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(["timestamp", "commit", "benchmark", "n", "repeats",
+                             "min_ms", "median_ms", "per_item_us"])
+        writer.writerow([
+            datetime.datetime.now().isoformat(timespec="seconds"), _commit(), nombre, n, repeticiones,
+            round(minimo * 1000, 3), round(mediana * 1000, 3), round(minimo / n * 1e6, 4),
+        ])
@@ -0,0 +1,36 @@
+"""
+Costo de admision.py por chequeo: admitir() es O(1) y no crece con la
+cantidad de clientes con cubo (el comportamiento está en
+tests/unit/test_admision.py).
+
+    python -m pytest tests/perf/test_admision_costo.py -q -s
+"""
+
+import time
+
+from microbench import ESCALA, medir
+from tests.utils.modulos import cargar_modulo
+
+admision = cargar_modulo("admision_bench", "Usuario", "admision.py")
+
+
+def test_admitir_es_o1_con_muchos_clientes():
+    def control_con(clientes):
+        control = admision.ControlDeAdmision(por_cliente=admision.Limite(1e6, 1e6),
+                                             por_endpoint={"/caro": admision.Limite(1e6, 1e6)})
+        for i in range(clientes):
+            control.admitir(f"10.0.{i // 256}.{i % 256}", "/caro")
+        return control
+
+    def ciclos(control, n=5000):
+        def correr():
+            inicio = time.perf_counter()
+            for i in range(n):
+                if control.admitir(f"10.0.0.{i % 256}", "/caro") is None:
+                    control.liberar("/caro")
+            return time.perf_counter() - inicio
+        return medir(f"admision_{len(control._cubos)}_cubos", correr, n, repeticiones=5)
+
+    # El costo por chequeo no crece con la cantidad de clientes registrados
+    pocos, muchos = ciclos(control_con(256)), ciclos(control_con(50_000 * ESCALA))
+    assert muchos < pocos * 3
@@ -0,0 +1,68 @@
+"""
+Agregación y CSV del harness de carga (tools/loadtest/reporte.py), sin servicios.
+La corrida real se lanza aparte:
+
+    python -m tools.loadtest --modo flask --duracion 15
+"""
+
+import os
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from tools.loadtest.reporte import agregar, escribir_csv, leer_anteriores, percentil, regresiones  # noqa: E402
+
+
+class _ClienteFalso:
+    def __init__(self, muestras):
+        self.latencias, self.codigos, self.errores = defaultdict(list), defaultdict(Counter), Counter()
+        for endpoint, ms, codigo, error in muestras:
+            self.latencias[endpoint].append(ms)
+            self.codigos[endpoint][codigo] += 1
+            if error:
+                self.errores[endpoint] += 1
+
+
+def test_percentil_rango_mas_cercano():
+    valores = list(range(1, 101))
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 95) == 95
+    assert percentil(valores, 99) == 99
+    assert percentil([7.0], 99) == 7.0
+    assert percentil([], 50) == 0.0
+
+
+def test_agregar_une_hilos_por_endpoint():
+    a = _ClienteFalso([("GV GET /x", float(ms), 200, False) for ms in range(1, 51)])
+    b = _ClienteFalso([("GV GET /x", float(ms), 200, False) for ms in range(51, 101)]
+                      + [("GR POST /y", 10.0, 409, False), ("GR POST /y", 30.0, 500, True)])
+    filas = {f["endpoint"]: f for f in agregar([a, b], segundos=2.0)}
+
+    x = filas["GV GET /x"]
+    assert (x["requests"], x["errors"], x["rps"]) == (100, 0, 50.0)
+    assert (x["p50_ms"], x["p95_ms"], x["p99_ms"], x["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+    assert filas["GR POST /y"]["status_codes"] == "409:1;500:1"
+    assert filas["GR POST /y"]["errors"] == 1
+    assert filas["TOTAL"]["requests"] == 102
+    assert filas["TOTAL"]["errors"] == 1
+
+
+def test_csv_y_regresiones_contra_otro_commit(tmp_path):
+    csv_path = Path(tmp_path) / "loadtest.csv"
+    base = {"timestamp": "2026-01-01T00:00:00", "mode": "flask", "scenario": "navegar", "threads": 8,
+            "duration_seconds": 15, "requests": 10, "errors": 0, "rps": 1.0, "p50_ms": 5.0,
+            "p99_ms": 30.0, "max_ms": 40.0, "status_codes": "200:10"}
+    escribir_csv([dict(base, commit="aaa1111", endpoint="GV GET /x", p95_ms=20.0)], csv_path)
+    escribir_csv([dict(base, commit="bbb2222", endpoint="GV GET /x", p95_ms=10.0)], csv_path)
+    assert csv_path.read_text(encoding="utf-8").count("timestamp,commit") == 1
+
+    # El mismo commit no cuenta como referencia
+    anteriores = leer_anteriores("bbb2222", "flask", csv_path)
+    assert anteriores[("navegar", "8", "GV GET /x")]["commit"] == "aaa1111"
+
+    actual = [{"endpoint": "GV GET /x", "p95_ms": 30.0}]
+    assert regresiones("navegar", 8, actual, anteriores, umbral_pct=20) == [("GV GET /x", 20.0, 30.0, "aaa1111")]
+    assert regresiones("navegar", 8, actual, anteriores, umbral_pct=60) == []
+    assert leer_anteriores("bbb2222", "gunicorn", csv_path) == {}
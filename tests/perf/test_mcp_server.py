@@ -0,0 +1,114 @@
+"""
+Tools del servidor MCP (pf3866_mcp/server.py) en proceso contra un servicio
+HTTP local lento: las tools compuestas (smoke test, salud de los tres
+servicios) hacen sus llamadas en paralelo, varias tools a la vez no se
+bloquean entre sí y los errores de red siguen saliendo como status 0.
+
+    python -m pytest tests/perf/test_mcp_server.py -q -s
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("fastmcp")
+pytest.importorskip("httpx")
+
+from microbench import ROOT  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("mcp_server_bench", ROOT / "pf3866_mcp" / "server.py")
+server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server)
+
+DEMORA = 0.3
+
+
+def _tool(tool):
+    # @mcp.tool() devuelve el objeto Tool de fastmcp; la función original queda en .fn
+    return getattr(tool, "fn", tool)
+
+
+class _Servidor(ThreadingHTTPServer):
+    request_queue_size = 64  # el default (5) descarta conexiones simultáneas y las reintenta a 1 s
+
+
+class Servicio:
+    """Servidor local que cuenta las solicitudes por ruta y tarda DEMORA en responder."""
+
+    def __init__(self):
+        self.llamadas = Counter()
+        servicio = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servicio.llamadas[self.path] += 1
+                time.sleep(DEMORA)
+                cuerpo = f'{{"path": "{self.path}"}}'.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = _Servidor(("127.0.0.1", 0), Manejador)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def servicio(monkeypatch):
+    local = Servicio()
+    for nombre in server.BASE_URLS:
+        monkeypatch.setitem(server.BASE_URLS, nombre, local.url)
+    yield local
+    local.servidor.shutdown()
+    local.servidor.server_close()
+
+
+def _correr(corrutina):
+    inicio = time.perf_counter()
+    resultado = asyncio.run(corrutina)
+    return resultado, time.perf_counter() - inicio
+
+
+def test_smoke_test_en_paralelo(servicio):
+    resultados, duracion = _correr(_tool(server.smoke_test_usuario)())
+    print(f"\n[MCP] smoke_test_usuario: 3 llamadas de {DEMORA * 1000:.0f} ms en {duracion * 1000:.0f} ms")
+    assert set(resultados) == {"routes", "reservations", "payments"}
+    assert all(r["ok"] and r["status"] == 200 for r in resultados.values())
+    assert resultados["payments"]["body"] == {"path": "/get_all_payments"}
+    assert duracion < 2 * DEMORA
+
+
+def test_salud_de_los_tres_servicios(servicio):
+    resultado, duracion = _correr(_tool(server.get_health_all)())
+    assert resultado["ok"] and set(resultado["services"]) == set(server.BASE_URLS)
+    assert servicio.llamadas["/health"] == 3
+    assert duracion < 2 * DEMORA
+
+
+def test_tools_simultaneas_no_se_bloquean(servicio):
+    async def varias():
+        llamadas = [_tool(server.get_airplane_seats_vuelos)(i) for i in range(10)]
+        return await asyncio.gather(*llamadas, _tool(server.get_health)("usuario"))
+
+    resultados, duracion = _correr(varias())
+    print(f"\n[MCP] 11 tools simultáneas de {DEMORA * 1000:.0f} ms en {duracion * 1000:.0f} ms")
+    assert all(r["ok"] for r in resultados)
+    assert duracion < 3 * DEMORA
+
+
+def test_error_de_red_es_status_0(monkeypatch):
+    monkeypatch.setitem(server.BASE_URLS, "usuario", "http://127.0.0.1:9")
+    resultado, _ = _correr(_tool(server.get_health_all)())
+    assert not resultado["ok"]
+    usuario = resultado["services"]["usuario"]
+    assert usuario["status"] == 0 and not usuario["ok"] and "Error de red" in usuario["body"]
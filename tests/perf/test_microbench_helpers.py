@@ -0,0 +1,136 @@
+"""
+Micro-benchmarks de los helpers que corren en cada escritura (GestionVuelos y
+GestionReservas importados en proceso, sin servicios): detección de claves
+duplicadas, parseo de fechas de rutas, generación de asientos, códigos de
+reserva únicos, validate/dump de Marshmallow sobre 10k elementos y búsqueda de
+asiento por número.
+
+Solo verifican resultados; los tiempos se imprimen con -s y, con
+PERF_HISTORY=1, quedan en metrics/microbench.csv (ver microbench.py).
+
+    PERF_HISTORY=1 PERF_FULL=1 python -m pytest tests/perf/test_microbench_helpers.py -q -s
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from microbench import ESCALA, cargar_app, medir  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def gv():
+    return cargar_app("gv_app_bench", "GestionVuelos")
+
+
+@pytest.fixture(scope="module")
+def gr():
+    return cargar_app("gr_app_bench", "GestionReservas")
+
+
+def _ruta(i):
+    dia = i % 28 + 1
+    return {
+        "airplane_route_id": i + 1,
+        "airplane_id": i % 50 + 1,
+        "flight_number": f"AB-{i % 10000:04d}",
+        "departure": f"Aeropuerto {i % 300}",
+        "departure_time": f"Marzo {dia}, 2030 - {i % 24:02d}:{i % 60:02d}:00",
+        "arrival": f"Aeropuerto {(i + 7) % 300}",
+        "arrival_time": f"Marzo {dia}, 2030 - {(i + 3) % 24:02d}:{i % 60:02d}:00",
+        "price": 60000 + i,
+        "Moneda": "Colones",
+    }
+
+
+def test_detectar_claves_duplicadas(gv):
+    n = 10_000 * ESCALA
+    cuerpo = "{" + ", ".join(f'"campo_{i}": {i}' for i in range(n)) + ', "campo_7": 0}'
+    duplicadas = medir("detectar_claves_duplicadas", lambda: gv.detectar_claves_duplicadas(cuerpo), n)
+    assert duplicadas == ["campo_7"]
+
+    # Cuerpo típico de una ruta (el caso de cada POST/PUT), repetido n veces
+    ruta = json.dumps(_ruta(1))
+    medir("detectar_claves_duplicadas_ruta", lambda: [gv.detectar_claves_duplicadas(ruta) for _ in range(n)], n)
+
+
+def test_parsear_fecha_formato_api_y_dateutil(gv):
+    # Reemplaza a traducir_mes_espanol_a_ingles + parser.parse: fechas.parsear_fecha
+    # usa una regex para el formato de la API y solo cae a dateutil en los demás
+    parsear = gv.parsear_fecha
+    n = 20_000 * ESCALA
+    api = [f"Marzo {i % 28 + 1}, {2000 + i % 60} - {i % 24:02d}:{i % 60:02d}:{i % 59:02d}" for i in range(n)]
+    otros = [f"{i % 28 + 1} setiembre {2000 + i % 60} {i % 24:02d}:{i % 60:02d}" for i in range(n // 10)]
+
+    fechas = medir("parsear_fecha_api", lambda: [parsear(t) for t in api], n, preparar=parsear.cache_clear)
+    assert fechas[0].month == 3 and fechas[-1].year == 2000 + (n - 1) % 60
+    fechas = medir("parsear_fecha_dateutil", lambda: [parsear(t) for t in otros], len(otros),
+                   preparar=parsear.cache_clear)
+    assert all(f.month == 9 for f in fechas)
+    medir("parsear_fecha_cache", lambda: [parsear(t) for t in api[:4096]], 4096)
+
+
+def test_generar_asientos_para_avion(gv):
+    # Una cabina tiene como máximo 999 filas: N grande = muchos aviones
+    aviones, capacidad = 1_000 * ESCALA, 300
+    modelos = gv.airplane_models
+    mapas = medir("generar_asientos_para_avion",
+                  lambda: [gv.generar_asientos_para_avion(i, capacidad, modelos[i % len(modelos)])
+                           for i in range(aviones)],
+                  aviones * capacidad)
+    assert len(mapas) == aviones and all(len(m) == m.libres() == capacidad for m in mapas[:50])
+
+
+def test_generar_codigo_reserva_unico(gr, monkeypatch):
+    existentes = 20_000 * ESCALA
+    rnd = random.Random(40)
+    alfabeto = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    monkeypatch.setattr(gr, "reservations", [
+        {"reservation_code": "".join(rnd.choices(alfabeto, k=6))} for _ in range(existentes)
+    ])
+    codigos = 200
+    nuevos = medir("generar_codigo_reserva_unico", lambda: [gr.generar_codigo_reserva_unico() for _ in range(codigos)],
+                   codigos, repeticiones=3)
+    usados = {r["reservation_code"] for r in gr.reservations}
+    assert len(nuevos) == codigos and not usados.intersection(nuevos)
+
+
+def test_marshmallow_validate_y_dump_10k(gv, gr):
+    n = 10_000 * ESCALA
+    rutas = [_ruta(i) for i in range(n)]
+    errores = medir("route_schema_validate_many", lambda: gv.airplane_routes_schema.validate(rutas), n, repeticiones=3)
+    assert errores == {}
+
+    guardadas = [dict(r, departure_ts=1900000000 + i, arrival_ts=1900003600 + i, flight_time="1 horas 0 minutos")
+                 for i, r in enumerate(rutas)]
+    dump = medir("route_schema_dump_many", lambda: gv.airplane_routes_schema.dump(guardadas), n, repeticiones=3)
+    assert len(dump) == n and dump[0]["departure_utc"] == "2030-03-17T17:46:40Z"
+
+    reservas = [{
+        "airplane_id": i % 50 + 1, "airplane_route_id": i % 300 + 1, "passport_number": f"A{i:08d}",
+        "full_name": "Pasajero Bench", "email": f"p{i}@example.com", "phone_number": "+50688888888",
+        "emergency_contact_name": "Contacto", "emergency_contact_phone": "+50677777777",
+        "seat_number": f"{i % 30 + 1}A", "status": "Reservado",
+    } for i in range(n)]
+    errores = medir("reservation_schema_validate_many",
+                    lambda: gr.reservation_schema.validate(reservas, many=True), n, repeticiones=3)
+    assert errores == {}
+    dump = medir("reservation_schema_dump_many", lambda: gr.reservation_schema.dump(reservas, many=True), n,
+                 repeticiones=3)
+    assert len(dump) == n
+
+
+def test_busqueda_de_asiento_por_numero(gv):
+    mapa = gv.generar_asientos_para_avion(1, 5_000)
+    n = 100_000 * ESCALA
+    rnd = random.Random(40)
+    numeros = [mapa.numero(rnd.randrange(len(mapa))) for _ in range(n)]
+    indices = medir("seatmap_indice", lambda: [mapa.indice(s) for s in numeros], n)
+    assert [mapa.numero(i) for i in indices[:100]] == numeros[:100]
+    estados = medir("seatmap_estado_por_numero", lambda: [mapa.estado(mapa.indice(s)) for s in numeros], n)
+    assert set(estados) == {"Libre"}
@@ -0,0 +1,130 @@
+"""
+Benchmark de memoria del mapa compacto de asientos (GestionVuelos/seatmap.py)
+frente a la representación anterior (un dict por asiento).
+
+Corre en proceso, sin servicios. Con PERF_FULL=1 la línea base de dicts también
+se mide con 1M de asientos (unos 250 MB); por defecto se mide con 100k y se
+compara por asiento.
+
+    python -m pytest tests/perf -q -s
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "GestionVuelos"))
+
+from seatmap import ESTADOS, LAYOUTS, SeatMap  # noqa: E402
+
+TOTAL_ASIENTOS = 1_000_000
+ASIENTOS_POR_AVION = 160   # 6250 aviones = 1M de asientos exactos
+
+
+def _medir(construir):
+    tracemalloc.start()
+    try:
+        inicio = tracemalloc.take_snapshot()
+        objeto = construir()
+        fin = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    total = sum(s.size_diff for s in fin.compare_to(inicio, "filename"))
+    return objeto, total
+
+
+def _flota_compacta(total):
+    aviones = total // ASIENTOS_POR_AVION
+    return {aid: SeatMap(aid, ASIENTOS_POR_AVION) for aid in range(1, aviones + 1)}
+
+
+def _flota_dicts(total):
+    aviones = total // ASIENTOS_POR_AVION
+    asientos = []
+    for aid in range(1, aviones + 1):
+        for i in range(ASIENTOS_POR_AVION):
+            asientos.append({"airplane_id": aid, "seat_number": f"{i // 6 + 1}{'ABCDEF'[i % 6]}", "status": "Libre"})
+    return asientos
+
+
+def test_memoria_mapa_compacto_1m_asientos():
+    mapas, bytes_compacto = _medir(lambda: _flota_compacta(TOTAL_ASIENTOS))
+    asientos = sum(len(m) for m in mapas.values())
+    por_asiento_compacto = bytes_compacto / asientos
+
+    n_dicts = TOTAL_ASIENTOS if os.getenv("PERF_FULL") == "1" else TOTAL_ASIENTOS // 10
+    lista, bytes_dicts = _medir(lambda: _flota_dicts(n_dicts))
+    por_asiento_dicts = bytes_dicts / len(lista)
+    del lista
+
+    print(f"\n[seatmap] {asientos} asientos: {bytes_compacto / 1e6:.1f} MB "
+          f"({por_asiento_compacto:.2f} B/asiento)")
+    print(f"[dicts]   {n_dicts} asientos: {bytes_dicts / 1e6:.1f} MB "
+          f"({por_asiento_dicts:.1f} B/asiento)")
+
+    # Un byte de estado por asiento más la cabecera de cada avión
+    assert por_asiento_compacto < 4
+    assert por_asiento_dicts / por_asiento_compacto > 50
+
+
+def test_conteo_de_libres_1m_asientos():
+    mapas = _flota_compacta(TOTAL_ASIENTOS)
+    for aid in range(1, len(mapas) + 1, 3):
+        mapas[aid].cambiar(0, "Pagado")
+
+    t0 = time.perf_counter()
+    libres = sum(m.libres() for m in mapas.values())
+    transcurrido = time.perf_counter() - t0
+
+    print(f"\n[seatmap] conteo de libres en {TOTAL_ASIENTOS} asientos: {transcurrido * 1000:.1f} ms")
+    assert libres == TOTAL_ASIENTOS - len(range(1, len(mapas) + 1, 3))
+
+
+def test_indice_y_numero_son_inversos():
+    mapa = SeatMap(7, 15)
+    for i in range(len(mapa)):
+        assert mapa.indice(mapa.numero(i)) == i
+    # Asientos fuera de la capacidad, columnas inexistentes y ceros a la izquierda
+    for invalido in ("3D", "1G", "01A", "0A", "A", "", "1", "²A"):
+        assert mapa.indice(invalido) is None, invalido
+    assert mapa.asientos()[14] == {"airplane_id": 7, "seat_number": "3C", "status": "Libre"}
+
+
+def test_generacion_flota_realista_1m_asientos():
+    # Aviones de capacidad típica por modelo (A380 de 525, B777 de 396, ...) hasta 1M de asientos
+    modelos = list(LAYOUTS.values())
+    t0 = time.perf_counter()
+    flota, total, aid = [], 0, 0
+    while total < TOTAL_ASIENTOS:
+        layout = modelos[aid % len(modelos)]
+        aid += 1
+        mapa = layout.generar(aid, layout.capacidad_tipica)
+        flota.append(mapa)
+        total += len(mapa)
+    transcurrido = time.perf_counter() - t0
+
+    print(f"\n[seatmap] {len(flota)} aviones realistas ({total} asientos) generados en {transcurrido * 1000:.0f} ms")
+    assert sum(m.libres() for m in flota) == total
+    a380 = next(m for m in flota if m.layout.nombre == "A380")
+    assert a380.indice("12A") is None and a380.indice("1K") is not None
+
+
+def test_contadores_por_estado_siguen_las_transiciones():
+    mapa = LAYOUTS["Boeing 737"].generar(3, 40)
+    rnd = random.Random(37)
+    for _ in range(2000):
+        mapa.cambiar(rnd.randrange(len(mapa)), rnd.choice(ESTADOS))
+    recontado = {estado: mapa._estados.count(codigo) for codigo, estado in enumerate(ESTADOS)}
+    assert mapa.conteo() == recontado
+    assert mapa.copia().conteo() == recontado
+
+    for i in range(len(mapa) - 10, len(mapa)):
+        mapa.cambiar(i, "Libre")
+    reducido, conflictos = mapa.redimensionar(30)
+    assert conflictos == []
+    esperado = {estado: 0 for estado in ESTADOS}
+    for i in range(30):
+        esperado[mapa.estado(i)] += 1
+    assert reducido.conteo() == esperado
@@ -0,0 +1,189 @@
+"""
+Seed masivo y determinista (POST /admin/seed en GestionVuelos y GestionReservas,
+ver semilla_vuelos.py y semilla_reservas.py), en proceso y sin servicios: la
+flota sale del test client de GestionVuelos y se le pasa a GestionReservas en
+lugar de pedirla por HTTP. También el arranque en segundo plano de
+GestiónReservas (ArranqueReservas) con GestiónVuelos simulado.
+
+    PERF_FULL=1 python -m pytest tests/perf/test_seed_bulk.py -q -s
+"""
+
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from microbench import ESCALA, cargar_app, medir  # noqa: E402
+
+FLOTA = {"seed": 7, "airplanes": 20, "capacity": 30, "routes": 60, "base_date": "2025-06-01"}
+
+
+@pytest.fixture(scope="module")
+def gv():
+    return cargar_app("gv_app_bench", "GestionVuelos")
+
+
+@pytest.fixture(scope="module")
+def gr():
+    return cargar_app("gr_app_bench", "GestionReservas")
+
+
+def test_seed_no_se_registra_sin_la_variable(monkeypatch):
+    # Reemplaza el store sin autenticación: apagado por defecto
+    monkeypatch.delenv("ADMIN_SEED_ENABLED")
+    monkeypatch.setenv("SEED_DATA", "0")
+    for nombre, servicio in (("gv_app_sin_seed", "GestionVuelos"), ("gr_app_sin_seed", "GestionReservas")):
+        app = cargar_app(nombre, servicio).app
+        assert "admin_seed" not in app.view_functions
+        assert app.test_client().post("/admin/seed", json={}).status_code == 404
+
+
+def _flota(cliente):
+    rutas = cliente.get("/get_all_airplanes_routes").get_json()
+    agrupados = cliente.get("/seats/grouped-by-airplane").get_json()
+    asientos = {int(aid): [(a["seat_number"], a["status"]) for a in lista] for aid, lista in agrupados.items()}
+    return rutas, asientos
+
+
+@pytest.fixture
+def flota_gr(gv, gr, monkeypatch):
+    cliente = gv.app.test_client()
+    assert cliente.post("/admin/seed", json=FLOTA).status_code == 201
+    flota = _flota(cliente)
+    monkeypatch.setattr(gr, "_leer_flota_vuelos", lambda: flota)
+    return gr.app.test_client()
+
+
+def test_seed_vuelos_determinista(gv):
+    cliente = gv.app.test_client()
+    r = cliente.post("/admin/seed", json=FLOTA)
+    assert r.status_code == 201, r.get_json()
+    assert r.get_json()["airplanes"] == 20 and r.get_json()["seats"] == 600 and r.get_json()["routes"] == 60
+
+    aviones = cliente.get("/get_airplanes").get_json()
+    rutas = cliente.get("/get_all_airplanes_routes").get_json()
+    assert [a["airplane_id"] for a in aviones] == list(range(1, 21))
+    assert len({r["flight_number"] for r in rutas}) == 60
+    assert all(r["departure"] != r["arrival"] for r in rutas)
+    # Tres rutas por avión, todos los asientos libres
+    assert set(Counter(r["airplane_id"] for r in rutas).values()) == {3}
+    assert all(estado == "Libre" for lista in _flota(cliente)[1].values() for _, estado in lista)
+
+    cliente.post("/admin/seed", json=FLOTA)
+    assert cliente.get("/get_airplanes").get_json() == aviones
+    assert cliente.get("/get_all_airplanes_routes").get_json() == rutas
+
+    cliente.post("/admin/seed", json={**FLOTA, "seed": 8})
+    assert cliente.get("/get_all_airplanes_routes").get_json() != rutas
+
+
+def test_seed_vuelos_parametros_invalidos(gv):
+    cliente = gv.app.test_client()
+    r = cliente.post("/admin/seed", json={"airplanes": 0, "capacity": "x", "base_date": "01/06/2025"})
+    assert r.status_code == 400
+    assert set(r.get_json()["errors"]) == {"airplanes", "capacity", "base_date"}
+    assert cliente.post("/admin/seed", json={"airplanes": 1, "capacity": 99999}).status_code == 400
+
+
+def test_seed_reservas_determinista(flota_gr, gr):
+    cuerpo = {"seed": 3, "reservations": 500, "payments": 150, "sync_seats": False, "base_date": "2025-06-01"}
+    r = flota_gr.post("/admin/seed", json=cuerpo)
+    assert r.status_code == 201, r.get_json()
+    assert r.get_json()["reservations"] == 500 and r.get_json()["payments"] == 150
+
+    reservas = flota_gr.get("/get_fake_reservations").get_json()
+    pagos = flota_gr.get("/get_all_fake_payments").get_json()
+    assert [x["reservation_id"] for x in reservas] == list(range(1, 501))
+    # El estado del asiento es del avión: a lo sumo una reserva por asiento de avión
+    assert len({(x["airplane_id"], x["seat_number"]) for x in reservas}) == 500
+    rutas, _ = gr._leer_flota_vuelos()
+    avion_de_ruta = {r["airplane_route_id"]: r["airplane_id"] for r in rutas}
+    assert all(avion_de_ruta[x["airplane_route_id"]] == x["airplane_id"] for x in reservas)
+    # Las reservas de un avión se reparten entre sus tres rutas
+    assert len({x["airplane_route_id"] for x in reservas}) > 20
+    assert len({x["reservation_code"] for x in reservas}) == 500
+    assert len({p["payment_id"] for p in pagos}) == 150
+    assert Counter(x["status"] for x in reservas) == {"Reservado": 350, "Pagado": 150}
+    assert gr.reservation_schema.validate(reservas[0]) == {}
+    # Índices derivados reconstruidos con los datos nuevos
+    rutas, _ = gr.INGRESOS_POR_RUTA.resumen()
+    assert sum(f["payments"] for f in rutas) == 150
+
+    flota_gr.post("/admin/seed", json=cuerpo)
+    assert flota_gr.get("/get_fake_reservations").get_json() == reservas
+    assert flota_gr.get("/get_all_fake_payments").get_json() == pagos
+
+
+def test_seed_reservas_sin_asientos_suficientes(flota_gr):
+    # 20 aviones x 30 asientos = 600 asientos, sin importar las 60 rutas
+    assert flota_gr.post("/admin/seed", json={"reservations": 600, "sync_seats": False}).status_code == 201
+    r = flota_gr.post("/admin/seed", json={"reservations": 601, "sync_seats": False})
+    assert r.status_code == 409
+    assert flota_gr.post("/admin/seed", json={"reservations": 10, "payments": 11}).status_code == 409
+    assert flota_gr.post("/admin/seed", json={"reservations": -1}).status_code == 400
+
+
+def test_bench_seed_reservas(gv, gr):
+    # 1000 aviones x 200 asientos con 10 rutas por avión: 200k asientos para 100k reservas
+    cliente = gv.app.test_client()
+    cliente.post("/admin/seed", json={"seed": 1, "airplanes": 1000 * ESCALA, "capacity": 200,
+                                      "routes": 10000 * ESCALA})
+    rutas, asientos = _flota(cliente)
+    numeros = {aid: [n for n, _ in lista] for aid, lista in asientos.items()}
+    cantidad = 100_000 * ESCALA
+
+    reservas, pagos = medir(
+        "seed_reservas", lambda: gr.generar_semilla(1, cantidad, cantidad // 3, rutas, numeros,
+                                                    datetime(2025, 6, 1), gr.formatear_fecha_espanol),
+        cantidad, repeticiones=1)
+    assert len(reservas) == cantidad and len(pagos) == cantidad // 3
+    medir("seed_analitica_cargar", lambda: gr.ANALITICA.cargar(reservas, pagos), cantidad, repeticiones=1)
+
+
+def test_arranque_reintenta_mientras_gestion_vuelos_arranca(gr, monkeypatch):
+    # Dos intentos con GestiónVuelos caído y después responde
+    respuestas = [gr.GestionVuelosNoDisponible("GET /get_all_airplanes_routes: ConnectionError")] * 2
+    nuevas = [{"reservation_code": "ABC234", "airplane_id": 1, "airplane_route_id": 1, "flight_number": "AA-1000",
+               "seat_number": f"1{letra}", "status": estado, "price": 100.0}
+              for letra, estado in (("A", "Pagado"), ("B", "Reservado"))]
+
+    def generar(n, pagadas):
+        assert (n, pagadas) == (2, 1)
+        if respuestas:
+            raise respuestas.pop()
+        return nuevas
+
+    monkeypatch.setenv("GESTIONVUELOS_SERVICE", "http://gestionvuelos")
+    monkeypatch.setattr(gr, "generate_fake_reservations", generar)
+    monkeypatch.setattr(gr, "reservations", [{"reservation_id": 7, "reservation_code": "ABC234"}])
+    monkeypatch.setattr(gr, "payments", [])
+    monkeypatch.setattr(gr, "INGRESOS_POR_RUTA", gr.IngresosPorRuta())
+    monkeypatch.setattr(gr, "ANALITICA", gr.AnaliticaReservas())
+    arranque = gr.ArranqueReservas(2, 1, espera_max=5, backoff_base=0.01)
+    arranque.iniciar()
+    assert arranque.esperar(5) == "listo"
+
+    estado = arranque.snapshot()
+    assert estado["attempts"] == 3 and estado["reservations"] == 2 and estado["payments"] == 1
+    assert "ConnectionError" in estado["last_error"]
+    # IDs a continuación de los existentes y códigos sin repetir
+    assert [r["reservation_id"] for r in gr.reservations] == [7, 8, 9]
+    assert len({r["reservation_code"] for r in gr.reservations}) == 3
+    assert [p["reservation_id"] for p in gr.payments] == [8]
+    assert gr.INGRESOS_POR_RUTA.resumen()[0][0]["payments"] == 1
+
+
+def test_arranque_falla_si_gestion_vuelos_no_responde_a_tiempo(gr, monkeypatch):
+    def generar(n, pagadas):
+        raise gr.GestionVuelosNoDisponible("GET /get_all_airplanes_routes: HTTP 503")
+
+    monkeypatch.setenv("GESTIONVUELOS_SERVICE", "http://gestionvuelos")
+    monkeypatch.setattr(gr, "generate_fake_reservations", generar)
+    arranque = gr.ArranqueReservas(3, 1, espera_max=0.1, backoff_base=0.02)
+    arranque.iniciar()
+    assert arranque.esperar(5) == "fallido"
+    assert arranque.snapshot()["attempts"] >= 2 and "503" in arranque.snapshot()["last_error"]
@@ -0,0 +1,81 @@
+"""
+Benchmark de arranque en frío: tiempo de `import app` de cada servicio en un
+proceso nuevo y resumen de `python -X importtime` (tiempo propio agrupado por
+paquete raíz).
+
+El piso es importar solo Flask, Marshmallow, requests y dotenv, que todo
+servicio necesita; lo que el servicio agrega encima debe quedar por debajo de
+200 ms. Faker, flasgger, OpenTelemetry y NumPy no deben cargarse al importar
+(ver arranque.py y analytics.py).
+
+    python -m pytest tests/perf/test_startup_import.py -q -s
+"""
+
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from microbench import GUARDAR_HISTORIAL, ROOT, registrar  # noqa: E402
+
+PISO = "import flask, marshmallow, requests, dotenv"
+PEREZOSOS = ("faker", "faker_airtravel", "flasgger", "opentelemetry", "numpy")
+MAX_SOBRE_PISO_MS = 200
+REPETICIONES = 3
+
+_MEDIR = """
+import sys, time
+t = time.perf_counter()
+{codigo}
+print((time.perf_counter() - t) * 1000)
+print(",".join(sorted(m for m in sys.modules if "." not in m)))
+"""
+
+
+def _importar(codigo, carpeta):
+    """(ms de import, módulos raíz cargados) en un intérprete nuevo."""
+    salida = subprocess.run([sys.executable, "-c", _MEDIR.format(codigo=codigo)], cwd=carpeta,
+                            capture_output=True, text=True, timeout=60,
+                            env=dict(os.environ, OTEL_TRACES_EXPORTER="none"))
+    assert salida.returncode == 0, salida.stderr[-2000:]
+    ms, modulos = salida.stdout.strip().splitlines()[-2:]
+    return float(ms), set(modulos.split(","))
+
+
+def _resumen_importtime(carpeta, top=8):
+    """Tiempo propio (µs) por paquete raíz según `python -X importtime`."""
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=carpeta,
+                            capture_output=True, text=True, timeout=60)
+    por_paquete = Counter()
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, _, nombre = linea[len("import time:"):].split("|")
+        por_paquete[nombre.strip().split(".")[0]] += int(propio)
+    return por_paquete.most_common(top)
+
+
+@pytest.fixture(scope="module")
+def piso_ms():
+    return min(_importar(PISO, ROOT)[0] for _ in range(REPETICIONES))
+
+
+@pytest.mark.parametrize("servicio", ["GestionVuelos", "GestionReservas", "Usuario"])
+def test_import_del_servicio(servicio, piso_ms):
+    carpeta = ROOT / servicio
+    corridas = [_importar("import app", carpeta) for _ in range(REPETICIONES)]
+    tiempos = sorted(ms for ms, _ in corridas)
+    cargados = corridas[-1][1]
+
+    print(f"\n[STARTUP] {servicio}: import {tiempos[0]:.0f} ms (piso Flask+deps {piso_ms:.0f} ms)")
+    for paquete, micros in _resumen_importtime(carpeta):
+        print(f"    {micros / 1000:8.1f} ms  {paquete}")
+    if GUARDAR_HISTORIAL:
+        registrar(f"import_{servicio}", 1, REPETICIONES, tiempos[0] / 1000, tiempos[len(tiempos) // 2] / 1000)
+
+    assert not cargados.intersection(PEREZOSOS), f"se importan al arrancar: {cargados.intersection(PEREZOSOS)}"
+    assert tiempos[0] - piso_ms < MAX_SOBRE_PISO_MS
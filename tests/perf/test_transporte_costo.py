@@ -0,0 +1,41 @@
+"""
+Costo del transporte binario (transporte.py) con datos sembrados: bytes y
+tiempo de codificar y decodificar las listas de asientos y rutas en JSON y en
+MessagePack (el comportamiento está en tests/unit/test_transporte.py).
+
+    python -m pytest tests/perf/test_transporte_costo.py -q -s
+"""
+
+import json
+
+import pytest
+
+from microbench import ESCALA, cargar_app, medir
+
+msgpack = pytest.importorskip("msgpack")
+
+FLOTA = {"seed": 11, "airplanes": 20, "capacity": 30 * ESCALA, "routes": 60, "base_date": "2025-06-01"}
+
+
+@pytest.fixture(scope="module")
+def cliente_gv():
+    gv = cargar_app("gv_app_transporte", "GestionVuelos")
+    cliente = gv.app.test_client()
+    assert cliente.post("/admin/seed", json=FLOTA).status_code == 201
+    return cliente
+
+
+def test_costo_codificar_y_decodificar(cliente_gv):
+    datos = {
+        "asientos": cliente_gv.get("/seats/grouped-by-airplane").get_json(),
+        "rutas": cliente_gv.get("/get_all_airplanes_routes").get_json(),
+    }
+    for nombre, obj in datos.items():
+        n = len(obj)
+        cuerpo_json = medir(f"transporte_json_dumps_{nombre}", lambda: json.dumps(obj).encode(), n)
+        cuerpo_msgpack = medir(f"transporte_msgpack_packb_{nombre}", lambda: msgpack.packb(obj), n)
+        assert medir(f"transporte_json_loads_{nombre}", lambda: json.loads(cuerpo_json), n) == obj
+        assert medir(f"transporte_msgpack_unpackb_{nombre}", lambda: msgpack.unpackb(cuerpo_msgpack), n) == obj
+        print(f"\n[BYTES] {nombre}: json={len(cuerpo_json)} msgpack={len(cuerpo_msgpack)}")
+        assert len(cuerpo_msgpack) < len(cuerpo_json)
+
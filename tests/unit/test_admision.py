@@ -0,0 +1,147 @@
+"""
+admision.py en proceso, con un reloj falso y una app Flask mínima: cubos de
+tokens por cliente y por endpoint, tope de concurrencia, Retry-After y
+descarte LRU de clientes.
+
+    python -m pytest tests/unit/test_admision.py -q
+"""
+
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+from tests.utils.modulos import cargar_modulo
+
+admision = cargar_modulo("admision_unit", "Usuario", "admision.py")
+
+
+class Reloj:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_parsear_limites_y_reglas():
+    assert admision.parsear_limite("5:10") == (5.0, 10.0)
+    assert admision.parsear_limite("0.5") == (0.5, 1.0)
+    assert admision.parsear_limite("") is None and admision.parsear_limite("0") is None
+    with pytest.raises(ValueError):
+        admision.parsear_limite("-1:5")
+    assert admision.parsear_reglas("/a=2:4, /b=0,basura") == {"/a": (2.0, 4.0)}
+    assert admision.parsear_reglas("/a=3,/b=1", valor=int) == {"/a": 3, "/b": 1}
+
+
+def test_cubo_por_cliente_y_por_endpoint():
+    reloj = Reloj()
+    control = admision.ControlDeAdmision(
+        por_cliente=admision.Limite(10, 5), por_endpoint={"/caro": admision.Limite(1, 2)}, reloj=reloj)
+
+    def pedir(cliente, endpoint):
+        rechazo = control.admitir(cliente, endpoint)
+        if rechazo is None:
+            control.liberar(endpoint)
+        return rechazo
+
+    # Ráfaga del endpoint caro agotada: 429 y no se descuenta el token del cliente
+    assert pedir("a", "/caro") is None and pedir("a", "/caro") is None
+    codigo, retry_after, _, motivo = pedir("a", "/caro")
+    assert (codigo, retry_after, motivo) == (429, 1, "rate_limit")
+    assert all(pedir("a", "/barato") is None for _ in range(3))
+    assert pedir("a", "/barato")[0] == 429
+    # Otro cliente tiene sus propios cubos
+    assert pedir("b", "/caro") is None
+
+    # La recarga es perezosa: 1 s después hay un token más en /caro
+    reloj.t += 1.0
+    assert pedir("a", "/caro") is None
+    assert pedir("a", "/caro")[0] == 429
+    assert control.snapshot()["rejected"]["rate_limit"] == 3
+
+
+def test_retry_after_segun_tasa():
+    reloj = Reloj()
+    control = admision.ControlDeAdmision(por_cliente=admision.Limite(0.2, 1), reloj=reloj)
+    assert control.admitir("a", "/x") is None
+    assert control.admitir("a", "/x")[1] == 5
+    reloj.t += 2.5
+    assert control.admitir("a", "/x")[1] == 3
+
+
+def test_descarte_lru_de_clientes():
+    control = admision.ControlDeAdmision(por_cliente=admision.Limite(1, 1), max_clientes=3, reloj=Reloj())
+    for cliente in "abc":
+        assert control.admitir(cliente, "/x") is None
+    assert control.admitir("a", "/x")[0] == 429          # "a" pasa a ser el más reciente
+    assert control.admitir("d", "/x") is None            # descarta "b"
+    assert control.snapshot()["clients_tracked"] == 3
+    assert control.admitir("b", "/x") is None            # "b" vuelve con el cubo lleno
+    assert control.admitir("a", "/x")[0] == 429
+
+
+@pytest.fixture
+def app_lenta():
+    """App con un endpoint caro que espera a que el test lo suelte."""
+    app = Flask("admision_test")
+    soltar = threading.Event()
+    dentro = threading.Semaphore(0)
+
+    @app.route("/caro")
+    def caro():
+        dentro.release()
+        soltar.wait(5)
+        return jsonify({"ok": True})
+
+    @app.route("/livez")
+    def livez():
+        return jsonify({"status": "alive"})
+
+    return app, soltar, dentro
+
+
+def test_tope_de_concurrencia_con_flask(app_lenta):
+    app, soltar, dentro = app_lenta
+    control = admision.ControlDeAdmision(concurrencia={"/caro": 2}, en_curso_max=3, exentos=("/livez",))
+    control.registrar(app)
+    cliente = app.test_client()
+
+    respuestas = []
+    hilos = [threading.Thread(target=lambda: respuestas.append(cliente.get("/caro"))) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    assert dentro.acquire(timeout=5) and dentro.acquire(timeout=5)
+
+    # Tercera solicitud al endpoint lleno: 503 al instante, con Retry-After
+    r = cliente.get("/caro")
+    assert r.status_code == 503 and r.headers["Retry-After"] == "1"
+    assert "simultáneas" in r.get_json()["message"]
+    assert control.snapshot()["in_flight_by_endpoint"] == {"/caro": 2}
+    # Otra ruta entra (total 3) y los exentos no cuentan
+    assert cliente.get("/no_existe").status_code == 404
+    assert cliente.get("/livez").status_code == 200
+
+    soltar.set()
+    for hilo in hilos:
+        hilo.join(5)
+    assert [r.status_code for r in respuestas] == [200, 200]
+    assert control.snapshot()["in_flight"] == 0
+    assert cliente.get("/caro").status_code == 200
+
+
+def test_sobrecarga_global(app_lenta):
+    app, soltar, dentro = app_lenta
+    control = admision.ControlDeAdmision(en_curso_max=1)
+    control.registrar(app)
+    cliente = app.test_client()
+
+    hilo = threading.Thread(target=lambda: cliente.get("/caro"))
+    hilo.start()
+    assert dentro.acquire(timeout=5)
+    r = cliente.get("/livez")
+    assert r.status_code == 503 and r.headers["Retry-After"] == "1"
+    soltar.set()
+    hilo.join(5)
+    assert control.snapshot()["rejected"]["sobrecarga"] == 1
+
@@ -0,0 +1,147 @@
+"""
+agrupador.py en proceso contra un upstream HTTP local lento: las GET idénticas
+y simultáneas salen una sola vez a la red, las distintas y las escrituras no se
+agrupan, y una lectura posterior a una escritura propia no reusa una respuesta
+anterior.
+
+    python -m pytest tests/unit/test_agrupador.py -q
+"""
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tests.utils.modulos import cargar_modulo
+
+agrupador = cargar_modulo("agrupador_unit", "Usuario", "agrupador.py")
+
+
+class Upstream:
+    """Servidor local que cuenta las solicitudes por método y ruta y tarda `demora` en responder."""
+
+    def __init__(self):
+        self.demora = 0.2
+        self.llamadas = Counter()
+        self.version = 0
+        upstream = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def _responder(self):
+                upstream.llamadas[(self.command, self.path)] += 1
+                if self.command == "PUT":
+                    upstream.version += 1
+                # La versión se lee al llegar la solicitud, como un snapshot del store
+                cuerpo = f'{{"path": "{self.path}", "version": {upstream.version}}}'.encode()
+                if self.command == "GET":
+                    time.sleep(upstream.demora)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            do_GET = do_PUT = _responder
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def upstream():
+    servidor = Upstream()
+    yield servidor
+    servidor.servidor.shutdown()
+    servidor.servidor.server_close()
+
+
+@pytest.fixture
+def sesion():
+    lecturas = agrupador.AgrupadorDeLecturas()
+    sesion = requests.Session()
+    lecturas.instalar(sesion)
+    sesion.lecturas = lecturas
+    return sesion
+
+
+def test_get_identicas_simultaneas_salen_una_vez(upstream, sesion):
+    url = f"{upstream.url}/get_airplane_seats/7/seats"
+    with ThreadPoolExecutor(30) as pool:
+        respuestas = list(pool.map(lambda _: sesion.get(url, timeout=5), range(30)))
+
+    assert all(r.status_code == 200 and r.json()["path"] == "/get_airplane_seats/7/seats" for r in respuestas)
+    assert upstream.llamadas[("GET", "/get_airplane_seats/7/seats")] == 1
+    # Cada seguidora recibe su propio Response (copia), con el cuerpo ya leído
+    assert len({id(r) for r in respuestas}) == 30
+
+    estado = sesion.lecturas.snapshot()
+    assert (estado["leaders"], estado["followers"], estado["in_flight"]) == (1, 29, 0)
+    assert estado["top_keys"][0] == {"url": url, "leaders": 1, "followers": 29}
+
+
+def test_distintas_urls_params_y_escrituras_no_se_agrupan(upstream, sesion):
+    upstream.demora = 0.1
+    lecturas = [("/a", None), ("/b", None), ("/a", {"x": "1"})] * 5
+    with ThreadPoolExecutor(len(lecturas)) as pool, ThreadPoolExecutor(5) as escrituras:
+        puts = [escrituras.submit(sesion.put, f"{upstream.url}/a", timeout=5) for _ in range(5)]
+        list(pool.map(lambda p: sesion.get(upstream.url + p[0], params=p[1], timeout=5), lecturas))
+        assert all(f.result().status_code == 200 for f in puts)
+
+    assert upstream.llamadas[("GET", "/a")] == 1
+    assert upstream.llamadas[("GET", "/b")] == 1
+    assert upstream.llamadas[("GET", "/a?x=1")] == 1
+    assert upstream.llamadas[("PUT", "/a")] == 5
+
+
+def test_lectura_tras_escritura_propia_no_reusa_respuesta_vieja(upstream, sesion):
+    url = f"{upstream.url}/seats"
+    # Una lectura lenta queda en curso con la versión 0
+    vieja = ThreadPoolExecutor(1).submit(sesion.get, url, timeout=5)
+    time.sleep(0.05)
+    # Este hilo escribe y luego lee: no puede sumarse a la lectura anterior al PUT
+    assert sesion.put(url, timeout=5).status_code == 200
+    nueva = sesion.get(url, timeout=5)
+
+    assert vieja.result().json()["version"] == 0
+    assert nueva.json()["version"] == 1
+    assert upstream.llamadas[("GET", "/seats")] == 2
+
+
+def test_error_de_la_lider_llega_a_las_seguidoras(sesion):
+    # Puerto 9 (discard) sin servidor: todas fallan con la misma excepción
+    with ThreadPoolExecutor(10) as pool:
+        futuros = [pool.submit(sesion.get, "http://127.0.0.1:9/x", timeout=1) for _ in range(10)]
+    errores = [f.exception() for f in futuros]
+    assert all(isinstance(e, requests.exceptions.ConnectionError) for e in errores)
+    assert sesion.lecturas.snapshot()["in_flight"] == 0
+
+
+def test_ruta_normalizada_acota_cardinalidad():
+    assert agrupador.ruta_normalizada("http://gv:5001/get_airplane_seats/17/seats") == "/get_airplane_seats/{id}/seats"
+    assert agrupador.ruta_normalizada("http://gr:5002/get_reservation_by_code/AB12CD") == "/get_reservation_by_code/{id}"
+    assert agrupador.ruta_normalizada("http://gv:5001/get_airplanes") == "/get_airplanes"
+
+
+def test_seguidora_espera_como_mucho_su_timeout(upstream, sesion):
+    upstream.demora = 0.6
+    url = f"{upstream.url}/lenta"
+    lider = ThreadPoolExecutor(1).submit(sesion.get, url, timeout=5)
+    time.sleep(0.05)
+
+    inicio = time.perf_counter()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        sesion.get(url, timeout=(0.05, 0.1))
+    assert time.perf_counter() - inicio < 0.4
+
+    # La líder no se entera y termina con su respuesta
+    assert lider.result().status_code == 200
+    assert upstream.llamadas[("GET", "/lenta")] == 1
+    assert sesion.lecturas.snapshot()["in_flight"] == 0
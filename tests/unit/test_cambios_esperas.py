@@ -0,0 +1,58 @@
+"""
+Feed de cambios de GestionVuelos en proceso: max_seconds y timeout no aceptan
+valores no finitos, el stream dura a lo sumo CHANGES_STREAM_MAX_SECONDS y los
+long-polls y streams abiertos a la vez no pasan de CHANGES_WAITERS_MAX (el
+resto recibe 503 con Retry-After).
+"""
+
+import threading
+import time
+
+import pytest
+
+from tests.utils.modulos import cargar_app
+
+
+@pytest.fixture(scope="module")
+def gv():
+    return cargar_app("gv_app_unit", "GestionVuelos")
+
+
+@pytest.fixture
+def cliente(gv, monkeypatch):
+    monkeypatch.setattr(gv, "ESPERAS_CAMBIOS", threading.BoundedSemaphore(1))
+    return gv.app.test_client()
+
+
+@pytest.mark.parametrize("query", [
+    "/changes?timeout=inf", "/changes?timeout=nan",
+    "/changes/stream?max_seconds=inf", "/changes/stream?max_seconds=-inf",
+])
+def test_segundos_no_finitos(cliente, query):
+    r = cliente.get(query)
+    assert r.status_code == 400, r.get_json()
+
+
+def test_max_seconds_acotado(gv, cliente, monkeypatch):
+    monkeypatch.setattr(gv, "CHANGES_STREAM_MAX_SECONDS", 0.2)
+    inicio = time.perf_counter()
+    r = cliente.get("/changes/stream?max_seconds=1e9")
+    assert r.status_code == 200 and r.get_data(as_text=True).startswith("retry:")
+    assert time.perf_counter() - inicio < 2
+
+
+def test_tope_de_esperas_abiertas(gv, cliente):
+    version = gv.CHANGE_FEED.version
+    abierto = cliente.get(f"/changes/stream?since={version}&max_seconds=30", buffered=False)
+    assert abierto.status_code == 200
+
+    # Sin lugar: otro stream y un long-poll que tendría que esperar
+    for query in (f"/changes/stream?since={version}", f"/changes?since={version}&timeout=5"):
+        r = cliente.get(query)
+        assert r.status_code == 503, query
+        assert r.headers["Retry-After"] == str(gv.CHANGES_RETRY_AFTER_S)
+    # Un long-poll sin espera no ocupa lugar
+    assert cliente.get(f"/changes?since={version}").status_code == 200
+
+    abierto.close()
+    assert cliente.get(f"/changes?since={version}&timeout=0.05").status_code == 200
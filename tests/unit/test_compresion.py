@@ -0,0 +1,124 @@
+"""
+Compresión negociada (compresion.py) y vista compacta de pagos, en proceso con
+datos sembrados: bytes en el cable de los endpoints de pagos y de asientos con
+y sin gzip, descompresión de solicitudes y compresión de cuerpos salientes.
+
+    python -m pytest tests/unit/test_compresion.py -q -s
+"""
+
+import gzip
+import json
+
+import pytest
+
+from tests.utils.modulos import cargar_app, cargar_modulo
+
+compresion = cargar_modulo("compresion_unit", "Usuario", "compresion.py")
+
+FLOTA = {"seed": 11, "airplanes": 40, "capacity": 30, "routes": 60, "base_date": "2025-06-01"}
+SEMILLA = {"seed": 11, "reservations": 1000, "payments": 600, "sync_seats": False, "base_date": "2025-06-01"}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture(scope="module")
+def clientes():
+    gv = cargar_app("gv_app_unit", "GestionVuelos")
+    gr = cargar_app("gr_app_unit", "GestionReservas")
+    cliente_gv = gv.app.test_client()
+    assert cliente_gv.post("/admin/seed", json=FLOTA).status_code == 201
+    rutas = cliente_gv.get("/get_all_airplanes_routes").get_json()
+    agrupados = cliente_gv.get("/seats/grouped-by-airplane").get_json()
+    flota = rutas, {int(aid): [(a["seat_number"], a["status"]) for a in lista] for aid, lista in agrupados.items()}
+    original = gr._leer_flota_vuelos
+    gr._leer_flota_vuelos = lambda: flota
+    try:
+        cliente_gr = gr.app.test_client()
+        assert cliente_gr.post("/admin/seed", json=SEMILLA).status_code == 201
+    finally:
+        gr._leer_flota_vuelos = original
+    return cliente_gv, cliente_gr
+
+
+def _bytes(cliente, ruta):
+    plano = cliente.get(ruta)
+    comprimido = cliente.get(ruta, headers=GZIP)
+    assert plano.status_code == comprimido.status_code == 200
+    assert "Content-Encoding" not in plano.headers
+    assert comprimido.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in comprimido.headers["Vary"]
+    assert gzip.decompress(comprimido.get_data()) == plano.get_data()
+    return len(plano.get_data()), len(comprimido.get_data())
+
+
+def test_bytes_en_el_cable_pagos_y_asientos(clientes):
+    cliente_gv, cliente_gr = clientes
+    medidas = {
+        "GR /get_all_fake_payments": _bytes(cliente_gr, "/get_all_fake_payments"),
+        "GR /get_all_fake_payments?view=compact": _bytes(cliente_gr, "/get_all_fake_payments?view=compact"),
+        "GV /get_airplane_seats/1/seats": _bytes(cliente_gv, "/get_airplane_seats/1/seats"),
+        "GV /seats/grouped-by-airplane": _bytes(cliente_gv, "/seats/grouped-by-airplane"),
+        "GV /get_all_airplanes_routes": _bytes(cliente_gv, "/get_all_airplanes_routes"),
+    }
+    for nombre, (plano, comprimido) in medidas.items():
+        print(f"\n[BYTES] {nombre}: identity={plano} gzip={comprimido} (-{100 * (1 - comprimido / plano):.0f} %)")
+
+    pagos, compactos = medidas["GR /get_all_fake_payments"], medidas["GR /get_all_fake_payments?view=compact"]
+    assert compactos[0] < pagos[0] * 0.6
+    assert pagos[1] < pagos[0] * 0.3
+    assert medidas["GV /seats/grouped-by-airplane"][1] < medidas["GV /seats/grouped-by-airplane"][0] * 0.2
+
+
+def test_vista_compacta_referencia_la_reserva(clientes):
+    _, cliente_gr = clientes
+    completos = cliente_gr.get("/get_all_fake_payments").get_json()
+    compactos = cliente_gr.get("/get_all_fake_payments?view=compact").get_json()
+    assert len(compactos) == len(completos) == SEMILLA["payments"]
+    for completo, compacto in zip(completos, compactos):
+        assert set(compacto) <= set(completo) and "passport_number" not in compacto
+        assert compacto == {k: completo[k] for k in compacto}
+        assert compacto["reservation_id"] and compacto["reservation_code"]
+    assert cliente_gr.get("/get_all_fake_payments?view=xml").status_code == 400
+
+
+def test_respuestas_chicas_y_etag(clientes):
+    cliente_gv, _ = clientes
+    # /livez está por debajo del umbral: viaja sin comprimir aunque el cliente acepte gzip
+    r = cliente_gv.get("/livez", headers=GZIP)
+    assert "Content-Encoding" not in r.headers
+    # El ETag pasa a débil con gzip y el 304 sigue funcionando
+    r = cliente_gv.get("/openapi.json", headers=GZIP)
+    assert r.headers["Content-Encoding"] == "gzip" and r.headers["ETag"].startswith('W/"')
+    assert cliente_gv.get("/openapi.json", headers={**GZIP, "If-None-Match": r.headers["ETag"]}).status_code == 304
+
+
+def test_solicitudes_comprimidas(clientes):
+    cliente_gv, _ = clientes
+    cuerpo = json.dumps({"allocations": [{"airplane_id": 1, "count": 1}]}).encode()
+    cabeceras = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    r = cliente_gv.post("/seats/allocate", data=gzip.compress(cuerpo), headers=cabeceras)
+    assert r.status_code == 200 and r.get_json()["allocated"] == 1
+
+    assert cliente_gv.post("/seats/allocate", data=b"no es gzip", headers=cabeceras).status_code == 400
+    assert cliente_gv.post("/seats/allocate", data=cuerpo,
+                           headers={**cabeceras, "Content-Encoding": "zstd"}).status_code == 415
+    # Un cuerpo que se infla por encima del tope se corta sin descomprimirlo entero
+    bomba = gzip.compress(b" " * (compresion._MAX_DESCOMPRIMIDO + 1), compresslevel=1)
+    assert cliente_gv.post("/seats/allocate", data=bomba, headers=cabeceras).status_code == 413
+
+
+def test_comprimir_solicitudes_salientes():
+    enviados = []
+
+    class Sesion:
+        def request(self, method, url, *args, **kwargs):
+            enviados.append(kwargs)
+
+    sesion = Sesion()
+    compresion.comprimir_solicitudes(sesion, minimo=1024)
+    sesion.request("PUT", "http://gv/seats/batch", json={"updates": []}, timeout=5)
+    grande = {"updates": [{"airplane_id": 1, "seat_number": f"{i}A", "status": "Libre"} for i in range(100)]}
+    sesion.request("PUT", "http://gv/seats/batch", json=grande, timeout=5)
+
+    assert enviados[0] == {"json": {"updates": []}, "timeout": 5}
+    assert enviados[1]["headers"]["Content-Encoding"] == "gzip" and "json" not in enviados[1]
+    assert json.loads(gzip.decompress(enviados[1]["data"])) == grande
@@ -0,0 +1,38 @@
+"""
+Los módulos compartidos (tools/compartidos.py) son idénticos en los tres
+servicios: una edición hecha en una sola copia rompe este test hasta correr
+`python -m tools.compartidos`.
+"""
+
+import shutil
+
+import pytest
+
+from tools import compartidos
+
+
+def test_copias_identicas_a_la_fuente():
+    assert compartidos.diferencias() == []
+
+
+def test_sincronizar_propaga_la_fuente(tmp_path):
+    for servicio in (compartidos.FUENTE, *compartidos.COPIAS):
+        (tmp_path / servicio).mkdir()
+        for modulo in compartidos.MODULOS:
+            shutil.copyfile(compartidos.ROOT / servicio / modulo, tmp_path / servicio / modulo)
+    editado = tmp_path / "Usuario" / "metrics.py"
+    editado.write_text(editado.read_text() + "# cambio local\n")
+    (tmp_path / "GestionReservas" / "salud.py").unlink()
+
+    esperadas = [("Usuario", "metrics.py"), ("GestionReservas", "salud.py")]
+    assert compartidos.diferencias(tmp_path) == esperadas
+    assert compartidos.sincronizar(tmp_path) == esperadas
+    assert compartidos.diferencias(tmp_path) == []
+
+
+def test_check_falla_con_copias_distintas(monkeypatch, capsys):
+    monkeypatch.setattr(compartidos, "diferencias", lambda raiz=None: [("Usuario", "tracing.py")])
+    with pytest.raises(SystemExit) as salida:
+        compartidos.main(["--check"])
+    assert salida.value.code == 1
+    assert "Usuario/tracing.py" in capsys.readouterr().err
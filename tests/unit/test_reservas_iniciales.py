@@ -0,0 +1,77 @@
+"""
+Reservas iniciales de GestionReservas (generate_fake_reservations) contra un
+GestiónVuelos simulado: si un avión ya no tiene asientos libres, las que faltan
+se piden en otras rutas hasta llegar a `n` o quedarse sin rutas.
+"""
+
+import pytest
+
+from tests.utils.modulos import cargar_app
+
+
+class _Respuesta:
+    def __init__(self, cuerpo, status_code=200):
+        self.status_code = status_code
+        self._cuerpo = cuerpo
+
+    def json(self):
+        return self._cuerpo
+
+
+class GestionVuelosSimulado:
+    """Rutas fijas y `libres` asientos por avión; cuenta las tandas de /seats/allocate."""
+
+    def __init__(self, rutas_por_avion, libres):
+        self.rutas = [
+            {"airplane_route_id": airplane_id * 10 + k, "airplane_id": airplane_id,
+             "flight_number": f"AA-{airplane_id}{k:03d}", "price": 100.0}
+            for airplane_id, cantidad in rutas_por_avion.items() for k in range(cantidad)
+        ]
+        self.libres = dict(libres)
+        self.tandas = []
+
+    def __call__(self, metodo, ruta, **kwargs):
+        if ruta == "/get_all_airplanes_routes":
+            return _Respuesta([dict(r) for r in self.rutas])
+        pedidos = kwargs["json"]["allocations"]
+        self.tandas.append(pedidos)
+        resultados = []
+        for pedido in pedidos:
+            airplane_id = pedido["airplane_id"]
+            if self.libres.get(airplane_id, 0) < 1:
+                resultados.append({"status_code": 409, "message": "Sin asientos libres"})
+                continue
+            self.libres[airplane_id] -= 1
+            resultados.append({"status_code": 200, "seats": [f"{self.libres[airplane_id] + 1}A"]})
+        return _Respuesta({"results": resultados})
+
+
+@pytest.fixture
+def gr():
+    return cargar_app("gr_app_unit", "GestionReservas")
+
+
+def test_completa_n_con_las_rutas_restantes(gr, monkeypatch):
+    # El avión 1 está lleno; sus rutas salen primero con cualquier orden del shuffle
+    vuelos = GestionVuelosSimulado({1: 3, 2: 4}, libres={1: 0, 2: 10})
+    monkeypatch.setattr(gr, "_llamar_gestion_vuelos", vuelos)
+    monkeypatch.setattr(gr.random, "shuffle", lambda rutas: rutas.sort(key=lambda r: r["airplane_id"]))
+
+    generadas = gr.generate_fake_reservations(3, pagadas=2)
+
+    assert len(generadas) == 3
+    assert {r["airplane_id"] for r in generadas} == {2}
+    assert len({r["airplane_route_id"] for r in generadas}) == 3
+    assert [r["status"] for r in generadas] == ["Pagado", "Pagado", "Reservado"]
+    # Segunda tanda: solo las que faltaban y sin volver al avión lleno
+    assert [[p["airplane_id"] for p in tanda] for tanda in vuelos.tandas] == [[1, 1, 1], [2, 2, 2]]
+
+
+def test_se_detiene_sin_rutas_restantes(gr, monkeypatch):
+    vuelos = GestionVuelosSimulado({1: 2, 2: 2}, libres={1: 1, 2: 0})
+    monkeypatch.setattr(gr, "_llamar_gestion_vuelos", vuelos)
+
+    generadas = gr.generate_fake_reservations(4)
+
+    assert [r["airplane_id"] for r in generadas] == [1]
+    assert sum(len(tanda) for tanda in vuelos.tandas) <= 4
@@ -0,0 +1,87 @@
+"""
+Altas de rutas de GestionVuelos desde varios hilos (el servicio corre con
+--threads 8): la misma ruta enviada a la vez se registra una sola vez, en la
+lista y en el índice, y actualizar una ruta que otro hilo elimina no la vuelve
+a poner en el índice.
+"""
+
+import threading
+
+import pytest
+
+from tests.utils.modulos import cargar_app
+
+HILOS = 8
+FLOTA = {"seed": 5, "airplanes": 3, "capacity": 12, "routes": 6, "base_date": "2031-01-01"}
+
+
+@pytest.fixture(scope="module")
+def gv():
+    gv = cargar_app("gv_app_unit", "GestionVuelos")
+    assert gv.app.test_client().post("/admin/seed", json=FLOTA).status_code == 201
+    return gv
+
+
+def _ruta_nueva(gv):
+    with gv.STORE_LOCK.read():
+        airplane_id = gv.airplanes[0]["airplane_id"]
+        route_id = max((r["airplane_route_id"] for r in gv.airplanes_routes), default=0) + 1
+    return {
+        "airplane_route_id": route_id,
+        "airplane_id": airplane_id,
+        "flight_number": f"ZZ-{route_id % 10000:04d}",
+        "departure": "San José",
+        "departure_time": "Marzo 3, 2031 - 08:00:00",
+        "arrival": "Lima",
+        "arrival_time": "Marzo 3, 2031 - 12:30:00",
+        "price": 350,
+        "Moneda": "Dolares",
+    }
+
+
+def _en_paralelo(funcion):
+    barrera = threading.Barrier(HILOS)
+    resultados = []
+
+    def correr():
+        barrera.wait()
+        resultados.append(funcion())
+
+    hilos = [threading.Thread(target=correr) for _ in range(HILOS)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return resultados
+
+
+def test_alta_concurrente_registra_la_ruta_una_vez(gv):
+    ruta = _ruta_nueva(gv)
+    codigos = _en_paralelo(lambda: gv.app.test_client().post("/add_airplane_route", json=ruta).status_code)
+
+    assert sorted(codigos) == [201] + [400] * (HILOS - 1)
+    rid = ruta["airplane_route_id"]
+    assert sum(r["airplane_route_id"] == rid for r in gv.airplanes_routes) == 1
+    assert gv.app.test_client().get(f"/get_airplanes_route_by_id/{rid}").status_code == 200
+
+
+def test_actualizar_ruta_eliminada_mientras_tanto(gv, monkeypatch):
+    cliente = gv.app.test_client()
+    ruta = _ruta_nueva(gv)
+    assert cliente.post("/add_airplane_route", json=ruta).status_code == 201
+    rid = ruta["airplane_route_id"]
+
+    # La eliminación entra después de la primera búsqueda y antes de aplicar el cambio
+    parsear = gv.parsear_fecha
+
+    def parsear_y_eliminar(texto):
+        if any(r["airplane_route_id"] == rid for r in gv.airplanes_routes):
+            assert cliente.delete(f"/delete_airplane_route_by_id/{rid}").status_code == 200
+        return parsear(texto)
+
+    monkeypatch.setattr(gv, "parsear_fecha", parsear_y_eliminar)
+    r = cliente.put(f"/update_airplane_route_by_id/{rid}", json={**ruta, "price": 400})
+
+    assert r.status_code == 404, r.get_json()
+    assert cliente.get(f"/get_airplanes_route_by_id/{rid}").status_code == 404
+    assert rid not in gv.INDICE_RUTAS._rutas
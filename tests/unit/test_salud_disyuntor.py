@@ -0,0 +1,157 @@
+"""
+salud.py en proceso contra un upstream HTTP local: la sonda de /readyz se
+cachea y se hace de a una, y el disyuntor corta las llamadas a un upstream
+caído sin esperar el timeout. Un upstream vivo pero no listo (/readyz 503) no
+abre el disyuntor.
+
+    python -m pytest tests/unit/test_salud_disyuntor.py -q
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tests.utils.modulos import cargar_modulo
+
+salud = cargar_modulo("salud_unit", "Usuario", "salud.py")
+
+
+class Upstream:
+    """
+    Servidor local con /readyz y /datos; `codigo`, `codigo_readyz` (None: el mismo
+    que `codigo`) y `demora` se cambian durante el test.
+    """
+
+    def __init__(self):
+        self.codigo = 200
+        self.codigo_readyz = None
+        self.demora = 0.0
+        self.sondas = 0
+        upstream = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                codigo = upstream.codigo
+                if self.path == "/readyz":
+                    upstream.sondas += 1
+                    codigo = upstream.codigo_readyz or codigo
+                time.sleep(upstream.demora)
+                self.send_response(codigo)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+    def cerrar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    servidor = Upstream()
+    monkeypatch.setenv("UPSTREAM_TEST_URL", servidor.url)
+    yield servidor
+    servidor.cerrar()
+
+
+def test_sonda_cacheada_y_de_a_una(upstream):
+    upstream.demora = 0.05
+    dependencia = salud.Dependencia("upstream", "UPSTREAM_TEST_URL", ttl=0.3)
+
+    with ThreadPoolExecutor(20) as pool:
+        resultados = list(pool.map(lambda _: dependencia.sondear(), range(50)))
+    assert all(r["ready"] for r in resultados)
+    assert upstream.sondas == 1
+
+    time.sleep(0.35)
+    assert dependencia.sondear()["ready"] and upstream.sondas == 2
+
+    # No listo se informa, pero el upstream responde: el disyuntor sigue cerrado
+    upstream.codigo = 503
+    time.sleep(0.35)
+    estado = dependencia.estado()
+    assert estado["ready"] is False and estado["status_code"] == 503
+    assert estado["breaker"]["state"] == "cerrado"
+
+
+def test_disyuntor_corta_y_se_recupera(upstream):
+    dependencia = salud.Dependencia("upstream", "UPSTREAM_TEST_URL", ttl=0.2, enfriamiento=0.3)
+    sesion = requests.Session()
+    salud.Dependencias(dependencia).proteger(sesion, connect_timeout=0.5)
+
+    assert sesion.get(f"{upstream.url}/datos", timeout=20).status_code == 200
+    # Fuera de las dependencias no se toca nada
+    with pytest.raises(requests.exceptions.ConnectionError) as exc:
+        sesion.get("http://127.0.0.1:9/datos", timeout=1)
+    assert not isinstance(exc.value, salud.CircuitoAbierto)
+
+    # Llamadas que fallan con 503: se abre al `umbral` de fallos seguidos
+    upstream.codigo = 503
+    for _ in range(3):
+        assert sesion.get(f"{upstream.url}/datos", timeout=20).status_code == 503
+    assert dependencia.disyuntor.estado == "abierto"
+    inicio = time.perf_counter()
+    with pytest.raises(salud.CircuitoAbierto):
+        sesion.get(f"{upstream.url}/datos", timeout=20)
+    assert time.perf_counter() - inicio < 0.05
+    assert dependencia.disyuntor.snapshot()["rejected"] == 1
+
+    # Tras el enfriamiento pasa una llamada de prueba y, si sale bien, se cierra
+    upstream.codigo = 200
+    time.sleep(0.35)
+    assert sesion.get(f"{upstream.url}/datos", timeout=20).status_code == 200
+    assert dependencia.disyuntor.estado == "cerrado"
+
+
+def test_upstream_no_listo_sigue_atendiendo(upstream):
+    # Como GestiónReservas con GestiónVuelos caído: /readyz 503, el resto responde
+    dependencia = salud.Dependencia("upstream", "UPSTREAM_TEST_URL", ttl=0.0)
+    sesion = requests.Session()
+    salud.Dependencias(dependencia).proteger(sesion)
+    upstream.codigo_readyz = 503
+
+    for _ in range(5):
+        assert dependencia.sondear()["ready"] is False
+        assert sesion.get(f"{upstream.url}/datos", timeout=20).status_code == 200
+    assert dependencia.disyuntor.snapshot()["opens"] == 0
+
+
+def test_upstream_caido_abre_al_primer_fallo(upstream):
+    dependencia = salud.Dependencia("upstream", "UPSTREAM_TEST_URL", ttl=10.0, timeout=0.5)
+    sesion = requests.Session()
+    salud.Dependencias(dependencia).proteger(sesion, connect_timeout=0.5)
+    assert sesion.get(f"{upstream.url}/datos", timeout=20).status_code == 200
+
+    # El fallo de red vuelve a sondear; la sonda tampoco llega y abre el disyuntor
+    upstream.cerrar()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sesion.get(f"{upstream.url}/datos", timeout=20)
+    assert dependencia.disyuntor.estado == "abierto"
+    with pytest.raises(salud.CircuitoAbierto):
+        sesion.get(f"{upstream.url}/datos", timeout=20)
+
+
+def test_disyuntor_umbral_y_prueba_fallida():
+    disyuntor = salud.Disyuntor(umbral=3, enfriamiento=0.1)
+    for _ in range(2):
+        assert disyuntor.permitir()
+        disyuntor.fallo("ConnectionError")
+    assert disyuntor.estado == "cerrado"
+    disyuntor.fallo("ConnectionError")
+    assert disyuntor.estado == "abierto" and not disyuntor.permitir()
+
+    time.sleep(0.12)
+    # Semiabierto: una sola llamada de prueba; si falla vuelve a abrirse
+    assert disyuntor.permitir() and not disyuntor.permitir()
+    disyuntor.fallo("Timeout")
+    assert disyuntor.estado == "abierto" and disyuntor.snapshot()["opens"] == 2
@@ -0,0 +1,138 @@
+"""
+Orden de los comandos del outbox de asientos de GestionReservas (SeatOutbox),
+sin hilo de entrega: reservar (solo_si_libre) reemplaza un "Libre" pendiente,
+no pisa otra reserva en camino y un "Libre" viejo que se reintenta tras un
+timeout no vuelve a la cola si ya hay un estado más nuevo para el asiento.
+Una reserva sin confirmar se retira sin dejar el asiento tomado en GestiónVuelos.
+"""
+
+import pytest
+
+from tests.utils.modulos import cargar_app
+
+ASIENTO = (1, "1A")
+
+
+class _Respuesta:
+    def __init__(self, cuerpo, status_code=200):
+        self.status_code = status_code
+        self._cuerpo = cuerpo
+        self.text = str(cuerpo)
+
+    def json(self):
+        return self._cuerpo
+
+
+@pytest.fixture
+def gr():
+    return cargar_app("gr_app_unit", "GestionReservas")
+
+
+@pytest.fixture
+def outbox(gr):
+    outbox = gr.SeatOutbox()
+    outbox._asegurar_hilo = lambda: None  # los lotes se toman a mano
+    return outbox
+
+
+def _pendiente(outbox):
+    return outbox._pendientes[ASIENTO]["status"]
+
+
+def test_reserva_reemplaza_libre_pendiente(outbox):
+    libre = outbox.encolar(*ASIENTO, "Libre")
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    assert reserva is not None and _pendiente(outbox) == "Reservado"
+    assert outbox._pendientes[ASIENTO]["tickets"] == [libre, reserva]
+
+
+def test_reserva_no_pisa_otra_en_camino(outbox):
+    assert outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True) is not None
+    assert outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True) is None
+    # Tampoco mientras el lote de la primera está en curso
+    outbox._tomar_lote()
+    assert not outbox._pendientes
+    assert outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True) is None
+
+
+def test_libre_reintentado_tras_timeout_no_pisa_reserva_nueva(outbox):
+    outbox.encolar(*ASIENTO, "Libre")
+    lote = outbox._tomar_lote()
+    assert outbox._en_vuelo == {ASIENTO: "Libre"}
+
+    # GestiónVuelos aplicó el "Libre" pero la respuesta no llegó; entra una reserva nueva
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    assert reserva is not None
+    outbox._reprogramar(lote, "ReadTimeout")
+
+    assert _pendiente(outbox) == "Reservado"
+    assert reserva in outbox._pendientes[ASIENTO]["tickets"]
+    assert [c["status"] for c in outbox._tomar_lote()] == ["Reservado"]
+
+
+def test_reserva_exige_libre_solo_sin_nada_en_camino(outbox):
+    outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    assert outbox._pendientes[ASIENTO]["esperado"] == "Libre"
+
+    # Sobre un "Libre" sin entregar no se sabe qué estado tiene GestiónVuelos
+    otro = (1, "2B")
+    outbox.encolar(*otro, "Libre")
+    outbox.encolar(*otro, "Reservado", solo_si_libre=True)
+    assert outbox._pendientes[otro]["esperado"] is None
+
+
+def test_409_de_gestion_vuelos_llega_al_ticket(gr, outbox, monkeypatch):
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    enviados = []
+
+    def put(url, json, timeout):
+        enviados.extend(json["updates"])
+        return _Respuesta({"results": [{"status_code": 409, "message": "El asiento 1A no está 'Libre'."}]})
+
+    monkeypatch.setattr(gr.HTTP, "put", put)
+    outbox._entregar(outbox._tomar_lote())
+
+    assert enviados[0]["expected_status"] == "Libre"
+    assert (reserva["estado"], reserva["codigo"]) == ("fallido", 409)
+
+
+def test_retirar_reserva_que_nunca_salio(outbox):
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    assert outbox.retirar(reserva) == "retirado"
+    assert not outbox._pendientes
+    assert outbox.stats["retirados"] == 1
+
+
+def test_retirar_reserva_que_reemplazo_un_libre(outbox):
+    libre = outbox.encolar(*ASIENTO, "Libre")
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    outbox.retirar(reserva)
+    assert _pendiente(outbox) == "Libre"
+    assert outbox._pendientes[ASIENTO]["tickets"] == [libre]
+
+
+def test_retirar_reserva_en_curso_la_libera_si_se_aplico(outbox):
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    lote = outbox._tomar_lote()
+    assert outbox.retirar(reserva) == "retirado"
+    assert not outbox._pendientes
+
+    outbox._completar(lote[0], "entregado")
+    assert reserva["estado"] == "retirado"
+    assert _pendiente(outbox) == "Libre"
+
+
+def test_retirar_reserva_en_curso_rechazada_no_libera(outbox):
+    # Si GestiónVuelos respondió 409, el asiento es de otro: no se toca
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    lote = outbox._tomar_lote()
+    outbox.retirar(reserva)
+    outbox._fallar(lote[0], "El asiento 1A no está 'Libre'.", 409)
+    assert not outbox._pendientes
+
+
+def test_retirar_ticket_resuelto_devuelve_su_estado(outbox):
+    reserva = outbox.encolar(*ASIENTO, "Reservado", solo_si_libre=True)
+    outbox._completar(outbox._tomar_lote()[0], "entregado")
+    assert outbox.retirar(reserva) == "entregado"
+    assert outbox.stats["retirados"] == 0
@@ -0,0 +1,59 @@
+"""
+Muestreo de tracing.py en proceso: con OTEL_TRACES_SAMPLER_ARG < 1 la fracción
+de solicitudes raíz muestreadas es la configurada (una sola decisión, no
+ratio²) y un traceparent entrante manda sobre el ratio.
+"""
+
+import importlib.util
+import secrets
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+flask = pytest.importorskip("flask")
+
+ROOT = Path(__file__).resolve().parents[2]
+RATIO = 0.5
+N = 4000
+
+
+@pytest.fixture(scope="module")
+def cliente(tmp_path_factory):
+    spec = importlib.util.spec_from_file_location("tracing_muestreo", ROOT / "GestionVuelos" / "tracing.py")
+    tracing = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tracing)
+
+    mp = pytest.MonkeyPatch()
+    mp.setenv("OTEL_TRACES_EXPORTER", "file")
+    mp.setenv("OTEL_TRACES_SAMPLER_ARG", str(RATIO))
+    mp.setenv("OTEL_EXPORTER_FILE_PATH", str(tmp_path_factory.mktemp("trazas") / "traces.jsonl"))
+    # Marshmallow se parchea a nivel de clase: no contaminar al resto de los tests
+    mp.setattr(tracing, "_instrumentar_marshmallow", lambda: None)
+
+    app = flask.Flask("muestreo")
+
+    @app.get("/x")
+    def x():
+        return {"muestreada": tracing.trace.get_current_span().is_recording()}
+
+    assert tracing.iniciar_tracing(app, "Muestreo")
+    yield app.test_client()
+    mp.undo()
+
+
+def test_fraccion_muestreada_es_el_ratio(cliente):
+    muestreadas = sum(cliente.get("/x").get_json()["muestreada"] for _ in range(N))
+    fraccion = muestreadas / N
+    print(f"\n[TRACING] ratio={RATIO} muestreadas={fraccion:.3f}")
+    # 4000 solicitudes con p=0.5: el desvío estándar es ~0.008
+    assert abs(fraccion - RATIO) < 0.05
+
+
+def test_traceparent_entrante_manda(cliente):
+    def con_flags(flags):
+        traceparent = f"00-{secrets.token_hex(16)}-{secrets.token_hex(8)}-{flags}"
+        return cliente.get("/x", headers={"traceparent": traceparent}).get_json()["muestreada"]
+
+    assert all(con_flags("01") for _ in range(50))
+    assert not any(con_flags("00") for _ in range(50))
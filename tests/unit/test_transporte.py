@@ -0,0 +1,95 @@
+"""
+Transporte binario entre servicios (transporte.py), en proceso con datos
+sembrados: el mismo contenido en JSON y en MessagePack, JSON como default y en
+los errores, y la sesión que pide MessagePack y lo lee con resp.json(). El
+costo de codificar y decodificar está en tests/perf/test_transporte_costo.py.
+
+    python -m pytest tests/unit/test_transporte.py -q -s
+"""
+
+import json
+
+import pytest
+import requests
+
+from tests.utils.modulos import cargar_app, cargar_modulo
+
+msgpack = pytest.importorskip("msgpack")
+
+transporte = cargar_modulo("transporte_unit", "Usuario", "transporte.py")
+
+FLOTA = {"seed": 11, "airplanes": 20, "capacity": 30, "routes": 60, "base_date": "2025-06-01"}
+MSGPACK = {"Accept": transporte.ACCEPT_INTERNO}
+
+
+@pytest.fixture(scope="module")
+def cliente_gv():
+    gv = cargar_app("gv_app_unit", "GestionVuelos")
+    cliente = gv.app.test_client()
+    assert cliente.post("/admin/seed", json=FLOTA).status_code == 201
+    return cliente
+
+
+@pytest.mark.parametrize("ruta", [
+    "/get_airplanes",
+    "/get_all_airplanes_routes",
+    "/seats/grouped-by-airplane",
+    "/get_airplane_seats/1/seats",
+    "/search_flights?origin=a",
+])
+def test_mismo_contenido_en_msgpack_y_json(cliente_gv, ruta):
+    plano = cliente_gv.get(ruta)
+    binario = cliente_gv.get(ruta, headers=MSGPACK)
+    assert plano.status_code == binario.status_code == 200
+    assert plano.mimetype == "application/json"
+    assert binario.mimetype == transporte.MSGPACK
+    assert "Accept" in binario.headers["Vary"] and "Accept" in plano.headers["Vary"]
+    # Claves int de los snapshots (p. ej. grouped-by-airplane) llegan como str, igual que en JSON
+    assert msgpack.unpackb(binario.get_data()) == plano.get_json()
+    print(f"\n[BYTES] GV {ruta}: json={len(plano.get_data())} msgpack={len(binario.get_data())}")
+
+
+def test_json_sigue_siendo_el_default(cliente_gv):
+    for cabeceras in ({}, {"Accept": "*/*"}, {"Accept": "application/json"},
+                      {"Accept": "application/json, application/msgpack"}):
+        assert cliente_gv.get("/get_airplanes", headers=cabeceras).mimetype == "application/json"
+    # Fuera de la lista de rutas internas no se negocia
+    r = cliente_gv.get("/health", headers={"Accept": transporte.MSGPACK})
+    assert r.mimetype == "application/json" and "Accept" not in r.headers.get("Vary", "")
+
+
+def test_errores_salen_en_json(cliente_gv):
+    r = cliente_gv.get("/get_airplane_seats/999999/seats", headers=MSGPACK)
+    assert r.status_code == 404
+    assert r.mimetype == "application/json" and r.get_json()["message"]
+
+
+def test_sesion_pide_msgpack_y_lee_con_json():
+    enviados = []
+    cuerpo = {"airplane_id": 1, "seats": ["1A", "1B"]}
+
+    class Sesion:
+        def request(self, method, url, *args, **kwargs):
+            enviados.append((method, kwargs))
+            resp = requests.Response()
+            resp.status_code = 200
+            if (kwargs.get("headers") or {}).get("Accept") == transporte.ACCEPT_INTERNO:
+                resp.headers["Content-Type"] = transporte.MSGPACK
+                resp._content = msgpack.packb(cuerpo)
+            else:
+                resp.headers["Content-Type"] = "application/json"
+                resp._content = json.dumps(cuerpo).encode()
+            return resp
+
+    sesion = Sesion()
+    transporte.usar_transporte_binario(sesion)
+
+    binaria = sesion.request("GET", "http://gv/get_airplanes", timeout=5)
+    assert enviados[-1][1]["headers"]["Accept"] == transporte.ACCEPT_INTERNO
+    assert transporte.es_json(binaria) and binaria.json() == cuerpo
+
+    # Un Accept explícito o un método que no es GET no se tocan
+    assert sesion.request("GET", "http://gv/x", headers={"accept": "application/json"}).json() == cuerpo
+    assert enviados[-1][1]["headers"] == {"accept": "application/json"}
+    sesion.request("PUT", "http://gv/seats/batch", json={}, timeout=5)
+    assert "headers" not in enviados[-1][1]
@@ -0,0 +1,38 @@
+"""
+Carga en proceso de los módulos de los microservicios, para los tests de
+tests/unit y los benchmarks de tests/perf.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def cargar_app(nombre, servicio):
+    """
+    Importa <servicio>/app.py como módulo `nombre` (los tres servicios se llaman
+    app.py, así que no pueden importarse todos como `app`).
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    carpeta = str(ROOT / servicio)
+    sys.path.insert(0, carpeta)
+    try:
+        spec = importlib.util.spec_from_file_location(nombre, os.path.join(carpeta, "app.py"))
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nombre] = modulo
+        spec.loader.exec_module(modulo)
+    finally:
+        sys.path.remove(carpeta)
+    return modulo
+
+
+def cargar_modulo(nombre, servicio, archivo):
+    """Importa <servicio>/<archivo> suelto como módulo `nombre` (p. ej. un helper copiado en cada servicio)."""
+    spec = importlib.util.spec_from_file_location(nombre, ROOT / servicio / archivo)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,73 @@
+# tools/compartidos.py
+"""
+Módulos compartidos por los tres microservicios. Cada imagen de Docker se
+construye solo con la carpeta de su servicio (build: ./Servicio), así que estos
+archivos viven copiados en cada una. La copia de GestionVuelos es la fuente: se
+edita ahí y se propaga con
+
+    python -m tools.compartidos            # copia GestionVuelos/<m> a los otros servicios
+    python -m tools.compartidos --check    # sale con 1 si alguna copia difiere (CI)
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FUENTE = "GestionVuelos"
+COPIAS = ("GestionReservas", "Usuario")
+MODULOS = (
+    "arranque.py",
+    "compresion.py",
+    "metrics.py",
+    "openapi_spec.py",
+    "salud.py",
+    "tracing.py",
+    "transporte.py",
+)
+
+
+def diferencias(raiz=ROOT):
+    """[(servicio, modulo)] de las copias que no son idénticas a la de FUENTE."""
+    distintas = []
+    for modulo in MODULOS:
+        fuente = (raiz / FUENTE / modulo).read_bytes()
+        for servicio in COPIAS:
+            copia = raiz / servicio / modulo
+            if not copia.exists() or copia.read_bytes() != fuente:
+                distintas.append((servicio, modulo))
+    return distintas
+
+
+def sincronizar(raiz=ROOT):
+    """Copia a los otros servicios los módulos que difieren; devuelve los copiados."""
+    distintas = diferencias(raiz)
+    for servicio, modulo in distintas:
+        shutil.copyfile(raiz / FUENTE / modulo, raiz / servicio / modulo)
+    return distintas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.compartidos", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="solo verificar, sin copiar")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        distintas = diferencias()
+        for servicio, modulo in distintas:
+            print(f"{servicio}/{modulo} difiere de {FUENTE}/{modulo}", file=sys.stderr)
+        if distintas:
+            print("Corré `python -m tools.compartidos` para sincronizar las copias.", file=sys.stderr)
+            sys.exit(1)
+        print(f"{len(MODULOS)} módulos compartidos idénticos en {FUENTE}, {', '.join(COPIAS)}.")
+        return
+
+    for servicio, modulo in sincronizar():
+        print(f"{FUENTE}/{modulo} -> {servicio}/{modulo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# tools/loadtest/__init__.py
+"""
+Pruebas de carga de los tres servicios (GestiónVuelos, GestiónReservas, Usuario).
+
+Levanta los servicios en local (servidor de Flask o gunicorn, un proceso por
+servicio) o apunta a unos ya levantados, los recorre con varios hilos durante
+un tiempo fijo y reporta throughput y latencias p50/p95/p99 por endpoint.
+Cada corrida agrega filas a metrics/loadtest.csv con el commit actual, así las
+regresiones se siguen commit a commit.
+
+    python -m tools.loadtest                          # flask, todos los escenarios
+    python -m tools.loadtest --modo gunicorn --hilos 16 --duracion 30
+    python -m tools.loadtest --modo externo --escenarios navegar,contencion
+    python -m tools.loadtest --comparar --umbral 20   # exit 1 si p95 empeora > 20 %
+
+Escenarios (tools/loadtest/escenarios.py):
+  navegar     lecturas: aviones, rutas, asientos, búsqueda, reservas, proxy Usuario
+  reservar    reserva un asiento libre y la elimina
+  pagar       reserva, paga y cancela (pago + reserva)
+  mixto       70 % navegar, 15 % reservar, 15 % pagar
+  contencion  todos los hilos pelean por los mismos pocos asientos (201 o 409)
+"""
@@ -0,0 +1,89 @@
+# tools/loadtest/__main__.py
+import argparse
+import datetime
+import sys
+
+from . import __doc__ as AYUDA
+from .escenarios import ESCENARIOS, ejecutar, preparar_contexto
+from .reporte import (
+    CSV_PATH,
+    agregar,
+    commit_actual,
+    escribir_csv,
+    imprimir,
+    leer_anteriores,
+    regresiones,
+)
+from .servicios import Servicios
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.loadtest", description=AYUDA,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modo", choices=("flask", "gunicorn", "externo"), default="flask",
+                        help="cómo levantar los servicios (externo: ya corriendo, URLs de *_BASE_URL)")
+    parser.add_argument("--escenarios", default=",".join(ESCENARIOS),
+                        help=f"lista separada por comas de: {', '.join(ESCENARIOS)}")
+    parser.add_argument("--hilos", type=int, default=8, help="clientes concurrentes por escenario")
+    parser.add_argument("--duracion", type=float, default=15.0, help="segundos por escenario")
+    parser.add_argument("--calentamiento", type=float, default=2.0, help="segundos sin medir antes de cada escenario")
+    parser.add_argument("--puerto-base", type=int, default=6001, help="primer puerto en modo gunicorn")
+    parser.add_argument("--workers-usuario", type=int, default=4, help="workers de gunicorn para Usuario")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-csv", action="store_true", help="no escribir metrics/loadtest.csv")
+    parser.add_argument("--comparar", action="store_true",
+                        help="mostrar la variación de p95 frente a la última corrida de otro commit")
+    parser.add_argument("--umbral", type=float, default=None,
+                        help="con --comparar: exit 1 si algún p95 empeora más de este porcentaje")
+    args = parser.parse_args(argv)
+
+    args.escenarios = [e.strip() for e in args.escenarios.split(",") if e.strip()]
+    desconocidos = [e for e in args.escenarios if e not in ESCENARIOS]
+    if desconocidos:
+        parser.error(f"escenarios desconocidos: {', '.join(desconocidos)}")
+    if args.hilos < 1 or args.duracion <= 0:
+        parser.error("--hilos y --duracion deben ser positivos")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    commit = commit_actual()
+    anteriores = leer_anteriores(commit, args.modo) if args.comparar else {}
+    encontradas = []
+
+    try:
+        with Servicios(args.modo, args.puerto_base, args.workers_usuario) as servicios:
+            contexto = preparar_contexto(servicios.urls)
+            for escenario in args.escenarios:
+                if args.calentamiento > 0:
+                    ejecutar(escenario, servicios.urls, contexto, args.hilos, args.calentamiento, args.semilla)
+                segundos, clientes = ejecutar(escenario, servicios.urls, contexto, args.hilos,
+                                              args.duracion, args.semilla)
+                filas = agregar(clientes, segundos)
+                imprimir(escenario, filas, anteriores, args.hilos)
+
+                ahora = datetime.datetime.now().isoformat(timespec="seconds")
+                for fila in filas:
+                    fila.update(timestamp=ahora, commit=commit, mode=args.modo, scenario=escenario,
+                                threads=args.hilos, duration_seconds=round(segundos, 2))
+                if not args.sin_csv:
+                    escribir_csv(filas)
+                if args.comparar and args.umbral is not None:
+                    encontradas += [(escenario, *r) for r in regresiones(escenario, args.hilos, filas,
+                                                                         anteriores, args.umbral)]
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if not args.sin_csv:
+        print(f"\nResultados agregados en {CSV_PATH} (commit {commit})")
+    if encontradas:
+        print(f"\nRegresiones de p95 mayores a {args.umbral}%:", file=sys.stderr)
+        for escenario, endpoint, antes, ahora, commit_previo in encontradas:
+            print(f"  {escenario} · {endpoint}: {antes:.1f} ms ({commit_previo}) -> {ahora:.1f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# tools/loadtest/escenarios.py
+"""
+Escenarios de carga. Cada escenario es una función (cliente, contexto, rnd) que
+hace una iteración; el motor la repite en cada hilo hasta agotar la duración.
+Los flujos que reservan dejan el asiento libre al terminar, así una corrida
+larga no agota los asientos.
+"""
+
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+TIMEOUT_S = 20
+
+GV, GR, US = "GestionVuelos", "GestionReservas", "Usuario"
+_PREFIJO = {GV: "GV", GR: "GR", US: "US"}
+
+
+class Cliente:
+    """Sesión HTTP de un hilo; anota latencia y código de cada llamada por endpoint."""
+
+    def __init__(self, urls):
+        self.urls = urls
+        self.sesion = requests.Session()
+        self.latencias = defaultdict(list)   # endpoint -> [ms]
+        self.codigos = defaultdict(Counter)  # endpoint -> {status: n}
+        self.errores = Counter()             # endpoint -> n
+
+    def llamar(self, servicio, metodo, ruta, etiqueta=None, esperados=(200,), **kwargs):
+        """
+        Hace la llamada y la registra bajo 'GV GET /ruta' (etiqueta reemplaza la
+        ruta cuando lleva IDs). Un código fuera de `esperados` o un error de red
+        cuenta como error. Devuelve la respuesta o None.
+        """
+        endpoint = f"{_PREFIJO[servicio]} {metodo} {etiqueta or ruta}"
+        inicio = time.perf_counter()
+        try:
+            r = self.sesion.request(metodo, self.urls[servicio] + ruta, timeout=TIMEOUT_S, **kwargs)
+            codigo = r.status_code
+        except requests.RequestException:
+            r, codigo = None, "red"
+        self.latencias[endpoint].append((time.perf_counter() - inicio) * 1000)
+        self.codigos[endpoint][codigo] += 1
+        if codigo not in esperados:
+            self.errores[endpoint] += 1
+            return None
+        return r
+
+
+def _cuerpo_reserva(airplane_id, route_id, seat_number):
+    return {
+        "passport_number": "A12345678",
+        "full_name": "Pasajero Carga",
+        "email": "carga@example.com",
+        "phone_number": "+50688888888",
+        "emergency_contact_name": "Contacto Carga",
+        "emergency_contact_phone": "+50677777777",
+        "airplane_id": airplane_id,
+        "airplane_route_id": route_id,
+        "seat_number": seat_number,
+        "status": "Reservado",
+    }
+
+
+def preparar_contexto(urls, asientos_contencion=4):
+    """Rutas existentes y los asientos que se disputan en el escenario de contención."""
+    rutas = requests.get(urls[GV] + "/get_all_airplanes_routes", timeout=TIMEOUT_S).json()
+    if not rutas:
+        raise RuntimeError("GestiónVuelos no tiene rutas; no hay nada que reservar.")
+    rutas = [(r["airplane_route_id"], r["airplane_id"]) for r in rutas]
+
+    route_id, airplane_id = rutas[0]
+    asientos = requests.get(f"{urls[GV]}/get_airplane_seats/{airplane_id}/seats", timeout=TIMEOUT_S).json()
+    libres = [s["seat_number"] for s in asientos if s["status"] == "Libre"]
+    return {
+        "rutas": rutas,
+        "airplane_ids": sorted({a for _, a in rutas}),
+        "contencion": (route_id, airplane_id, libres[:asientos_contencion]),
+    }
+
+
+# --- Escenarios ---
+def navegar(cliente, contexto, rnd):
+    airplane_id = rnd.choice(contexto["airplane_ids"])
+    route_id, _ = rnd.choice(contexto["rutas"])
+    lecturas = (
+        (GV, "/get_airplanes", None),
+        (GV, "/get_all_airplanes_routes", None),
+        (GV, "/seats/grouped-by-airplane", None),
+        (GV, f"/get_airplane_seats/{airplane_id}/seats", "/get_airplane_seats/<id>/seats"),
+        (GV, f"/get_airplanes_route_by_id/{route_id}", "/get_airplanes_route_by_id/<id>"),
+        (GV, "/search_flights?limit=20", "/search_flights"),
+        (GR, "/get_fake_reservations", None),
+        (US, "/get_all_airplanes_routes", None),
+        (US, "/search_flights?limit=20", "/search_flights"),
+    )
+    servicio, ruta, etiqueta = rnd.choice(lecturas)
+    # /get_fake_reservations responde 204 sin reservas (con gunicorn no corre el seed de __main__)
+    cliente.llamar(servicio, "GET", ruta, etiqueta, esperados=(200, 204))
+
+
+def _reservar_libre(cliente, contexto, rnd):
+    route_id, airplane_id = rnd.choice(contexto["rutas"])
+    r = cliente.llamar(GV, "GET", f"/get_random_free_seat/{airplane_id}", "/get_random_free_seat/<id>",
+                       esperados=(200, 404))
+    if r is None or r.status_code == 404:
+        return None
+    # Otro hilo puede tomar el asiento entre la consulta y la reserva: 409 es válido
+    r = cliente.llamar(GR, "POST", "/add_reservation", esperados=(201, 409),
+                       json=_cuerpo_reserva(airplane_id, route_id, r.json()["seat_number"]))
+    if r is None or r.status_code != 201:
+        return None
+    return r.json()["reservation"]
+
+
+def reservar(cliente, contexto, rnd):
+    reserva = _reservar_libre(cliente, contexto, rnd)
+    if reserva is not None:
+        cliente.llamar(GR, "DELETE", f"/delete_reservation_by_id/{reserva['reservation_id']}",
+                       "/delete_reservation_by_id/<id>")
+
+
+def pagar(cliente, contexto, rnd):
+    reserva = _reservar_libre(cliente, contexto, rnd)
+    if reserva is None:
+        return
+    r = cliente.llamar(GR, "POST", "/create_payment", esperados=(201,), json={
+        "reservation_id": reserva["reservation_id"], "payment_method": "Tarjeta", "currency": "Dolares",
+    })
+    if r is None:
+        cliente.llamar(GR, "DELETE", f"/delete_reservation_by_id/{reserva['reservation_id']}",
+                       "/delete_reservation_by_id/<id>")
+        return
+    cliente.llamar(GR, "DELETE", f"/cancel_payment_and_reservation/{r.json()['payment']['payment_id']}",
+                   "/cancel_payment_and_reservation/<id>")
+
+
+def mixto(cliente, contexto, rnd):
+    rnd.choices((navegar, reservar, pagar), weights=(70, 15, 15))[0](cliente, contexto, rnd)
+
+
+def contencion(cliente, contexto, rnd):
+    route_id, airplane_id, asientos = contexto["contencion"]
+    if not asientos:
+        raise RuntimeError("No hay asientos libres para el escenario de contención.")
+    r = cliente.llamar(GR, "POST", "/add_reservation", "/add_reservation (contención)", esperados=(201, 409),
+                       json=_cuerpo_reserva(airplane_id, route_id, rnd.choice(asientos)))
+    if r is not None and r.status_code == 201:
+        cliente.llamar(GR, "DELETE", f"/delete_reservation_by_id/{r.json()['reservation']['reservation_id']}",
+                       "/delete_reservation_by_id/<id> (contención)")
+
+
+ESCENARIOS = {
+    "navegar": navegar,
+    "reservar": reservar,
+    "pagar": pagar,
+    "mixto": mixto,
+    "contencion": contencion,
+}
+
+
+def ejecutar(escenario, urls, contexto, hilos, duracion_s, semilla=0):
+    """
+    Corre `escenario` en `hilos` hilos durante `duracion_s` segundos.
+    Devuelve (segundos reales, clientes) para agregar en reporte.py.
+    """
+    funcion = ESCENARIOS[escenario]
+    arranque = threading.Barrier(hilos + 1)
+    fin = []
+
+    def trabajador(i):
+        cliente = Cliente(urls)
+        rnd = random.Random(semilla * 1000 + i)
+        arranque.wait()
+        while time.monotonic() < fin[0]:
+            funcion(cliente, contexto, rnd)
+        return cliente
+
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        futuros = [ejecutor.submit(trabajador, i) for i in range(hilos)]
+        inicio = time.monotonic()
+        fin.append(inicio + duracion_s)
+        arranque.wait()
+        clientes = [f.result() for f in futuros]
+    return time.monotonic() - inicio, clientes
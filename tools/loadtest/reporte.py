@@ -0,0 +1,112 @@
+# tools/loadtest/reporte.py
+"""Percentiles por endpoint, CSV en metrics/ y comparación con la corrida anterior."""
+
+import csv
+import math
+import subprocess
+from collections import Counter, defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+METRICS_DIR = ROOT / "metrics"
+CSV_PATH = METRICS_DIR / "loadtest.csv"
+
+COLUMNAS = [
+    "timestamp", "commit", "mode", "scenario", "threads", "duration_seconds", "endpoint",
+    "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "status_codes",
+]
+
+
+def percentil(ordenados, p):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(math.ceil(p / 100 * len(ordenados)) - 1, 0)]
+
+
+def agregar(clientes, segundos):
+    """Une las muestras de todos los hilos: una fila por endpoint más la fila 'TOTAL'."""
+    latencias, codigos, errores = defaultdict(list), defaultdict(Counter), Counter()
+    for cliente in clientes:
+        for endpoint, valores in cliente.latencias.items():
+            latencias[endpoint].extend(valores)
+            codigos[endpoint].update(cliente.codigos[endpoint])
+        errores.update(cliente.errores)
+
+    def _fila(endpoint, valores, por_codigo, n_errores):
+        valores.sort()
+        return {
+            "endpoint": endpoint,
+            "requests": len(valores),
+            "errors": n_errores,
+            "rps": round(len(valores) / segundos, 2) if segundos else 0.0,
+            "p50_ms": round(percentil(valores, 50), 2),
+            "p95_ms": round(percentil(valores, 95), 2),
+            "p99_ms": round(percentil(valores, 99), 2),
+            "max_ms": round(valores[-1], 2) if valores else 0.0,
+            "status_codes": ";".join(f"{c}:{n}" for c, n in sorted(por_codigo.items(), key=lambda x: str(x[0]))),
+        }
+
+    filas = [_fila(e, latencias[e], codigos[e], errores[e]) for e in sorted(latencias)]
+    todas = [v for valores in latencias.values() for v in valores]
+    total_codigos = sum(codigos.values(), Counter())
+    filas.append(_fila("TOTAL", todas, total_codigos, sum(errores.values())))
+    return filas
+
+
+def commit_actual():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10)
+        return salida.stdout.strip() or "desconocido"
+    except (OSError, subprocess.SubprocessError):
+        return "desconocido"
+
+
+def leer_anteriores(commit, modo, csv_path=CSV_PATH):
+    """
+    Última corrida registrada de cada (escenario, hilos, endpoint) en el mismo
+    modo pero en otro commit: {(escenario, hilos, endpoint): fila}.
+    """
+    if not csv_path.exists():
+        return {}
+    anteriores = {}
+    with csv_path.open(newline="", encoding="utf-8") as f:
+        for fila in csv.DictReader(f):
+            if fila["mode"] == modo and fila["commit"] != commit:
+                anteriores[(fila["scenario"], fila["threads"], fila["endpoint"])] = fila
+    return anteriores
+
+
+def escribir_csv(filas, csv_path=CSV_PATH):
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not csv_path.exists()
+    with csv_path.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNAS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(filas)
+
+
+def imprimir(escenario, filas, anteriores=None, hilos=None):
+    print(f"\n== {escenario} ==")
+    print(f"{'endpoint':<58} {'req':>7} {'err':>5} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}  Δp95")
+    for fila in filas:
+        delta = ""
+        previa = (anteriores or {}).get((escenario, str(hilos), fila["endpoint"]))
+        if previa and float(previa["p95_ms"]) > 0:
+            delta = f"{(fila['p95_ms'] / float(previa['p95_ms']) - 1) * 100:+.1f}%"
+        print(f"{fila['endpoint']:<58} {fila['requests']:>7} {fila['errors']:>5} {fila['rps']:>9.1f} "
+              f"{fila['p50_ms']:>8.1f} {fila['p95_ms']:>8.1f} {fila['p99_ms']:>8.1f}  {delta}")
+
+
+def regresiones(escenario, hilos, filas, anteriores, umbral_pct):
+    """Endpoints cuyo p95 empeoró más de umbral_pct respecto a la corrida anterior."""
+    encontradas = []
+    for fila in filas:
+        previa = anteriores.get((escenario, str(hilos), fila["endpoint"]))
+        if previa and float(previa["p95_ms"]) > 0:
+            cambio = (fila["p95_ms"] / float(previa["p95_ms"]) - 1) * 100
+            if cambio > umbral_pct:
+                encontradas.append((fila["endpoint"], float(previa["p95_ms"]), fila["p95_ms"], previa["commit"]))
+    return encontradas
@@ -0,0 +1,135 @@
+# tools/loadtest/servicios.py
+"""Arranque y parada de los servicios para las pruebas de carga."""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SERVICIOS = ("GestionVuelos", "GestionReservas", "Usuario")
+
+# app.run() de cada servicio usa puertos fijos
+PUERTOS_FLASK = {"GestionVuelos": 5001, "GestionReservas": 5002, "Usuario": 5003}
+
+# Mismas variables que tests/api/*_common.py
+VARIABLES_EXTERNO = {
+    "GestionVuelos": ("GESTIONVUELOS_BASE_URL", "http://localhost:5001"),
+    "GestionReservas": ("GESTIONRESERVAS_BASE_URL", "http://localhost:5002"),
+    "Usuario": ("USUARIO_BASE_URL", "http://localhost:5003"),
+}
+
+# GestiónVuelos y GestiónReservas guardan el estado en memoria: un solo worker
+# (igual que en los Dockerfile). Usuario no tiene estado y escala con workers.
+HILOS_GUNICORN = 8
+
+
+def _puerto_ocupado(puerto):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.2)
+        return s.connect_ex(("127.0.0.1", puerto)) == 0
+
+
+def _esperar_listo(url, proceso, limite_s=30.0):
+    # /readyz y no /health: GestiónReservas responde antes de tener sus reservas iniciales
+    fin = time.monotonic() + limite_s
+    while time.monotonic() < fin:
+        if proceso.poll() is not None:
+            return False
+        try:
+            if requests.get(f"{url}/readyz", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+class Servicios:
+    """
+    Context manager que deja los tres servicios respondiendo y expone sus URLs.
+
+    modo 'flask' corre `python app.py` (puertos 5001-5003), 'gunicorn' corre
+    `gunicorn app:app` desde puerto_base, 'externo' no arranca nada y usa las
+    variables de entorno de los tests.
+    """
+
+    def __init__(self, modo="flask", puerto_base=6001, workers_usuario=4):
+        self.modo = modo
+        self.puerto_base = puerto_base
+        self.workers_usuario = workers_usuario
+        self.urls = {}
+        self._procesos = []
+        self._logs = None
+
+    def __enter__(self):
+        if self.modo == "externo":
+            self.urls = {s: os.getenv(var, defecto).rstrip("/") for s, (var, defecto) in VARIABLES_EXTERNO.items()}
+            for servicio, url in self.urls.items():
+                try:
+                    requests.get(f"{url}/readyz", timeout=5).raise_for_status()
+                except requests.RequestException as e:
+                    raise RuntimeError(f"{servicio} no está listo en {url}: {e}") from None
+            return self
+
+        if self.modo == "flask":
+            puertos = dict(PUERTOS_FLASK)
+        else:
+            puertos = {s: self.puerto_base + i for i, s in enumerate(SERVICIOS)}
+        ocupados = [str(p) for p in puertos.values() if _puerto_ocupado(p)]
+        if ocupados:
+            raise RuntimeError(f"Puertos ocupados: {', '.join(ocupados)}. Detén esos servicios o usa --modo externo.")
+
+        self.urls = {s: f"http://127.0.0.1:{p}" for s, p in puertos.items()}
+        entorno = dict(
+            os.environ,
+            GESTIONVUELOS_SERVICE=self.urls["GestionVuelos"],
+            GESTIONRESERVAS_SERVICE=self.urls["GestionReservas"],
+            PYTHONUNBUFFERED="1",
+        )
+        # Todo el tráfico sale de 127.0.0.1: con el control de admisión de Usuario
+        # se mediría el rate limit y no el servicio. ADMISION=1 lo deja activo.
+        entorno.setdefault("ADMISION", "0")
+        self._logs = Path(tempfile.mkdtemp(prefix="loadtest_"))
+        try:
+            # GestiónVuelos primero: los otros dos lo consultan al arrancar
+            for servicio in SERVICIOS:
+                proceso = self._lanzar(servicio, puertos[servicio], entorno)
+                if not _esperar_listo(self.urls[servicio], proceso):
+                    raise RuntimeError(f"{servicio} no arrancó; revisa {self._logs / (servicio + '.log')}")
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _lanzar(self, servicio, puerto, entorno):
+        if self.modo == "flask":
+            comando = [sys.executable, "app.py"]
+        else:
+            workers = self.workers_usuario if servicio == "Usuario" else 1
+            comando = [
+                sys.executable, "-m", "gunicorn", "-w", str(workers), "--threads", str(HILOS_GUNICORN),
+                "-b", f"127.0.0.1:{puerto}", "app:app",
+            ]
+        log = open(self._logs / f"{servicio}.log", "wb")
+        proceso = subprocess.Popen(comando, cwd=ROOT / servicio, env=entorno, stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+        self._procesos.append(proceso)
+        return proceso
+
+    def __exit__(self, *exc):
+        for proceso in reversed(self._procesos):
+            proceso.terminate()
+        for proceso in self._procesos:
+            try:
+                proceso.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+        self._procesos.clear()
+        return False
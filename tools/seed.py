@@ -0,0 +1,108 @@
+# tools/seed.py
+"""
+Genera un entorno de datos para pruebas de capacidad en servicios ya levantados:
+primero la flota en GestiónVuelos (POST /admin/seed) y después las reservas y
+pagos en GestiónReservas (POST /admin/seed), que marca los asientos ocupados.
+Todo es determinista: la misma --semilla con los mismos tamaños produce los
+mismos datos.
+
+    python -m tools.seed                                   # 3 aviones, 3 reservas
+    python -m tools.seed --aviones 5000 --capacidad 200 --rutas 50000 \\
+        --reservas 1000000 --pagos 300000 --semilla 42     # 1M asientos, 1M reservas
+
+Las URLs salen de GESTIONVUELOS_BASE_URL y GESTIONRESERVAS_BASE_URL (por
+defecto localhost:5001 y localhost:5002), igual que en tools/loadtest. Los
+servicios tienen que haberse levantado con ADMIN_SEED_ENABLED=1: sin esa
+variable POST /admin/seed no existe (responde 404).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+URL_VUELOS = os.getenv("GESTIONVUELOS_BASE_URL", "http://localhost:5001").rstrip("/")
+URL_RESERVAS = os.getenv("GESTIONRESERVAS_BASE_URL", "http://localhost:5002").rstrip("/")
+TIMEOUT = 600
+
+
+def capacidad(valor):
+    if valor == "layout":
+        return valor
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError("debe ser un entero positivo o 'layout'") from None
+    if numero <= 0:
+        raise argparse.ArgumentTypeError("debe ser un entero positivo o 'layout'")
+    return numero
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.seed", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--aviones", type=int, default=3)
+    parser.add_argument("--capacidad", type=capacidad, default=15,
+                        help="asientos por avión o 'layout' (capacidad típica de cada modelo)")
+    parser.add_argument("--rutas", type=int, default=None, help="por defecto, una por avión")
+    parser.add_argument("--reservas", type=int, default=3)
+    parser.add_argument("--pagos", type=int, default=0)
+    parser.add_argument("--fecha-base", default=None, help="YYYY-MM-DD (por defecto hoy)")
+    parser.add_argument("--sin-asientos", action="store_true",
+                        help="no marcar en GestiónVuelos los asientos de las reservas")
+    parser.add_argument("--solo-vuelos", action="store_true", help="no generar reservas ni pagos")
+    return parser.parse_args(argv)
+
+
+def sembrar(url, cuerpo):
+    inicio = time.perf_counter()
+    resp = requests.post(f"{url}/admin/seed", json=cuerpo, timeout=TIMEOUT)
+    segundos = time.perf_counter() - inicio
+    try:
+        datos = resp.json()
+    except ValueError:
+        datos = {"message": resp.text[:500]}
+    if resp.status_code == 404:
+        raise RuntimeError(f"{url}/admin/seed no existe: levantá el servicio con ADMIN_SEED_ENABLED=1.")
+    if resp.status_code != 201:
+        raise RuntimeError(f"{url}/admin/seed respondió {resp.status_code}: {datos.get('message')}")
+    return datos, segundos
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    comun = {"seed": args.semilla}
+    if args.fecha_base:
+        comun["base_date"] = args.fecha_base
+
+    try:
+        vuelos, segundos = sembrar(URL_VUELOS, {
+            **comun, "airplanes": args.aviones, "capacity": args.capacidad,
+            "routes": args.aviones if args.rutas is None else args.rutas,
+        })
+        print(f"GestiónVuelos: {vuelos['airplanes']} aviones, {vuelos['seats']} asientos, "
+              f"{vuelos['routes']} rutas ({segundos:.2f} s)")
+        if args.solo_vuelos:
+            return
+
+        reservas, segundos = sembrar(URL_RESERVAS, {
+            **comun, "reservations": args.reservas, "payments": args.pagos,
+            "sync_seats": not args.sin_asientos,
+        })
+        print(f"GestiónReservas: {reservas['reservations']} reservas, {reservas['payments']} pagos "
+              f"({segundos:.2f} s)")
+        sync = reservas.get("seat_sync")
+        if sync:
+            print(f"  asientos: {sync['applied']} de {sync['updates']} actualizados en {sync['batches']} lotes")
+            if "error" in sync:
+                raise RuntimeError(f"sincronización de asientos incompleta: {sync['error']}")
+    except (requests.exceptions.RequestException, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()